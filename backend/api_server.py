@@ -2,19 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import json
-import json as _json_mod
 import os
-import re
-import time as _time
-import urllib.request as _urllib_request
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
 from typing import AsyncGenerator, Dict, List, Literal, Optional, Union
 
 from cachetools import TTLCache
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 # Ensure assistant workflow points to OpenAI API when backend is started standalone.
@@ -22,9 +18,29 @@ os.environ.setdefault("QWEN_BASE_URL", "https://api.openai.com/v1")
 os.environ.setdefault("ROUTER_BASE_URL", os.environ["QWEN_BASE_URL"])
 os.environ.setdefault("ROUTER_API_KEY", os.environ.get("OPENAI_API_KEY", ""))
 
+from backend.warmup import BootProfile, start_warmup
+
+# Created before the project imports so the boot profile includes them.
+BOOT_PROFILE = BootProfile()
+
+from backend.commute_cache import COMMUTE_CACHE
+from backend.sse_codec import StreamCompressor, content_version, dumps, negotiate_encoding, sse_event
+from core.logger import log_message
+from core.settings import COMMUTE_DEADLINE_S, SSE_COMPRESSION
+from core.tracing import configure_otel, incr, latency_summary, metrics_text, span, start_trace
+from orchestration.listing_store import resolve_listings
+from orchestration.nodes import turn_page
 from orchestration.state import AgentState
 from orchestration.workflow import process_turn
+from skills.qa.chunk_index import _load_sidecar as _load_qa_sidecar
 from skills.search.agentic import build_search_runtime
+from skills.search.commute import get_commute_graph, warm_popular_destinations
+from skills.search.engine import embed_query
+from skills.search.geocoder import get_place_index
+from skills.search.listing_fields import _json_list, listing_deposit, listing_items
+from skills.search.location_match import _get_location_match_index
+from skills.search.runtime_bundle import load_runtime_bundle
+from skills.search.soft_rank import _load_pref_vector_store
 
 
 class ChatMessage(BaseModel):
@@ -37,6 +53,16 @@ class ChatStreamRequest(BaseModel):
     user_text: Optional[str] = None
     messages: List[ChatMessage] = Field(default_factory=list)
     route_hint: Optional[Dict] = None
+    # Content versions the client already holds; matching arrays are omitted.
+    known_result_set_id: Optional[str] = None
+    known_shortlist_version: Optional[str] = None
+
+
+class PageRequest(BaseModel):
+    session_id: str = Field(min_length=1)
+    page_action: Literal["next", "prev"] = "next"
+    known_result_set_id: Optional[str] = None
+    known_shortlist_version: Optional[str] = None
 
 
 app = FastAPI(title="AI Assistant Backend Proxy", version="0.1.0")
@@ -61,13 +87,34 @@ def get_runtime():
     return _RUNTIME
 
 
+# Boot steps the server cannot answer searches without; the others retry lazily.
+_REQUIRED_WARMUP_STEPS = ("runtime", "embedder", "location_index", "commute_tables")
+
+
+def _warmup_steps() -> list:
+    return [
+        ("bundle", load_runtime_bundle),
+        ("runtime", lambda: type(get_runtime()).__name__),
+        ("embedder", lambda: int(embed_query(get_runtime().embedder, "warmup").shape[1])),
+        ("location_index", lambda: len(_get_location_match_index().get("entries") or [])),
+        ("pref_vectors", lambda: len(_load_pref_vector_store())),
+        ("commute_tables", warm_popular_destinations),
+        ("place_index", lambda: type(get_place_index()).__name__),
+        ("qa_chunk_index", lambda: len(_load_qa_sidecar()["listings"])),
+    ]
+
+
 @app.on_event("startup")
 def _preload_runtime():
-    """Eagerly load sentence-transformer + Qdrant client at startup."""
+    """Warm the embedder, Qdrant client and search indexes in the background.
+
+    The port binds right away; /readyz flips to 200 once warmup is done.
+    """
     import time as _t
-    t0 = _t.perf_counter()
-    get_runtime()
-    print(f"[TIMING] startup preload={_t.perf_counter()-t0:.2f}s")
+    BOOT_PROFILE.record("imports", _t.perf_counter() - BOOT_PROFILE.started)
+    if configure_otel():
+        log_message("INFO", "[tracing] OpenTelemetry exporter enabled")
+    start_warmup(BOOT_PROFILE, _warmup_steps(), required=_REQUIRED_WARMUP_STEPS)
 
 ROUTER_DEBUG = str(os.environ.get("ROUTER_DEBUG", "1")).strip().lower() in {"1", "true", "yes", "on"}
 SESSIONS: TTLCache = TTLCache(maxsize=50, ttl=3600)  # max 50 sessions, 1-hour TTL
@@ -79,44 +126,6 @@ SESSION_LOCKS_META = Lock()  # protects SESSION_LOCKS dict itself
 MAX_USER_INPUT = 2000
 
 
-def _json_list(val: object) -> list[str]:
-    """Parse a JSON-encoded array string (e.g. image_urls) into list[str]."""
-    if isinstance(val, list):
-        return [str(x) for x in val if x]
-    if isinstance(val, str) and val.strip():
-        try:
-            parsed = json.loads(val)
-            if isinstance(parsed, list):
-                return [str(x) for x in parsed if x]
-        except Exception:
-            pass
-    return []
-
-
-def _features_list(val: object) -> list[str]:
-    """Parse features — handles JSON arrays, Python lists, and newline/semicolon-separated strings."""
-    _skip = {"ask agent", "n/a", "none", ""}
-    def _clean(s: str) -> str:
-        return re.sub(r"^[\-–•]\s*", "", s).strip()
-    if isinstance(val, list):
-        return [_clean(str(x)) for x in val if _clean(str(x)).lower() not in _skip]
-    if isinstance(val, str) and val.strip():
-        if val.strip().lower() in _skip:
-            return []
-        # Try JSON array first
-        if val.strip().startswith("["):
-            try:
-                parsed = json.loads(val)
-                if isinstance(parsed, list):
-                    return [_clean(str(x)) for x in parsed if _clean(str(x)).lower() not in _skip]
-            except Exception:
-                pass
-        # Newline or semicolon separated; strip leading "- " or "• " list markers
-        return [_clean(x) for x in val.replace(";", "\n").split("\n")
-                if _clean(x) and _clean(x).lower() not in _skip]
-    return []
-
-
 def _safe_str(val: object) -> str:
     """Convert to string, treating None/NaN/nan as empty."""
     if val is None:
@@ -156,21 +165,6 @@ def _num(val: object, default: float | int = 0, *, keep_zero: bool = True) -> fl
         return default
 
 
-def _parse_deposit(val: object) -> float | int | None:
-    """Parse deposit which may be a string like '£1,600' or 'Ask agent'."""
-    if val is None:
-        return None
-    import re as _re
-    m = _re.search(r'[\d,]+(?:\.\d+)?', str(val).replace(',', ''))
-    if m:
-        try:
-            f = float(m.group().replace(',', ''))
-            return int(f) if f == int(f) else round(f, 2)
-        except (ValueError, TypeError):
-            pass
-    return None
-
-
 def _is_real_image(url: str) -> bool:
     """Filter out placeholder/logo images — only keep real property photos."""
     if not url:
@@ -187,199 +181,218 @@ def _is_real_image(url: str) -> bool:
     return True
 
 
-# --- Commute time enrichment via TfL Journey API ---
-_COMMUTE_CACHE: Dict[tuple, tuple] = {}  # key -> (result_dict, timestamp)
-_COMMUTE_CACHE_TTL = 3600  # 1 hour
-_COMMUTE_CACHE_MAX = 2000
-
-
-def _commute_cache_key(from_lat, from_lon, to_lat, to_lon):
-    return (round(from_lat, 3), round(from_lon, 3), round(to_lat, 3), round(to_lon, 3))
-
-
+# --- Commute time enrichment (offline engine, TfL fallback) ---
 def _fetch_commute_time(from_lat: float, from_lon: float, to_lat: float, to_lon: float) -> Optional[dict]:
     """Fetch commute time from TfL Journey API. Returns {minutes, summary} or None."""
-    key = _commute_cache_key(from_lat, from_lon, to_lat, to_lon)
-
-    # Check cache
-    cached = _COMMUTE_CACHE.get(key)
-    if cached:
-        result, ts = cached
-        if _time.time() - ts < _COMMUTE_CACHE_TTL:
-            return result
-        else:
-            del _COMMUTE_CACHE[key]
-
-    try:
-        url = (
-            f"https://api.tfl.gov.uk/Journey/JourneyResults/"
-            f"{from_lat},{from_lon}/to/{to_lat},{to_lon}"
-            f"?time=0900&timeIs=Departing"
-        )
-        req = _urllib_request.Request(url, headers={"User-Agent": "RentSearch/1.0"})
-        with _urllib_request.urlopen(req, timeout=4) as resp:
-            data = _json_mod.loads(resp.read().decode())
-
-        journeys = data.get("journeys") or []
-        if not journeys:
-            return None
-
-        # Pick the fastest journey
-        best = min(journeys, key=lambda j: j.get("duration", 9999))
-        duration = best.get("duration")
-        if duration is None:
-            return None
-
-        # Build summary from legs (e.g. "25 min via Victoria line")
-        legs = best.get("legs") or []
-        tube_legs = [l for l in legs if l.get("mode", {}).get("name") in ("tube", "elizabeth-line", "dlr", "overground-train")]
-        if tube_legs:
-            line_name = tube_legs[0].get("routeOptions", [{}])[0].get("name", "")
-            if line_name:
-                summary = f"{duration} min via {line_name}"
-            else:
-                mode_name = tube_legs[0].get("mode", {}).get("name", "transit")
-                summary = f"{duration} min via {mode_name}"
-        else:
-            # Bus or walking only
-            modes = list(set(l.get("mode", {}).get("name", "") for l in legs if l.get("mode", {}).get("name") != "walking"))
-            if modes:
-                summary = f"{duration} min via {modes[0]}"
-            else:
-                summary = f"{duration} min (walking)"
+    return COMMUTE_CACHE.lookup(from_lat, from_lon, to_lat, to_lon)
 
-        result = {"minutes": int(duration), "summary": summary}
 
-        # Store in cache (with LRU eviction)
-        if len(_COMMUTE_CACHE) >= _COMMUTE_CACHE_MAX:
-            # Remove oldest entry
-            oldest_key = min(_COMMUTE_CACHE, key=lambda k: _COMMUTE_CACHE[k][1])
-            del _COMMUTE_CACHE[oldest_key]
-        _COMMUTE_CACHE[key] = (result, _time.time())
+def _enrich_commute_times(listings: list, dest: dict) -> bool:
+    """Add commute_time_minutes and commute_summary to each listing dict.
 
-        return result
-    except Exception:
-        return None
-
-
-def _enrich_commute_times(listings: list, dest: dict) -> None:
-    """Add commute_time_minutes and commute_summary to each listing dict."""
+    Uses the offline commute engine; only listings it cannot reach (no
+    station within walking range) go to the TfL Journey API. Returns False
+    when some TfL lookups were still pending at the deadline.
+    """
     dest_lat = dest.get("lat")
     dest_lon = dest.get("lon")
     if dest_lat is None or dest_lon is None:
-        return
+        return True
 
-    def _fetch_for_listing(listing):
+    graph = get_commute_graph()
+    remote = []
+    for listing in listings:
         lat = listing.get("lat")
         lon = listing.get("lon")
-        if lat is None or lon is None:
-            return listing, None
-        return listing, _fetch_commute_time(float(lat), float(lon), float(dest_lat), float(dest_lon))
-
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = {executor.submit(_fetch_for_listing, l): l for l in listings}
-        for future in as_completed(futures, timeout=8):
-            try:
-                listing, result = future.result(timeout=5)
-                if result:
-                    listing["commute_time_minutes"] = result["minutes"]
-                    listing["commute_summary"] = result["summary"]
+        result = None
+        if lat is not None and lon is not None:
+            result = graph.commute(float(lat), float(lon), float(dest_lat), float(dest_lon))
+            if result is None:
+                remote.append(listing)
+                continue
+        listing["commute_time_minutes"] = result["minutes"] if result else None
+        listing["commute_summary"] = result["summary"] if result else None
+    if not remote:
+        return True
+
+    # Never block the response on cold TfL lookups beyond the deadline;
+    # late results still land in the cache for the next render.
+    results, settled = COMMUTE_CACHE.lookup_many_settled(
+        [(float(l["lat"]), float(l["lon"]), float(dest_lat), float(dest_lon)) for l in remote],
+        deadline_s=COMMUTE_DEADLINE_S,
+    )
+    for listing, result in zip(remote, results):
+        listing["commute_time_minutes"] = result["minutes"] if result else None
+        listing["commute_summary"] = result["summary"] if result else None
+    return settled
+
+
+def _cover_and_gallery(r: dict) -> tuple[str, list[str]]:
+    raw_cover = str(r.get("image_url", ""))
+    cover = raw_cover if _is_real_image(raw_cover) else ""
+    raw_gallery = _json_list(r.get("image_urls"))  # a real array on freshly synced points
+    gallery = [u for u in raw_gallery if _is_real_image(u)]
+    # If cover was filtered out but gallery has real images, use first as cover
+    if not cover and gallery:
+        cover = gallery[0]
+    return cover, gallery
+
+
+def _map_listing(r: dict) -> dict:
+    cover, gallery = _cover_and_gallery(r)
+    return {
+        "title": str(r.get("title", "")),
+        "url": str(r.get("url", "")),
+        "image_url": cover,
+        "address": str(r.get("address", "")),
+        "price_pcm": _num(r.get("price_pcm")),
+        "bedrooms": _num(r.get("bedrooms")),
+        "bathrooms": _num(r.get("bathrooms")),
+        "available_from": str(r.get("available_from", "")),
+        "description": str(r.get("description", "")),
+        "features": listing_items(r, "features"),
+        "property_type": str(r.get("property_type", "")),
+        "furnish_type": str(r.get("furnish_type", "")),
+        "lat": _num(r.get("latitude"), None),
+        "lon": _num(r.get("longitude"), None),
+        "image_urls": gallery,
+        "deposit": _num(r.get("deposit")),
+        "final_score": _num(r.get("final_score")),
+        "penalty_reasons": [p for p in _to_list(r.get("penalty_reasons")) if not p.startswith("unknown_hard(")],
+        "preference_hits": _to_list(r.get("preference_hits")),
+        "red_flags": _to_list(r.get("red_flags")),
+        "match_pct": int(_num(r.get("match_pct"), 100)),
+        "source_site": _safe_str(r.get("source_site") or r.get("source")),
+        "openrent_url": _safe_str(r.get("openrent_url")),
+        "commute_time_minutes": r.get("commute_time_minutes"),
+        "commute_summary": r.get("commute_summary"),
+    }
+
+def _map_listing_light(r: dict) -> dict:
+    """Lightweight listing for map pins — only fields needed for markers + popups."""
+    return {
+        "title": str(r.get("title", "")),
+        "url": str(r.get("url", "")),
+        "image_url": str(r.get("image_url", "")),
+        "price_pcm": _num(r.get("price_pcm")),
+        "bedrooms": _num(r.get("bedrooms")),
+        "bathrooms": _num(r.get("bathrooms")),
+        "property_type": str(r.get("property_type", "")),
+        "lat": _num(r.get("latitude"), None),
+        "lon": _num(r.get("longitude"), None),
+    }
+
+# --- Page cards (cached per page content, next page prefetched) ---
+_PAGE_CARDS: TTLCache = TTLCache(maxsize=256, ttl=900)
+_PAGE_CARDS_LOCK = Lock()
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="page-prefetch")
+
+
+def _page_key(rows: list, constraints: dict | None) -> str:
+    dest = (constraints or {}).get("commute_destination")
+    dest_key = (dest.get("lat"), dest.get("lon")) if isinstance(dest, dict) else None
+    return content_version([dest_key] + [
+        (r.get("url"), r.get("final_score"), r.get("match_pct"), r.get("penalty_reasons"), r.get("red_flags"))
+        for r in rows
+    ])
+
+
+def _page_cards(rows: list, constraints: dict | None) -> list[dict]:
+    """Display cards for one page: mapped, commute-enriched and re-sorted."""
+    key = _page_key(rows, constraints)
+    with _PAGE_CARDS_LOCK:
+        cached = _PAGE_CARDS.get(key)
+    if cached is not None:
+        return cached
+
+    listings = [_map_listing(r) for r in rows]
+    settled = True
+    # Enrich with commute times if destination is set
+    commute_dest = (constraints or {}).get("commute_destination")
+    if isinstance(commute_dest, dict) and commute_dest.get("lat"):
+        settled = _enrich_commute_times(listings, commute_dest)
+        # Adjust match_pct based on commute time
+        for l in listings:
+            ct = l.get("commute_time_minutes")
+            if ct is not None:
+                if ct <= 30:
+                    pass  # full match
+                elif ct <= 45:
+                    l["match_pct"] = max(50, (l.get("match_pct") or 100) - 7)
                 else:
-                    listing["commute_time_minutes"] = None
-                    listing["commute_summary"] = None
-            except Exception:
-                listing = futures[future]
-                listing["commute_time_minutes"] = None
-                listing["commute_summary"] = None
+                    l["match_pct"] = max(50, (l.get("match_pct") or 100) - 15)
+            else:
+                l["match_pct"] = max(50, (l.get("match_pct") or 100) - 5)
+    # Re-sort: match_pct descending first, then final_score descending as tiebreaker
+    listings.sort(key=lambda l: (-(l.get("match_pct") or 0), -(l.get("final_score") or 0)))
+    if settled:
+        # Cards with commute times still pending are rebuilt on the next
+        # render, once the late TfL results are in the commute cache.
+        with _PAGE_CARDS_LOCK:
+            _PAGE_CARDS[key] = listings
+    return listings
+
+
+def _next_page_rows(state: AgentState) -> list:
+    if not state.has_more:
+        return []
+    k = int((state.constraints or {}).get("k") or 5)
+    start = (state.page_index + 1) * k
+    return resolve_listings(state.search_full_results[start:start + k])
 
 
-def build_metadata(state: AgentState) -> dict | None:
-    """Extract structured metadata from agent state for the frontend."""
-    meta: dict = {}
+def _prefetch_next_page(state: AgentState) -> None:
+    """Build the next page's cards (commute lookups included) in the background."""
+    rows = _next_page_rows(state)
+    if rows:
+        _PREFETCH_POOL.submit(_page_cards, rows, dict(state.constraints or {}))
 
-    def _map_listing(r: dict) -> dict:
-        raw_cover = str(r.get("image_url", ""))
-        cover = raw_cover if _is_real_image(raw_cover) else ""
-        raw_gallery = _json_list(r.get("image_urls"))
-        gallery = [u for u in raw_gallery if _is_real_image(u)]
-        # If cover was filtered out but gallery has real images, use first as cover
-        if not cover and gallery:
-            cover = gallery[0]
-        return {
-            "title": str(r.get("title", "")),
-            "url": str(r.get("url", "")),
-            "image_url": cover,
-            "address": str(r.get("address", "")),
-            "price_pcm": _num(r.get("price_pcm")),
-            "bedrooms": _num(r.get("bedrooms")),
-            "bathrooms": _num(r.get("bathrooms")),
-            "available_from": str(r.get("available_from", "")),
-            "description": str(r.get("description", "")),
-            "features": _features_list(r.get("features")),
-            "property_type": str(r.get("property_type", "")),
-            "furnish_type": str(r.get("furnish_type", "")),
-            "lat": _num(r.get("latitude"), None),
-            "lon": _num(r.get("longitude"), None),
-            "image_urls": gallery,
-            "deposit": _num(r.get("deposit")),
-            "final_score": _num(r.get("final_score")),
-            "penalty_reasons": [p for p in _to_list(r.get("penalty_reasons")) if not p.startswith("unknown_hard(")],
-            "preference_hits": _to_list(r.get("preference_hits")),
-            "red_flags": _to_list(r.get("red_flags")),
-            "match_pct": int(_num(r.get("match_pct"), 100)),
-            "source_site": _safe_str(r.get("source_site") or r.get("source")),
-            "openrent_url": _safe_str(r.get("openrent_url")),
-            "commute_time_minutes": r.get("commute_time_minutes"),
-            "commute_summary": r.get("commute_summary"),
-        }
 
-    def _map_listing_light(r: dict) -> dict:
-        """Lightweight listing for map pins — only fields needed for markers + popups."""
-        return {
-            "title": str(r.get("title", "")),
-            "url": str(r.get("url", "")),
-            "image_url": str(r.get("image_url", "")),
-            "price_pcm": _num(r.get("price_pcm")),
-            "bedrooms": _num(r.get("bedrooms")),
-            "bathrooms": _num(r.get("bathrooms")),
-            "property_type": str(r.get("property_type", "")),
-            "lat": _num(r.get("latitude"), None),
-            "lon": _num(r.get("longitude"), None),
-        }
+def _result_set_id(rows: list) -> str:
+    """Version of the map-pin set: changes whenever the ranked result set does."""
+    return content_version(
+        (r.get("url"), r.get("price_pcm"), r.get("latitude"), r.get("longitude")) for r in rows
+    )
+
+
+def build_metadata(
+    state: AgentState,
+    known_result_set_id: str | None = None,
+    known_shortlist_version: str | None = None,
+) -> dict | None:
+    """Extract structured metadata from agent state for the frontend.
+
+    ``all_listings`` (map pins) and ``shortlist.listings`` are versioned; when
+    the client echoes the current version the array is left out and the
+    client keeps the copy it already has.
+    """
+    meta: dict = {}
 
     # Search results
     if state.last_results:
-        listings = [_map_listing(r) for r in state.last_results]
-        # Enrich with commute times if destination is set
-        commute_dest = (state.constraints or {}).get("commute_destination")
-        if isinstance(commute_dest, dict) and commute_dest.get("lat"):
-            _enrich_commute_times(listings, commute_dest)
-            # Adjust match_pct based on commute time
-            for l in listings:
-                ct = l.get("commute_time_minutes")
-                if ct is not None:
-                    if ct <= 30:
-                        pass  # full match
-                    elif ct <= 45:
-                        l["match_pct"] = max(50, (l.get("match_pct") or 100) - 7)
-                    else:
-                        l["match_pct"] = max(50, (l.get("match_pct") or 100) - 15)
-                else:
-                    l["match_pct"] = max(50, (l.get("match_pct") or 100) - 5)
-        # Re-sort: match_pct descending first, then final_score descending as tiebreaker
-        listings.sort(key=lambda l: (-(l.get("match_pct") or 0), -(l.get("final_score") or 0)))
-        all_listings = [_map_listing_light(r) for r in state.search_full_results] if state.search_full_results else listings
-        total = len(state.search_full_results)
+        listings = _page_cards(state.last_results, state.constraints)
+        pin_rows = state.search_full_results or state.last_results
+        result_set_id = _result_set_id(pin_rows)
+        # Estimated while the ranking can still page further (AgentState.search_cursor).
+        total = state.result_total()
         k = int((state.constraints or {}).get("k") or 5)
         shown_so_far = (state.page_index + 1) * k
         meta["search_results"] = {
             "listings": listings,
-            "all_listings": all_listings,
+            "result_set_id": result_set_id,
             "page_index": state.page_index,
             "has_more": state.has_more,
             "total": total,
             "remaining": max(0, total - shown_so_far),
+            "total_is_estimate": state.search_cursor is not None,
+            # Next page's covers, so the client can warm its image cache.
+            "prefetch_images": [c for c in (_cover_and_gallery(r)[0] for r in _next_page_rows(state)) if c],
         }
+        if result_set_id != known_result_set_id:
+            meta["search_results"]["all_listings"] = (
+                [_map_listing_light(r) for r in state.search_full_results]
+                if state.search_full_results else listings
+            )
 
     # Constraints
     if state.constraints:
@@ -426,7 +439,7 @@ def build_metadata(state: AgentState) -> dict | None:
                     "price_pcm": _num(r.get("price_pcm")),
                     "bedrooms": _num(r.get("bedrooms")),
                     "bathrooms": _num(r.get("bathrooms")),
-                    "deposit": _parse_deposit(r.get("deposit")),
+                    "deposit": listing_deposit(r),
                     "available_from": str(r.get("available_from", "")),
                     "size_sqm": _num(r.get("size_sqm")),
                     "furnish_type": str(r.get("furnish_type") or ""),
@@ -462,11 +475,14 @@ def build_metadata(state: AgentState) -> dict | None:
         }
         for r in shortlist_items
     ]
+    shortlist_version = content_version(shortlist_listings)
     meta["shortlist"] = {
         "count": len(shortlist_items),
         "saved_ids": saved_ids,
-        "listings": shortlist_listings,
+        "version": shortlist_version,
     }
+    if shortlist_version != known_shortlist_version:
+        meta["shortlist"]["listings"] = shortlist_listings
 
     # Quick replies — contextual suggestions
     quick: list[dict] = []
@@ -487,10 +503,6 @@ def build_metadata(state: AgentState) -> dict | None:
     return meta if meta else None
 
 
-def sse_event(event: str, data: dict) -> str:
-    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
-
-
 def split_chunks(text: str, size: int = 8) -> list[str]:
     if not text:
         return []
@@ -533,6 +545,21 @@ async def healthz() -> JSONResponse:
     return JSONResponse({"ok": True, "service": "backend-proxy", "sessions": len(SESSIONS)})
 
 
+@app.get("/readyz")
+async def readyz() -> JSONResponse:
+    """Readiness probe: 503 until boot warmup has finished, or if a required step failed."""
+    snap = BOOT_PROFILE.snapshot()
+    return JSONResponse(snap, status_code=200 if snap["ready"] else 503)
+
+
+@app.get("/metrics")
+async def metrics(request: Request) -> Response:
+    """Span latency quantiles and counters (Prometheus text, or ?format=json)."""
+    if request.query_params.get("format") == "json":
+        return JSONResponse({"latency": latency_summary()})
+    return Response(metrics_text(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/crawl-status")
 async def crawl_status() -> JSONResponse:
     """Return the last crawl pipeline status (written by auto_crawl.sh)."""
@@ -547,6 +574,39 @@ async def crawl_status() -> JSONResponse:
         return JSONResponse({"status": "error", "message": "Corrupt status file"}, status_code=500)
 
 
+def _page_locked(lock: Lock, req: PageRequest, state: AgentState) -> dict | None:
+    with lock:
+        user_in = "show me more" if req.page_action == "next" else "go back"
+        with span("node.paginate"):
+            reply, _ = turn_page(state, req.page_action, get_runtime())
+        state.last_intent = "Page_Nav"
+        state.history.append((user_in, reply))
+        with span("build_metadata"):
+            metadata = build_metadata(state, req.known_result_set_id, req.known_shortlist_version)
+        _prefetch_next_page(state)
+        return metadata
+
+
+@app.post("/api/chat/page")
+async def chat_page(req: PageRequest) -> Response:
+    """Serve "Show more" / "go back" straight from the session's ranked results.
+
+    Skips routing and the LangGraph flow: the page is sliced from
+    ``search_full_results`` and its cards are usually already built by the
+    prefetch that ran when the previous page was served.
+    """
+    with SESSIONS_LOCK:
+        state = SESSIONS.get(req.session_id)
+    if state is None:
+        return JSONResponse({"message": "Unknown session"}, status_code=404)
+    with start_trace("page_turn", action=req.page_action) as root:
+        metadata = await asyncio.to_thread(_page_locked, get_session_lock(req.session_id), req, state)
+        body = dumps(metadata or {})
+        root.set(page_index=state.page_index, bytes=len(body))
+    incr("turns", intent="Page_Nav")
+    return Response(body, media_type="application/json")
+
+
 @app.post("/api/chat/stream")
 async def chat_stream(req: ChatStreamRequest, request: Request) -> StreamingResponse:
     async def event_gen() -> AsyncGenerator[str, None]:
@@ -559,38 +619,36 @@ async def chat_stream(req: ChatStreamRequest, request: Request) -> StreamingResp
             return
 
         try:
-            import time
-            t0 = time.perf_counter()
             state = get_or_create_state(req.session_id)
             session_lock = get_session_lock(req.session_id)
             hint_str = str(req.route_hint.get("intent") if req.route_hint else "none")
-            print(f"[TIMING] start intent={hint_str!r} text={user_text[:60]!r}")
-
-            t1 = time.perf_counter()
-            reply = await asyncio.to_thread(
-                _run_locked,
-                session_lock,
-                user_text,
-                state,
-                get_runtime(),
-                ROUTER_DEBUG,
-                req.route_hint,
-            )
-            t2 = time.perf_counter()
-            print(f"[TIMING] process_turn={t2-t1:.2f}s  total_so_far={t2-t0:.2f}s  reply_len={len(reply)}")
 
-            metadata = build_metadata(state)
-            t3 = time.perf_counter()
+            # Spans cover the work only; the trace closes before anything is yielded.
+            with start_trace("chat_turn", hint=hint_str, text=user_text[:60]) as root:
+                with span("process_turn"):
+                    reply = await asyncio.to_thread(
+                        _run_locked,
+                        session_lock,
+                        user_text,
+                        state,
+                        get_runtime(),
+                        ROUTER_DEBUG,
+                        req.route_hint,
+                    )
+                with span("build_metadata") as sp:
+                    metadata = build_metadata(state, req.known_result_set_id, req.known_shortlist_version)
+                    _prefetch_next_page(state)
+                    event = sse_event("metadata", metadata) if metadata else None
+                    sp.set(bytes=len(event) if event else 0)
+                root.set(intent=state.last_intent or "", reply_len=len(reply))
+            incr("turns", intent=state.last_intent or "unknown")
             has_search = bool(metadata and metadata.get("search_results", {}).get("listings"))
 
             if has_search:
                 # Search response: send metadata first so listing cards appear immediately.
                 # Skip streaming the listing-dump text — the frontend replaces it with
                 # "Found X properties..." anyway via onMetadata, and we avoid messy concat.
-                print(f"[TIMING] pipeline+metadata={t3-t2:.2f}s  total={t3-t0:.2f}s | "
-                      f"listings={len(metadata['search_results']['listings'])} "
-                      f"constraints={bool(metadata.get('constraints'))}")
-                yield sse_event("metadata", metadata)
+                yield event
             else:
                 # Non-search (QA, Explain, Chitchat, etc.): stream text first, then metadata.
                 is_silent = req.route_hint is not None
@@ -602,18 +660,25 @@ async def chat_stream(req: ChatStreamRequest, request: Request) -> StreamingResp
                     yield sse_event("delta", {"text": chunk})
                     if chunk_delay:
                         await asyncio.sleep(chunk_delay)
-                if metadata:
-                    print(f"[TIMING] stream+metadata={t3-t2:.2f}s  total={t3-t0:.2f}s | "
-                          f"constraints={bool(metadata.get('constraints'))}")
-                    yield sse_event("metadata", metadata)
+                if event:
+                    yield event
                 else:
                     print("[SSE] no metadata to send (last_results empty?)")
             yield sse_event("done", {"ok": True})
         except Exception as exc:  # noqa: BLE001
+            incr("turn_errors")
             yield sse_event("error", {"message": str(exc)})
 
-    return StreamingResponse(
-        event_gen(),
-        media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
-    )
+    headers = {"Cache-Control": "no-cache", "Connection": "keep-alive"}
+    encoding = negotiate_encoding(request.headers.get("accept-encoding")) if SSE_COMPRESSION else None
+    if encoding is None:
+        return StreamingResponse(event_gen(), media_type="text/event-stream", headers=headers)
+
+    async def compressed_gen() -> AsyncGenerator[bytes, None]:
+        compressor = StreamCompressor(encoding)
+        async for event in event_gen():
+            yield compressor.compress(event)
+        yield compressor.finish()
+
+    headers.update({"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+    return StreamingResponse(compressed_gen(), media_type="text/event-stream", headers=headers)
@@ -0,0 +1,209 @@
+"""TfL commute lookups behind an LRU+TTL cache with a disk warm tier.
+
+  - memory tier: ``cachetools.TLRUCache`` (O(1) LRU eviction, per-entry
+    TTL) guarded by a lock — lookups run on a thread pool
+  - disk tier: a small SQLite table so warm entries survive restarts
+  - negative caching: failed/empty journeys are cached for a short TTL so a
+    bad origin is not re-fetched on every render
+  - batch API: origins sharing a rounded key are fetched once; callers wait
+    at most ``deadline_s`` and late results still land in the cache for the
+    next render
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from cachetools import TLRUCache
+
+from core.settings import (
+    COMMUTE_CACHE_DB_PATH,
+    COMMUTE_CACHE_MAX,
+    COMMUTE_CACHE_NEGATIVE_TTL,
+    COMMUTE_CACHE_TTL,
+)
+from core.tracing import incr, traced
+
+Key = Tuple[float, float, float, float]
+
+_MISS = object()
+
+
+def commute_key(from_lat: float, from_lon: float, to_lat: float, to_lon: float) -> Key:
+    return (round(from_lat, 3), round(from_lon, 3), round(to_lat, 3), round(to_lon, 3))
+
+
+def _ttl_for(_key: Key, value: Optional[dict], now: float) -> float:
+    return now + (COMMUTE_CACHE_TTL if value is not None else COMMUTE_CACHE_NEGATIVE_TTL)
+
+
+@traced("tfl.journey")
+def _fetch_tfl(from_lat: float, from_lon: float, to_lat: float, to_lon: float) -> Optional[dict]:
+    """Fastest TfL Journey API result as {minutes, summary}, or None."""
+    url = (
+        f"https://api.tfl.gov.uk/Journey/JourneyResults/"
+        f"{from_lat},{from_lon}/to/{to_lat},{to_lon}"
+        f"?time=0900&timeIs=Departing"
+    )
+    req = urllib.request.Request(url, headers={"User-Agent": "RentSearch/1.0"})
+    with urllib.request.urlopen(req, timeout=4) as resp:
+        data = json.loads(resp.read().decode())
+
+    journeys = data.get("journeys") or []
+    if not journeys:
+        return None
+
+    # Pick the fastest journey
+    best = min(journeys, key=lambda j: j.get("duration", 9999))
+    duration = best.get("duration")
+    if duration is None:
+        return None
+
+    # Build summary from legs (e.g. "25 min via Victoria line")
+    legs = best.get("legs") or []
+    tube_legs = [l for l in legs if l.get("mode", {}).get("name") in ("tube", "elizabeth-line", "dlr", "overground-train")]
+    if tube_legs:
+        line_name = tube_legs[0].get("routeOptions", [{}])[0].get("name", "")
+        if line_name:
+            summary = f"{duration} min via {line_name}"
+        else:
+            mode_name = tube_legs[0].get("mode", {}).get("name", "transit")
+            summary = f"{duration} min via {mode_name}"
+    else:
+        # Bus or walking only
+        modes = list(set(l.get("mode", {}).get("name", "") for l in legs if l.get("mode", {}).get("name") != "walking"))
+        if modes:
+            summary = f"{duration} min via {modes[0]}"
+        else:
+            summary = f"{duration} min (walking)"
+
+    return {"minutes": int(duration), "summary": summary}
+
+
+class CommuteCache:
+    def __init__(self, db_path: str = "", maxsize: int = COMMUTE_CACHE_MAX, workers: int = 8):
+        self._mem: TLRUCache = TLRUCache(maxsize=maxsize, ttu=_ttl_for, timer=time.time)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Key, Any] = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="commute")
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS commute (key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+                )
+                self._db.commit()
+            except Exception:
+                self._db = None
+
+    # ── tiers ────────────────────────────────────────────────────────────────
+
+    def get(self, key: Key) -> Any:
+        """Cached value (possibly None for a negative entry) or ``_MISS``."""
+        with self._lock:
+            value = self._mem.get(key, _MISS)
+        if value is not _MISS or self._db is None:
+            incr("commute_cache_lookups", tier="memory" if value is not _MISS else "miss")
+            return value
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, expires FROM commute WHERE key = ?", (json.dumps(key),)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            incr("commute_cache_lookups", tier="miss")
+            return _MISS
+        incr("commute_cache_lookups", tier="disk")
+        value = json.loads(row[0])
+        with self._lock:
+            self._mem[key] = value
+        return value
+
+    def put(self, key: Key, value: Optional[dict]) -> None:
+        with self._lock:
+            self._mem[key] = value
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO commute (key, value, expires) VALUES (?, ?, ?)",
+                    (json.dumps(key), json.dumps(value), _ttl_for(key, value, time.time())),
+                )
+                self._db.commit()
+
+    # ── lookups ──────────────────────────────────────────────────────────────
+
+    def _load(self, key: Key) -> Optional[dict]:
+        try:
+            value = _fetch_tfl(*key)
+        except Exception:
+            value = None
+        self.put(key, value)
+        with self._lock:
+            self._inflight.pop(key, None)
+        return value
+
+    def _submit(self, key: Key):
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is None:
+                fut = self._pool.submit(self._load, key)
+                self._inflight[key] = fut
+        return fut
+
+    def lookup(self, from_lat: float, from_lon: float, to_lat: float, to_lon: float) -> Optional[dict]:
+        key = commute_key(from_lat, from_lon, to_lat, to_lon)
+        value = self.get(key)
+        if value is not _MISS:
+            return value
+        return self._submit(key).result()
+
+    def lookup_many(
+        self,
+        pairs: Iterable[Tuple[float, float, float, float]],
+        deadline_s: float,
+    ) -> List[Optional[dict]]:
+        """Results aligned with ``pairs``; None for anything not ready by the deadline."""
+        return self.lookup_many_settled(pairs, deadline_s)[0]
+
+    def lookup_many_settled(
+        self,
+        pairs: Iterable[Tuple[float, float, float, float]],
+        deadline_s: float,
+    ) -> Tuple[List[Optional[dict]], bool]:
+        """Like ``lookup_many``, plus whether every lookup finished by the deadline."""
+        keys = [commute_key(*p) for p in pairs]
+        found: Dict[Key, Optional[dict]] = {}
+        pending: Dict[Key, Any] = {}
+        for key in dict.fromkeys(keys):
+            value = self.get(key)
+            if value is _MISS:
+                pending[key] = self._submit(key)
+            else:
+                found[key] = value
+        settled = True
+        if pending:
+            done, _ = wait(list(pending.values()), timeout=max(0.0, deadline_s))
+            settled = len(done) == len(pending)
+            for key, fut in pending.items():
+                if fut in done and fut.exception() is None:
+                    found[key] = fut.result()
+        return [found.get(k) for k in keys], settled
+
+    async def lookup_many_async(
+        self,
+        pairs: Iterable[Tuple[float, float, float, float]],
+        deadline_s: float,
+    ) -> List[Optional[dict]]:
+        pairs = list(pairs)
+        return await asyncio.to_thread(self.lookup_many, pairs, deadline_s)
+
+
+COMMUTE_CACHE = CommuteCache(COMMUTE_CACHE_DB_PATH)
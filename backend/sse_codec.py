@@ -0,0 +1,92 @@
+"""SSE encoding for /api/chat/stream.
+
+  - JSON via ``orjson`` when installed, stdlib ``json`` otherwise
+  - stream compression negotiated from ``Accept-Encoding`` (br > gzip);
+    every event is flushed on its own so the client still sees it at once
+  - content versions: pins and shortlist cards carry a short hash so the
+    client can echo what it already holds and the server can leave the
+    unchanged arrays out of the next metadata event
+"""
+
+import hashlib
+import json
+import zlib
+from typing import Any, Iterable, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+
+def dumps(data: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {dumps(data)}\n\n"
+
+
+def content_version(items: Iterable[Any]) -> str:
+    """Short stable hash of a JSON-serialisable sequence."""
+    h = hashlib.blake2b(digest_size=8)
+    for item in items:
+        h.update(json.dumps(item, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+# ── Compression ───────────────────────────────────────────────────────────────
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick ``br`` or ``gzip`` from an Accept-Encoding header (q=0 excluded)."""
+    offered = {}
+    for part in str(accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[name] = q
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes at every event boundary."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(mode=brotli.MODE_TEXT, quality=5)
+        elif encoding == "gzip":
+            self._c = zlib.compressobj(6, zlib.DEFLATED, 31)
+        else:
+            raise ValueError(f"unsupported encoding: {encoding}")
+
+    def compress(self, chunk: str) -> bytes:
+        data = chunk.encode("utf-8")
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.flush()
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._c.finish()
+        return self._c.flush(zlib.Z_FINISH)
@@ -0,0 +1,84 @@
+"""Boot warmup and readiness for the backend.
+
+Startup runs the warmup steps on a background thread so the server binds
+its port immediately; ``/readyz`` answers 503 until every step has finished
+and 200 afterwards, unless a required step failed. Each step is timed into
+a boot profile that is logged once and served by the probe; step times
+also feed the ``boot.<step>`` latency metrics (core.tracing).
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
+
+from core.tracing import observe
+
+Step = Tuple[str, Callable[[], Any]]
+
+_logger = logging.getLogger(__name__)
+
+
+class BootProfile:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.steps: List[Dict[str, Any]] = []
+        self.ready = threading.Event()
+        self.failed: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, result: Any = None, error: Optional[str] = None) -> None:
+        entry: Dict[str, Any] = {"step": name, "seconds": round(seconds, 3)}
+        if result is not None:
+            entry["result"] = result
+        if error:
+            entry["error"] = error
+        with self._lock:
+            self.steps.append(entry)
+        observe(f"boot.{name}", seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            steps = list(self.steps)
+        return {
+            "ready": self.ready.is_set(),
+            "failed": self.failed,
+            "elapsed_s": round(time.perf_counter() - self.started, 3),
+            "steps": steps,
+        }
+
+
+def run_warmup(profile: BootProfile, steps: List[Step], required: Collection[str] = ()) -> None:
+    """Run ``steps`` in order; a failing step is recorded and the rest still run.
+
+    The server is marked ready even if an optional step failed (its lazy
+    loader will retry on first use); ``profile.failed`` names the step. If
+    a step named in ``required`` fails, ready stays unset and ``failed``
+    names that step instead.
+    """
+    required_failed = False
+    for name, fn in steps:
+        t0 = time.perf_counter()
+        try:
+            result = fn()
+            profile.record(name, time.perf_counter() - t0, result if isinstance(result, (int, str, dict)) else None)
+        except Exception as exc:  # noqa: BLE001
+            profile.record(name, time.perf_counter() - t0, error=str(exc))
+            if name in required and not required_failed:
+                profile.failed, required_failed = name, True
+            else:
+                profile.failed = profile.failed or name
+    if not required_failed:
+        profile.ready.set()
+    parts = " ".join(f"{s['step']}={s['seconds']:.2f}s" for s in profile.steps)
+    if required_failed:
+        _logger.error("boot not ready: required step %r failed after %.2fs | %s",
+                      profile.failed, time.perf_counter() - profile.started, parts)
+    else:
+        _logger.info("boot ready=%.2fs | %s", time.perf_counter() - profile.started, parts)
+
+
+def start_warmup(profile: BootProfile, steps: List[Step], required: Collection[str] = ()) -> threading.Thread:
+    thread = threading.Thread(target=run_warmup, args=(profile, steps, required), name="warmup", daemon=True)
+    thread.start()
+    return thread
@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Tuple
 import numpy as np
 
 from skills.search.extractors import _safe_text, parse_jsonish_items
+from skills.search.listing_fields import listing_items
 
 try:
     from skills.search.bool_signals import synthetic_text_from_bools
@@ -73,12 +74,12 @@ def _sim_text(query: str, text: str, embedder, cache: Dict[str, np.ndarray]) ->
 
 def _collect_value_candidates(r: Dict[str, Any]) -> List[Dict[str, str]]:
     cands: List[Dict[str, str]] = []
-    for v in parse_jsonish_items(r.get("schools")):
+    for v in listing_items(r, "schools"):
         parts = [_safe_text(x) for x in str(v).split(";")]
         for p in parts:
             if p:
                 cands.append({"field": "schools", "text": p})
-    for v in parse_jsonish_items(r.get("stations")):
+    for v in listing_items(r, "stations"):
         cands.append({"field": "stations", "text": v})
     for v in parse_jsonish_items(r.get("features")):
         cands.append({"field": "features", "text": v})
@@ -1,11 +1,14 @@
+from __future__ import annotations
+
 import json
 import hashlib
-import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import pandas as pd
 from openai import OpenAI
 
+if TYPE_CHECKING:  # only used in annotations
+    import pandas as pd
+
 from core.chatbot_config import (
     SEARCH_EXTRACT_ALL_SYSTEM,
     EXTRACT_SYSTEM,
@@ -18,6 +21,7 @@ from core.chatbot_config import (
     ROUTER_MODEL,
 )
 from core.settings import DEFAULT_K
+from core.tracing import incr, span
 from skills.search.extractors import (
     _extract_json_obj,
     _normalize_constraint_extract,
@@ -36,13 +40,21 @@ def _is_fixed_temp(model: str) -> bool:
     return any(model.startswith(p) for p in _GPT5_MODELS)
 
 
+def _record_usage(sp, usage) -> None:
+    tokens_in = getattr(usage, "prompt_tokens", 0) or 0
+    tokens_out = getattr(usage, "completion_tokens", 0) or 0
+    sp.set(tokens_in=tokens_in, tokens_out=tokens_out)
+    incr("llm_tokens", tokens_in, direction="in", span=sp.name)
+    incr("llm_tokens", tokens_out, direction="out", span=sp.name)
+
+
 def qwen_chat(messages, temperature=0.0, _label: str = "llm") -> str:
     kwargs: dict = dict(model=QWEN_MODEL, messages=messages)
     if not _is_fixed_temp(QWEN_MODEL):
         kwargs["temperature"] = temperature
-    t0 = time.perf_counter()
-    r = qwen_client.chat.completions.create(**kwargs)
-    print(f"[TIMING] {_label}={time.perf_counter()-t0:.2f}s tokens_in={r.usage.prompt_tokens} tokens_out={r.usage.completion_tokens}")
+    with span(f"llm.{_label}", model=QWEN_MODEL) as sp:
+        r = qwen_client.chat.completions.create(**kwargs)
+        _record_usage(sp, r.usage)
     return r.choices[0].message.content.strip()
 
 
@@ -50,9 +62,9 @@ def qwen_router_chat(messages, temperature=0.0) -> str:
     kwargs: dict = dict(model=ROUTER_MODEL, messages=messages)
     if not _is_fixed_temp(ROUTER_MODEL):
         kwargs["temperature"] = temperature
-    t0 = time.perf_counter()
-    r = router_client.chat.completions.create(**kwargs)
-    print(f"[TIMING] router={time.perf_counter()-t0:.2f}s tokens_in={r.usage.prompt_tokens} tokens_out={r.usage.completion_tokens}")
+    with span("llm.router", model=ROUTER_MODEL) as sp:
+        r = router_client.chat.completions.create(**kwargs)
+        _record_usage(sp, r.usage)
     return r.choices[0].message.content.strip()
 
 
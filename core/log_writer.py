@@ -0,0 +1,176 @@
+"""Background JSONL log writer.
+
+Request threads hand records to ``submit``; one daemon thread drains a
+bounded queue, serialises records in batches and appends them to disk:
+
+  - a record is a dict or a zero-arg callable returning one, so building a
+    large payload also happens off the request thread
+  - with ``zstandard`` installed and ``RENT_LOG_COMPRESSION=zstd`` each batch
+    is one zstd frame appended to ``<path>.zst`` (concatenated frames read
+    back as a single stream: ``zstd -dc ranking_log.jsonl.zst``); otherwise
+    plain JSONL at ``<path>``
+  - a file that would grow past ``RENT_LOG_ROTATE_MB`` is renamed to
+    ``<file>.<UTC timestamp>`` first
+  - above the queue high-water mark, sheddable records are sampled down to
+    ``RENT_LOG_BACKPRESSURE_SAMPLE``; a full queue drops the record. Both
+    show up in ``/metrics`` as ``rent_log_records_dropped_total``
+  - ``flush()`` blocks until the queue is drained; it also runs at exit
+"""
+
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from core.logger import log_message
+from core.settings import (
+    LOG_ASYNC,
+    LOG_BACKPRESSURE_HIGH_WATER,
+    LOG_BACKPRESSURE_SAMPLE,
+    LOG_BATCH_MAX,
+    LOG_COMPRESSION,
+    LOG_FLUSH_S,
+    LOG_QUEUE_MAX,
+    LOG_ROTATE_MB,
+)
+from core.tracing import incr
+
+try:
+    import zstandard as _zstd
+except ImportError:  # optional: plain JSONL without it
+    _zstd = None
+
+Record = Union[Dict[str, Any], Callable[[], Optional[Dict[str, Any]]]]
+_Item = Tuple[str, Record, str]
+
+
+class LogWriter:
+    def __init__(
+        self,
+        max_queue: int = LOG_QUEUE_MAX,
+        batch_max: int = LOG_BATCH_MAX,
+        flush_s: float = LOG_FLUSH_S,
+        rotate_bytes: int = int(LOG_ROTATE_MB * 1024 * 1024),
+        compression: str = LOG_COMPRESSION,
+    ) -> None:
+        self._q: "queue.Queue[_Item]" = queue.Queue(maxsize=max(1, max_queue))
+        self._high_water = max(1, int(self._q.maxsize * LOG_BACKPRESSURE_HIGH_WATER))
+        self.batch_max = max(1, batch_max)
+        self.flush_s = max(0.0, flush_s)
+        self.rotate_bytes = max(0, rotate_bytes)
+        self._zstd = _zstd.ZstdCompressor(level=3) if compression == "zstd" and _zstd is not None else None
+        if compression == "zstd" and _zstd is None:
+            log_message("WARN", "RENT_LOG_COMPRESSION=zstd but zstandard is not installed; writing plain JSONL")
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._io_lock = threading.Lock()  # inline writes (LOG_ASYNC off) come from request threads
+
+    # ── Request side ──────────────────────────────────────────────────────
+
+    def submit(self, path: str, record: Record, log_name: str, sheddable: bool = True) -> bool:
+        """Queue one record; returns False if it was shed or dropped."""
+        self._ensure_started()
+        if sheddable and self._q.qsize() >= self._high_water and random.random() >= LOG_BACKPRESSURE_SAMPLE:
+            incr("log_records_dropped", log=log_name, reason="sampled")
+            return False
+        try:
+            self._q.put_nowait((path, record, log_name))
+        except queue.Full:
+            incr("log_records_dropped", log=log_name, reason="queue_full")
+            return False
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued record is written (or ``timeout`` passes)."""
+        deadline = time.monotonic() + timeout
+        with self._q.all_tasks_done:
+            while self._q.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._q.all_tasks_done.wait(remaining)
+        return True
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    # ── Writer thread ─────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            batch: List[_Item] = [self._q.get()]
+            deadline = time.monotonic() + self.flush_s
+            while len(batch) < self.batch_max:
+                try:
+                    batch.append(self._q.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self.write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+
+    def write_batch(self, batch: List[_Item]) -> None:
+        by_path: Dict[str, Tuple[str, List[str]]] = {}
+        for path, record, log_name in batch:
+            try:
+                obj = record() if callable(record) else record
+                if obj is None:
+                    continue
+                line = json.dumps(obj, ensure_ascii=False)
+            except Exception as e:
+                log_message("WARN", f"failed to write {log_name}: {e}")
+                continue
+            by_path.setdefault(path, (log_name, []))[1].append(line)
+        for path, (log_name, lines) in by_path.items():
+            try:
+                self._append(path, ("\n".join(lines) + "\n").encode("utf-8"))
+                incr("log_records_written", len(lines), log=log_name)
+            except Exception as e:
+                log_message("WARN", f"failed to write {log_name}: {e}")
+
+    def _append(self, path: str, data: bytes) -> None:
+        target = path + ".zst" if self._zstd is not None else path
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        with self._io_lock:
+            if self._zstd is not None:
+                data = self._zstd.compress(data)
+            if self.rotate_bytes and os.path.exists(target) and os.path.getsize(target) + len(data) > self.rotate_bytes:
+                stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+                os.replace(target, f"{target}.{stamp}")
+            with open(target, "ab") as f:
+                f.write(data)
+
+
+_WRITER: Optional[LogWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_log_writer() -> LogWriter:
+    global _WRITER
+    if _WRITER is None:
+        with _WRITER_LOCK:
+            if _WRITER is None:
+                _WRITER = LogWriter()
+                atexit.register(_WRITER.flush)
+    return _WRITER
+
+
+def write_jsonl(path: str, record: Record, log_name: str, sheddable: bool = True) -> bool:
+    """Append ``record`` to ``path``: queued when async logging is on, inline otherwise."""
+    writer = get_log_writer()
+    if LOG_ASYNC:
+        return writer.submit(path, record, log_name, sheddable=sheddable)
+    writer.write_batch([(path, record, log_name)])
+    return True
@@ -1,11 +1,13 @@
-import json
 import os
-from typing import Any, Dict, List
+import random
+from typing import Any, Dict, List, Optional
 
 LOG_LEVEL = os.environ.get("RENT_LOG_LEVEL", "INFO").strip().upper()
 RANKING_LOG_DETAIL = os.environ.get("RENT_RANKING_LOG_DETAIL", "summary").strip().lower()
 RANKING_LOG_MAX_CANDIDATES = int(os.environ.get("RENT_RANKING_LOG_MAX_CANDIDATES", "6"))
 RANKING_LOG_TEXT_LIMIT = int(os.environ.get("RENT_RANKING_LOG_TEXT_LIMIT", "320"))
+# Fraction of turns whose ranking log carries candidate records (summary detail).
+RANKING_LOG_SAMPLE_RATE = float(os.environ.get("RENT_RANKING_LOG_SAMPLE_RATE", "1.0"))
 
 _LOG_LEVEL_ORDER = {"ERROR": 40, "WARN": 30, "INFO": 20, "DEBUG": 10}
 
@@ -47,52 +49,65 @@ def _compact_candidate_list(items: List[Dict[str, Any]], max_items: int) -> List
     return out
 
 
+def ranking_log_candidate_limit() -> Optional[int]:
+    """How many candidate records this turn's ranking log needs.
+
+    None means all of them (``RANKING_LOG_DETAIL=full``); summary logs keep
+    only the top ``RANKING_LOG_MAX_CANDIDATES``, and turns outside the sample
+    keep none.
+    """
+    if RANKING_LOG_DETAIL == "full":
+        return None
+    if random.random() >= RANKING_LOG_SAMPLE_RATE:
+        return 0
+    return RANKING_LOG_MAX_CANDIDATES
+
+
+def _ranking_log_payload(obj: Dict[str, Any]) -> Dict[str, Any]:
+    if RANKING_LOG_DETAIL == "full":
+        # Candidate lists may be lazy views (skills.search.pipeline.LazyRecords).
+        return {k: v.materialize() if hasattr(v, "materialize") else v for k, v in obj.items()}
+    from skills.search.extractors import compact_constraints_view
+
+    counts = obj.get("counts", {}) if isinstance(obj, dict) else {}
+    stage_d = obj.get("stage_d", {}) if isinstance(obj, dict) else {}
+    return {
+        "timestamp": obj.get("timestamp"),
+        "log_path": obj.get("log_path"),
+        "user_query": obj.get("user_query"),
+        "stage_a_query": obj.get("stage_a_query"),
+        "counts": counts,
+        "constraints": compact_constraints_view(obj.get("constraints") or {}),
+        "structured_conflict_count": int((obj.get("structured_audit") or {}).get("conflict_count", 0)),
+        "semantic_parse_source": (obj.get("signals") or {}).get("semantic_debug", {}).get("parse_source"),
+        "stage_a_candidates": _compact_candidate_list(
+            obj.get("stage_a_candidates") or [],
+            RANKING_LOG_MAX_CANDIDATES,
+        ),
+        "stage_b_pass_candidates": _compact_candidate_list(
+            obj.get("stage_b_pass_candidates") or [],
+            RANKING_LOG_MAX_CANDIDATES,
+        ),
+        "stage_c_candidates": _compact_candidate_list(
+            obj.get("stage_c_candidates") or [],
+            RANKING_LOG_MAX_CANDIDATES,
+        ),
+        "stage_d": {
+            "enabled": stage_d.get("enabled"),
+            "error": stage_d.get("error"),
+            "output_preview": _truncate_text(stage_d.get("output"), RANKING_LOG_TEXT_LIMIT),
+        },
+    }
+
+
 def append_ranking_log_entry(path: str, obj: Dict[str, Any]) -> None:
-    try:
-        payload = obj
-        if RANKING_LOG_DETAIL != "full":
-            from skills.search.extractors import compact_constraints_view
-
-            counts = obj.get("counts", {}) if isinstance(obj, dict) else {}
-            stage_d = obj.get("stage_d", {}) if isinstance(obj, dict) else {}
-            payload = {
-                "timestamp": obj.get("timestamp"),
-                "log_path": obj.get("log_path"),
-                "user_query": obj.get("user_query"),
-                "stage_a_query": obj.get("stage_a_query"),
-                "counts": counts,
-                "constraints": compact_constraints_view(obj.get("constraints") or {}),
-                "structured_conflict_count": int((obj.get("structured_audit") or {}).get("conflict_count", 0)),
-                "semantic_parse_source": (obj.get("signals") or {}).get("semantic_debug", {}).get("parse_source"),
-                "stage_a_candidates": _compact_candidate_list(
-                    obj.get("stage_a_candidates") or [],
-                    RANKING_LOG_MAX_CANDIDATES,
-                ),
-                "stage_b_pass_candidates": _compact_candidate_list(
-                    obj.get("stage_b_pass_candidates") or [],
-                    RANKING_LOG_MAX_CANDIDATES,
-                ),
-                "stage_c_candidates": _compact_candidate_list(
-                    obj.get("stage_c_candidates") or [],
-                    RANKING_LOG_MAX_CANDIDATES,
-                ),
-                "stage_d": {
-                    "enabled": stage_d.get("enabled"),
-                    "error": stage_d.get("error"),
-                    "output_preview": _truncate_text(stage_d.get("output"), RANKING_LOG_TEXT_LIMIT),
-                },
-            }
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
-    except Exception as e:
-        log_message("WARN", f"failed to write ranking log: {e}")
-
-
-def append_jsonl(path: str, obj: Dict[str, Any], log_name: str) -> None:
-    try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(obj, ensure_ascii=False) + "\n")
-    except Exception as e:
-        log_message("WARN", f"failed to write {log_name}: {e}")
+    """Queue a ranking log entry; the summary view is built on the writer thread."""
+    from core.log_writer import write_jsonl
+
+    write_jsonl(path, lambda: _ranking_log_payload(obj), "ranking log")
+
+
+def append_jsonl(path: str, obj: Dict[str, Any], log_name: str, sheddable: bool = True) -> None:
+    from core.log_writer import write_jsonl
+
+    write_jsonl(path, obj, log_name, sheddable=sheddable)
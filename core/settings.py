@@ -11,6 +11,17 @@ QDRANT_URL = os.environ.get("RENT_QDRANT_URL", "")
 QDRANT_API_KEY = os.environ.get("RENT_QDRANT_API_KEY", "")
 QDRANT_ENABLE_PREFILTER = os.environ.get("RENT_QDRANT_ENABLE_PREFILTER", "1") != "0"
 
+# Hybrid Stage A: dense + BM25 sparse prefetch fused with RRF (skills/search/sparse.py).
+# Used only when the collection has the sparse vector; otherwise dense-only.
+QDRANT_HYBRID = os.environ.get("RENT_QDRANT_HYBRID", "1") != "0"
+# Fused hits returned per query (caps RENT_RECALL while hybrid is active).
+QDRANT_HYBRID_RECALL = int(os.environ.get("RENT_QDRANT_HYBRID_RECALL", "300"))
+# Candidates each branch (dense, sparse) feeds into the fusion.
+QDRANT_HYBRID_PREFETCH = int(os.environ.get("RENT_QDRANT_HYBRID_PREFETCH", "300"))
+# Compile Stage B hard constraints into the Stage A payload filter
+# (skills/search/constraint_pushdown.py); Stage B still audits every row.
+QDRANT_PUSHDOWN_HARD = os.environ.get("RENT_QDRANT_PUSHDOWN_HARD", "1") != "0"
+
 VERBOSE_STATE_LOG = os.environ.get("RENT_VERBOSE_STATE_LOG", "0") == "1"
 STAGEA_TRACE = os.environ.get("RENT_STAGEA_TRACE", "0") != "0"
 
@@ -88,3 +99,84 @@ PREF_VECTOR_PATH = os.environ.get(
 )
 PREF_VECTOR_FEATURE_WEIGHT = float(os.environ.get("RENT_PREF_VECTOR_FEATURE_WEIGHT", "0.80"))
 PREF_VECTOR_DESCRIPTION_WEIGHT = float(os.environ.get("RENT_PREF_VECTOR_DESCRIPTION_WEIGHT", "0.60"))
+
+# Area price-statistics cube (built by crawler/sync_qdrant.py).
+AREA_STATS_PATH = os.environ.get(
+    "RENT_AREA_STATS_PATH",
+    os.path.join(ROOT_DIR, "artifacts", "skills", "search", "data", "area_stats.json"),
+)
+
+# Per-listing QA chunk index (built by crawler/sync_qdrant.py).
+QA_CHUNK_INDEX_DIR = os.environ.get(
+    "RENT_QA_CHUNK_INDEX_DIR",
+    os.path.join(ROOT_DIR, "artifacts", "skills", "qa", "data", "chunk_index"),
+)
+QA_CHUNK_INDEX_LRU_SIZE = int(os.environ.get("RENT_QA_CHUNK_INDEX_LRU_SIZE", "512"))
+# Total chunks scored per category in a multi-listing QA pass (0 = no cap).
+QA_BATCH_MAX_CHUNKS = int(os.environ.get("RENT_QA_BATCH_MAX_CHUNKS", "400"))
+
+# Offline commute engine (skills/search/commute.py).
+STATIONS_PATH = os.environ.get("RENT_STATIONS_PATH", os.path.join(ROOT_DIR, "artifacts", "stations.json"))
+COMMUTE_POPULAR_DESTINATIONS = [
+    s for s in os.environ.get(
+        "RENT_COMMUTE_POPULAR_DESTINATIONS",
+        "Bank,Oxford Circus,Kings Cross St Pancras,Liverpool Street,Canary Wharf,London Bridge,Waterloo,"
+        "Victoria,Paddington,Tottenham Court Road,Old Street,Farringdon",
+    ).split(",")
+    if s.strip()
+]
+
+# TfL commute lookup cache (backend/commute_cache.py).
+COMMUTE_CACHE_DB_PATH = os.environ.get(
+    "RENT_COMMUTE_CACHE_DB_PATH",
+    os.path.join(ROOT_DIR, "artifacts", "backend", "commute_cache.sqlite"),
+)
+COMMUTE_CACHE_MAX = int(os.environ.get("RENT_COMMUTE_CACHE_MAX", "5000"))
+COMMUTE_CACHE_TTL = float(os.environ.get("RENT_COMMUTE_CACHE_TTL", str(24 * 3600)))
+COMMUTE_CACHE_NEGATIVE_TTL = float(os.environ.get("RENT_COMMUTE_CACHE_NEGATIVE_TTL", "600"))
+COMMUTE_DEADLINE_S = float(os.environ.get("RENT_COMMUTE_DEADLINE_S", "1.5"))
+
+# Offline place geocoder for commute destinations (skills/search/geocoder.py).
+GEOCODE_CACHE_PATH = os.environ.get(
+    "RENT_GEOCODE_CACHE_PATH",
+    os.path.join(ROOT_DIR, "artifacts", "skills", "search", "data", "geocode_cache.json"),
+)
+# How long a turn may wait for a remote lookup of an unknown place (0 = never).
+GEOCODE_REMOTE_WAIT_S = float(os.environ.get("RENT_GEOCODE_REMOTE_WAIT_S", "0"))
+
+# Compress /api/chat/stream (br/gzip, negotiated from Accept-Encoding).
+SSE_COMPRESSION = os.environ.get("RENT_SSE_COMPRESSION", "1") == "1"
+
+# Prebuilt runtime bundle loaded at backend boot (skills/search/runtime_bundle.py).
+RUNTIME_BUNDLE_DIR = os.environ.get(
+    "RENT_RUNTIME_BUNDLE_DIR",
+    os.path.join(ROOT_DIR, "artifacts", "runtime_bundle"),
+)
+
+# Tracing / metrics (core/tracing.py).
+TRACE_LOG = os.environ.get("RENT_TRACE_LOG", "1") == "1"
+TRACE_WINDOW = int(os.environ.get("RENT_TRACE_WINDOW", "2048"))  # samples per span for p50/p95/p99
+OTEL_ENABLED = os.environ.get("RENT_OTEL_ENABLED", "0") == "1"
+OTEL_SERVICE_NAME = os.environ.get("RENT_OTEL_SERVICE_NAME", "rent-assistant-backend")
+
+# Background JSONL log writer for ranking / audit logs (core/log_writer.py).
+LOG_ASYNC = os.environ.get("RENT_LOG_ASYNC", "1") == "1"
+LOG_QUEUE_MAX = int(os.environ.get("RENT_LOG_QUEUE_MAX", "2048"))
+LOG_BATCH_MAX = int(os.environ.get("RENT_LOG_BATCH_MAX", "64"))
+LOG_FLUSH_S = float(os.environ.get("RENT_LOG_FLUSH_S", "0.5"))
+LOG_ROTATE_MB = float(os.environ.get("RENT_LOG_ROTATE_MB", "64"))  # 0 = never rotate
+LOG_COMPRESSION = os.environ.get("RENT_LOG_COMPRESSION", "zstd").strip().lower()  # zstd | none
+# Queue fill ratio above which sheddable records are sampled, and the rate kept.
+LOG_BACKPRESSURE_HIGH_WATER = float(os.environ.get("RENT_LOG_BACKPRESSURE_HIGH_WATER", "0.75"))
+LOG_BACKPRESSURE_SAMPLE = float(os.environ.get("RENT_LOG_BACKPRESSURE_SAMPLE", "0.1"))
+
+# Adaptive Stage A recall (skills/search/recall_control.py): size the first
+# fetch from prefilter cardinality and past Stage B pass rates, page further
+# only while fewer than k + RECALL_MARGIN listings survive. RENT_RECALL caps it.
+ADAPTIVE_RECALL = os.environ.get("RENT_ADAPTIVE_RECALL", "1") == "1"
+RECALL_MIN = int(os.environ.get("RENT_RECALL_MIN", "50"))
+RECALL_MARGIN = int(os.environ.get("RENT_RECALL_MARGIN", "25"))
+RECALL_OVERFETCH = float(os.environ.get("RENT_RECALL_OVERFETCH", "1.5"))
+RECALL_PRIOR_PASS_RATE = float(os.environ.get("RENT_RECALL_PRIOR_PASS_RATE", "0.25"))
+RECALL_PASS_RATE_ALPHA = float(os.environ.get("RENT_RECALL_PASS_RATE_ALPHA", "0.2"))  # EWMA weight of the newest turn
+RECALL_MAX_PAGES = int(os.environ.get("RENT_RECALL_MAX_PAGES", "4"))
@@ -0,0 +1,237 @@
+"""Lightweight per-turn tracing and latency metrics.
+
+  - ``span(name, **attrs)`` times a block. Spans nest through a contextvar,
+    so everything under ``start_trace`` in the same thread (or in
+    ``asyncio.to_thread``, which copies the context) lands in one trace
+  - every finished span feeds a latency window per name (p50/p95/p99 over
+    the most recent samples) and a counter; ``incr`` adds plain counters
+  - when a root trace ends, one ``[TRACE]`` line summarises its spans
+  - ``metrics_text()`` renders everything in Prometheus text format for
+    ``/metrics``
+  - OpenTelemetry is optional: with ``RENT_OTEL_ENABLED=1`` and the SDK
+    installed, spans are mirrored to an OTLP exporter (local collector by
+    default)
+"""
+
+import contextvars
+import functools
+import math
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from core.settings import OTEL_ENABLED, OTEL_SERVICE_NAME, TRACE_LOG, TRACE_WINDOW
+
+try:
+    from opentelemetry import trace as _otel_trace
+except ImportError:  # optional
+    _otel_trace = None
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "parent", "attrs", "start", "duration", "children", "_otel")
+
+    def __init__(self, name: str, trace_id: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.parent = parent
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.children: List["Span"] = []
+        self._otel = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+        if self._otel is not None:
+            for k, v in attrs.items():
+                if isinstance(v, (str, bool, int, float)):
+                    self._otel.set_attribute(k, v)
+
+
+_CURRENT: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("rent_trace_span", default=None)
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+_LOCK = threading.Lock()
+_WINDOWS: Dict[str, Deque[float]] = {}
+_TOTALS: Dict[str, Tuple[int, float]] = {}  # name -> (count, sum_seconds)
+_COUNTERS: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+
+def observe(name: str, seconds: float) -> None:
+    with _LOCK:
+        window = _WINDOWS.get(name)
+        if window is None:
+            window = _WINDOWS[name] = deque(maxlen=TRACE_WINDOW)
+        window.append(seconds)
+        n, total = _TOTALS.get(name, (0, 0.0))
+        _TOTALS[name] = (n + 1, total + seconds)
+
+
+def incr(name: str, value: float = 1.0, **labels: Any) -> None:
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    with _LOCK:
+        _COUNTERS[key] = _COUNTERS.get(key, 0.0) + value
+
+
+def _quantile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, int(math.ceil(q * len(sorted_vals))) - 1))
+    return sorted_vals[idx]
+
+
+def latency_summary() -> Dict[str, Dict[str, float]]:
+    """{span name: {count, sum_s, p50_s, p95_s, p99_s}} (quantiles over the recent window)."""
+    with _LOCK:
+        items = [(name, sorted(w), _TOTALS[name]) for name, w in _WINDOWS.items()]
+    return {
+        name: {
+            "count": n,
+            "sum_s": round(total, 6),
+            "p50_s": round(_quantile(vals, 0.50), 6),
+            "p95_s": round(_quantile(vals, 0.95), 6),
+            "p99_s": round(_quantile(vals, 0.99), 6),
+        }
+        for name, vals, (n, total) in sorted(items)
+    }
+
+
+def _labels(pairs: Tuple[Tuple[str, str], ...]) -> str:
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{v.replace(chr(34), chr(39))}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+def metrics_text() -> str:
+    lines = [
+        "# HELP rent_span_seconds Span latency by name (quantiles over the recent window).",
+        "# TYPE rent_span_seconds summary",
+    ]
+    for name, s in latency_summary().items():
+        for q, key in (("0.5", "p50_s"), ("0.95", "p95_s"), ("0.99", "p99_s")):
+            lines.append(f'rent_span_seconds{{span="{name}",quantile="{q}"}} {s[key]}')
+        lines.append(f'rent_span_seconds_count{{span="{name}"}} {s["count"]}')
+        lines.append(f'rent_span_seconds_sum{{span="{name}"}} {s["sum_s"]}')
+    with _LOCK:
+        counters = sorted(_COUNTERS.items())
+    seen = set()
+    for (name, pairs), value in counters:
+        metric = f"rent_{name}_total"
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} counter")
+            seen.add(metric)
+        lines.append(f"{metric}{_labels(pairs)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    with _LOCK:
+        _WINDOWS.clear()
+        _TOTALS.clear()
+        _COUNTERS.clear()
+
+
+# ── Spans ─────────────────────────────────────────────────────────────────────
+
+_OTEL_TRACER = None
+
+
+def configure_otel() -> bool:
+    """Install an OTLP exporter when enabled and the SDK is importable."""
+    global _OTEL_TRACER
+    if not OTEL_ENABLED or _otel_trace is None:
+        return False
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        return False
+    provider = TracerProvider(resource=Resource.create({"service.name": OTEL_SERVICE_NAME}))
+    # Endpoint comes from OTEL_EXPORTER_OTLP_ENDPOINT (default http://localhost:4318).
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    _otel_trace.set_tracer_provider(provider)
+    _OTEL_TRACER = _otel_trace.get_tracer("rent-assistant")
+    return True
+
+
+def current_trace_id() -> Optional[str]:
+    cur = _CURRENT.get()
+    return cur.trace_id if cur is not None else None
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span]:
+    parent = _CURRENT.get()
+    trace_id = parent.trace_id if parent is not None else ""
+    sp = Span(name, trace_id, parent, attrs)
+    if parent is not None:
+        parent.children.append(sp)
+    otel_cm = None
+    if _OTEL_TRACER is not None:
+        otel_cm = _OTEL_TRACER.start_as_current_span(name)
+        sp._otel = otel_cm.__enter__()
+        sp.set(**attrs)
+    token = _CURRENT.set(sp)
+    try:
+        yield sp
+    except BaseException as exc:
+        sp.attrs["error"] = type(exc).__name__
+        incr("span_errors", span=name)
+        raise
+    finally:
+        _CURRENT.reset(token)
+        sp.duration = time.perf_counter() - sp.start
+        observe(name, sp.duration)
+        if otel_cm is not None:
+            otel_cm.__exit__(None, None, None)
+
+
+@contextmanager
+def start_trace(name: str, **attrs: Any) -> Iterator[Span]:
+    """Root span for one turn; prints the ``[TRACE]`` summary when it ends."""
+    token = _CURRENT.set(None)
+    try:
+        with span(name, **attrs) as root:
+            root.trace_id = uuid.uuid4().hex[:16]
+            yield root
+    finally:
+        _CURRENT.reset(token)
+    if TRACE_LOG:
+        print(format_trace(root))
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def _walk(sp: Span, depth: int = 0) -> Iterator[Tuple[int, Span]]:
+    yield depth, sp
+    for child in sp.children:
+        yield from _walk(child, depth + 1)
+
+
+def format_trace(root: Span) -> str:
+    parts = []
+    for depth, sp in _walk(root):
+        if depth == 0:
+            continue
+        dur = sp.duration if sp.duration is not None else time.perf_counter() - sp.start
+        extra = " ".join(f"{k}={v}" for k, v in sp.attrs.items())
+        parts.append(f"{'>' * (depth - 1)}{sp.name}={dur:.2f}s" + (f"[{extra}]" if extra else ""))
+    head_attrs = " ".join(f"{k}={v!r}" for k, v in root.attrs.items())
+    return f"[TRACE] {root.trace_id} {root.name}={root.duration or 0.0:.2f}s {head_attrs} | " + " ".join(parts)
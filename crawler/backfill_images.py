@@ -7,7 +7,7 @@ window.PAGE_MODEL, and updates Qdrant payload in-place.
 
 Stores:
   image_url   — cover photo (og:image, kept for backward compat)
-  image_urls  — JSON array of up to MAX_IMAGES full-gallery URLs (size656x437)
+  image_urls  — array of up to MAX_IMAGES full-gallery URLs (size656x437)
 
 Usage:
     python3 crawler/backfill_images.py [--concurrency 20] [--dry-run] [--limit N]
@@ -162,7 +162,7 @@ async def backfill(concurrency: int, dry_run: bool, limit: Optional[int]):
                 image_urls, og_image = await fetch_gallery(http, url)
 
             if image_urls:
-                payload: dict = {"image_urls": json.dumps(image_urls)}
+                payload: dict = {"image_urls": image_urls}
                 # Backfill og cover photo too if missing
                 if not existing_og and og_image:
                     payload["image_url"] = og_image
@@ -16,6 +16,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from london_regions import LONDON_REGIONS, LONDON_POSTCODE_DISTRICTS
+from region_index import REGION_INDEX, haversine_km
 
 
 # ── 1. 从地址提取 postcode ────────────────────────────────────────
@@ -86,12 +87,7 @@ def get_regions_for_district(district: str) -> list[str]:
     """
     if not district:
         return []
-    district_upper = district.upper().strip()
-    matches = []
-    for region_name, data in LONDON_REGIONS.items():
-        if district_upper in [p.upper() for p in data["postcodes"]]:
-            matches.append(region_name)
-    return matches
+    return REGION_INDEX.regions_for_district(district)
 
 
 def get_regions_for_address(address: str) -> list[str]:
@@ -107,18 +103,6 @@ def get_regions_for_address(address: str) -> list[str]:
 
 # ── 3. lat/lng → 距离计算 ─────────────────────────────────────────
 
-def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """
-    计算两点间的球面距离（千米）
-    """
-    R = 6371.0
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lng2 - lng1)
-    a = math.sin(dphi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda/2)**2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-
 def get_nearest_regions(lat: float, lng: float, max_km: float = 1.5) -> list[dict]:
     """
     给定坐标，返回 max_km 范围内所有 region，按距离排序。
@@ -130,20 +114,14 @@ def get_nearest_regions(lat: float, lng: float, max_km: float = 1.5) -> list[dic
       {"region": "Hackney Central", "distance_km": 0.8, ...},
     ]
     """
-    results = []
-    for region_name, data in LONDON_REGIONS.items():
-        dist = haversine_km(lat, lng, data["lat"], data["lng"])
-        if dist <= max_km:
-            results.append({
-                "region": region_name,
-                "distance_km": round(dist, 3),
-                "lat": data["lat"],
-                "lng": data["lng"],
-                "zone": data.get("zone"),
-                "borough": data.get("borough"),
-            })
-    results.sort(key=lambda x: x["distance_km"])
-    return results
+    return REGION_INDEX.nearest(lat, lng, max_km)
+
+
+def get_nearest_regions_many(points: list[tuple[float, float]], max_km: float = 1.5) -> list[list[dict]]:
+    """
+    批量版 get_nearest_regions（sync 时按 listing 批量调用）
+    """
+    return REGION_INDEX.nearest_many(points, max_km)
 
 
 def get_primary_region(lat: float, lng: float) -> Optional[str]:
@@ -161,15 +139,7 @@ def get_region_center(region_name: str) -> Optional[tuple[float, float]]:
     "Dalston" → (51.5463, -0.0750)
     用于搜索时构造 Qdrant geo radius filter
     """
-    r = LONDON_REGIONS.get(region_name)
-    if r:
-        return r["lat"], r["lng"]
-    # 模糊匹配（不区分大小写）
-    name_lower = region_name.lower()
-    for k, v in LONDON_REGIONS.items():
-        if k.lower() == name_lower:
-            return v["lat"], v["lng"]
-    return None
+    return REGION_INDEX.center(region_name)
 
 
 def miles_to_meters(miles: float) -> float:
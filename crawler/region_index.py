@@ -0,0 +1,113 @@
+"""
+region_index.py
+---------------
+LONDON_REGIONS 的共享查询索引（crawler 同步和搜索 fallback 共用）：
+
+  - name → region       O(1)（不区分大小写）
+  - district → regions  O(1)（保持 LONDON_REGIONS 顺序）
+  - substring 匹配      预建子串表，O(len(keyword)²) 与 region 数量无关
+  - 最近 region         网格索引，只扫描查询点附近的格子
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from crawler.london_regions import LONDON_REGIONS
+except ImportError:
+    from london_regions import LONDON_REGIONS
+
+_CELL_DEG = 0.02  # ~2.2 km 纬度 / ~1.4 km 经度
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    R = 6371.0
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda/2)**2
+    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return int(math.floor(lat / _CELL_DEG)), int(math.floor(lng / _CELL_DEG))
+
+
+class RegionIndex:
+    def __init__(self, regions: Dict[str, dict]):
+        self.names: List[str] = list(regions)
+        self.data: List[dict] = [regions[n] for n in self.names]
+        self.by_name: Dict[str, int] = {}
+        self.by_district: Dict[str, List[str]] = {}
+        self.substrings: Dict[str, int] = {}
+        self.grid: Dict[Tuple[int, int], List[int]] = {}
+        for i, (name, data) in enumerate(zip(self.names, self.data)):
+            low = name.lower()
+            self.by_name.setdefault(low, i)
+            for pc in data.get("postcodes") or []:
+                self.by_district.setdefault(pc.upper(), []).append(name)
+            # 每个子串记录第一个包含它的 region（与线性扫描的先后顺序一致）
+            for a in range(len(low)):
+                for b in range(a + 1, len(low) + 1):
+                    self.substrings.setdefault(low[a:b], i)
+            self.grid.setdefault(_cell(data["lat"], data["lng"]), []).append(i)
+        self.max_name_len = max((len(n) for n in self.by_name), default=0)
+
+    # ── 名字 / district ─────────────────────────────────────────
+
+    def center(self, region_name: str) -> Optional[Tuple[float, float]]:
+        i = self.by_name.get(str(region_name or "").strip().lower())
+        if i is None:
+            return None
+        return self.data[i]["lat"], self.data[i]["lng"]
+
+    def regions_for_district(self, district: str) -> List[str]:
+        return list(self.by_district.get(str(district or "").upper().strip(), []))
+
+    def match_keyword(self, keyword: str) -> Optional[str]:
+        """Exact name, else the first region where keyword ⊂ name or name ⊂ keyword."""
+        kw = str(keyword or "").strip().lower()
+        if not kw:
+            return None
+        i = self.by_name.get(kw)
+        if i is not None:
+            return self.names[i]
+        best = self.substrings.get(kw)
+        # region 名字出现在 keyword 里：枚举 keyword 的子串查表
+        for a in range(len(kw)):
+            for b in range(a + 1, min(len(kw), a + self.max_name_len) + 1):
+                j = self.by_name.get(kw[a:b])
+                if j is not None and (best is None or j < best):
+                    best = j
+        return self.names[best] if best is not None else None
+
+    # ── 最近 region ──────────────────────────────────────────────
+
+    def nearest(self, lat: float, lng: float, max_km: float = 1.5) -> List[dict]:
+        r_lat = int(math.ceil(max_km / 111.0 / _CELL_DEG))
+        r_lng = int(math.ceil(max_km / (111.0 * max(0.1, math.cos(math.radians(lat)))) / _CELL_DEG))
+        c_lat, c_lng = _cell(lat, lng)
+        results = []
+        for dy in range(-r_lat, r_lat + 1):
+            for dx in range(-r_lng, r_lng + 1):
+                for i in self.grid.get((c_lat + dy, c_lng + dx), ()):
+                    data = self.data[i]
+                    dist = haversine_km(lat, lng, data["lat"], data["lng"])
+                    if dist <= max_km:
+                        results.append({
+                            "region": self.names[i],
+                            "distance_km": round(dist, 3),
+                            "lat": data["lat"],
+                            "lng": data["lng"],
+                            "zone": data.get("zone"),
+                            "borough": data.get("borough"),
+                        })
+        results.sort(key=lambda x: x["distance_km"])
+        return results
+
+    def nearest_many(self, points: Iterable[Tuple[float, float]], max_km: float = 1.5) -> List[List[dict]]:
+        """批量版本（sync 时按 listing 批量调用）。"""
+        return [self.nearest(lat, lng, max_km) for lat, lng in points]
+
+
+REGION_INDEX = RegionIndex(LONDON_REGIONS)
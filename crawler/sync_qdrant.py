@@ -42,6 +42,12 @@ sys.path.insert(0, str(CRAWLER_DIR))
 
 from geo_utils import extract_postcode_district, get_regions_for_district
 
+sys.path.insert(1, str(PROJECT_ROOT))
+from skills.search.bool_signals import PRECOMPUTED_FIELD as BOOL_SIGNALS_FIELD, text_bool_signals
+from skills.search.listing_fields import normalize_listing_fields
+from skills.search.sparse import SPARSE_VECTOR_NAME, average_doc_length, document_sparse_vector, listing_text
+from skills.search.red_flags import PRECOMPUTED_FIELD as RED_FLAGS_FIELD, detect_red_flags
+
 # ── Config ──────────────────────────────────────────────────────
 COLLECTION = os.environ.get("RENT_QDRANT_COLLECTION", "rent_listings")
 QDRANT_URL = os.environ.get("RENT_QDRANT_URL", "")
@@ -90,6 +96,20 @@ KEYWORD_INDEX_FIELDS = [
     "location_tokens",
 ]
 
+# Typed fields Stage A filters on when hard constraints are pushed down
+# (skills/search/constraint_pushdown.py).
+HARD_FILTER_INDEX_FIELDS = {
+    "price_pcm_num": "FLOAT",
+    "bedrooms_num": "FLOAT",
+    "bathrooms_num": "FLOAT",
+    "size_sqm_num": "FLOAT",
+    "min_tenancy_months_num": "FLOAT",
+    "available_from_epoch": "INTEGER",
+    "furnish_norm": "KEYWORD",
+    "let_type_norm": "KEYWORD",
+    "non_residential": "BOOL",
+}
+
 
 # ══════════════════════════════════════════════════════════════════
 # Helpers
@@ -104,6 +124,17 @@ def listing_id_to_uuid(lid: str) -> str:
     return str(uuid.uuid5(_UUID_NS, lid))
 
 
+def build_point_vector(dense: List[float], rec: Dict[str, Any], avgdl: Optional[float]) -> Any:
+    """Default dense vector plus the named BM25 sparse vector (dense only when avgdl is None)."""
+    if avgdl is None:
+        return dense
+    indices, values = document_sparse_vector(listing_text(rec), avgdl)
+    return {
+        "": dense,
+        SPARSE_VECTOR_NAME: models.SparseVector(indices=indices, values=values),
+    }
+
+
 def build_location_tokens(rec: Dict[str, Any]) -> Dict[str, List[str]]:
     """Generate location token lists for Qdrant payload indexing."""
     tokens: Dict[str, List[str]] = {
@@ -210,6 +241,15 @@ def build_payload(rec: Dict[str, Any], loc_tokens: Dict[str, List[str]]) -> Dict
     payload["location_region_tokens"] = loc_tokens["region"]
     payload["location_tokens"] = loc_tokens["all"]
 
+    # Text-derived signals, so Stage B/C read them instead of regexing
+    # descriptions per query (older points without them fall back to the scan).
+    payload[BOOL_SIGNALS_FIELD] = text_bool_signals(rec)
+    payload[RED_FLAGS_FIELD] = detect_red_flags(rec)
+
+    # Typed copies of the raw display strings (epoch dates, numbers, enums,
+    # arrays) so the runtime stops re-parsing them per request.
+    payload.update(normalize_listing_fields(rec))
+
     return payload
 
 
@@ -238,17 +278,29 @@ def create_collection(client: QdrantClient):
             size=VECTOR_DIM,
             distance=models.Distance.COSINE,
         ),
+        # BM25 term weights; Qdrant applies IDF at query time.
+        sparse_vectors_config={
+            SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF),
+        },
     )
-    print(f"Created collection: {COLLECTION} (dim={VECTOR_DIM}, cosine)")
+    print(f"Created collection: {COLLECTION} (dim={VECTOR_DIM}, cosine + sparse '{SPARSE_VECTOR_NAME}')")
+    ensure_payload_indexes(client)
+
 
-    # Create payload indexes for location prefiltering
-    for field in KEYWORD_INDEX_FIELDS:
+def ensure_payload_indexes(client: QdrantClient):
+    """Create any missing payload indexes (location prefilter + pushed-down hard constraints)."""
+    existing = set((client.get_collection(COLLECTION).payload_schema or {}).keys())
+    wanted = {field: "KEYWORD" for field in KEYWORD_INDEX_FIELDS}
+    wanted.update(HARD_FILTER_INDEX_FIELDS)
+    for field, schema in wanted.items():
+        if field in existing:
+            continue
         client.create_payload_index(
             collection_name=COLLECTION,
             field_name=field,
-            field_schema=models.PayloadSchemaType.KEYWORD,
+            field_schema=getattr(models.PayloadSchemaType, schema),
         )
-        print(f"  Created index: {field}")
+        print(f"  Created index: {field} ({schema.lower()})")
 
 
 def fetch_existing_ids(client: QdrantClient) -> Dict[str, str]:
@@ -312,6 +364,7 @@ def sync_full(client: QdrantClient, records: List[Dict[str, Any]], embedder: Tex
 
     # Prepare all embed texts
     embed_texts = [build_embed_text(r) for r in records]
+    avgdl = average_doc_length(listing_text(r) for r in records)
 
     total = len(records)
     upserted = 0
@@ -331,7 +384,7 @@ def sync_full(client: QdrantClient, records: List[Dict[str, Any]], embedder: Tex
             payload = build_payload(rec, loc_tokens)
             points.append(models.PointStruct(
                 id=listing_id_to_uuid(lid),
-                vector=vec.tolist(),
+                vector=build_point_vector(vec.tolist(), rec, avgdl),
                 payload=payload,
             ))
 
@@ -348,6 +401,8 @@ def sync_incremental(client: QdrantClient, records: List[Dict[str, Any]], embedd
     if not client.collection_exists(COLLECTION):
         print("Collection does not exist — falling back to full sync.")
         return sync_full(client, records, embedder)
+    # Collections built before an index was added get it here.
+    ensure_payload_indexes(client)
 
     # 1. Fetch existing listing_ids from Qdrant
     print("Fetching existing IDs from Qdrant...")
@@ -386,6 +441,13 @@ def sync_incremental(client: QdrantClient, records: List[Dict[str, Any]], embedd
     if to_add:
         add_recs = [new_ids[lid] for lid in to_add]
         add_texts = [build_embed_text(r) for r in add_recs]
+        # BM25 length normalisation against the whole current corpus.
+        avgdl: Optional[float] = average_doc_length(listing_text(r) for r in records)
+        sparse_cfg = client.get_collection(COLLECTION).config.params.sparse_vectors or {}
+        if SPARSE_VECTOR_NAME not in sparse_cfg:
+            print(f"  [WARN] collection has no '{SPARSE_VECTOR_NAME}' sparse vector; "
+                  "adding dense-only points (run --mode full to enable hybrid search)")
+            avgdl = None
 
         upserted = 0
         for i in range(0, len(add_recs), BATCH_SIZE):
@@ -402,7 +464,7 @@ def sync_incremental(client: QdrantClient, records: List[Dict[str, Any]], embedd
                 payload = build_payload(rec, loc_tokens)
                 points.append(models.PointStruct(
                     id=listing_id_to_uuid(lid),
-                    vector=vec.tolist(),
+                    vector=build_point_vector(vec.tolist(), rec, avgdl),
                     payload=payload,
                 ))
 
@@ -429,6 +491,7 @@ def purge_stale(client: QdrantClient, days: int):
     if not client.collection_exists(COLLECTION):
         print("[WARN] Collection does not exist, nothing to purge.")
         return
+    ensure_payload_indexes(client)
 
     # Scroll all points and check scraped_at
     stale_ids: list[str] = []
@@ -526,6 +589,29 @@ def main():
         from skills.search.location_match import rebuild_location_index
         rebuild_location_index()
 
+    # Rebuild the area price-statistics cube from the synced records
+    if args.mode is not None:
+        print("\nRebuilding area price-statistics cube...")
+        from skills.search.area_stats import rebuild_area_stats
+        rebuild_area_stats(
+            build_payload(rec, build_location_tokens(rec))
+            for rec in records if rec.get("listing_id")
+        )
+
+        # Chunk + embed listing text for QA retrieval (reuses unchanged vectors)
+        print("\nRebuilding QA chunk index...")
+        from skills.qa.chunk_index import rebuild_qa_chunk_index
+        rebuild_qa_chunk_index(
+            (build_payload(rec, build_location_tokens(rec)) for rec in records if rec.get("listing_id")),
+            embedder,
+        )
+
+    # Pack boot-time indexes (location, commute graph, pref vectors) for fast restarts
+    if args.mode is not None or args.purge_days is not None:
+        print("\nRebuilding runtime bundle...")
+        from skills.search.runtime_bundle import build_runtime_bundle
+        build_runtime_bundle()
+
 
 if __name__ == "__main__":
     main()
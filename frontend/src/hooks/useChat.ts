@@ -1,6 +1,6 @@
 import { useEffect, useRef, useState } from "react";
-import { streamChat } from "../lib/mockStream";
-import type { ChatSession, Message, SessionMetadata } from "../types/chat";
+import { fetchPage, preloadImages, streamChat } from "../lib/mockStream";
+import type { ChatSession, ListingData, Message, SessionMetadata } from "../types/chat";
 import { createId } from "./useSessions";
 
 function firstLine(content: string): string {
@@ -8,6 +8,37 @@ function firstLine(content: string): string {
   return line || "New Chat";
 }
 
+type VersionCache = {
+  resultSetId?: string;
+  pins?: ListingData[];
+  shortlistVersion?: string;
+  shortlist?: ListingData[];
+};
+
+// Fill arrays the server left out (unchanged since the version we sent) from
+// the cache, and remember anything new it did send.
+function hydrateMetadata(meta: SessionMetadata, cache: VersionCache): SessionMetadata {
+  const results = meta.search_results;
+  if (results?.result_set_id) {
+    if (results.all_listings) {
+      cache.resultSetId = results.result_set_id;
+      cache.pins = results.all_listings;
+    } else if (results.result_set_id === cache.resultSetId) {
+      meta = { ...meta, search_results: { ...results, all_listings: cache.pins } };
+    }
+  }
+  const shortlist = meta.shortlist;
+  if (shortlist?.version) {
+    if (shortlist.listings) {
+      cache.shortlistVersion = shortlist.version;
+      cache.shortlist = shortlist.listings;
+    } else if (shortlist.version === cache.shortlistVersion) {
+      meta = { ...meta, shortlist: { ...shortlist, listings: cache.shortlist } };
+    }
+  }
+  return meta;
+}
+
 type UseChatOptions = {
   activeSession: ChatSession | undefined;
   updateSession: (id: string, updater: (s: ChatSession) => ChatSession) => void;
@@ -28,6 +59,7 @@ export function useChat({ activeSession, updateSession }: UseChatOptions) {
   const isGeneratingRef = useRef(false);
 
   const lastAckIdRef = useRef<string | null>(null);
+  const versionCacheRef = useRef<VersionCache>({});
 
   useEffect(() => {
     setMetadata(null);
@@ -36,6 +68,7 @@ export function useChat({ activeSession, updateSession }: UseChatOptions) {
     setSuppressedIds(new Set());
     lastSearchSigRef.current = "";
     lastAckIdRef.current = null;
+    versionCacheRef.current = {};
   }, [activeSession?.id]);
 
   async function sendMessage(input: string, routeHint?: Record<string, unknown>) {
@@ -74,6 +107,8 @@ export function useChat({ activeSession, updateSession }: UseChatOptions) {
       await streamChat(activeSession.id, prompt, {
         signal: controller.signal,
         routeHint,
+        knownResultSetId: versionCacheRef.current.resultSetId,
+        knownShortlistVersion: versionCacheRef.current.shortlistVersion,
         onChunk: (chunk) => {
           updateSession(activeSession.id, (session) => {
             const messages = session.messages.map((m) =>
@@ -82,8 +117,10 @@ export function useChat({ activeSession, updateSession }: UseChatOptions) {
             return { ...session, updatedAt: Date.now(), messages };
           });
         },
-        onMetadata: (meta) => {
+        onMetadata: (raw) => {
+          const meta = hydrateMetadata(raw, versionCacheRef.current);
           setMetadata(meta);
+          preloadImages(meta.search_results?.prefetch_images);
 
           const sig = (meta.search_results?.listings ?? []).map((l) => l.url).join(",");
           const hasNewResults = sig !== "" && sig !== lastSearchSigRef.current;
@@ -173,30 +210,45 @@ export function useChat({ activeSession, updateSession }: UseChatOptions) {
     const controller = new AbortController();
     abortRef.current = controller;
 
-    try {
-      await streamChat(activeSession.id, prompt, {
-        signal: controller.signal,
-        routeHint,
-        onChunk: () => {},
-        onMetadata: (meta) => {
-          setMetadata(meta);
+    const onMetadata = (raw: SessionMetadata) => {
+      const meta = hydrateMetadata(raw, versionCacheRef.current);
+      setMetadata(meta);
+      preloadImages(meta.search_results?.prefetch_images);
 
-          const hasResults = (meta.search_results?.listings?.length ?? 0) > 0;
-          const hasCompare = (meta.compare_data?.listings?.length ?? 0) >= 2;
+      const hasResults = (meta.search_results?.listings?.length ?? 0) > 0;
+      const hasCompare = (meta.compare_data?.listings?.length ?? 0) >= 2;
 
-          if (hasResults || hasCompare) {
-            // Move card rendering to the ack message position (or keep current)
-            const targetId = ackId ?? metadataForId;
-            if (targetId) {
-              setSuppressedIds((prev) => new Set([...prev, targetId]));
-              setMetadataForId(targetId);
-            }
-            if (hasResults) {
-              lastSearchSigRef.current = (meta.search_results?.listings ?? []).map((l) => l.url).join(",");
-            }
-          }
-        },
-      });
+      if (hasResults || hasCompare) {
+        // Move card rendering to the ack message position (or keep current)
+        const targetId = ackId ?? metadataForId;
+        if (targetId) {
+          setSuppressedIds((prev) => new Set([...prev, targetId]));
+          setMetadataForId(targetId);
+        }
+        if (hasResults) {
+          lastSearchSigRef.current = (meta.search_results?.listings ?? []).map((l) => l.url).join(",");
+        }
+      }
+    };
+
+    try {
+      if (isPagination) {
+        const meta = await fetchPage(activeSession.id, routeHint?.page_action === "prev" ? "prev" : "next", {
+          signal: controller.signal,
+          knownResultSetId: versionCacheRef.current.resultSetId,
+          knownShortlistVersion: versionCacheRef.current.shortlistVersion,
+        });
+        onMetadata(meta);
+      } else {
+        await streamChat(activeSession.id, prompt, {
+          signal: controller.signal,
+          routeHint,
+          knownResultSetId: versionCacheRef.current.resultSetId,
+          knownShortlistVersion: versionCacheRef.current.shortlistVersion,
+          onChunk: () => {},
+          onMetadata,
+        });
+      }
     } catch (error) {
       if (!(error instanceof DOMException) || error.name !== "AbortError") {
         console.error("[silent action failed]", error);
@@ -3,6 +3,9 @@ import type { SessionMetadata } from "../types/chat";
 type StreamOptions = {
   signal: AbortSignal;
   routeHint?: Record<string, unknown>;
+  // Versions the client already holds; the server omits unchanged arrays.
+  knownResultSetId?: string;
+  knownShortlistVersion?: string;
   onChunk: (chunk: string) => void;
   onMetadata?: (meta: SessionMetadata) => void;
 };
@@ -24,6 +27,8 @@ export async function streamChat(
       session_id: sessionId,
       user_text: userText,
       ...(options.routeHint ? { route_hint: options.routeHint } : {}),
+      ...(options.knownResultSetId ? { known_result_set_id: options.knownResultSetId } : {}),
+      ...(options.knownShortlistVersion ? { known_shortlist_version: options.knownShortlistVersion } : {}),
     }),
   });
 
@@ -71,3 +76,41 @@ export async function streamChat(
     }
   }
 }
+
+type PageOptions = {
+  signal: AbortSignal;
+  knownResultSetId?: string;
+  knownShortlistVersion?: string;
+};
+
+// "Show more" / "go back": served from the session's cached ranking, no LLM turn.
+export async function fetchPage(
+  sessionId: string,
+  pageAction: "next" | "prev",
+  options: PageOptions,
+): Promise<SessionMetadata> {
+  const response = await fetch(`${API_BASE}/api/chat/page`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    signal: options.signal,
+    body: JSON.stringify({
+      session_id: sessionId,
+      page_action: pageAction,
+      ...(options.knownResultSetId ? { known_result_set_id: options.knownResultSetId } : {}),
+      ...(options.knownShortlistVersion ? { known_shortlist_version: options.knownShortlistVersion } : {}),
+    }),
+  });
+  if (!response.ok) {
+    throw new Error(`Request failed: ${response.status}`);
+  }
+  return (await response.json()) as SessionMetadata;
+}
+
+export function preloadImages(urls: string[] | undefined): void {
+  for (const url of urls ?? []) {
+    const img = new Image();
+    img.src = url;
+  }
+}
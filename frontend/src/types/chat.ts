@@ -47,11 +47,15 @@ export type ListingData = {
 
 export type SearchResultsMeta = {
   listings: ListingData[];
+  // Omitted when the request echoed the current result_set_id.
   all_listings?: ListingData[];
+  result_set_id?: string;
   page_index: number;
   has_more: boolean;
   total: number;
   remaining: number;
+  // Cover images of the next page, for the browser cache.
+  prefetch_images?: string[];
 };
 
 export type ConstraintsMeta = Record<string, unknown>;
@@ -83,7 +87,9 @@ export type CompareData = {
 export type ShortlistMeta = {
   count: number;
   saved_ids: string[];
-  listings: ListingData[];
+  // Omitted when the request echoed the current version.
+  listings?: ListingData[];
+  version?: string;
 };
 
 export type SessionMetadata = {
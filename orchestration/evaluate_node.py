@@ -12,14 +12,19 @@ Also populates:
 """
 from __future__ import annotations
 
+import logging
 import re
-from collections import Counter
 from datetime import date, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 from orchestration.state import GraphState
+from skills.search.area_stats import area_budget_gain
 from skills.search.formatter import format_relax_results_reply
 
+_logger = logging.getLogger(__name__)
+
 # ── Tunables ──────────────────────────────────────────────────────────────────
 MIN_PAGES = 2
 MAX_RELAX_ATTEMPTS = 2
@@ -96,85 +101,140 @@ def _extract_layout_requirements(constraints: Dict[str, Any]) -> Tuple[set, set]
     return req_beds, req_baths
 
 
+def _audit_fail_fields(a: Dict[str, Any]) -> List[str]:
+    """Canonical constraint names that failed for one audit record.
+
+    Stage B emits ``hard_fail_fields``; older audit records only carry the
+    reason strings, so fall back to parsing those.
+    """
+    fields = a.get("hard_fail_fields")
+    if fields is not None:
+        return list(fields)
+    return [_parse_constraint_name(r) for r in (a.get("hard_fail_reasons") or [])]
+
+
+def _sensitivity_arrays(audits: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Typed columns + per-constraint fail masks for the Stage B candidates."""
+    n = len(audits)
+    price = np.full(n, np.nan)
+    beds = np.full(n, np.nan)
+    baths = np.full(n, np.nan)
+    n_fail = np.zeros(n, dtype=np.int32)
+    fail: Dict[str, np.ndarray] = {}
+    for i, a in enumerate(audits):
+        p = _to_num(a.get("price_pcm"))
+        b = _to_num(a.get("bedrooms"))
+        ba = _to_num(a.get("bathrooms"))
+        if p is not None:
+            price[i] = p
+        if b is not None:
+            beds[i] = round(b)
+        if ba is not None:
+            baths[i] = ba
+        fields = _audit_fail_fields(a)
+        n_fail[i] = len(fields)
+        for name in fields:
+            mask = fail.get(name)
+            if mask is None:
+                mask = fail[name] = np.zeros(n, dtype=bool)
+            mask[i] = True
+    return {"price": price, "beds": beds, "baths": baths, "n_fail": n_fail, "fail": fail, "n": n}
+
+
 def compute_confirmed_sensitivity(
     audits: List[Dict[str, Any]],
     constraints: Dict[str, Any],
 ) -> Dict[str, Any]:
     """Count listings with CONFIRMED values for alternative constraint scenarios.
 
+    Every what-if is a combination of boolean masks over the Stage B
+    candidates followed by a popcount.
+
     Returns dict with optional keys:
       "budget":  {"threshold": int, "gain": int}   — raise budget to threshold → +gain
       "layout":  [(bed_count, confirmed_count), ...]  — alternative bedrooms within budget
       "other":   {constraint_name: count, ...}      — single-miss for minor constraints
+      "combo":   {"threshold": int, "drop": str, "gain": int}
+                 — raise budget AND drop one minor constraint, when that beats either alone
     """
     budget = _to_num(constraints.get("max_rent_pcm"))
     req_beds, req_baths = _extract_layout_requirements(constraints)
     result: Dict[str, Any] = {}
+    cols = _sensitivity_arrays(audits)
+    price, beds, baths = cols["price"], cols["beds"], cols["baths"]
+    fail, n_fail = cols["fail"], cols["n_fail"]
+    no_fail = np.zeros(cols["n"], dtype=bool)
+
+    has_price = ~np.isnan(price)
+    has_beds = ~np.isnan(beds)
+    # Confirmed layout match: bedrooms known and requested; bathrooms known and
+    # requested when the user specified them.
+    layout_ok = has_beds & np.isin(beds, sorted(req_beds))
+    if req_baths:
+        layout_ok &= ~np.isnan(baths) & np.isin(baths, sorted(req_baths))
+    within_budget = has_price & (price <= budget) if budget is not None else has_price
 
     # --- Budget sensitivity ---
     # How many CONFIRMED layout-matching listings are just above the current budget?
     if budget is not None and req_beds:
-        for factor in [1.15, 1.25, 1.50]:
-            new_budget = int(round(budget * factor))
-            gain = 0
-            for a in audits:
-                price = _to_num(a.get("price_pcm"))
-                beds = _to_num(a.get("bedrooms"))
-                if price is None or beds is None:
-                    continue
-                # Must be over current budget but within new budget
-                if price <= budget or price > new_budget:
-                    continue
-                # Must match bedroom requirement
-                if int(round(beds)) not in req_beds:
-                    continue
-                # Bathrooms: if user specified, require confirmed match
-                if req_baths:
-                    baths = _to_num(a.get("bathrooms"))
-                    if baths is None:
-                        continue
-                    if float(baths) not in req_baths:
-                        continue
-                gain += 1
-            if gain > 0:
-                result["budget"] = {"threshold": new_budget, "gain": gain}
-                break  # use the smallest meaningful threshold
+        if cols["n"] == 0:
+            # No audits this turn (e.g. cache hit) — answer from the area stats cube.
+            for factor in [1.15, 1.25, 1.50]:
+                new_budget = int(round(budget * factor))
+                gain = area_budget_gain(constraints, new_budget) or 0
+                if gain > 0:
+                    result["budget"] = {"threshold": new_budget, "gain": gain}
+                    break
+        else:
+            over_budget = layout_ok & has_price & (price > budget)
+            for factor in [1.15, 1.25, 1.50]:
+                new_budget = int(round(budget * factor))
+                gain = int(np.count_nonzero(over_budget & (price <= new_budget)))
+                if gain > 0:
+                    result["budget"] = {"threshold": new_budget, "gain": gain}
+                    break  # use the smallest meaningful threshold
 
     # --- Layout sensitivity ---
     # How many CONFIRMED listings with different bedrooms are within budget?
-    layout_counts: Counter = Counter()
-    for a in audits:
-        price = _to_num(a.get("price_pcm"))
-        beds = _to_num(a.get("bedrooms"))
-        if price is None or beds is None:
-            continue
-        bed_val = int(round(beds))
-        # Must be within budget (confirmed)
-        if budget is not None and price > budget:
-            continue
-        # Must be a different bedroom count than requested
-        if bed_val in req_beds:
-            continue
-        layout_counts[bed_val] += 1
-    if layout_counts:
-        # Top 2 alternatives, sorted by count descending
-        result["layout"] = layout_counts.most_common(2)
+    alt = has_beds & within_budget & ~np.isin(beds, sorted(req_beds))
+    if alt.any():
+        values, first_idx, counts = np.unique(beds[alt], return_index=True, return_counts=True)
+        # Top 2 alternatives, count descending; ties keep first-seen order.
+        order = sorted(range(len(values)), key=lambda j: (-counts[j], first_idx[j]))[:2]
+        result["layout"] = [(int(values[j]), int(counts[j])) for j in order]
 
     # --- Other constraints (furnish, let_type, etc.) ---
     # Single-miss approach is fine here — null values are rare for these fields.
-    other_counts: Counter = Counter()
-    for a in audits:
-        if a.get("hard_pass"):
-            continue
-        reasons = a.get("hard_fail_reasons") or []
-        if len(reasons) != 1:
-            continue
-        name = _parse_constraint_name(reasons[0])
+    single = n_fail == 1
+    other_counts: Dict[str, int] = {}
+    for name, mask in fail.items():
         if name in ("budget", "layout", "location", "other"):
             continue  # handled separately or not actionable
-        other_counts[name] += 1
+        cnt = int(np.count_nonzero(single & mask))
+        if cnt:
+            other_counts[name] = cnt
     if other_counts:
-        result["other"] = dict(other_counts)
+        result["other"] = other_counts
+
+    # --- Budget + one minor constraint ---
+    # Candidates whose only blockers are price/layout (resolved by the typed
+    # layout/price check) plus at most the dropped constraint.
+    budget_info = result.get("budget")
+    typed_layout = not any(
+        isinstance(opt, dict) and (opt.get("property_type") or opt.get("layout_tag"))
+        for opt in (constraints.get("layout_options") or [])
+    )
+    if budget_info and other_counts and typed_layout:
+        blockers = n_fail - fail.get("budget", no_fail) - fail.get("layout", no_fail)
+        price_ok = layout_ok & has_price & (price <= budget_info["threshold"])
+        best: Optional[Dict[str, Any]] = None
+        for name in other_counts:
+            passes = price_ok & ((blockers == 0) | ((blockers == 1) & fail[name]))
+            gain = int(np.count_nonzero(passes & (n_fail > 0)))
+            if gain > max(budget_info["gain"], other_counts[name]) and (best is None or gain > best["gain"]):
+                best = {"threshold": budget_info["threshold"], "drop": name, "gain": gain}
+        if best:
+            result["combo"] = best
 
     return result
 
@@ -209,6 +269,16 @@ def _build_sensitivity_message(
             plural = "listings" if count != 1 else "listing"
             lines.append(f"  \U0001f4a1 {bed_label}{budget_str} \u2192 {count} confirmed {plural}")
 
+    # Budget + one minor constraint together
+    combo_info = confirmed.get("combo")
+    if combo_info:
+        label = _other_constraint_label(combo_info["drop"], c)
+        plural = "listings" if combo_info["gain"] != 1 else "listing"
+        lines.append(
+            f"  \U0001f4a1 Raise budget to \u00a3{combo_info['threshold']:,} and {label[:1].lower() + label[1:]}"
+            f" \u2192 +{combo_info['gain']} confirmed {plural}"
+        )
+
     # Other constraints
     other_info = confirmed.get("other", {})
     for name, count in sorted(other_info.items(), key=lambda x: -x[1]):
@@ -389,21 +459,24 @@ def _build_proactive_insight(
     display_results: List[Dict[str, Any]],
     constraints: Dict[str, Any],
     k: int,
+    total: Optional[int] = None,
 ) -> str:
     """1-2 sentence quality snapshot appended after every successful search.
 
-    Shows: count (shown vs total), price range, and budget headroom.
+    Shows: count (shown vs total), price range, and budget headroom. ``total``
+    is the estimated match count while only part of the ranking is held.
     """
     if not display_results:
         return ""
 
-    n_total = len(display_results)
+    n_total = max(len(display_results), int(total or 0))
     prices = sorted(
         p for r in display_results if (p := _to_num(r.get("price_pcm"))) is not None
     )
     budget = _to_num(constraints.get("max_rent_pcm"))
 
-    count_str = f"Showing {k} of {n_total}" if n_total > k else str(n_total)
+    about = "about " if n_total > len(display_results) else ""
+    count_str = f"Showing {k} of {about}{n_total}" if n_total > k else str(n_total)
     listing_label = "listing" if n_total == 1 else "listings"
 
     if not prices:
@@ -428,13 +501,32 @@ def _build_proactive_insight(
 
 # ── Node ─────────────────────────────────────────────────────────────────────
 
+def _complete_audits(state: GraphState) -> List[Dict[str, Any]]:
+    """Stage B audits including the candidates pushed-down constraints left out.
+
+    A pushed-down Stage A returns almost only passing listings. The
+    unfiltered candidates are fetched here, once per search and only when
+    the relax / near-miss analysis needs them; the relax search then reuses
+    that frame instead of querying Qdrant again.
+    """
+    loader = state.get("stage_b_unfiltered")
+    if loader is not None:
+        state["stage_b_unfiltered"] = None
+        try:
+            stage_a_df, audits = loader()
+        except Exception:
+            _logger.exception("evaluate_node: unfiltered Stage A failed — using pushed-down audits")
+        else:
+            state["stage_b_audits"] = audits
+            state["stage_a_prefilter_count"] = int(stage_a_df.attrs.get("prefilter_count") or 0)
+    return list(state.get("stage_b_audits") or [])
+
+
 def evaluate_node(state: GraphState) -> GraphState:
     """Inspect search results and audit trail; set eval_decision."""
     status = state.get("last_search_status") or "unknown"
     agent_state = state["agent_state"]
     results = list(agent_state.last_results or [])
-    audits: List[Dict[str, Any]] = list(state.get("stage_b_audits") or [])
-    prefilter_count: int = int(state.get("stage_a_prefilter_count") or -1)
     geo_fallback_area: Optional[str] = state.get("stage_a_geo_fallback_area") or None
     attempt: int = int(state.get("relax_attempt") or 0)
     original_budget: Optional[int] = agent_state.original_budget
@@ -473,7 +565,7 @@ def evaluate_node(state: GraphState) -> GraphState:
             if has_budget:
                 state["eval_decision"] = "relax"
                 state["relax_bottleneck"] = "budget"
-                state["relax_near_miss"] = _find_near_miss(audits)
+                state["relax_near_miss"] = _find_near_miss(_complete_audits(state))
                 return state
 
         state["eval_decision"] = "done"
@@ -484,11 +576,17 @@ def evaluate_node(state: GraphState) -> GraphState:
         count_line = f"\n\n[debug] display={n_display_total} strict={n_strict_total} k={k} threshold={k * MIN_PAGES} attempt={attempt}"
 
         # P3: proactive quality insight appended to every successful search reply.
-        insight = _build_proactive_insight(display_results, agent_state.constraints or {}, k)
+        insight = _build_proactive_insight(
+            display_results,
+            agent_state.constraints or {},
+            k,
+            # Only the first pages are ranked; count the rest from the estimate.
+            total=agent_state.result_total() if getattr(agent_state, "search_cursor", None) is not None else None,
+        )
 
         # If we got here via a relax loop, rebuild reply with ★ markup + sensitivity table.
         if attempt > 0:
-            confirmed = compute_confirmed_sensitivity(audits, agent_state.constraints or {})
+            confirmed = compute_confirmed_sensitivity(_complete_audits(state), agent_state.constraints or {})
             sensitivity_msg = _build_sensitivity_message(confirmed, agent_state.constraints)
             state["reply_text"] = format_relax_results_reply(
                 listings=results,
@@ -501,8 +599,11 @@ def evaluate_node(state: GraphState) -> GraphState:
             # attempt == 0: base reply + P3 insight + optional sensitivity hint.
             base = str(state.get("reply_text") or "")
             sensitivity_note = ""
-            if n_strict_total < k * MIN_PAGES:
-                confirmed = compute_confirmed_sensitivity(audits, agent_state.constraints or {})
+            # The hint is optional: skip it rather than fetch the near misses
+            # a pushed-down Stage A left out (with no loader pending, this
+            # only reads this turn's audits).
+            if n_strict_total < k * MIN_PAGES and state.get("stage_b_unfiltered") is None:
+                confirmed = compute_confirmed_sensitivity(_complete_audits(state), agent_state.constraints or {})
                 sensitivity_msg = _build_sensitivity_message(confirmed, agent_state.constraints)
                 if sensitivity_msg:
                     sensitivity_note = (
@@ -516,6 +617,11 @@ def evaluate_node(state: GraphState) -> GraphState:
             state["reply_text"] = base + insight + geo_note + sensitivity_note + count_line
         return state
 
+    # Every path below relaxes or explains the misses, so it needs them all;
+    # this also turns a pushed-down prefilter count back into a location count.
+    audits: List[Dict[str, Any]] = _complete_audits(state)
+    prefilter_count: int = int(state.get("stage_a_prefilter_count") or -1)
+
     # 3. Location miss (Stage A found nothing matching the location filter).
     if prefilter_count == 0:
         state["eval_decision"] = "ask_user"
@@ -22,6 +22,7 @@ from orchestration.nodes import (
     search_node,
     shortlist_node,
 )
+from core.tracing import traced
 from orchestration.relax_node import relax_node
 from orchestration.state import GraphState
 
@@ -40,27 +41,27 @@ def build_graph() -> Any:
     graph = StateGraph(GraphState)
 
     # ── Top-level domain routing ──────────────────────────────────────────────
-    graph.add_node("domain_router", domain_router_node)
-    graph.add_node("general", general_node)
+    graph.add_node("domain_router", traced("node.domain_router")(domain_router_node))
+    graph.add_node("general", traced("node.general")(general_node))
 
     # ── Rental sub-pipeline ───────────────────────────────────────────────────
-    graph.add_node("route", route_node)
-    graph.add_node("apply_suggestion", apply_suggestion_node)
-    graph.add_node("search", search_node)
-    graph.add_node("evaluate", evaluate_node)
-    graph.add_node("relax", relax_node)
-    graph.add_node("qa_plan", qa_plan_node)
-    graph.add_node("qa_execute", qa_execute_node)
-    graph.add_node("paginate", paginate_node)
-    graph.add_node("compare", compare_node)
-    graph.add_node("area_compare", area_compare_node)
-    graph.add_node("shortlist", shortlist_node)
-    graph.add_node("explain", explain_node)
-    graph.add_node("direct_reply", direct_reply_node)
-    graph.add_node("fallback", fallback_node)
+    graph.add_node("route", traced("node.route")(route_node))
+    graph.add_node("apply_suggestion", traced("node.apply_suggestion")(apply_suggestion_node))
+    graph.add_node("search", traced("node.search")(search_node))
+    graph.add_node("evaluate", traced("node.evaluate")(evaluate_node))
+    graph.add_node("relax", traced("node.relax")(relax_node))
+    graph.add_node("qa_plan", traced("node.qa_plan")(qa_plan_node))
+    graph.add_node("qa_execute", traced("node.qa_execute")(qa_execute_node))
+    graph.add_node("paginate", traced("node.paginate")(paginate_node))
+    graph.add_node("compare", traced("node.compare")(compare_node))
+    graph.add_node("area_compare", traced("node.area_compare")(area_compare_node))
+    graph.add_node("shortlist", traced("node.shortlist")(shortlist_node))
+    graph.add_node("explain", traced("node.explain")(explain_node))
+    graph.add_node("direct_reply", traced("node.direct_reply")(direct_reply_node))
+    graph.add_node("fallback", traced("node.fallback")(fallback_node))
 
     # ── Shared ────────────────────────────────────────────────────────────────
-    graph.add_node("finalize", finalize_node)
+    graph.add_node("finalize", traced("node.finalize")(finalize_node))
 
     # ── Edges: domain dispatch ────────────────────────────────────────────────
     graph.add_edge(START, "domain_router")
@@ -0,0 +1,169 @@
+"""Process-wide listing payload store.
+
+Search results are large dicts (descriptions, features, station/school JSON,
+image lists) and the same listing is typically held several times per
+session: in ``search_full_results``, in each cached ``QuerySnapshot`` of
+``snapshot_history`` and across sessions that hit the same area.
+
+This module interns the static Qdrant payload of every listing once per
+process and lets session state keep a lightweight ``ListingRef`` instead:
+the ref points at the shared payload and carries only the per-search score
+overlay (``final_score``, ``*_detail``, ``penalty_reasons`` …).
+
+Lifetime is plain Python reference counting — the store holds payloads
+weakly, so a payload is dropped as soon as the last ``ListingRef`` pointing
+at it is garbage collected (e.g. when a snapshot falls out of history or a
+session expires).
+"""
+from __future__ import annotations
+
+import copy
+import threading
+import weakref
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+# Static listing fields written by crawler/sync_qdrant.py (PAYLOAD_FIELDS +
+# location tokens). Everything else on a ranked row is treated as per-search
+# overlay and kept on the ref.
+_SHARED_FIELDS = frozenset({
+    "listing_id", "url", "source_site", "source", "scraped_at",
+    "image_url", "image_urls",
+    "address", "postcode", "postcode_district", "title",
+    "price_pcm", "price_pw", "price_display",
+    "bedrooms", "bathrooms", "property_type", "size_sqm", "size_sqft",
+    "deposit", "deposit_amount", "available_from", "min_tenancy",
+    "let_type", "furnish_type", "council_tax",
+    "description", "features", "stations", "schools",
+    "latitude", "longitude",
+    "added_date", "discovery_paths",
+    "max_tenants",
+    "bills_included", "student_friendly", "families_allowed",
+    "pets_allowed", "smokers_allowed", "dss_covers_rent",
+    "garden", "parking", "fireplace", "epc_rating", "epc_not_required",
+    "online_viewings", "live_in_landlord", "dss_income_accepted",
+    "openrent_url",
+    "location_postcode_tokens", "location_station_tokens",
+    "location_region_tokens", "location_tokens",
+    # sync-time derived fields (bool_signals / red_flags / listing_fields)
+    "bool_signals", "red_flag_labels",
+    "available_from_epoch", "available_now", "min_tenancy_months_num",
+    "deposit_value", "furnish_norm", "property_type_norm",
+    "let_type_norm", "non_residential", "price_pcm_num",
+    "bedrooms_num", "bathrooms_num", "size_sqm_num",
+    "stations_items", "schools_items", "features_items",
+    "_qdrant_id",
+})
+
+
+class _SharedPayload(dict):
+    """Plain dict that can be weakly referenced by the store."""
+
+    __slots__ = ("__weakref__",)
+
+
+def listing_key(listing: Mapping) -> Optional[str]:
+    for field in ("_qdrant_id", "listing_id", "url"):
+        v = listing.get(field)
+        if v is not None and str(v).strip():
+            return f"{field}:{v}"
+    return None
+
+
+class ListingRef(Mapping):
+    """Read-only view of one ranked listing: shared payload + score overlay.
+
+    Behaves like the original row dict for ``.get`` / ``[]`` / ``in`` /
+    iteration, so consumers that only read fields do not need to change.
+    Use ``to_dict()`` (or ``resolve_listing``) where a mutable dict is needed.
+    """
+
+    __slots__ = ("key", "payload", "overlay")
+
+    def __init__(self, key: str, payload: _SharedPayload, overlay: Dict[str, Any]):
+        self.key = key
+        self.payload = payload
+        self.overlay = overlay
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.overlay:
+            return self.overlay[name]
+        return self.payload[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.overlay or name in self.payload
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.payload
+        for k in self.overlay:
+            if k not in self.payload:
+                yield k
+
+    def __len__(self) -> int:
+        return len(self.payload) + sum(1 for k in self.overlay if k not in self.payload)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.payload, **self.overlay}
+
+    # The payload is shared and never mutated in place; copies only need
+    # their own overlay.
+    def __copy__(self) -> "ListingRef":
+        return ListingRef(self.key, self.payload, dict(self.overlay))
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ListingRef":
+        return ListingRef(self.key, self.payload, copy.deepcopy(self.overlay, memo))
+
+    def __repr__(self) -> str:
+        return f"ListingRef({self.key!r}, overlay={len(self.overlay)} fields)"
+
+
+class ListingStore:
+    def __init__(self) -> None:
+        self._payloads: "weakref.WeakValueDictionary[str, _SharedPayload]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def intern(self, listing: Mapping) -> Any:
+        """Return a ``ListingRef`` for ``listing``; rows without an id pass through."""
+        if isinstance(listing, ListingRef):
+            return listing
+        key = listing_key(listing)
+        if key is None:
+            return listing
+        shared: Dict[str, Any] = {}
+        overlay: Dict[str, Any] = {}
+        for k, v in listing.items():
+            if k in _SHARED_FIELDS:
+                shared[k] = v
+            else:
+                overlay[k] = v
+        with self._lock:
+            payload = self._payloads.get(key)
+            # A re-crawl can change a listing's payload; keep the newest copy.
+            if payload is None or payload != shared:
+                payload = _SharedPayload(shared)
+                self._payloads[key] = payload
+        return ListingRef(key, payload, overlay)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._payloads.get(key)
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+
+LISTING_STORE = ListingStore()
+
+
+def to_refs(listings: Iterable[Mapping]) -> List[Any]:
+    return [LISTING_STORE.intern(r) for r in (listings or [])]
+
+
+def resolve_listing(item: Any) -> Dict[str, Any]:
+    if isinstance(item, ListingRef):
+        return item.to_dict()
+    return item
+
+
+def resolve_listings(items: Iterable[Any]) -> List[Dict[str, Any]]:
+    return [resolve_listing(r) for r in (items or [])]
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from copy import deepcopy
+from dataclasses import replace
 from typing import Any, Dict, List, Optional, Tuple
 
+from orchestration.listing_store import to_refs
 from orchestration.state import QuerySnapshot
 from skills.search.constraint_extraction import _normalize_layout_options
 
@@ -44,6 +46,8 @@ def snapshot_from_constraints(
     constraints: Optional[Dict[str, Any]],
     *,
     results: Optional[List[Dict[str, Any]]] = None,
+    result_total: Optional[int] = None,
+    search_cursor: Optional[Dict[str, Any]] = None,
 ) -> QuerySnapshot:
     c = dict(constraints or {})
     snap = empty_snapshot()
@@ -62,7 +66,10 @@ def snapshot_from_constraints(
     # Carry it through so a cache-hit restore doesn't silently reset page size.
     raw_k = c.get("k")
     snap.k = int(raw_k) if raw_k is not None else None
-    snap.results = list(results or [])
+    # Keep refs into the shared listing store rather than full payload copies.
+    snap.results = to_refs(results or [])
+    snap.result_total = result_total
+    snap.search_cursor = search_cursor
     return snap
 
 
@@ -106,7 +113,12 @@ def derive_snapshot(
     if is_reset:
         return empty_snapshot()
 
-    base = deepcopy(old_snapshot) if old_snapshot is not None else empty_snapshot()
+    # Search results belong to the prior snapshot version; start empty until
+    # refreshed (and skip deep-copying them).
+    base = (
+        deepcopy(replace(old_snapshot, results=[], result_total=None, search_cursor=None))
+        if old_snapshot is not None else empty_snapshot()
+    )
     set_fields = dict(set_fields or {})
     clear_set = {str(x).strip() for x in (clear_fields or []) if str(x).strip() in SNAPSHOT_FIELDS}
 
@@ -137,8 +149,6 @@ def derive_snapshot(
         else:
             setattr(base, field, None)
 
-    # Search results belong to the prior snapshot version; clear until refreshed.
-    base.results = []
     return base
 
 
@@ -5,7 +5,9 @@ import copy
 import json
 import logging
 import re
-from typing import Literal
+from typing import Any, Dict, Literal, Tuple
+
+import numpy as np
 
 _logger = logging.getLogger(__name__)
 
@@ -13,10 +15,16 @@ _logger = logging.getLogger(__name__)
 # Futures are stored here (not in LangGraph state) to avoid serialization issues.
 _SPEC_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4)
 _SPEC_CACHE: dict[int, concurrent.futures.Future] = {}
+# Stage A frames kept for a relax step later in the same turn, keyed by
+# GraphState["_turn_key"]. Like the futures, DataFrames stay out of graph
+# state; finalize_node drops the entry, or process_turn if the graph raises.
+_STAGE_A_CACHE: dict[int, tuple] = {}
 
 from core.chatbot_config import GENERAL_SYSTEM
 from core.llm_client import llm_grounded_explain, qwen_chat, render_stage_d_for_user
+from core.settings import DEFAULT_RECALL
 from orchestration.domain_router import domain_route_turn
+from orchestration.listing_store import resolve_listings, to_refs
 from orchestration.merger import derive_snapshot, push_history, snapshot_from_constraints, snapshot_to_constraints
 from orchestration.refinement_plan import build_refinement_plan
 from orchestration.router import route_turn
@@ -27,7 +35,8 @@ from skills.qa.handler import (
     build_qa_context,
     classify_qa_scope,
 )
-from skills.search.agentic import run_search_skill
+from skills.search.agentic import more_search_results, run_search_skill, stage_a_reusable
+from skills.search.area_stats import lookup_area_price_stats
 from skills.search.handler import format_listing_row
 
 from orchestration.state import GraphState
@@ -223,6 +232,58 @@ def route_node(state: GraphState) -> GraphState:
     return state
 
 
+def release_stage_a(state) -> None:
+    """Drop the turn's cached Stage A frame."""
+    _STAGE_A_CACHE.pop(state.get("_turn_key"), None)
+
+
+def _stash_stage_a(state: GraphState, out: dict) -> None:
+    """Keep this search's Stage A frame for a possible relax step in the same turn."""
+    key = state.get("_turn_key")
+    if key is not None and out.get("stage_a_df") is not None:
+        _STAGE_A_CACHE[key] = (dict(out.get("constraints") or {}), out.get("stage_a_df"))
+    else:
+        release_stage_a(state)
+
+
+def _near_miss_loader(state: GraphState, out: dict):
+    """The search's unfiltered Stage B loader, caching the frame it fetches.
+
+    That frame covers the whole recall window without pushed-down
+    constraints, so a budget / furnish / date relax can re-run Stage B/C
+    on it (see ``stage_a_reusable``).
+    """
+    loader = out.get("load_unfiltered_stage_b")
+    key = state.get("_turn_key")
+    if loader is None or key is None:
+        return loader
+    constraints = dict(out.get("constraints") or {})
+
+    def load():
+        stage_a_df, audits = loader()
+        _STAGE_A_CACHE[key] = (constraints, stage_a_df)
+        return stage_a_df, audits
+
+    return load
+
+
+def _set_search_results(agent_state, full_results: list, new_results: list, out: dict) -> None:
+    agent_state.search_full_results = full_results
+    agent_state.page_index = 0
+    agent_state.last_results = new_results
+    agent_state.search_total = out.get("result_total")
+    agent_state.search_cursor = out.get("search_cursor")
+    agent_state.has_more = len(full_results) > len(new_results) or agent_state.search_cursor is not None
+
+
+def _extend_results(agent_state, need: int, runtime) -> None:
+    """Page further down the last ranking until ``need`` results are held or it runs out."""
+    while agent_state.search_cursor is not None and len(agent_state.search_full_results) < need:
+        rows, agent_state.search_cursor = more_search_results(agent_state.search_cursor, runtime)
+        if rows:
+            agent_state.search_full_results = list(agent_state.search_full_results) + to_refs(rows)
+
+
 def search_node(state: GraphState) -> GraphState:
     agent_state = state["agent_state"]
     runtime = state["runtime"]
@@ -230,6 +291,7 @@ def search_node(state: GraphState) -> GraphState:
     prev_full_results = list(agent_state.search_full_results or prev_results)
     prev_page_index = int(agent_state.page_index or 0)
     prev_has_more = bool(agent_state.has_more)
+    prev_total, prev_cursor = agent_state.search_total, agent_state.search_cursor
     prev_focus_id = agent_state.current_focus_listing_id
     prev_focus_payload = agent_state.current_focus_listing_payload
     prev_focus_source = agent_state.focus_source
@@ -240,6 +302,10 @@ def search_node(state: GraphState) -> GraphState:
     relax_override = state.get("relax_override_constraints")
     if relax_override is not None:
         state["relax_override_constraints"] = None  # consume
+        # Relaxing budget/furnish/dates doesn't change Stage A's location filter:
+        # re-run Stage B/C over this turn's candidates instead of querying Qdrant.
+        cached_constraints, cached_df = _STAGE_A_CACHE.pop(state.get("_turn_key"), None) or (None, None)
+        reuse_df = cached_df if stage_a_reusable(cached_df, cached_constraints, relax_override) else None
         try:
             out = run_search_skill(
                 user_text=str(state.get("user_input") or ""),
@@ -247,6 +313,7 @@ def search_node(state: GraphState) -> GraphState:
                 runtime=runtime,
                 override_constraints=relax_override,
                 precomputed_semantic_terms={},
+                stage_a_df=reuse_df,
             )
         except Exception:
             _logger.exception("search_node (relax): run_search_skill failed — rolling back state")
@@ -255,14 +322,18 @@ def search_node(state: GraphState) -> GraphState:
             agent_state.search_full_results = prev_full_results
             agent_state.page_index = prev_page_index
             agent_state.has_more = prev_has_more
+            agent_state.search_total, agent_state.search_cursor = prev_total, prev_cursor
             state["reply_text"] = (
                 "Search failed this turn. I kept your previous results intact. "
                 "Please retry or adjust your query."
             )
             return state
 
+        _stash_stage_a(state, out)
+
         # Write audit data to GraphState regardless of result count.
         state["stage_b_audits"] = list(out.get("stage_b_audits") or [])
+        state["stage_b_unfiltered"] = _near_miss_loader(state, out)
         state["stage_a_prefilter_count"] = int(out.get("stage_a_prefilter_count") or 0)
         state["stage_a_geo_fallback_area"] = out.get("stage_a_geo_fallback_area") or None
 
@@ -272,19 +343,21 @@ def search_node(state: GraphState) -> GraphState:
         if agent_state.original_budget is not None and agent_state.constraints:
             agent_state.constraints["max_rent_pcm"] = agent_state.original_budget
         agent_state.user_profile.update(out.get("profile_patch") or {})
-        full_results = list(out.get("all_ranked_listings") or out.get("listings") or [])
+        full_results = to_refs(out.get("all_ranked_listings") or out.get("listings") or [])
         k = int(((out.get("constraints") or {}).get("k") or 5))
-        new_results = list(full_results[:k])
+        new_results = resolve_listings(full_results[:k])
 
-        committed_snapshot = snapshot_from_constraints(agent_state.constraints, results=full_results)
+        committed_snapshot = snapshot_from_constraints(
+            agent_state.constraints,
+            results=full_results,
+            result_total=out.get("result_total"),
+            search_cursor=out.get("search_cursor"),
+        )
         new_history, _ = push_history(agent_state.snapshot_history or [], committed_snapshot, max_size=5)
         agent_state.snapshot_history = new_history
 
         if new_results:
-            agent_state.search_full_results = full_results
-            agent_state.page_index = 0
-            agent_state.last_results = new_results
-            agent_state.has_more = len(full_results) > len(new_results)
+            _set_search_results(agent_state, full_results, new_results, out)
             _auto_focus_first(agent_state)
             state["last_search_status"] = "success"
         else:
@@ -292,6 +365,7 @@ def search_node(state: GraphState) -> GraphState:
             agent_state.search_full_results = prev_full_results
             agent_state.page_index = prev_page_index
             agent_state.has_more = prev_has_more
+            agent_state.search_total, agent_state.search_cursor = prev_total, prev_cursor
             agent_state.current_focus_listing_id = prev_focus_id
             agent_state.current_focus_listing_payload = prev_focus_payload
             agent_state.focus_source = prev_focus_source
@@ -307,6 +381,7 @@ def search_node(state: GraphState) -> GraphState:
     state["relax_log"] = []
     state["relax_near_miss"] = []
     state["stage_b_audits"] = []
+    state["stage_b_unfiltered"] = None
     state["stage_a_prefilter_count"] = -1
     state["stage_a_geo_fallback_area"] = None
     agent_state.pending_suggestion = None
@@ -399,8 +474,13 @@ def search_node(state: GraphState) -> GraphState:
             agent_state.search_full_results = cached_results
             agent_state.page_index = 0
             k = int((agent_state.constraints or {}).get("k") or 5)
-            agent_state.last_results = list(cached_results[:k])
-            agent_state.has_more = len(cached_results) > len(agent_state.last_results)
+            agent_state.last_results = resolve_listings(cached_results[:k])
+            # The snapshot keeps its ranking's cursor, so "show more" pages on
+            # past the cached rows.
+            agent_state.search_total, agent_state.search_cursor = matched.result_total, matched.search_cursor
+            agent_state.has_more = (
+                len(cached_results) > len(agent_state.last_results) or agent_state.search_cursor is not None
+            )
             _auto_focus_first(agent_state)
             state["last_search_status"] = "cache_hit"
             lines = [f"Reused cached results ({len(cached_results)} listings).", "", f"Top {len(agent_state.last_results)} results:"]
@@ -414,6 +494,7 @@ def search_node(state: GraphState) -> GraphState:
             agent_state.search_full_results = []
             agent_state.page_index = 0
             agent_state.has_more = False
+            agent_state.search_total, agent_state.search_cursor = None, None
             agent_state.current_focus_listing_id = None
             agent_state.current_focus_listing_payload = None
             agent_state.focus_source = None
@@ -449,38 +530,41 @@ def search_node(state: GraphState) -> GraphState:
         agent_state.search_full_results = prev_full_results
         agent_state.page_index = prev_page_index
         agent_state.has_more = prev_has_more
+        agent_state.search_total, agent_state.search_cursor = prev_total, prev_cursor
         state["reply_text"] = (
             "Search failed this turn. I kept your previous results intact. "
             "Please retry or adjust your query."
         )
         return state
 
+    _stash_stage_a(state, out)
+
     # Write audit data to GraphState for evaluate_node.
     state["stage_b_audits"] = list(out.get("stage_b_audits") or [])
+    state["stage_b_unfiltered"] = _near_miss_loader(state, out)
     state["stage_a_prefilter_count"] = int(out.get("stage_a_prefilter_count") or 0)
     state["stage_a_geo_fallback_area"] = out.get("stage_a_geo_fallback_area") or None
 
     agent_state.constraints = out.get("constraints")
     agent_state.user_profile.update(out.get("profile_patch") or {})
-    full_results = list(out.get("all_ranked_listings") or [])
-    if not full_results:
-        full_results = list(out.get("listings") or [])
+    # Session state keeps refs into the shared listing store; only the visible
+    # page is materialised as full dicts.
+    full_results = to_refs(out.get("all_ranked_listings") or out.get("listings") or [])
     k = int(((out.get("constraints") or {}).get("k") or 5))
-    new_results = list(full_results[:k])
+    new_results = resolve_listings(full_results[:k])
     bot_text = out.get("reply_text") or "No result."
 
     committed_snapshot = snapshot_from_constraints(
         agent_state.constraints,
         results=full_results,
+        result_total=out.get("result_total"),
+        search_cursor=out.get("search_cursor"),
     )
     new_history, _ = push_history(agent_state.snapshot_history or [], committed_snapshot, max_size=5)
     agent_state.snapshot_history = new_history
 
     if new_results:
-        agent_state.search_full_results = full_results
-        agent_state.page_index = 0
-        agent_state.last_results = new_results
-        agent_state.has_more = len(full_results) > len(new_results)
+        _set_search_results(agent_state, full_results, new_results, out)
         _auto_focus_first(agent_state)
         state["last_search_status"] = "success"
     else:
@@ -489,6 +573,7 @@ def search_node(state: GraphState) -> GraphState:
         agent_state.search_full_results = prev_full_results
         agent_state.page_index = prev_page_index
         agent_state.has_more = prev_has_more
+        agent_state.search_total, agent_state.search_cursor = prev_total, prev_cursor
         agent_state.current_focus_listing_id = prev_focus_id
         agent_state.current_focus_listing_payload = prev_focus_payload
         agent_state.focus_source = prev_focus_source
@@ -514,40 +599,48 @@ def search_node(state: GraphState) -> GraphState:
     return state
 
 
-def paginate_node(state: GraphState) -> GraphState:
-    agent_state = state["agent_state"]
-    action = str(state.get("page_action") or "next").strip().lower()
+def turn_page(agent_state, action: str, runtime=None) -> Tuple[str, Dict[str, Any]]:
+    """Move ``agent_state`` one page through ``search_full_results``.
+
+    Returns (reply_text, info). Shared by ``paginate_node`` and the backend's
+    direct pagination endpoint, which skips the graph entirely. With a search
+    ``runtime`` a page past the held results is fetched from
+    ``search_cursor``.
+    """
+    action = str(action or "next").strip().lower()
     if action not in {"next", "prev"}:
         action = "next"
-    full = list(agent_state.search_full_results or [])
+    full = agent_state.search_full_results
     if not full:
         full = list(agent_state.last_results or [])
         agent_state.search_full_results = list(full)
 
     if not full:
-        state["reply_text"] = "I don't have active listings yet. Tell me your budget/location/layout first, and I'll search."
-        return state
+        return "I don't have active listings yet. Tell me your budget/location/layout first, and I'll search.", {"moved": False}
 
     k = int(((agent_state.constraints or {}).get("k") or 5))
     cur_page = int(agent_state.page_index or 0)
     target_page = cur_page + 1 if action == "next" else cur_page - 1
     start = target_page * k
     end = start + k
+    if action == "next" and agent_state.search_cursor is not None and runtime is not None:
+        # One page past the target, so has_more below is exact.
+        _extend_results(agent_state, end + 1, runtime)
+        full = agent_state.search_full_results
+    info: Dict[str, Any] = {"moved": False, "action": action, "page_index_old": cur_page, "k": k, "total": agent_state.result_total()}
     if action == "next" and start >= len(full):
         agent_state.has_more = False
-        state["reply_text"] = "This is already the last page."
-        return state
+        return "This is already the last page.", info
     if action == "prev" and target_page < 0:
-        state["reply_text"] = "This is already the first page."
-        return state
+        return "This is already the first page.", info
 
-    page_rows = list(full[start:end])
+    page_rows = resolve_listings(full[start:end])
     agent_state.page_index = target_page
     agent_state.last_results = page_rows
-    agent_state.has_more = end < len(full)
+    agent_state.has_more = end < len(full) or agent_state.search_cursor is not None
     _auto_focus_first(agent_state)
 
-    lines = [f"Page {target_page + 1} results ({start + 1}-{min(end, len(full))} of {len(full)}):"]
+    lines = [f"Page {target_page + 1} results ({start + 1}-{min(end, len(full))} of {agent_state.result_total()}):"]
     for i, row in enumerate(page_rows, start=1):
         lines.append(format_listing_row(row, i, view_mode="summary"))
     if agent_state.current_focus_listing_payload:
@@ -561,22 +654,21 @@ def paginate_node(state: GraphState) -> GraphState:
             f"Note: default focus is set to listing #1 ({focus_title}). "
             "Say 'tell me about listing 2' to switch focus, or ask 'which one has ...' to compare all listings."
         )
+    info.update({
+        "moved": True,
+        "page_index_new": target_page,
+        "slice_start": start,
+        "slice_end": min(end, len(full)),
+        "has_more": agent_state.has_more,
+    })
+    return "\n".join(lines), info
 
-    _debug_print(
-        bool(state.get("router_debug")),
-        {
-            "phase": "paginate",
-            "action": action,
-            "page_index_old": cur_page,
-            "page_index_new": target_page,
-            "slice_start": start,
-            "slice_end": min(end, len(full)),
-            "total": len(full),
-            "k": k,
-            "has_more": agent_state.has_more,
-        },
-    )
-    state["reply_text"] = "\n".join(lines)
+
+def paginate_node(state: GraphState) -> GraphState:
+    reply, info = turn_page(state["agent_state"], str(state.get("page_action") or "next"), state.get("runtime"))
+    if info.get("moved"):
+        _debug_print(bool(state.get("router_debug")), {"phase": "paginate", **info})
+    state["reply_text"] = reply
     return state
 
 
@@ -702,8 +794,8 @@ def _try_answer_commute_question(user_in: str, agent_state) -> Optional[str]:
         return f"I couldn't find \"{dest_name}\" on the map. Could you be more specific?"
 
     # Call TfL Journey API
-    from backend.api_server import _fetch_commute_time
-    result = _fetch_commute_time(float(from_lat), float(from_lon), float(geocoded["lat"]), float(geocoded["lon"]))
+    from backend.commute_cache import COMMUTE_CACHE
+    result = COMMUTE_CACHE.lookup(float(from_lat), float(from_lon), float(geocoded["lat"]), float(geocoded["lon"]))
 
     listing_title = focus.get("title", "this listing")
 
@@ -848,6 +940,7 @@ def apply_suggestion_node(state: GraphState) -> GraphState:
     state["relax_log"] = []
     state["relax_near_miss"] = []
     state["stage_b_audits"] = []
+    state["stage_b_unfiltered"] = None
     state["stage_a_prefilter_count"] = -1
     state["stage_a_geo_fallback_area"] = None
     return state
@@ -1266,46 +1359,52 @@ def _format_areas(areas: list) -> str:
     return ", ".join(areas[:-1]) + f" and {areas[-1]}"
 
 
-def _run_area_compare(areas: list, base_constraints: dict, user_in: str, runtime) -> str:
-    """Per-area Qdrant search → aggregate price stats → markdown table + LLM verdict."""
-    import statistics as _stats
+def _area_price_stats(area: str, base_constraints: dict, runtime) -> dict:
+    """Price stats for one area: precomputed cube first, else aggregate-only search.
 
-    area_data = []
-    for area in areas:
-        area_constraints = {**base_constraints, "location_keywords": [area]}
-        try:
-            out = run_search_skill(
-                user_text="",
-                state_constraints={},
-                runtime=runtime,
-                override_constraints=area_constraints,
-                precomputed_semantic_terms={},
-            )
-            all_listings = list(out.get("all_ranked_listings") or out.get("listings") or [])
-            prices = [
-                float(r["price_pcm"])
-                for r in all_listings
-                if r.get("price_pcm") is not None
-            ]
-        except Exception:
-            _logger.exception("area_compare: search failed for area=%s", area)
-            all_listings = []
-            prices = []
-
-        if prices:
-            min_p = min(prices)
-            max_p = max(prices)
-            med_p = _stats.median(prices)
-        else:
-            min_p = max_p = med_p = None
+    Both count by Stage B's rules (see skills.search.area_stats), but the
+    live search only counts what Stage A's recall returns; ``source`` and
+    ``truncated`` say which the row's figures are.
+    """
+    area_constraints = {**base_constraints, "location_keywords": [area]}
+    cached = lookup_area_price_stats(area, area_constraints)
+    if cached is not None:
+        return cached
+    try:
+        out = run_search_skill(
+            user_text="",
+            state_constraints={},
+            runtime=runtime,
+            override_constraints=area_constraints,
+            precomputed_semantic_terms={},
+            aggregate_only=True,
+        )
+        count = int(out.get("count") or 0)
+        prices = np.asarray(out.get("prices") or [], dtype=float)
+        truncated = int(out.get("stage_a_prefilter_count") or 0) > DEFAULT_RECALL
+    except Exception:
+        _logger.exception("area_compare: search failed for area=%s", area)
+        count = 0
+        prices = np.empty(0, dtype=float)
+        truncated = False
+
+    if prices.size:
+        min_p = float(prices.min())
+        max_p = float(prices.max())
+        med_p = float(np.median(prices))
+    else:
+        min_p = max_p = med_p = None
+    return {
+        "area": area, "count": count, "min": min_p, "median": med_p, "max": max_p,
+        "source": "live", "truncated": truncated,
+    }
 
-        area_data.append({
-            "area": area,
-            "count": len(all_listings),
-            "min": min_p,
-            "median": med_p,
-            "max": max_p,
-        })
+
+def _run_area_compare(areas: list, base_constraints: dict, user_in: str, runtime) -> str:
+    """Concurrent per-area Qdrant search → aggregate price stats → markdown table + LLM verdict."""
+    # Areas are independent — fan out so N areas cost about one search's latency.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(len(areas), 6))) as pool:
+        area_data = list(pool.map(lambda a: _area_price_stats(a, base_constraints, runtime), areas))
 
     def _fp(v):
         return f"£{int(v):,}" if v is not None else "—"
@@ -1313,7 +1412,13 @@ def _run_area_compare(areas: list, base_constraints: dict, user_in: str, runtime
     def _row_md(cells):
         return "| " + " | ".join(str(c) for c in cells) + " |"
 
-    headers = ["Area", "Listings", "Min/mo", "Median/mo", "Max/mo"]
+    def _source(d):
+        # The cube counts every indexed listing; a live search only its recall window.
+        if d.get("source") == "cube":
+            return "area stats"
+        return f"live search, top {DEFAULT_RECALL:,}" if d.get("truncated") else "live search"
+
+    headers = ["Area", "Listings", "Min/mo", "Median/mo", "Max/mo", "Source"]
     sep = "| " + " | ".join(["---"] * len(headers)) + " |"
     rows_md = [
         _row_md([
@@ -1322,6 +1427,7 @@ def _run_area_compare(areas: list, base_constraints: dict, user_in: str, runtime
             _fp(d["min"]),
             _fp(d["median"]),
             _fp(d["max"]),
+            _source(d),
         ])
         for d in area_data
     ]
@@ -1514,6 +1620,9 @@ def shortlist_node(state: GraphState) -> GraphState:
 
 
 def finalize_node(state: GraphState) -> GraphState:
+    # The relax loop is over; drop this turn's Stage A frame and near-miss loader.
+    release_stage_a(state)
+    state["stage_b_unfiltered"] = None
     state["attempt_count"] = int(state.get("attempt_count") or 0) + 1
     agent_state = state["agent_state"]
     user_in = str(state.get("user_input") or "")
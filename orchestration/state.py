@@ -1,7 +1,8 @@
 import hashlib
+import itertools
 import json
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple, TypedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict
 
 
 @dataclass
@@ -24,6 +25,10 @@ class QuerySnapshot:
 
     # Cached search output for this snapshot.
     results: List[Dict[str, Any]] = field(default_factory=list)
+    # Estimated total and "show more" cursor of the ranking behind results,
+    # so a cache hit pages on past them (see AgentState.search_cursor).
+    result_total: Optional[int] = None
+    search_cursor: Optional[Dict[str, Any]] = field(default=None, repr=False)
 
     @staticmethod
     def _norm_num(v: Any) -> Any:
@@ -73,9 +78,15 @@ class AgentState:
     focus_source: Optional[str] = None  # auto | user_command | user_query
     last_qa_scope: Optional[str] = None  # single | list | clarify
     last_results: List[Dict[str, Any]] = field(default_factory=list)
-    search_full_results: List[Dict[str, Any]] = field(default_factory=list)
+    search_full_results: List[Dict[str, Any]] = field(default_factory=list)  # ListingRef views (orchestration.listing_store)
     page_index: int = 0
     has_more: bool = False
+    # Adaptive recall ranks only the first pages' worth of matches. search_total
+    # estimates all matches; search_cursor is where the ranking continues
+    # (plain data for skills.search.agentic.more_search_results) and is None
+    # once the ranking is exhausted.
+    search_total: Optional[int] = None
+    search_cursor: Optional[Dict[str, Any]] = field(default=None, repr=False)
     snapshot_history: List[QuerySnapshot] = field(default_factory=list)
     original_budget: Optional[int] = None  # user's stated max_rent_pcm before any auto-relax
     last_intent: Optional[str] = None  # intent from most recent turn (set by process_turn)
@@ -88,6 +99,13 @@ class AgentState:
     shortlist: List[Dict[str, Any]] = field(default_factory=list)  # user-saved listings
     last_compare_source: Optional[str] = None  # "shortlist" | "results" — set by compare_node
 
+    def result_total(self) -> int:
+        """Matches for the last search: exact once the ranking is exhausted, else estimated."""
+        held = len(self.search_full_results or [])
+        if self.search_cursor is None or self.search_total is None:
+            return held
+        return max(held, int(self.search_total))
+
 
 class GraphState(TypedDict, total=False):
     # ── Input ────────────────────────────────────────────────────────────────
@@ -115,6 +133,7 @@ class GraphState(TypedDict, total=False):
 
     # ── Speculative parallel execution ────────────────────────────────────────
     _spec_key: Optional[int]         # key into nodes._SPEC_CACHE for parallel refinement_plan
+    _turn_key: int                   # unique per turn; key into nodes._STAGE_A_CACHE
 
     # ── Turn output ──────────────────────────────────────────────────────────
     reply_text: str
@@ -147,6 +166,10 @@ class GraphState(TypedDict, total=False):
     stage_a_prefilter_count: int            # 0 = location miss
     stage_a_geo_fallback_area: Optional[str]  # area name used for geo-radius fallback, or None
     relax_near_miss: List[Dict[str, Any]]   # listings that failed exactly 1 constraint
+    stage_b_unfiltered: Optional[Callable[[], Tuple[Any, List[Dict[str, Any]]]]]  # near-miss loader (evaluate_node)
+
+
+_TURN_KEYS = itertools.count(1)
 
 
 def make_graph_state(user_input: str, *, agent_state: Any, runtime: Any, router_debug: bool = False, route_hint: Optional[Dict[str, Any]] = None) -> GraphState:
@@ -169,6 +192,8 @@ def make_graph_state(user_input: str, *, agent_state: Any, runtime: Any, router_
         shortlist_action=None,
         refinement_type=None,
         page_action=None,
+        # Key for this turn's entries in process-level caches
+        _turn_key=next(_TURN_KEYS),
         # Turn output defaults
         reply_text="",
         error=None,
@@ -196,4 +221,5 @@ def make_graph_state(user_input: str, *, agent_state: Any, runtime: Any, router_
         stage_a_prefilter_count=-1,
         stage_a_geo_fallback_area=None,
         relax_near_miss=[],
+        stage_b_unfiltered=None,
     )
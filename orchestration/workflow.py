@@ -8,6 +8,8 @@ from typing import Optional
 _logger = logging.getLogger(__name__)
 
 from orchestration.graph import build_graph
+from orchestration.listing_store import resolve_listings
+from orchestration.nodes import release_stage_a
 from orchestration.state import make_graph_state
 from orchestration.router import route_turn
 from orchestration.state import AgentState
@@ -105,7 +107,7 @@ def _legacy_process_turn(user_in: str, state: AgentState, runtime, router_debug:
             elif action == "prev" and target_page < 0:
                 bot_text = "This is already the first page."
             else:
-                page_rows = list(full[start:end])
+                page_rows = resolve_listings(full[start:end])
                 state.page_index = target_page
                 state.last_results = page_rows
                 state.search_full_results = full
@@ -198,7 +200,10 @@ def process_turn(user_in: str, state: AgentState, runtime, router_debug: bool =
         router_debug=router_debug,
         route_hint=route_hint,
     )
-    out = _GRAPH_RUNNER.invoke(graph_state)
+    try:
+        out = _GRAPH_RUNNER.invoke(graph_state)
+    finally:
+        release_stage_a(graph_state)
     state.last_intent = str((out or {}).get("intent") or "")
     return str((out or {}).get("reply_text") or "")
 
@@ -71,7 +71,7 @@ def append_structured_training_samples(
             "target_value": item.get("final_value"),
             "target_constraints": audit.get("final_constraints", {}),
         }
-        append_jsonl(STRUCTURED_TRAINING_LOG_PATH, rec, "structured training samples")
+        append_jsonl(STRUCTURED_TRAINING_LOG_PATH, rec, "structured training samples", sheddable=False)
 
 
 def emit_structured_audit_logs(
@@ -0,0 +1,283 @@
+"""Per-listing QA chunk index.
+
+QA evidence retrieval works over the same static chunks for a listing on
+every question (stations, schools, features, description sentences). This
+module builds them once per listing:
+
+  - chunk list (field + text), nearest-station chunk included
+  - token postings (per-chunk term frequencies, lengths)
+  - L2-normalised chunk embeddings
+
+``crawler/sync_qdrant.py`` writes the embeddings to a sidecar directory:
+``vectors.npy`` (loaded with ``mmap_mode="r"``), ``chunks.jsonl`` (one
+line of chunks per listing, mmapped and read per listing) and
+``meta.json`` (model + per-listing vector rows and line offsets). The
+sidecar is reloaded when ``meta.json`` changes. Listings missing from the
+sidecar are indexed on first use and kept in a bounded per-process LRU,
+so follow-up questions about the same listing only embed the query.
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.internal_helpers import _collect_value_candidates, _embed_texts_cached
+from core.settings import EMBED_MODEL, QA_CHUNK_INDEX_DIR, QA_CHUNK_INDEX_LRU_SIZE
+
+_VECTORS_FILE = "vectors.npy"
+_META_FILE = "meta.json"
+_CHUNKS_FILE = "chunks.jsonl"
+
+
+def tokenize(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", str(text or "").lower())
+
+
+def build_listing_chunks(distilled: Dict[str, Any]) -> List[Dict[str, str]]:
+    """All retrievable chunks for one listing, nearest station first."""
+    chunks = list(_collect_value_candidates(distilled))
+    ns = str(distilled.get("nearest_station") or "").strip()
+    if ns:
+        dist = distilled.get("distance_to_station_m")
+        text = f"{ns} ({dist}m away)" if dist is not None else ns
+        if text not in {c["text"] for c in chunks}:
+            chunks.insert(0, {"field": "nearest_station", "text": text})
+    return chunks
+
+
+@dataclass
+class ListingChunkIndex:
+    chunks: List[Dict[str, str]]
+    term_freqs: List[Dict[str, int]] = field(default_factory=list)
+    lengths: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    vectors: Optional[np.ndarray] = None  # (n_chunks, dim), L2-normalised
+
+    @classmethod
+    def from_chunks(cls, chunks: List[Dict[str, str]], vectors: Optional[np.ndarray] = None) -> "ListingChunkIndex":
+        term_freqs: List[Dict[str, int]] = []
+        lengths = np.zeros(len(chunks), dtype=np.float32)
+        for i, c in enumerate(chunks):
+            tf: Dict[str, int] = {}
+            toks = tokenize(c["text"])
+            for t in toks:
+                tf[t] = tf.get(t, 0) + 1
+            term_freqs.append(tf)
+            lengths[i] = len(toks)
+        return cls(chunks=chunks, term_freqs=term_freqs, lengths=lengths, vectors=vectors)
+
+    def rows_for_fields(self, allowed: Iterable[str]) -> np.ndarray:
+        allowed = set(allowed)
+        return np.array([i for i, c in enumerate(self.chunks) if c.get("field") in allowed], dtype=np.int64)
+
+    def ensure_vectors(self, embedder) -> Optional[np.ndarray]:
+        ensure_vectors_batch([self], embedder)
+        return self.vectors
+
+    def bm25(self, query_terms: List[str], rows: np.ndarray, k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+        """BM25 of ``rows`` (a sub-corpus, e.g. one category) against the query terms."""
+        n = len(rows)
+        scores = np.zeros(n, dtype=np.float64)
+        terms = list(dict.fromkeys(t for t in query_terms if t))
+        if n == 0 or not terms:
+            return scores
+        lengths = self.lengths[rows]
+        avg_len = float(lengths.mean()) or 1.0
+        norm = k1 * (1 - b + b * lengths / avg_len)
+        for term in terms:
+            tf = np.array([self.term_freqs[r].get(term, 0) for r in rows], dtype=np.float64)
+            df = int(np.count_nonzero(tf))
+            if df == 0:
+                continue
+            idf = np.log((n - df + 0.5) / (df + 0.5) + 1)
+            scores += idf * (tf * (k1 + 1)) / (tf + norm)
+        return scores
+
+
+def ensure_vectors_batch(indexes: Iterable[ListingChunkIndex], embedder) -> None:
+    """Embed chunks of every index still missing vectors in one embedder call."""
+    pending = [idx for idx in indexes if idx.vectors is None and idx.chunks]
+    if not pending or embedder is None:
+        return
+    cache: Dict[str, np.ndarray] = {}
+    _embed_texts_cached(embedder, list({c["text"] for idx in pending for c in idx.chunks}), cache)
+    for idx in pending:
+        idx.vectors = np.vstack([cache[c["text"]] for c in idx.chunks]).astype(np.float32)
+
+
+# ---------------------------------------------------------------------------
+# Sidecar (sync time) + lookup
+# ---------------------------------------------------------------------------
+
+_SIDECAR: Optional[Dict[str, Any]] = None
+_SIDECAR_LOCK = threading.Lock()
+_LRU: "OrderedDict[str, ListingChunkIndex]" = OrderedDict()
+_LRU_LOCK = threading.Lock()
+
+
+def _meta_mtime(index_dir: str) -> Optional[int]:
+    try:
+        return os.stat(os.path.join(index_dir, _META_FILE)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_sidecar(index_dir: str) -> Dict[str, Any]:
+    sidecar: Dict[str, Any] = {"mtime": _meta_mtime(index_dir), "listings": {}, "chunks": None, "vectors": None}
+    if sidecar["mtime"] is None:
+        return sidecar
+    chunks_path = os.path.join(index_dir, _CHUNKS_FILE)
+    vec_path = os.path.join(index_dir, _VECTORS_FILE)
+    try:
+        with open(os.path.join(index_dir, _META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if os.path.exists(chunks_path) and os.path.getsize(chunks_path) > 0:
+            with open(chunks_path, "rb") as f:
+                sidecar["chunks"] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            sidecar["listings"] = meta.get("listings") or {}
+        # Vectors from a different embedding model are not comparable to query vectors.
+        if meta.get("model") == EMBED_MODEL and os.path.exists(vec_path):
+            sidecar["vectors"] = np.load(vec_path, mmap_mode="r")
+    except Exception:
+        pass
+    return sidecar
+
+
+def _load_sidecar() -> Dict[str, Any]:
+    """Sidecar of QA_CHUNK_INDEX_DIR, reloaded (LRU dropped) when meta.json changes."""
+    global _SIDECAR
+    mtime = _meta_mtime(QA_CHUNK_INDEX_DIR)
+    sidecar = _SIDECAR
+    if sidecar is not None and sidecar["mtime"] == mtime:
+        return sidecar
+    with _SIDECAR_LOCK:
+        if _SIDECAR is None or _SIDECAR["mtime"] != mtime:
+            _SIDECAR = _read_sidecar(QA_CHUNK_INDEX_DIR)
+            with _LRU_LOCK:
+                _LRU.clear()
+        return _SIDECAR
+
+
+def _sidecar_chunks(sidecar: Dict[str, Any], span: List[int]) -> List[Dict[str, str]]:
+    """One listing's chunks, read from its line of chunks.jsonl."""
+    offset, length = span[2], span[3]
+    return [{"field": f, "text": t} for f, t in json.loads(sidecar["chunks"][offset:offset + length])]
+
+
+def _write_sidecar(index_dir: str, chunks_by_listing: Dict[str, List[Dict[str, str]]], vectors: np.ndarray) -> None:
+    """Write vectors.npy, chunks.jsonl and meta.json (last, as the version readers watch).
+
+    Each file is replaced atomically, so a reader that still maps the old
+    files keeps a consistent view until it reloads.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    listings: Dict[str, List[int]] = {}
+    row = offset = 0
+    tmp_chunks = os.path.join(index_dir, _CHUNKS_FILE + ".tmp")
+    with open(tmp_chunks, "wb") as f:
+        for lid, chunks in chunks_by_listing.items():
+            line = json.dumps([[c["field"], c["text"]] for c in chunks], ensure_ascii=False).encode("utf-8") + b"\n"
+            f.write(line)
+            # [first vector row, end row, byte offset, byte length]
+            listings[lid] = [row, row + len(chunks), offset, len(line)]
+            row += len(chunks)
+            offset += len(line)
+    tmp_vectors = os.path.join(index_dir, "vectors.tmp.npy")
+    np.save(tmp_vectors, vectors)
+    tmp_meta = os.path.join(index_dir, _META_FILE + ".tmp")
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(
+            {"model": EMBED_MODEL, "dim": int(vectors.shape[1]), "listings": listings},
+            f,
+            separators=(",", ":"),
+        )
+    os.replace(tmp_vectors, os.path.join(index_dir, _VECTORS_FILE))
+    os.replace(tmp_chunks, os.path.join(index_dir, _CHUNKS_FILE))
+    os.replace(tmp_meta, os.path.join(index_dir, _META_FILE))
+
+
+def rebuild_qa_chunk_index(
+    payloads: Iterable[Dict[str, Any]],
+    embedder,
+    index_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Chunk + embed every listing and write the sidecar.
+
+    Vectors from the previous sidecar are reused for unchanged chunk texts,
+    so an incremental sync only embeds new or edited listings. Call this
+    after sync_qdrant.py updates the collection.
+    """
+    # Local import: skills.qa.handler imports this module.
+    from skills.qa.handler import _distill_listing_payload
+
+    index_dir = index_dir or QA_CHUNK_INDEX_DIR
+    previous = _read_sidecar(index_dir)
+    prev_rows: Dict[str, int] = {}
+    if previous.get("vectors") is not None:
+        for span in previous["listings"].values():
+            for i, c in enumerate(_sidecar_chunks(previous, span)):
+                prev_rows.setdefault(c["text"], span[0] + i)
+
+    chunks_by_listing: Dict[str, List[Dict[str, str]]] = {}
+    for p in payloads:
+        lid = str(p.get("listing_id") or "").strip()
+        if lid:
+            chunks_by_listing[lid] = build_listing_chunks(_distill_listing_payload(p))
+    texts = [c["text"] for chunks in chunks_by_listing.values() for c in chunks]
+
+    dim = int(previous["vectors"].shape[1]) if previous.get("vectors") is not None else 0
+    missing = sorted({t for t in texts if t not in prev_rows})
+    fresh: Dict[str, np.ndarray] = {}
+    if missing:
+        fresh = dict(zip(missing, _embed_texts_cached(embedder, missing, {})))
+        dim = len(next(iter(fresh.values())))
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, t in enumerate(texts):
+        vectors[i] = fresh[t] if t in fresh else previous["vectors"][prev_rows[t]]
+
+    _write_sidecar(index_dir, chunks_by_listing, vectors)
+    print(
+        f"[qa_chunk_index] Saved {len(texts)} chunks for {len(chunks_by_listing)} listings "
+        f"({len(missing)} newly embedded) to {index_dir}"
+    )
+    global _SIDECAR
+    _SIDECAR = None
+    with _LRU_LOCK:
+        _LRU.clear()
+    return {"listings": len(chunks_by_listing), "chunks": len(texts), "embedded": len(missing)}
+
+
+def get_listing_index(distilled: Dict[str, Any]) -> ListingChunkIndex:
+    """Chunk index for one listing: LRU → sidecar → build on the fly."""
+    lid = str(distilled.get("listing_id") or distilled.get("url") or "").strip()
+    # First, so a rewritten sidecar drops the LRU before it is consulted.
+    sidecar = _load_sidecar()
+    if lid:
+        with _LRU_LOCK:
+            hit = _LRU.get(lid)
+            if hit is not None:
+                _LRU.move_to_end(lid)
+                return hit
+
+    idx: Optional[ListingChunkIndex] = None
+    span = sidecar["listings"].get(lid) if lid else None
+    if span:
+        start, end = span[0], span[1]
+        chunks = _sidecar_chunks(sidecar, span)
+        vecs = sidecar["vectors"]
+        idx = ListingChunkIndex.from_chunks(chunks, None if vecs is None else np.asarray(vecs[start:end]))
+    if idx is None:
+        idx = ListingChunkIndex.from_chunks(build_listing_chunks(distilled))
+
+    if lid:
+        with _LRU_LOCK:
+            _LRU[lid] = idx
+            while len(_LRU) > QA_CHUNK_INDEX_LRU_SIZE:
+                _LRU.popitem(last=False)
+    return idx
@@ -1,13 +1,15 @@
 import json
-import math
 import re
 from typing import Any, Dict, List, Optional
 
 import numpy as np
 
 from core.llm_client import qwen_chat
-from core.internal_helpers import _collect_value_candidates, _embed_texts_cached
+from core.settings import QA_BATCH_MAX_CHUNKS
+from core.internal_helpers import _embed_texts_cached
+from skills.qa.chunk_index import ListingChunkIndex, ensure_vectors_batch, get_listing_index
 from skills.qa.plan import build_qa_plan
+from skills.qa.structured import compose_structured_answer, detect_structured_topics, record_qa_turn
 from skills.search.extractors import _norm_furnish_value
 from skills.search.signals import split_query_signals
 
@@ -166,146 +168,154 @@ def _build_qa_signals(question: str) -> Dict[str, Any]:
     return build_qa_context(question)
 
 
-# ── BM25 retrieval ────────────────────────────────────────────────────────────
-
-def _tokenize_bm25(text: str) -> List[str]:
-    return re.findall(r"[a-z0-9]+", str(text or "").lower())
-
-
-def _bm25_scores(query_terms: List[str], texts: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
-    if not texts or not query_terms:
-        return [0.0] * len(texts)
-    tokenized = [_tokenize_bm25(t) for t in texts]
-    N = len(tokenized)
-    avg_len = sum(len(t) for t in tokenized) / N
-    scores = []
-    for tokens in tokenized:
-        doc_len = len(tokens)
-        score = 0.0
-        for term in set(query_terms):
-            tf = tokens.count(term)
-            if tf == 0:
-                continue
-            df = sum(1 for t in tokenized if term in t)
-            idf = math.log((N - df + 0.5) / (df + 0.5) + 1)
-            tf_norm = (tf * (k1 + 1)) / (tf + k1 * (1 - b + b * doc_len / (avg_len or 1)))
-            score += idf * tf_norm
-        scores.append(score)
-    return scores
-
-
-# ── Embedding retrieval ───────────────────────────────────────────────────────
-
-def _embedding_scores(query: str, texts: List[str], embedder) -> List[float]:
-    if not embedder or not texts or not (query or "").strip():
-        return [0.0] * len(texts)
-    cache: Dict[str, np.ndarray] = {}
-    vecs = _embed_texts_cached(embedder, [query] + texts, cache)
-    q_vec = vecs[0]
-    return [float(max(0.0, min(1.0, float(np.dot(q_vec, tv))))) for tv in vecs[1:]]
-
-
 # ── Chunk extraction per category ─────────────────────────────────────────────
 
 # Maps each need category to the listing fields that are relevant.
 _CATEGORY_FIELDS: Dict[str, set] = {
     "school":      {"schools", "description"},
-    "transit":     {"stations", "description"},
+    "transit":     {"nearest_station", "stations", "description"},
     "amenity":     {"features", "description"},
-    "general":     {"features", "description", "schools", "stations"},
+    "general":     {"nearest_station", "features", "description", "schools", "stations"},
 }
 
 
-def _get_category_chunks(distilled: Dict[str, Any], category: str) -> List[Dict[str, str]]:
-    allowed = _CATEGORY_FIELDS.get(category, _CATEGORY_FIELDS["general"])
-    chunks = [c for c in _collect_value_candidates(distilled) if c.get("field") in allowed]
-    # Prepend nearest_station as a synthetic transit chunk when relevant.
-    if category in ("transit", "general"):
-        ns = str(distilled.get("nearest_station") or "").strip()
-        dist = distilled.get("distance_to_station_m")
-        if ns:
-            text = f"{ns} ({dist}m away)" if dist is not None else ns
-            if text not in {c["text"] for c in chunks}:
-                chunks.insert(0, {"field": "nearest_station", "text": text})
-    return chunks
+def _embed_query(query: str, embedder, cache: Dict[str, np.ndarray]) -> Optional[np.ndarray]:
+    if not embedder or not (query or "").strip():
+        return None
+    return _embed_texts_cached(embedder, [query], cache)[0]
 
 
 # ── Hybrid BM25 + embedding retrieval ────────────────────────────────────────
 
-def _hybrid_retrieve(
+def _cap_rows(
+    query_terms: List[str],
+    parts: List[tuple],
+    max_chunks: int,
+) -> List[tuple]:
+    """Trim each listing's rows to an equal share of ``max_chunks``, keeping
+    the best BM25 rows (ties keep chunk order, so station/feature chunks win
+    over description sentences)."""
+    total = sum(len(rows) for _, rows in parts)
+    if max_chunks <= 0 or total <= max_chunks:
+        return parts
+    quota = max(1, max_chunks // max(1, len(parts)))
+    capped = []
+    for index, rows in parts:
+        if len(rows) > quota:
+            keep = np.argsort(-index.bm25(query_terms, rows), kind="stable")[:quota]
+            rows = rows[np.sort(keep)]
+        capped.append((index, rows))
+    return capped
+
+
+def _hybrid_retrieve_batch(
     query_terms: List[str],
-    chunks: List[Dict[str, str]],
+    indexes: List[ListingChunkIndex],
+    category: str,
     embedder,
     top_k: int = 4,
-) -> List[Dict[str, Any]]:
-    if not chunks:
-        return []
-    texts = [c["text"] for c in chunks]
-
-    bm25 = _bm25_scores(query_terms, texts)
-    bm25_max = max(bm25) if any(s > 0 for s in bm25) else 1.0
-    bm25_norm = [s / (bm25_max + 1e-8) for s in bm25]
-
-    query_str = " ".join(query_terms)
-    emb = _embedding_scores(query_str, texts, embedder)
-
-    seen: set = set()
-    results: List[Dict[str, Any]] = []
-    for i, chunk in enumerate(chunks):
-        text = chunk["text"]
-        if text in seen:
+    query_cache: Optional[Dict[str, np.ndarray]] = None,
+    max_chunks: int = 0,
+) -> List[List[Dict[str, Any]]]:
+    """Top evidence per listing for one category.
+
+    BM25 stays per listing (its IDF is relative to the listing's own
+    chunks); the embedding side embeds the query once and scores the union
+    of all listings' category chunks with a single matrix product.
+    """
+    allowed = _CATEGORY_FIELDS.get(category, _CATEGORY_FIELDS["general"])
+    parts = _cap_rows(query_terms, [(idx, idx.rows_for_fields(allowed)) for idx in indexes], max_chunks)
+    offsets = np.cumsum([0] + [len(rows) for _, rows in parts])
+    if not offsets[-1]:
+        return [[] for _ in indexes]
+
+    emb = np.zeros(int(offsets[-1]))
+    q_vec = _embed_query(" ".join(query_terms), embedder, query_cache if query_cache is not None else {})
+    if q_vec is not None:
+        ensure_vectors_batch([idx for idx, rows in parts if len(rows)], embedder)
+        if all(idx.vectors is not None for idx, rows in parts if len(rows)):
+            matrix = np.vstack([idx.vectors[rows] for idx, rows in parts if len(rows)])
+            emb = np.clip(matrix @ q_vec, 0.0, 1.0)
+
+    out: List[List[Dict[str, Any]]] = []
+    for n, (index, rows) in enumerate(parts):
+        if not len(rows):
+            out.append([])
             continue
-        seen.add(text)
-        results.append({
-            "field": chunk["field"],
-            "text": text,
-            "score": round(max(bm25_norm[i], emb[i]), 4),
-        })
-
-    results.sort(key=lambda x: x["score"], reverse=True)
-    return results[:top_k]
+        bm25 = index.bm25(query_terms, rows)
+        bm25_norm = bm25 / (bm25.max() + 1e-8) if bm25.max() > 0 else bm25
+        scores = np.maximum(bm25_norm, emb[offsets[n]:offsets[n + 1]])
+        seen: set = set()
+        results: List[Dict[str, Any]] = []
+        for i, row in enumerate(rows):
+            chunk = index.chunks[row]
+            text = chunk["text"]
+            if text in seen:
+                continue
+            seen.add(text)
+            results.append({
+                "field": chunk["field"],
+                "text": text,
+                "score": round(float(scores[i]), 4),
+            })
+        results.sort(key=lambda x: x["score"], reverse=True)
+        out.append(results[:top_k])
+    return out
 
 
 # ── Evidence retrieval across all need categories ─────────────────────────────
 
-def _retrieve_evidence(
+def _retrieve_evidence_batch(
     signals: Dict[str, Any],
-    distilled: Dict[str, Any],
+    distilled_rows: List[Dict[str, Any]],
     embedder,
     top_k: int = 4,
-) -> Dict[str, List[Dict[str, Any]]]:
+    max_chunks: int = 0,
+) -> List[Dict[str, List[Dict[str, Any]]]]:
     topic_pref = (signals or {}).get("topic_preferences") or {}
     school_terms  = [str(x) for x in (topic_pref.get("school_terms")  or []) if str(x).strip()]
     transit_terms = [str(x) for x in (topic_pref.get("transit_terms") or []) if str(x).strip()]
     general_terms = [str(x) for x in ((signals or {}).get("general_semantic") or []) if str(x).strip()]
 
-    evidence: Dict[str, List[Dict[str, Any]]] = {}
-
-    if school_terms:
-        hits = _hybrid_retrieve(school_terms, _get_category_chunks(distilled, "school"), embedder, top_k)
-        if hits:
-            evidence["school"] = hits
-
-    if transit_terms:
-        hits = _hybrid_retrieve(transit_terms, _get_category_chunks(distilled, "transit"), embedder, top_k)
-        if hits:
-            evidence["transportation"] = hits
+    indexes = [get_listing_index(d) for d in distilled_rows]
+    query_cache: Dict[str, np.ndarray] = {}
+    evidence: List[Dict[str, List[Dict[str, Any]]]] = [{} for _ in indexes]
 
-    if general_terms:
-        hits = _hybrid_retrieve(general_terms, _get_category_chunks(distilled, "amenity"), embedder, top_k)
-        if hits:
-            evidence["amenity"] = hits
+    for terms, category, key in (
+        (school_terms, "school", "school"),
+        (transit_terms, "transit", "transportation"),
+        (general_terms, "amenity", "amenity"),
+    ):
+        if not terms:
+            continue
+        hits = _hybrid_retrieve_batch(terms, indexes, category, embedder, top_k, query_cache, max_chunks)
+        for ev, h in zip(evidence, hits):
+            if h:
+                ev[key] = h
 
     # Fallback: no categories extracted — search all text fields
-    if not evidence:
+    todo = [i for i, ev in enumerate(evidence) if not ev]
+    if todo:
         all_terms = school_terms + transit_terms + general_terms
-        hits = _hybrid_retrieve(all_terms, _get_category_chunks(distilled, "general"), embedder, top_k)
-        if hits:
-            evidence["general"] = hits
+        hits = _hybrid_retrieve_batch(
+            all_terms, [indexes[i] for i in todo], "general", embedder, top_k, query_cache, max_chunks
+        )
+        for i, h in zip(todo, hits):
+            if h:
+                evidence[i]["general"] = h
 
     return evidence
 
 
+def _retrieve_evidence(
+    signals: Dict[str, Any],
+    distilled: Dict[str, Any],
+    embedder,
+    top_k: int = 4,
+) -> Dict[str, List[Dict[str, Any]]]:
+    return _retrieve_evidence_batch(signals, [distilled], embedder, top_k)[0]
+
+
 # ── QA scope classifier ───────────────────────────────────────────────────────
 
 def classify_qa_scope(
@@ -377,20 +387,13 @@ def classify_qa_scope(
 
 # ── Single listing QA ─────────────────────────────────────────────────────────
 
-def answer_single_listing_question(
-    question: str,
+def _structured_single_answer(
+    ctx: Dict[str, Any],
+    distilled: Dict[str, Any],
     listing_payload: Dict[str, Any],
-    embedder=None,
-    qa_ctx: Optional[Dict[str, Any]] = None,
-) -> str:
-    if not listing_payload:
-        return "I don't have the selected listing details yet."
-
-    ctx = qa_ctx or build_qa_context(question)
-    extraction_input = ctx["extraction_input"]
-    signals = ctx["signals"]
+) -> Optional[str]:
+    """Answer from payload fields alone, or None when evidence/LLM is needed."""
     final_constraints = ctx.get("final_constraints") or {}
-    distilled = _distill_listing_payload(listing_payload)
 
     # ── Structured fast paths (exact field lookups, no retrieval needed) ───────
     dep_req = final_constraints.get("deposit")
@@ -424,6 +427,32 @@ def answer_single_listing_question(
                 return f"Yes. Let type is {actual}. Please confirm with the listing agent."
             return f"No. Let type is {actual}, not {req}. Please confirm with the listing agent."
 
+    # ── Template answers for multi-field structured questions ─────────────────
+    topics = detect_structured_topics(ctx["extraction_input"])
+    if topics:
+        return compose_structured_answer(topics, distilled, listing_payload) + " Please confirm with the listing agent."
+    return None
+
+
+def answer_single_listing_question(
+    question: str,
+    listing_payload: Dict[str, Any],
+    embedder=None,
+    qa_ctx: Optional[Dict[str, Any]] = None,
+) -> str:
+    if not listing_payload:
+        return "I don't have the selected listing details yet."
+
+    ctx = qa_ctx or build_qa_context(question)
+    extraction_input = ctx["extraction_input"]
+    signals = ctx["signals"]
+    distilled = _distill_listing_payload(listing_payload)
+
+    local_answer = _structured_single_answer(ctx, distilled, listing_payload)
+    record_qa_turn(local_answer is not None)
+    if local_answer is not None:
+        return local_answer
+
     # ── Hybrid retrieval: BM25 + embedding per need category ──────────────────
     evidence_by_category = _retrieve_evidence(signals, distilled, embedder)
 
@@ -527,13 +556,29 @@ def answer_multi_listing_question(
                 else:
                     lines.append(f"- Listing {idx} ({title}): £{txt}")
         lines.append("\nPlease confirm deposit details with the listing agent.")
+        record_qa_turn(True)
+        return "\n".join(lines)
+
+    # ── Template answers for multi-field structured questions ─────────────────
+    topics = detect_structured_topics(extraction_input)
+    if topics:
+        lines = []
+        for idx, payload in enumerate(rows, start=1):
+            distilled = _distill_listing_payload(payload)
+            title = str(distilled.get("title") or f"Listing {idx}")
+            lines.append(f"- Listing {idx} ({title}): {compose_structured_answer(topics, distilled, payload)}")
+        lines.append("Please confirm key details with the listing agent.")
+        record_qa_turn(True)
         return "\n".join(lines)
+    record_qa_turn(False)
 
-    # ── Per-listing hybrid retrieval ───────────────────────────────────────────
+    # ── Batched hybrid retrieval over all listings ─────────────────────────────
+    distilled_rows = [_distill_listing_payload(payload) for payload in rows]
+    evidence_rows = _retrieve_evidence_batch(
+        signals, distilled_rows, embedder, max_chunks=QA_BATCH_MAX_CHUNKS
+    )
     listings_data = []
-    for idx, payload in enumerate(rows, start=1):
-        distilled = _distill_listing_payload(payload)
-        evidence_by_category = _retrieve_evidence(signals, distilled, embedder)
+    for idx, (distilled, evidence_by_category) in enumerate(zip(distilled_rows, evidence_rows), start=1):
         listings_data.append({
             "index": idx,
             "title": str(distilled.get("title") or f"Listing {idx}"),
@@ -0,0 +1,197 @@
+"""Deterministic answers for purely structured listing questions.
+
+Questions like "how many bathrooms and when is it available?" only need
+payload fields and resolved boolean signals, so they are answered from
+templates instead of an LLM call. A question qualifies only when every
+clause maps to a known structured topic; anything that needs free-text
+evidence (schools, transport quality, "is it quiet") falls through to the
+LLM path.
+
+Local vs. LLM-answered QA turns are counted in ``qa_turns``
+(core.tracing, labelled ``answered``).
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from core.tracing import incr
+from skills.search.bool_signals import resolve_all_bool_signals
+from skills.search.text_utils import _norm_furnish_value, _safe_text, _to_float
+
+# topic -> question pattern (matched per clause, lower-cased)
+_TOPIC_PATTERNS: Dict[str, str] = {
+    "bathrooms": r"\bbath(?:room)?s?\b",
+    "bedrooms": r"\b(?:bed(?:room)?s?|studio)\b",
+    "size": r"\b(?:size|how big|floor area|square (?:feet|foot|met(?:re|er)s?)|sq\.? ?(?:ft|m)|sqm|sqft)\b",
+    "available_from": r"\b(?:available|availability|move[- ]?in|when can i)\b",
+    "min_tenancy": r"\b(?:min(?:imum)? (?:tenancy|term|stay)|tenancy (?:length|term)|contract length|how long (?:is|can) (?:the )?(?:lease|contract|tenancy|i stay))\b",
+    "price": r"\b(?:rent|price|cost|how much|pcm|per month)\b",
+    "furnish_type": r"\bfurnish",
+    "nearest_station": r"\b(?:station|tube|underground|overground)\b",
+    "pets_allowed": r"\b(?:pets?|dogs?|cats?)\b",
+    "garden": r"\bgardens?\b",
+    "parking": r"\b(?:parking|park (?:my|a) car|garage|driveway)\b",
+    "bills_included": r"\bbills?\b",
+    "student_friendly": r"\bstudents?\b",
+    "families_allowed": r"\b(?:famil(?:y|ies)|kids|children)\b",
+    "smokers_allowed": r"\bsmok(?:e|ing|ers?)\b",
+    "dss_accepted": r"\b(?:dss|housing benefit|universal credit)\b",
+}
+_TOPIC_RE = {k: re.compile(p) for k, p in _TOPIC_PATTERNS.items()}
+
+# Wording that needs free-text judgement (or a field the templates don't
+# cover) even when a topic word matches.
+_FREE_TEXT_RE = re.compile(
+    r"\b(?:school|commute|transport|area|neighbou?rhood|quiet|noisy|safe|view|light|bright|"
+    r"condition|nice|good|best|worth|why|describe|tell me about|deposit|council tax|epc|let type)\b"
+)
+_CLAUSE_SPLIT_RE = re.compile(r"[?,;.!]|\band\b|\balso\b|\bplus\b|\bor\b")
+_FILLER_WORDS = {
+    "", "it", "is", "are", "does", "do", "the", "a", "an", "this", "that", "one", "listing", "flat",
+    "there", "please", "thanks", "thank", "you", "what", "about", "how", "and", "can", "i", "me",
+}
+
+# signal -> (yes sentence, no sentence, label when unknown)
+_BOOL_TEMPLATES: Dict[str, tuple] = {
+    "pets_allowed": ("Pets are allowed.", "Pets are not allowed.", "Pets"),
+    "garden": ("It has a garden.", "It has no garden.", "A garden"),
+    "parking": ("Parking is available.", "There is no parking.", "Parking"),
+    "bills_included": ("Bills are included.", "Bills are not included.", "Bills"),
+    "student_friendly": ("Students are welcome.", "Students are not accepted.", "Student suitability"),
+    "families_allowed": ("Families are welcome.", "Families are not accepted.", "Family suitability"),
+    "smokers_allowed": ("Smoking is allowed.", "Smoking is not allowed.", "Smoking"),
+    "dss_accepted": ("DSS / housing benefit is accepted.", "DSS / housing benefit is not accepted.", "DSS"),
+}
+
+
+def detect_structured_topics(question: str) -> Optional[List[str]]:
+    """Topics asked about, or None if any clause needs free-text evidence."""
+    q = str(question or "").lower()
+    if not q.strip() or _FREE_TEXT_RE.search(q):
+        return None
+    topics: List[str] = []
+    for clause in _CLAUSE_SPLIT_RE.split(q):
+        hits = [t for t, rx in _TOPIC_RE.items() if rx.search(clause)]
+        if not hits:
+            words = set(re.findall(r"[a-z]+", clause))
+            if words - _FILLER_WORDS:
+                return None
+            continue
+        topics.extend(t for t in hits if t not in topics)
+    return topics or None
+
+
+def _fmt_num(v: Any) -> Optional[str]:
+    n = _to_float(v)
+    if n is None:
+        return None
+    return str(int(n)) if float(n).is_integer() else f"{n:g}"
+
+
+def _not_provided(label: str) -> str:
+    return f"{label} is not provided in listing data — please ask the agent."
+
+
+def _answer_bathrooms(d: Dict[str, Any]) -> str:
+    n = _fmt_num(d.get("bathrooms"))
+    if n is None:
+        return _not_provided("The number of bathrooms")
+    return f"It has {n} bathroom{'' if n == '1' else 's'}."
+
+
+def _answer_bedrooms(d: Dict[str, Any]) -> str:
+    n = _fmt_num(d.get("bedrooms"))
+    if n is None:
+        return _not_provided("The number of bedrooms")
+    if n == "0":
+        return "It is a studio."
+    return f"It has {n} bedroom{'' if n == '1' else 's'}."
+
+
+def _answer_size(d: Dict[str, Any]) -> str:
+    sqm, sqft = _fmt_num(d.get("size_sqm")), _fmt_num(d.get("size_sqft"))
+    if sqm and sqft:
+        return f"It is {sqm} sqm ({sqft} sq ft)."
+    if sqm or sqft:
+        return f"It is {sqm} sqm." if sqm else f"It is {sqft} sq ft."
+    return _not_provided("The size")
+
+
+def _answer_available_from(d: Dict[str, Any]) -> str:
+    v = _safe_text(d.get("available_from"))
+    if not v or v.lower() in {"ask agent", "unknown"}:
+        return _not_provided("The availability date")
+    if v.lower() in {"now", "available now", "immediately"}:
+        return "It is available now."
+    return f"It is available from {v}."
+
+
+def _answer_min_tenancy(d: Dict[str, Any]) -> str:
+    months = _fmt_num(d.get("min_tenancy_months"))
+    if months:
+        return f"The minimum tenancy is {months} month{'' if months == '1' else 's'}."
+    raw = _safe_text(d.get("min_tenancy"))
+    if raw and raw.lower() not in {"ask agent", "unknown"}:
+        return f"The minimum tenancy is {raw}."
+    return _not_provided("The minimum tenancy")
+
+
+def _answer_price(d: Dict[str, Any]) -> str:
+    p = _fmt_num(d.get("price_pcm"))
+    return f"The rent is £{p} pcm." if p else _not_provided("The rent")
+
+
+def _answer_furnish(d: Dict[str, Any]) -> str:
+    f = _norm_furnish_value(d.get("furnish_type"))
+    if not f or f == "ask agent":
+        return _not_provided("Furnishing")
+    return f"It is {f}."
+
+
+def _answer_station(d: Dict[str, Any]) -> str:
+    ns = _safe_text(d.get("nearest_station"))
+    if not ns:
+        return _not_provided("The nearest station")
+    dist = _fmt_num(d.get("distance_to_station_m"))
+    return f"The nearest station is {ns}, {dist}m away." if dist else f"The nearest station is {ns}."
+
+
+_FIELD_ANSWERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "bathrooms": _answer_bathrooms,
+    "bedrooms": _answer_bedrooms,
+    "size": _answer_size,
+    "available_from": _answer_available_from,
+    "min_tenancy": _answer_min_tenancy,
+    "price": _answer_price,
+    "furnish_type": _answer_furnish,
+    "nearest_station": _answer_station,
+}
+
+
+def compose_structured_answer(
+    topics: List[str],
+    distilled: Dict[str, Any],
+    listing_payload: Dict[str, Any],
+) -> str:
+    """Template sentences for ``topics`` (from ``detect_structured_topics``)."""
+    bools = resolve_all_bool_signals(listing_payload) if any(t in _BOOL_TEMPLATES for t in topics) else {}
+    parts: List[str] = []
+    for topic in topics:
+        if topic in _FIELD_ANSWERS:
+            parts.append(_FIELD_ANSWERS[topic](distilled))
+            continue
+        yes, no, label = _BOOL_TEMPLATES[topic]
+        value = bools.get(topic)
+        if value is True:
+            parts.append(yes)
+        elif value is False:
+            parts.append(no)
+        else:
+            parts.append(f"{label} is not mentioned in listing data — please ask the agent.")
+    return " ".join(parts)
+
+
+# ── Local-answer share ────────────────────────────────────────────────────────
+
+def record_qa_turn(answered_locally: bool) -> None:
+    incr("qa_turns", answered="local" if answered_locally else "llm")
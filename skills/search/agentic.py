@@ -1,23 +1,25 @@
 from __future__ import annotations
 
+import copy
+import json
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-try:
-    from fastembed import TextEmbedding as _FastEmbed
-    _USE_FASTEMBED = True
-except ImportError:
-    from sentence_transformers import SentenceTransformer as _FastEmbed  # type: ignore
-    _USE_FASTEMBED = False
+import numpy as np
+import pandas as pd
 
+from core.tracing import span
 from skills.common.parse_signals import derive_signals, parse_signals
 from core.settings import (
     DEFAULT_K,
     DEFAULT_RECALL,
     EMBED_MODEL,
     ENABLE_STAGE_D_EXPLAIN,
+    QDRANT_HYBRID,
+    QDRANT_HYBRID_RECALL,
 )
+from skills.search.constraint_pushdown import hard_pushdown_key
 from skills.search.engine import load_stage_a_resources, stage_a_search
 from skills.search.extractors import (
     compact_constraints_view,
@@ -26,7 +28,9 @@ from skills.search.extractors import (
     summarize_constraint_changes,
 )
 from skills.search.hard_filter import apply_hard_filters_with_audit
+from skills.search.recall_control import Fetch, adaptive_stage_a_b, estimate_total, next_page, page_cursor
 from skills.search.signals import build_stage_a_query
+from skills.search.text_utils import _to_float
 from skills.search.handler import (
     format_listing_row,
     rank_stage_c,
@@ -39,8 +43,19 @@ class SearchRuntime:
     embedder: Any
 
 
+def embedder_class():
+    """fastembed when installed, else sentence-transformers (imported on demand:
+    both pull in large native stacks that the request path never needs)."""
+    try:
+        from fastembed import TextEmbedding
+        return TextEmbedding
+    except ImportError:
+        from sentence_transformers import SentenceTransformer  # type: ignore
+        return SentenceTransformer
+
+
 def build_search_runtime() -> SearchRuntime:
-    embedder = _FastEmbed(EMBED_MODEL) if _USE_FASTEMBED else _FastEmbed(EMBED_MODEL)
+    embedder = embedder_class()(EMBED_MODEL)
     return SearchRuntime(
         qdrant_client=load_stage_a_resources(),
         embedder=embedder,
@@ -64,6 +79,111 @@ def _build_profile_patch(constraints: Dict[str, Any]) -> Dict[str, Any]:
     return patch
 
 
+def _stage_a_location_key(c: Dict[str, Any]) -> str:
+    locs = sorted(str(x).strip().lower() for x in (c.get("location_keywords") or []) if str(x).strip())
+    return json.dumps({"loc": locs, "geo": c.get("geo_bound")}, sort_keys=True, default=str)
+
+
+def stage_a_reusable(
+    stage_a_df: Optional[pd.DataFrame],
+    prev_constraints: Optional[Dict[str, Any]],
+    new_constraints: Optional[Dict[str, Any]],
+    recall: int = DEFAULT_RECALL,
+) -> bool:
+    """True if a Stage A frame can serve a search with ``new_constraints``.
+
+    Stage A filters on location tokens / geo bounds and on any hard
+    constraints it pushed down; the rest only shift the query text. A frame
+    without pushed-down constraints that covers the whole recall window is
+    what an unpushed search would fetch, so Stage B/C can be re-run on it
+    for a budget, furnish or date change that leaves location and geo alone.
+    evaluate_node loads such a frame for the near-miss analysis before it
+    relaxes. The first, adaptively sized frame usually stops short of the
+    window, and a pushed-down frame lacks the listings a looser constraint
+    would let in, so neither is reused unless the constraints it was
+    filtered by are unchanged.
+    """
+    if stage_a_df is None or len(stage_a_df) == 0:
+        return False
+    attrs = getattr(stage_a_df, "attrs", {}) or {}
+    if int(attrs.get("prefilter_count") or 0) <= 0:
+        return False
+    # A hybrid search never returns more than its fused cap.
+    window = min(int(recall), QDRANT_HYBRID_RECALL) if QDRANT_HYBRID else int(recall)
+    covered = bool(attrs.get("exhausted")) or int(attrs.get("recall") or len(stage_a_df)) >= window
+    if not covered:
+        return False
+    pushed = attrs.get("hard_pushdown") or ""
+    if pushed and pushed != hard_pushdown_key(new_constraints):
+        return False
+    return _stage_a_location_key(prev_constraints or {}) == _stage_a_location_key(new_constraints or {})
+
+
+def _stage_a_fetcher(runtime: SearchRuntime, query: str, c: Dict[str, Any], pushdown: Optional[bool] = None) -> Fetch:
+    """Stage A page fetcher for ``adaptive_stage_a_b`` / ``next_page``."""
+    extra = {} if pushdown is None else {"pushdown": pushdown}
+
+    def _fetch(n: Any, offset: int, first: Dict[str, Any]) -> pd.DataFrame:
+        vector = first.get("query_vector")
+        with span("search.stage_a", offset=offset) as sp:
+            page = stage_a_search(
+                runtime.qdrant_client,
+                runtime.embedder,
+                query=query,
+                recall=n,
+                c=c,
+                offset=offset,
+                query_vector=None if vector is None else np.asarray(vector),
+                prefilter_count=first.get("prefilter_count"),
+                **extra,
+            )
+            sp.set(rows=len(page) if page is not None else 0, recall=page.attrs.get("recall"))
+        return page
+
+    return _fetch
+
+
+def _stage_b_filter(df: pd.DataFrame, c: Dict[str, Any]):
+    with span("search.stage_b") as sp:
+        out = apply_hard_filters_with_audit(df, c)
+        sp.set(rows=len(out[0]) if out[0] is not None else 0)
+    return out
+
+
+def more_search_results(
+    cursor: Dict[str, Any],
+    runtime: SearchRuntime,
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Next ranked listings for a ``search_cursor`` and the cursor after them.
+
+    The Stage A fetcher and the Stage C signals are rebuilt from the cursor
+    (query, query vector, constraints, pushdown key), so session state keeps
+    no closures over the runtime or the ranked rows. The page is fetched with
+    the first page's pushdown, whatever the setting is now, so its filter and
+    prefilter count still line up. The returned cursor is None once the
+    ranking is exhausted.
+    """
+    c = dict(cursor.get("constraints") or {})
+    fetch = _stage_a_fetcher(runtime, str(cursor.get("query") or ""), c, pushdown=bool(cursor.get("pushdown_key")))
+    kept, next_cursor = next_page(
+        fetch, _stage_b_filter, c, cursor, int(cursor.get("k") or DEFAULT_K), int(cursor.get("recall") or DEFAULT_RECALL)
+    )
+    if kept is None or len(kept) == 0:
+        return [], next_cursor
+    signals = derive_signals(
+        parsed={
+            "semantic_terms": cursor.get("semantic_terms") or {},
+            "semantic_parse_source": str(cursor.get("semantic_source") or "precomputed_plan"),
+            "final_constraints": c,
+        },
+        user_text=str(cursor.get("user_text") or ""),
+        constraints=c,
+    )
+    with span("search.stage_c", offset=int(cursor["offset"])):
+        ranked_more, _ = rank_stage_c(kept, signals, embedder=runtime.embedder)
+    return [row.to_dict() for _, row in ranked_more.reset_index(drop=True).iterrows()], next_cursor
+
+
 def run_search_skill(
     *,
     user_text: str,
@@ -74,16 +194,28 @@ def run_search_skill(
     precomputed_semantic_terms: Optional[Dict[str, Any]] = None,
     k: int = DEFAULT_K,
     recall: int = DEFAULT_RECALL,
+    aggregate_only: bool = False,
+    stage_a_df: Optional[pd.DataFrame] = None,
 ) -> Dict[str, Any]:
+    """Run Stage A → B → C for one search turn.
+
+    aggregate_only=True stops after Stage B and returns only the hard-filter
+    pass count and the passing ``price_pcm`` values (no ranking, no listing
+    dicts, no reply text) — enough for area price comparisons.
+
+    stage_a_df reuses a Stage A candidate frame from an earlier call in the
+    same turn (see ``stage_a_reusable``) and skips the Qdrant round-trip.
+    """
     prev_constraints = dict(state_constraints or {})
     structured_audit = {}
     if override_constraints is None:
-        parsed = parse_signals(
-            user_text,
-            state_constraints,
-            emit_audit=True,
-            audit_context="search",
-        )
+        with span("search.pre_a"):
+            parsed = parse_signals(
+                user_text,
+                state_constraints,
+                emit_audit=True,
+                audit_context="search",
+            )
         extracted = parsed.get("final_constraints") or {}
         structured_audit = parsed.get("structured_audit") or {}
         merged = merge_constraints(state_constraints, extracted)
@@ -119,22 +251,70 @@ def run_search_skill(
         user_text=user_text,
         constraints=merged,
     )
-    stage_a_query = build_stage_a_query(signals, user_text)
-    stage_a_df = stage_a_search(
-        runtime.qdrant_client,
-        runtime.embedder,
-        query=stage_a_query,
-        recall=int(recall),
-        c=merged,
-    )
+    if stage_a_df is None and not aggregate_only:
+        # Sized from filter selectivity; pages further only if Stage B keeps too few.
+        stage_a_query = build_stage_a_query(signals, user_text)
+        stage_a_df, filtered, stage_b_audits, _ = adaptive_stage_a_b(
+            _stage_a_fetcher(runtime, stage_a_query, merged),
+            _stage_b_filter,
+            merged,
+            int(merged.get("k") or k),
+            int(recall),
+        )
+        # Adaptive recall stops once a few pages' worth survive; "show more"
+        # continues down the same ranking instead of fetching everything now.
+        search_cursor = page_cursor(stage_a_df, len(filtered), int(recall))
+        if search_cursor is not None:
+            search_cursor.update(
+                query=stage_a_query,
+                query_vector=np.asarray(stage_a_df.attrs.get("query_vector")).tolist(),
+                pushdown_key=stage_a_df.attrs.get("hard_pushdown") or "",
+                constraints=copy.deepcopy(merged),
+                k=int(merged.get("k") or k),
+                recall=int(recall),
+                user_text=user_text,
+                semantic_terms=copy.deepcopy(semantic_terms),
+                semantic_source=semantic_source,
+            )
+    else:
+        search_cursor = None
+        if stage_a_df is None:
+            # Aggregates (counts, price spread) need every match, not a top-k pool.
+            stage_a_query = build_stage_a_query(signals, user_text)
+            with span("search.stage_a", recall=int(recall)) as sp:
+                stage_a_df = stage_a_search(
+                    runtime.qdrant_client,
+                    runtime.embedder,
+                    query=stage_a_query,
+                    recall=int(recall),
+                    c=merged,
+                    # The hybrid cap would truncate the aggregate.
+                    hybrid=False,
+                )
+                sp.set(rows=len(stage_a_df) if stage_a_df is not None else 0)
+        with span("search.stage_b") as sp:
+            filtered, stage_b_audits = apply_hard_filters_with_audit(stage_a_df, merged)
+            sp.set(rows=len(filtered) if filtered is not None else 0)
     stage_a_prefilter_count: int = int(
         stage_a_df.attrs.get("prefilter_count") or 0
     ) if hasattr(stage_a_df, "attrs") else 0
     stage_a_geo_fallback_area: Optional[str] = (
         stage_a_df.attrs.get("geo_fallback_area") or None
     ) if hasattr(stage_a_df, "attrs") else None
-    filtered, stage_b_audits = apply_hard_filters_with_audit(stage_a_df, merged)
-    ranked, _ = rank_stage_c(filtered, signals, embedder=runtime.embedder)
+    if aggregate_only:
+        prices: List[float] = []
+        if filtered is not None and len(filtered) > 0 and "price_pcm" in filtered.columns:
+            # Parsed like Stage B and the area-stats cube ("£1,750" included).
+            prices = [p for p in map(_to_float, filtered["price_pcm"]) if p is not None]
+        return {
+            "constraints": merged,
+            "count": len(filtered) if filtered is not None else 0,
+            "prices": prices,
+            "stage_a_prefilter_count": stage_a_prefilter_count,
+            "stage_a_geo_fallback_area": stage_a_geo_fallback_area,
+        }
+    with span("search.stage_c"):
+        ranked, _ = rank_stage_c(filtered, signals, embedder=runtime.embedder)
     ranked_full = ranked.reset_index(drop=True)
 
     n_filtered = len(filtered) if filtered is not None else 0
@@ -152,6 +332,28 @@ def run_search_skill(
         for _, row in ranked_full.iterrows():
             all_ranked_listings.append(row.to_dict())
 
+    load_unfiltered_stage_b = None
+    if (getattr(stage_a_df, "attrs", {}) or {}).get("hard_pushdown"):
+        pushed_df = stage_a_df
+
+        def load_unfiltered_stage_b() -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+            """Stage A without the pushed-down constraints, and its Stage B audits."""
+            with span("search.stage_a_unfiltered", recall=int(recall)) as sp:
+                unfiltered = stage_a_search(
+                    runtime.qdrant_client,
+                    runtime.embedder,
+                    query=build_stage_a_query(signals, user_text),
+                    recall=int(recall),
+                    c=merged,
+                    pushdown=False,
+                    query_vector=pushed_df.attrs.get("query_vector"),
+                )
+                sp.set(rows=len(unfiltered))
+            with span("search.stage_b") as sp:
+                _, audits = apply_hard_filters_with_audit(unfiltered, merged)
+                sp.set(audits=len(audits))
+            return unfiltered, audits
+
     lines: List[str] = []
     if not listings:
         lines.append("I couldn't find any matching listings. Try changing area, budget, or layout.")
@@ -173,8 +375,16 @@ def run_search_skill(
         "active_constraints": compact_constraints_view(merged),
         "listings": listings,
         "all_ranked_listings": all_ranked_listings,
+        # Matches over the full recall window; more than len(all_ranked_listings)
+        # while search_cursor can still page further down the ranking.
+        "result_total": estimate_total(stage_a_df, n_filtered, int(recall)),
+        # Plain data for more_search_results (None once Stage A is exhausted).
+        "search_cursor": search_cursor,
         "structured_audit": structured_audit,
         "stage_b_audits": stage_b_audits,
         "stage_a_prefilter_count": stage_a_prefilter_count,
         "stage_a_geo_fallback_area": stage_a_geo_fallback_area,
+        "stage_a_df": stage_a_df,
+        # Called by evaluate_node only when the relax / near-miss analysis runs.
+        "load_unfiltered_stage_b": load_unfiltered_stage_b,
     }
@@ -0,0 +1,312 @@
+"""Precomputed area price-statistics cube.
+
+Built by ``crawler/sync_qdrant.py`` after every sync and stored as a JSON
+artifact next to the location index. Each cell is keyed by
+``<dimension>:<key>`` (region / station / postcode district) × bedrooms ×
+furnish type and stores:
+
+  n        — residential listings in the cell (priced or not)
+  prices   — {price_pcm: count} for listings with a known price
+  avail    — {"now" | "YYYY-MM" | "unknown": count}, read like Stage B
+
+Price maps are exact multisets, so cells can be merged and capped by a
+budget without losing precision — area comparisons and budget-sensitivity
+hints read from here and only fall back to a live search when the filter
+combination is not representable (extra hard constraints, unknown area).
+
+Counting follows Stage B (hard_filter): the same non-residential and
+furnish readers, unknown bedrooms / price / furnish pass, and listings
+without a price count but add no price. The live fallback
+(``orchestration.nodes._area_price_stats``) uses these rules as well, but
+it only sees the listings inside Stage A's recall window, so the area
+comparison labels each row with where its figures came from.
+"""
+
+import json
+import os
+import re
+import statistics
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+from core.settings import AREA_STATS_PATH
+from skills.search.listing_fields import listing_available_from, listing_furnish, listing_non_residential
+from skills.search.text_utils import _norm_furnish_value, _safe_text, _to_float
+
+# (file mtime, indexed cube); reloaded when the artifact changes on disk.
+_AREA_STATS_CACHE: Optional[tuple] = None
+_AREA_STATS_LOCK = threading.Lock()
+
+# Constraint keys the cube can answer; anything else forces a live search.
+_COVERED_KEYS = {"location_keywords", "layout_options", "max_rent_pcm", "furnish_type", "k", "commute_destination"}
+
+# Furnish values that always pass the Stage B furnish check.
+_FURNISH_ALWAYS_PASS = {"", "ask agent", "flexible"}
+
+
+def _slug(text: Any) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(text or "").lower()).strip("_")
+
+
+def _beds_key(v: Any) -> str:
+    b = _to_float(v)
+    return str(int(round(b))) if b is not None else "unknown"
+
+
+def _req_beds_key(v: Any) -> str:
+    # Stage B truncates the requested count and rounds the listing's.
+    b = _to_float(v)
+    return str(int(b)) if b is not None else "unknown"
+
+
+def _avail_key(payload: Dict[str, Any]) -> str:
+    now, when = listing_available_from(payload)
+    if now:
+        return "now"
+    return when.strftime("%Y-%m") if not pd.isna(when) else "unknown"
+
+
+def _area_keys(payload: Dict[str, Any]) -> Set[str]:
+    keys: Set[str] = set()
+    for tok in payload.get("location_region_tokens") or []:
+        if not str(tok).endswith("_london"):
+            keys.add(f"region:{tok}")
+    for tok in payload.get("location_station_tokens") or []:
+        slug = _slug(tok)
+        if slug.endswith("_station"):
+            slug = slug[: -len("_station")]
+        if slug:
+            keys.add(f"station:{slug}")
+    district = _safe_text(payload.get("postcode_district")).lower()
+    if not district:
+        for tok in payload.get("location_postcode_tokens") or []:
+            if 2 <= len(str(tok)) <= 4:
+                district = str(tok).lower()
+                break
+    if district:
+        keys.add(f"district:{district}")
+    return keys
+
+
+# ---------------------------------------------------------------------------
+# Build (sync time)
+# ---------------------------------------------------------------------------
+
+def build_area_stats_cube(payloads: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate Qdrant payload dicts into the statistics cube."""
+    cells: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"n": 0, "prices": Counter(), "avail": Counter()})
+    n_listings = 0
+    for p in payloads:
+        if listing_non_residential(p):
+            continue
+        areas = _area_keys(p)
+        if not areas:
+            continue
+        n_listings += 1
+        beds = _beds_key(p.get("bedrooms"))
+        furnish = listing_furnish(p)
+        price = _to_float(p.get("price_pcm"))
+        avail = _avail_key(p)
+        for area in areas:
+            cell = cells[f"{area}|{beds}|{furnish}"]
+            cell["n"] += 1
+            if price is not None:
+                cell["prices"][f"{price:g}"] += 1
+            cell["avail"][avail] += 1
+
+    return {
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "listings": n_listings,
+        "cells": {
+            key: {"n": c["n"], "prices": dict(c["prices"]), "avail": dict(c["avail"])}
+            for key, c in cells.items()
+        },
+    }
+
+
+def rebuild_area_stats(payloads: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the cube and save it to AREA_STATS_PATH.
+
+    Call this after sync_qdrant.py updates the collection.
+    """
+    cube = build_area_stats_cube(payloads)
+    os.makedirs(os.path.dirname(AREA_STATS_PATH), exist_ok=True)
+    with open(AREA_STATS_PATH, "w", encoding="utf-8") as f:
+        json.dump(cube, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"[area_stats] Saved {len(cube['cells'])} cells ({cube['listings']} listings) to {AREA_STATS_PATH}")
+    global _AREA_STATS_CACHE
+    with _AREA_STATS_LOCK:
+        _AREA_STATS_CACHE = (_mtime(), _index_cube(cube))
+    return cube
+
+
+# ---------------------------------------------------------------------------
+# Lookup (query time)
+# ---------------------------------------------------------------------------
+
+def _index_cube(cube: Dict[str, Any]) -> Dict[str, Any]:
+    """Group cells by area key so lookups touch only that area's cells."""
+    by_area: Dict[str, List[tuple]] = defaultdict(list)
+    for key, cell in (cube.get("cells") or {}).items():
+        area, beds, furnish = key.split("|", 2)
+        by_area[area].append((beds, furnish, cell))
+    return {"built_at": cube.get("built_at"), "by_area": dict(by_area)}
+
+
+def _mtime() -> Optional[int]:
+    try:
+        return os.stat(AREA_STATS_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _get_area_stats() -> Dict[str, Any]:
+    """Indexed cube, reloaded when a sync in another process rewrites the file."""
+    global _AREA_STATS_CACHE
+    mtime = _mtime()
+    with _AREA_STATS_LOCK:
+        if _AREA_STATS_CACHE is not None and _AREA_STATS_CACHE[0] == mtime:
+            return _AREA_STATS_CACHE[1]
+    cube: Dict[str, Any] = {}
+    if mtime is not None:
+        try:
+            with open(AREA_STATS_PATH, "r", encoding="utf-8") as f:
+                cube = json.load(f)
+        except Exception:
+            cube = {}
+    indexed = _index_cube(cube)
+    with _AREA_STATS_LOCK:
+        _AREA_STATS_CACHE = (mtime, indexed)
+    return indexed
+
+
+def _resolve_area_key(area: str, by_area: Dict[str, Any]) -> Optional[str]:
+    slug = _slug(area)
+    for suffix in ("_london", "_station"):
+        if slug.endswith(suffix):
+            slug = slug[: -len(suffix)]
+    compact = re.sub(r"\s+", "", str(area or "")).lower()
+    for key in (f"region:{slug}", f"station:{slug}", f"district:{compact}"):
+        if key in by_area:
+            return key
+    return None
+
+
+def _covered_filters(constraints: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Translate constraints into cube filters, or None if not representable."""
+    for key, val in (constraints or {}).items():
+        if key in _COVERED_KEYS or val in (None, "", [], {}):
+            continue
+        return None
+    beds: Set[str] = set()
+    for opt in constraints.get("layout_options") or []:
+        if not isinstance(opt, dict):
+            return None
+        extra = {k: v for k, v in opt.items() if k != "bedrooms" and v not in (None, "")}
+        if extra or opt.get("bedrooms") is None:
+            return None
+        beds.add(_req_beds_key(opt.get("bedrooms")))
+    return {
+        "beds": beds,
+        "furnish": _norm_furnish_value(constraints.get("furnish_type")),
+        "max_rent": _to_float(constraints.get("max_rent_pcm")),
+    }
+
+
+def _collect_prices(
+    cells: List[tuple],
+    *,
+    beds: Set[str],
+    furnish: str,
+    max_rent: Optional[float],
+    min_rent: Optional[float] = None,
+    confirmed_beds: bool = False,
+) -> tuple:
+    """Return (listing_count, sorted price list, availability) for cells matching the filters.
+
+    The availability histogram covers the matching cells before the budget
+    cap; cells do not record which price goes with which date.
+    """
+    count = 0
+    prices: List[float] = []
+    avail: Counter = Counter()
+    for cell_beds, cell_furnish, cell in cells:
+        if beds:
+            if cell_beds not in beds and (confirmed_beds or cell_beds != "unknown"):
+                continue
+        elif confirmed_beds and cell_beds == "unknown":
+            continue
+        if furnish and cell_furnish not in _FURNISH_ALWAYS_PASS and cell_furnish != furnish:
+            continue
+        avail.update(cell.get("avail") or {})
+        priced = 0
+        for raw, n in (cell.get("prices") or {}).items():
+            p = float(raw)
+            priced += n
+            if max_rent is not None and p > max_rent:
+                continue
+            if min_rent is not None and p <= min_rent:
+                continue
+            prices.extend([p] * int(n))
+        # Listings without a price pass Stage B's budget check.
+        if min_rent is None:
+            count += int(cell.get("n") or 0) - priced
+    prices.sort()
+    return count + len(prices), prices, dict(avail)
+
+
+def lookup_area_price_stats(area: str, constraints: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Count/min/median/max of price_pcm for one area, or None if not covered.
+
+    ``availability`` is the {"now" | "YYYY-MM" | "unknown": count} histogram
+    of the listings matching bedrooms and furnish type.
+    """
+    filters = _covered_filters(constraints)
+    if filters is None:
+        return None
+    by_area = _get_area_stats()["by_area"]
+    key = _resolve_area_key(area, by_area)
+    if key is None:
+        return None
+    count, prices, avail = _collect_prices(by_area[key], **filters)
+    return {
+        "area": area,
+        "count": count,
+        "min": prices[0] if prices else None,
+        "median": statistics.median(prices) if prices else None,
+        "max": prices[-1] if prices else None,
+        "availability": avail,
+        "source": "cube",
+    }
+
+
+def area_budget_gain(constraints: Dict[str, Any], new_budget: float) -> Optional[int]:
+    """Confirmed-bedroom listings priced in (max_rent_pcm, new_budget] for a
+    single-location search, or None if the cube can't answer.
+
+    Multi-location searches are not answered: a listing can sit in several
+    area cells and would be double-counted.
+    """
+    c = dict(constraints or {})
+    budget = _to_float(c.pop("max_rent_pcm", None))
+    filters = _covered_filters(c)
+    areas = list(c.get("location_keywords") or [])
+    if filters is None or budget is None or len(areas) != 1 or not filters["beds"]:
+        return None
+    by_area = _get_area_stats()["by_area"]
+    key = _resolve_area_key(areas[0], by_area)
+    if key is None:
+        return None
+    _, prices, _ = _collect_prices(
+        by_area[key],
+        beds=filters["beds"],
+        furnish=filters["furnish"],
+        max_rent=float(new_budget),
+        min_rent=budget,
+        confirmed_beds=True,
+    )
+    return len(prices)
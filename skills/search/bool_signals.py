@@ -2,12 +2,13 @@
 
 Resolves True/False/None for boolean rental attributes by:
 1. Checking explicit boolean fields in the listing payload
-2. Scanning features and description text via regex
+2. Reading the text verdicts precomputed at sync time (``bool_signals``
+   payload field), else scanning features and description text via regex
 3. Returning None when no evidence is found
 """
 
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
 
 # ---------------------------------------------------------------------------
 # Signal definitions
@@ -153,53 +154,102 @@ def _coerce_bool(value: Any) -> Optional[bool]:
     return None
 
 
-# ---------------------------------------------------------------------------
-# Public API
-# ---------------------------------------------------------------------------
+# One alternation per signal and polarity, compiled once.
+_COMPILED: Dict[str, Tuple[Optional[Pattern[str]], Optional[Pattern[str]]]] = {
+    name: tuple(
+        re.compile("|".join(f"(?:{p})" for p in defn.get(key, [])), re.IGNORECASE) if defn.get(key) else None
+        for key in ("negative_patterns", "positive_patterns")
+    )
+    for name, defn in BOOL_SIGNAL_DEFS.items()
+}
 
-def resolve_bool_signal(signal_name: str, listing: dict) -> Optional[bool]:
-    """Resolve a boolean signal from listing data.
+# Payload field holding ``text_bool_signals`` output (crawler/sync_qdrant.py).
+PRECOMPUTED_FIELD = "bool_signals"
 
-    1. Check explicit field in payload -> return bool
-    2. Scan features + description text -> return bool
-    3. Return None if unknown
-    """
-    defn = BOOL_SIGNAL_DEFS.get(signal_name)
-    if defn is None:
+
+def _explicit_value(signal_name: str, listing: dict) -> Optional[bool]:
+    field_name = BOOL_SIGNAL_DEFS[signal_name].get("field", "")
+    if not field_name:
         return None
+    payload = listing.get("payload", listing)
+    raw = payload.get(field_name)
+    if raw is None and payload is not listing:
+        raw = listing.get(field_name)
+    if raw is None:
+        return None
+    return _coerce_bool(raw)
+
 
-    # Step 1: explicit field
-    field_name = defn.get("field", "")
-    if field_name:
-        payload = listing.get("payload", listing)
-        raw = payload.get(field_name)
-        if raw is None and payload is not listing:
-            raw = listing.get(field_name)
-        if raw is not None:
-            coerced = _coerce_bool(raw)
-            if coerced is not None:
-                return coerced
-
-    # Step 2: text scan
+def _listing_text_lower(listing: dict) -> str:
     text = _get_searchable_text(listing.get("payload", listing))
     if not text:
         text = _get_searchable_text(listing)
-    if not text:
+    return text.lower()
+
+
+def _text_verdict(signal_name: str, text_lower: str) -> Optional[bool]:
+    if not text_lower:
         return None
+    neg, pos = _COMPILED[signal_name]
+    # Negative patterns first (more specific, e.g. "no pets")
+    if neg is not None and neg.search(text_lower):
+        return False
+    if pos is not None and pos.search(text_lower):
+        return True
+    return None
 
-    text_lower = text.lower()
 
-    # Check negative patterns first (more specific, e.g. "no pets")
-    for pat in defn.get("negative_patterns", []):
-        if re.search(pat, text_lower, re.IGNORECASE):
-            return False
+def _precomputed(listing: dict) -> Optional[Dict[str, Optional[bool]]]:
+    payload = listing.get("payload", listing)
+    pre = payload.get(PRECOMPUTED_FIELD)
+    if pre is None and payload is not listing:
+        pre = listing.get(PRECOMPUTED_FIELD)
+    return pre if isinstance(pre, dict) else None
 
-    for pat in defn.get("positive_patterns", []):
-        if re.search(pat, text_lower, re.IGNORECASE):
-            return True
 
-    # Step 3: unknown
-    return None
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def text_bool_signals(listing: dict) -> Dict[str, Optional[bool]]:
+    """Text-only verdict for every signal (what sync stores in the payload)."""
+    text_lower = _listing_text_lower(listing)
+    return {name: _text_verdict(name, text_lower) for name in BOOL_SIGNAL_DEFS}
+
+
+def resolve_bool_signals(listing: dict, signal_names: Iterable[str]) -> Dict[str, Optional[bool]]:
+    """Resolve several signals for one listing, scanning its text at most once."""
+    out: Dict[str, Optional[bool]] = {}
+    pending: List[str] = []
+    for name in signal_names:
+        if name not in BOOL_SIGNAL_DEFS:
+            out[name] = None
+            continue
+        value = _explicit_value(name, listing)
+        out[name] = value
+        if value is None:
+            pending.append(name)
+    if pending:
+        pre = _precomputed(listing)
+        text_lower: Optional[str] = None
+        for name in pending:
+            if pre is not None and name in pre:
+                out[name] = _coerce_bool(pre[name]) if pre[name] is not None else None
+                continue
+            if text_lower is None:
+                text_lower = _listing_text_lower(listing)
+            out[name] = _text_verdict(name, text_lower)
+    return out
+
+
+def resolve_bool_signal(signal_name: str, listing: dict) -> Optional[bool]:
+    """Resolve a boolean signal from listing data.
+
+    1. Check explicit field in payload -> return bool
+    2. Use the precomputed text verdict, else scan features + description
+    3. Return None if unknown
+    """
+    return resolve_bool_signals(listing, (signal_name,))[signal_name]
 
 
 def resolve_all_bool_signals(listing: dict) -> Dict[str, Optional[bool]]:
@@ -207,7 +257,7 @@ def resolve_all_bool_signals(listing: dict) -> Dict[str, Optional[bool]]:
 
     Returns {signal_name: True/False/None}.
     """
-    return {name: resolve_bool_signal(name, listing) for name in BOOL_SIGNAL_DEFS}
+    return resolve_bool_signals(listing, BOOL_SIGNAL_DEFS)
 
 
 def synthetic_text_from_bools(listing: dict) -> List[str]:
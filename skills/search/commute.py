@@ -0,0 +1,247 @@
+"""Offline commute-time engine.
+
+Estimates door-to-door public-transport minutes without calling TfL:
+
+  - stations come from ``artifacts/stations.json`` (name, lat, lon, modes)
+  - each station links to its nearest same-mode neighbours (a stand-in for
+    line adjacency, which the station file does not carry); hop time is
+    distance / mode speed plus a dwell
+  - stations within a short walk of each other get an interchange edge
+  - listings and destinations reach the network on foot
+
+For a destination, one multi-source Dijkstra (seeded from every station
+within walking range of it) gives minutes-to-destination for all stations.
+Those tables are cached per rounded destination, and popular destinations
+can be precomputed at startup, so scoring hundreds of listings is a few
+dictionary lookups each.
+
+Estimates are deliberately coarse (±5–10 min) — good enough for display and
+ranking; ``backend/api_server.py`` still falls back to the TfL Journey API
+when a listing is outside walking range of any station.
+"""
+
+import heapq
+import json
+import math
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.settings import COMMUTE_POPULAR_DESTINATIONS, STATIONS_PATH
+
+WALK_M_PER_MIN = 80.0
+MAX_WALK_M = 1500.0
+INTERCHANGE_M = 400.0
+INTERCHANGE_PENALTY_MIN = 3.0
+WAIT_MIN = 4.0
+DWELL_MIN = 1.0
+NEIGHBOURS_PER_MODE = 4
+
+# Average in-vehicle speed (m/min) and longest plausible hop per mode.
+_MODE_SPEED = {
+    "tube": 550.0,
+    "elizabeth_line": 800.0,
+    "national_rail": 700.0,
+    "overground": 500.0,
+    "dlr": 450.0,
+    "tram": 350.0,
+}
+_MODE_MAX_HOP_M = {"elizabeth_line": 7000.0, "national_rail": 6000.0}
+_DEFAULT_MAX_HOP_M = 3500.0
+# Mode named in the summary when a station serves several.
+_MODE_PREFERENCE = ["tube", "elizabeth_line", "overground", "dlr", "national_rail", "tram"]
+_MODE_LABEL = {
+    "tube": "Underground",
+    "elizabeth_line": "Elizabeth line",
+    "national_rail": "National Rail",
+    "overground": "Overground",
+    "dlr": "DLR",
+    "tram": "Tram",
+}
+
+_GRID_DEG = 0.01
+_TABLE_CACHE_SIZE = 256
+
+
+def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    r = 6371000.0
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * r * math.asin(math.sqrt(a))
+
+
+def _cell(lat: float, lon: float) -> Tuple[int, int]:
+    return int(math.floor(lat / _GRID_DEG)), int(math.floor(lon / _GRID_DEG))
+
+
+class CommuteGraph:
+    def __init__(self, stations: List[Dict[str, Any]], edges: Optional[List[Dict[int, float]]] = None):
+        self.stations = [
+            s for s in stations
+            if isinstance(s, dict) and s.get("lat") is not None and s.get("lon") is not None
+        ]
+        self._grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, s in enumerate(self.stations):
+            self._grid[_cell(float(s["lat"]), float(s["lon"]))].append(i)
+        if edges is not None and len(edges) == len(self.stations):
+            self.edges = edges  # prebuilt (runtime bundle)
+        else:
+            self.edges = [{} for _ in self.stations]
+            self._build_edges()
+        self._tables: "OrderedDict[Tuple[float, float], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ── Build ────────────────────────────────────────────────────────────────
+
+    def _add_edge(self, a: int, b: int, minutes: float) -> None:
+        if minutes < self.edges[a].get(b, math.inf):
+            self.edges[a][b] = minutes
+            self.edges[b][a] = minutes
+
+    def _build_edges(self) -> None:
+        by_mode: Dict[str, List[int]] = defaultdict(list)
+        for i, s in enumerate(self.stations):
+            for mode in s.get("modes") or []:
+                by_mode[mode].append(i)
+        for mode, members in by_mode.items():
+            speed = _MODE_SPEED.get(mode, 500.0)
+            max_hop = _MODE_MAX_HOP_M.get(mode, _DEFAULT_MAX_HOP_M)
+            for i in members:
+                si = self.stations[i]
+                dists = sorted(
+                    (_haversine_m(si["lat"], si["lon"], self.stations[j]["lat"], self.stations[j]["lon"]), j)
+                    for j in members if j != i
+                )
+                for d, j in dists[:NEIGHBOURS_PER_MODE]:
+                    if d > max_hop:
+                        break
+                    self._add_edge(i, j, d / speed + DWELL_MIN)
+        for i, s in enumerate(self.stations):
+            for j, d in self.stations_near(s["lat"], s["lon"], INTERCHANGE_M):
+                if j != i:
+                    self._add_edge(i, j, d / WALK_M_PER_MIN + INTERCHANGE_PENALTY_MIN)
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    def stations_near(self, lat: float, lon: float, radius_m: float = MAX_WALK_M) -> List[Tuple[int, float]]:
+        """(station index, metres) within ``radius_m``, nearest first."""
+        r_lat = int(math.ceil(radius_m / 111000.0 / _GRID_DEG))
+        r_lon = int(math.ceil(radius_m / (111000.0 * max(0.1, math.cos(math.radians(lat)))) / _GRID_DEG))
+        c_lat, c_lon = _cell(lat, lon)
+        out: List[Tuple[int, float]] = []
+        for dy in range(-r_lat, r_lat + 1):
+            for dx in range(-r_lon, r_lon + 1):
+                for i in self._grid.get((c_lat + dy, c_lon + dx), ()):
+                    s = self.stations[i]
+                    d = _haversine_m(lat, lon, s["lat"], s["lon"])
+                    if d <= radius_m:
+                        out.append((i, d))
+        out.sort(key=lambda x: x[1])
+        return out
+
+    def _dijkstra(self, lat: float, lon: float) -> List[float]:
+        dist = [math.inf] * len(self.stations)
+        heap: List[Tuple[float, int]] = []
+        for i, d in self.stations_near(lat, lon):
+            t = d / WALK_M_PER_MIN
+            if t < dist[i]:
+                dist[i] = t
+                heap.append((t, i))
+        heapq.heapify(heap)
+        while heap:
+            t, i = heapq.heappop(heap)
+            if t > dist[i]:
+                continue
+            for j, w in self.edges[i].items():
+                nt = t + w
+                if nt < dist[j]:
+                    dist[j] = nt
+                    heapq.heappush(heap, (nt, j))
+        return dist
+
+    def destination_table(self, lat: float, lon: float) -> List[float]:
+        """Minutes from every station to the destination (cached per ~100 m)."""
+        key = (round(float(lat), 3), round(float(lon), 3))
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                return table
+        table = self._dijkstra(*key)
+        with self._lock:
+            self._tables[key] = table
+            while len(self._tables) > _TABLE_CACHE_SIZE:
+                self._tables.popitem(last=False)
+        return table
+
+    def commute(self, from_lat: float, from_lon: float, to_lat: float, to_lon: float) -> Optional[Dict[str, Any]]:
+        """{minutes, summary} for one origin, or None when no station is in reach."""
+        table = self.destination_table(to_lat, to_lon)
+        direct = _haversine_m(from_lat, from_lon, to_lat, to_lon)
+        best_t, best_i = math.inf, None
+        if direct <= 2 * MAX_WALK_M:
+            best_t = direct / WALK_M_PER_MIN
+        for i, d in self.stations_near(from_lat, from_lon):
+            t = d / WALK_M_PER_MIN + WAIT_MIN + table[i]
+            if t < best_t:
+                best_t, best_i = t, i
+        if math.isinf(best_t):
+            return None
+        minutes = max(1, int(round(best_t)))
+        if best_i is None:
+            return {"minutes": minutes, "summary": f"{minutes} min (walking)"}
+        s = self.stations[best_i]
+        modes = s.get("modes") or []
+        mode = next((_MODE_LABEL[m] for m in _MODE_PREFERENCE if m in modes), "transit")
+        return {"minutes": minutes, "summary": f"~{minutes} min via {s['name']} ({mode})"}
+
+    def commute_many(
+        self,
+        origins: Iterable[Tuple[float, float]],
+        to_lat: float,
+        to_lon: float,
+    ) -> List[Optional[Dict[str, Any]]]:
+        self.destination_table(to_lat, to_lon)
+        return [self.commute(lat, lon, to_lat, to_lon) for lat, lon in origins]
+
+
+_GRAPH: Optional[CommuteGraph] = None
+_GRAPH_LOCK = threading.Lock()
+
+
+def get_commute_graph() -> CommuteGraph:
+    global _GRAPH
+    if _GRAPH is None:
+        with _GRAPH_LOCK:
+            if _GRAPH is None:
+                try:
+                    with open(STATIONS_PATH, "r", encoding="utf-8") as f:
+                        stations = json.load(f)
+                except Exception:
+                    stations = []
+                _GRAPH = CommuteGraph(stations)
+    return _GRAPH
+
+
+def install_commute_graph(graph: CommuteGraph) -> None:
+    global _GRAPH
+    with _GRAPH_LOCK:
+        _GRAPH = graph
+
+
+def warm_popular_destinations() -> int:
+    """Precompute destination tables for COMMUTE_POPULAR_DESTINATIONS."""
+    graph = get_commute_graph()
+    wanted = {n.strip().lower() for n in COMMUTE_POPULAR_DESTINATIONS if n.strip()}
+    n = 0
+    for s in graph.stations:
+        if str(s.get("name") or "").lower() in wanted:
+            graph.destination_table(s["lat"], s["lon"])
+            n += 1
+    return n
+
+
+def estimate_commute(from_lat: float, from_lon: float, to_lat: float, to_lon: float) -> Optional[Dict[str, Any]]:
+    return get_commute_graph().commute(float(from_lat), float(from_lon), float(to_lat), float(to_lon))
@@ -27,6 +27,7 @@ from core.chatbot_config import (
     AVAILABLE_FROM_PREFIX_PATTERNS,
     AVAILABLE_FROM_BARE_PATTERNS,
 )
+from skills.search.geocoder import geocode_place
 from skills.search.text_utils import (
     _norm_furnish_value,
     _norm_property_type_value,
@@ -601,144 +602,16 @@ def _infer_min_tenancy_months_from_text(text: Any) -> Optional[float]:
     return None
 
 # --- Commute destination geocoding ---
-import json as _json
-import os as _os
-import urllib.request
-
-_STATION_INDEX: Dict[str, Dict[str, Any]] = {}
-
-def _load_station_index() -> Dict[str, Dict[str, Any]]:
-    global _STATION_INDEX
-    if _STATION_INDEX:
-        return _STATION_INDEX
-    path = _os.path.join(_os.path.dirname(__file__), "..", "..", "artifacts", "stations.json")
-    path = _os.path.normpath(path)
-    try:
-        with open(path, "r") as f:
-            stations = _json.load(f)
-        for s in stations:
-            key = s["name"].lower().strip()
-            _STATION_INDEX[key] = s
-            # Also index without " station" suffix
-            if key.endswith(" station"):
-                _STATION_INDEX[key[:-8]] = s
-            # Also index with " station" suffix if not present
-            if not key.endswith(" station"):
-                _STATION_INDEX[key + " station"] = s
-    except Exception:
-        pass
-    return _STATION_INDEX
-
-
-_COMMUTE_ABBREVS: Dict[str, str] = {
-    "kings x": "kings cross st pancras",
-    "kings cross": "kings cross st pancras",
-    "st pancras": "kings cross st pancras",
-    "liverpool st": "liverpool street",
-    "paddington stn": "paddington",
-    "waterloo stn": "waterloo",
-    "euston stn": "euston",
-    "victoria stn": "victoria",
-    "bank stn": "bank",
-    "old st": "old street",
-    "tottenham ct rd": "tottenham court road",
-    "tcr": "tottenham court road",
-    "elephant": "elephant & castle",
-    "the city": "bank",
-    "canary whf": "canary wharf",
-}
-
-
 def _geocode_commute_destination(name: str) -> Optional[Dict[str, Any]]:
     """Resolve a commute destination name to {name, lat, lon}.
 
-    1. Try stations.json lookup (exact, partial, abbreviation, fuzzy)
-    2. Fallback to TfL Place Search API
-    3. Fallback to OpenStreetMap Nominatim (any address)
+    Uses the offline place index (stations, regions, postcode districts,
+    landmarks); unknown places are resolved remotely in the background and
+    cached on disk for later turns.
     """
-    from skills.search.location_match import _edit_distance
-
     if not name or not isinstance(name, str):
         return None
-    cleaned = name.strip()
-    if not cleaned:
-        return None
-
-    idx = _load_station_index()
-    key = cleaned.lower()
-
-    # Exact match
-    if key in idx:
-        s = idx[key]
-        return {"name": s["name"], "lat": s["lat"], "lon": s["lon"]}
-
-    # Abbreviation expansion
-    expanded = _COMMUTE_ABBREVS.get(key)
-    if expanded and expanded in idx:
-        s = idx[expanded]
-        return {"name": s["name"], "lat": s["lat"], "lon": s["lon"]}
-
-    # Partial/substring match
-    for skey, s in idx.items():
-        if key in skey or skey in key:
-            return {"name": s["name"], "lat": s["lat"], "lon": s["lon"]}
-
-    # Fuzzy match via edit distance (handles typos like "oxfrd circus")
-    best_dist = 999
-    best_station = None
-    max_ed = max(1, min(3, len(key) // 4))  # allow 1-3 edits based on length
-    for skey, s in idx.items():
-        # Only compare if lengths are close (skip wildly different names)
-        if abs(len(skey) - len(key)) > max_ed + 1:
-            continue
-        dist = _edit_distance(key, skey)
-        if dist < best_dist and dist <= max_ed:
-            best_dist = dist
-            best_station = s
-    if best_station:
-        return {"name": best_station["name"], "lat": best_station["lat"], "lon": best_station["lon"]}
-
-    # Fallback 1: TfL Place Search API (transport-specific)
-    try:
-        import urllib.parse
-        encoded = urllib.parse.quote(cleaned)
-        url = f"https://api.tfl.gov.uk/Place/Search?name={encoded}&types=NaptanMetroStation,NaptanRailStation,NaptanBusCoachStation"
-        req = urllib.request.Request(url, headers={"User-Agent": "RentSearch/1.0"})
-        with urllib.request.urlopen(req, timeout=3) as resp:
-            data = _json.loads(resp.read().decode())
-        if isinstance(data, list) and data:
-            place = data[0]
-            return {
-                "name": place.get("commonName", cleaned),
-                "lat": place.get("lat"),
-                "lon": place.get("lon"),
-            }
-    except Exception:
-        pass
-
-    # Fallback 2: OpenStreetMap Nominatim (any address/place in London)
-    try:
-        import urllib.parse
-        query = f"{cleaned}, London, UK"
-        encoded = urllib.parse.quote(query)
-        url = (
-            f"https://nominatim.openstreetmap.org/search?q={encoded}"
-            "&format=json&limit=1&countrycodes=gb"
-            "&viewbox=-0.51,51.28,0.33,51.69&bounded=1"
-        )
-        req = urllib.request.Request(url, headers={"User-Agent": "RentSearch/1.0"})
-        with urllib.request.urlopen(req, timeout=3) as resp:
-            results = _json.loads(resp.read().decode())
-        if isinstance(results, list) and results:
-            hit = results[0]
-            lat = float(hit["lat"])
-            lon = float(hit["lon"])
-            display = hit.get("display_name", cleaned).split(",")[0]
-            return {"name": display, "lat": lat, "lon": lon}
-    except Exception:
-        pass
-
-    return None
+    return geocode_place(name)
 
 def _infer_commute_destination_from_query(text: str) -> Optional[str]:
     """Extract commute destination from user text via regex.
@@ -0,0 +1,147 @@
+"""Stage B hard constraints compiled into Qdrant payload conditions.
+
+Each condition is a relaxation of the matching Stage B check, so every row
+Stage B would keep still comes back from Stage A; Stage B keeps the final
+word and writes the audit trail. Stage B passes listings whose value is
+unknown, so every condition carries an ``IsEmpty`` escape on its field —
+points synced before the typed fields existed pass the same way.
+
+Not pushed down: layout ``property_type`` / studio tags (matched on raw
+text) and ``bool_preferences`` (resolved from text at query time).
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    from qdrant_client import models
+except ImportError:
+    models = None  # type: ignore[assignment]
+
+from skills.search.listing_fields import (
+    AVAILABLE_FROM_EPOCH,
+    BATHROOMS_NUM,
+    BEDROOMS_NUM,
+    FURNISH_NORM,
+    LET_TYPE_NORM,
+    MIN_TENANCY_MONTHS,
+    NON_RESIDENTIAL,
+    PRICE_PCM_NUM,
+    SIZE_SQM_NUM,
+    _epoch,
+    _norm_let_type,
+)
+from skills.search.text_utils import _norm_furnish_value
+
+_KEY_FIELDS = (
+    "layout_options", "max_rent_pcm", "available_from", "furnish_type",
+    "let_type", "min_tenancy_months", "min_size_sqm",
+)
+# Listing furnish values Stage B lets through for any requested furnish type.
+_FURNISH_ALWAYS_PASS = ("ask agent", "flexible", "")
+
+
+def _num(v: Any) -> Optional[float]:
+    # Same coercion as Stage B: a value it cannot read is not checked there either.
+    try:
+        return None if v is None else float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _or_unknown(field: str, cond: Any) -> Any:
+    return models.Filter(should=[cond, models.IsEmptyCondition(is_empty=models.PayloadField(key=field))])
+
+
+def _range(field: str, **bounds: float) -> Any:
+    return _or_unknown(field, models.FieldCondition(key=field, range=models.Range(**bounds)))
+
+
+def _match_any(field: str, values: List[str]) -> Any:
+    values = list(dict.fromkeys(values))
+    return _or_unknown(field, models.FieldCondition(key=field, match=models.MatchAny(any=values)))
+
+
+def _layout_option(opt: Dict[str, Any], budget: Optional[float]) -> List[Any]:
+    conds: List[Any] = []
+    bed = _num(opt.get("bedrooms"))
+    if bed is not None:
+        # Stage B compares int(round(listing)) with int(requested).
+        bed = float(int(bed))
+        conds.append(_range(BEDROOMS_NUM, gte=bed - 0.5, lte=bed + 0.5))
+    bath = _num(opt.get("bathrooms"))
+    if bath is not None:
+        conds.append(_range(BATHROOMS_NUM, gte=bath, lte=bath))
+    rent = _num(opt.get("max_rent_pcm"))
+    rent = rent if rent is not None else budget
+    if rent is not None:
+        conds.append(_range(PRICE_PCM_NUM, lte=rent))
+    return conds
+
+
+def _layout_conditions(options: List[Any], budget: Optional[float]) -> List[Any]:
+    branches: List[Any] = []
+    for opt in options:
+        if not isinstance(opt, dict):
+            continue
+        conds = _layout_option(opt, budget)
+        if not conds:
+            # This option matches any bedrooms/bathrooms/price.
+            return []
+        branches.append(models.Filter(must=conds))
+    return [models.Filter(should=branches)] if branches else []
+
+
+def compile_hard_constraints(c: Optional[Dict[str, Any]]) -> List[Any]:
+    """Conditions to AND into the Stage A filter (empty when nothing applies)."""
+    if models is None:
+        return []
+    c = c or {}
+    must: List[Any] = []
+
+    budget = _num(c.get("max_rent_pcm"))
+    options = c.get("layout_options") or []
+    if isinstance(options, list) and options:
+        must.extend(_layout_conditions(options, budget))
+    elif budget is not None:
+        must.append(_range(PRICE_PCM_NUM, lte=budget))
+
+    if c.get("available_from") is not None:
+        req_epoch = _epoch(pd.to_datetime(c.get("available_from"), errors="coerce"))
+        if req_epoch is not None:
+            # "Available now" points store no epoch, so they pass as unknown.
+            must.append(_range(AVAILABLE_FROM_EPOCH, lte=req_epoch))
+
+    furnish = _norm_furnish_value(c.get("furnish_type"))
+    if furnish:
+        must.append(_match_any(FURNISH_NORM, [furnish, *_FURNISH_ALWAYS_PASS]))
+
+    let_type = _norm_let_type(c.get("let_type"))
+    if let_type:
+        must.append(_match_any(LET_TYPE_NORM, [let_type, ""]))
+
+    tenancy = _num(c.get("min_tenancy_months"))
+    if tenancy is not None:
+        must.append(_range(MIN_TENANCY_MONTHS, lte=tenancy))
+
+    size = _num(c.get("min_size_sqm"))
+    if size is not None:
+        must.append(_range(SIZE_SQM_NUM, gte=size))
+    if not must:
+        # Leave the collection unfiltered (and uncounted) when no constraint is active.
+        return []
+    # Stage B drops non-residential rows outright; a missing flag never matches.
+    must.append(
+        models.Filter(must_not=[models.FieldCondition(key=NON_RESIDENTIAL, match=models.MatchValue(value=True))])
+    )
+    return must
+
+
+def hard_pushdown_key(c: Optional[Dict[str, Any]]) -> str:
+    """Identifies the hard constraints a pushed-down Stage A frame was filtered by ("" for none)."""
+    c = c or {}
+    active = {key: c[key] for key in _KEY_FIELDS if c.get(key) not in (None, "", [])}
+    # compile_hard_constraints pushes nothing down without active constraints.
+    return json.dumps(active, sort_keys=True, default=str) if active else ""
@@ -2,8 +2,8 @@ import json
 import math
 import os
 import re
-import time
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -14,10 +14,12 @@ except Exception:
     QdrantClient = None
     models = None
 
+from core.tracing import span
+
 try:
-    from crawler.london_regions import LONDON_REGIONS as _LONDON_REGIONS
+    from crawler.region_index import REGION_INDEX as _REGION_INDEX
 except Exception:
-    _LONDON_REGIONS = {}
+    _REGION_INDEX = None
 
 
 def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -31,27 +33,27 @@ def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
 
 def _geocode_location_keywords(keywords: List[str]) -> Optional[Tuple[float, float, str]]:
     """Match location keywords to a known London region. Returns (lat, lon, area_name) or None."""
-    if not _LONDON_REGIONS or not keywords:
+    if _REGION_INDEX is None or not keywords:
         return None
     for kw in keywords:
-        kw_norm = kw.strip().lower()
-        # Exact match first
-        for region_name, data in _LONDON_REGIONS.items():
-            if kw_norm == region_name.lower():
-                return data["lat"], data["lng"], region_name
-        # Substring match
-        for region_name, data in _LONDON_REGIONS.items():
-            rn = region_name.lower()
-            if kw_norm in rn or rn in kw_norm:
-                return data["lat"], data["lng"], region_name
+        region_name = _REGION_INDEX.match_keyword(kw)
+        if region_name:
+            lat, lon = _REGION_INDEX.center(region_name)
+            return lat, lon, region_name
     return None
 
 from skills.search.extractors import _safe_text, expand_location_keyword_candidates, _to_float
+from skills.search.constraint_pushdown import compile_hard_constraints, hard_pushdown_key
+from skills.search.sparse import SPARSE_VECTOR_NAME, query_sparse_vector
 from core.logger import log_message
 from core.settings import (
     QDRANT_COLLECTION,
     QDRANT_ENABLE_PREFILTER,
+    QDRANT_HYBRID,
+    QDRANT_HYBRID_PREFETCH,
+    QDRANT_HYBRID_RECALL,
     QDRANT_LOCAL_PATH,
+    QDRANT_PUSHDOWN_HARD,
     QDRANT_URL,
     QDRANT_API_KEY,
     STAGEA_TRACE,
@@ -103,13 +105,109 @@ def embed_query(embedder, q: str) -> np.ndarray:
     return x
 
 
+_SPARSE_READY: Dict[int, bool] = {}
+_SPARSE_READY_LOCK = threading.Lock()
+
+
+def _has_sparse_vector(client) -> bool:
+    """Whether the collection carries the BM25 sparse vector (older ones are dense-only)."""
+    key = id(client)
+    with _SPARSE_READY_LOCK:
+        if key in _SPARSE_READY:
+            return _SPARSE_READY[key]
+    ready = False
+    if hasattr(client, "query_points"):
+        try:
+            params = client.get_collection(QDRANT_COLLECTION).config.params
+            ready = SPARSE_VECTOR_NAME in (getattr(params, "sparse_vectors", None) or {})
+        except Exception as exc:
+            log_message("WARN", f"stageA sparse vector check failed: {exc}")
+    with _SPARSE_READY_LOCK:
+        _SPARSE_READY[key] = ready
+    if ready:
+        log_message("INFO", f"stageA hybrid retrieval enabled (sparse vector '{SPARSE_VECTOR_NAME}')")
+    return ready
+
+
+def _dense_search(client, qx: List[float], qfilter, limit: int, offset: int = 0) -> List[Any]:
+    if hasattr(client, "search"):
+        return client.search(
+            collection_name=QDRANT_COLLECTION,
+            query_vector=qx,
+            query_filter=qfilter,
+            limit=limit,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False,
+        )
+    qp = client.query_points(
+        collection_name=QDRANT_COLLECTION,
+        query=qx,
+        query_filter=qfilter,
+        limit=limit,
+        offset=offset,
+        with_payload=True,
+        with_vectors=False,
+    )
+    return list(getattr(qp, "points", []) or [])
+
+
+def _hybrid_search(client, qx: List[float], sparse, qfilter, limit: int, offset: int = 0) -> List[Any]:
+    """Dense and BM25 prefetch under the same filter, fused with reciprocal rank fusion."""
+    indices, values = sparse
+    branch = max(offset + limit, QDRANT_HYBRID_PREFETCH)
+    qp = client.query_points(
+        collection_name=QDRANT_COLLECTION,
+        prefetch=[
+            models.Prefetch(query=qx, filter=qfilter, limit=branch),
+            models.Prefetch(
+                query=models.SparseVector(indices=indices, values=values),
+                using=SPARSE_VECTOR_NAME,
+                filter=qfilter,
+                limit=branch,
+            ),
+        ],
+        query=models.FusionQuery(fusion=models.Fusion.RRF),
+        limit=limit,
+        offset=offset,
+        with_payload=True,
+        with_vectors=False,
+    )
+    return list(getattr(qp, "points", []) or [])
+
+
 def qdrant_search(
     client: QdrantClient,
     embedder,
     query: str,
-    recall: int,
+    recall: Union[int, Callable[[Optional[int]], int]],
     c: Optional[Dict[str, Any]] = None,
+    offset: int = 0,
+    pushdown: bool = QDRANT_PUSHDOWN_HARD,
+    query_vector: Optional[np.ndarray] = None,
+    prefilter_count: Optional[int] = None,
+    hybrid: bool = QDRANT_HYBRID,
 ) -> pd.DataFrame:
+    """Stage A recall.
+
+    ``recall`` may be a callable mapping the prefilter count to a limit, so
+    callers can size the fetch from filter selectivity. ``offset`` pages
+    further down the same ranking. The frame's attrs carry
+    ``prefilter_count``, the ``recall`` used and ``exhausted`` (no further
+    page can return anything).
+
+    With ``pushdown`` the Stage B hard constraints join the prefilter
+    (see constraint_pushdown); ``attrs["hard_pushdown"]`` then names the
+    constraints the frame was filtered by, and is "" for an unfiltered frame.
+
+    The attrs also keep the ``query_vector``. Further pages of the same turn
+    pass it (and ``prefilter_count``, for the same filter) back in, so they
+    neither re-embed the query nor re-count the filter.
+
+    ``hybrid=False`` keeps the dense search and its full ``recall``; the
+    fused list is capped at ``RENT_QDRANT_HYBRID_RECALL``, which suits a
+    ranked top-k but not an aggregate over every match.
+    """
     if models is None:
         raise ImportError("qdrant-client models are unavailable. Please run: pip install qdrant-client")
 
@@ -295,10 +393,21 @@ def qdrant_search(
             return None
         return models.Filter(must=must)
 
-    qx = embed_query(embedder, query)[0].tolist()
+    if query_vector is None:
+        query_vector = embed_query(embedder, query)[0]
+    qx = query_vector.tolist()
     qfilter = _build_qdrant_filter(c) if QDRANT_ENABLE_PREFILTER else None
-    prefilter_count = _count_prefilter_candidates(qfilter)
+    location_filter = qfilter
+    hard_conditions = compile_hard_constraints(c) if pushdown and QDRANT_ENABLE_PREFILTER else []
+    if hard_conditions:
+        qfilter = models.Filter(must=list(qfilter.must if qfilter is not None else []) + hard_conditions)
+    hard_key = hard_pushdown_key(c) if hard_conditions else ""
+    if prefilter_count is None:
+        prefilter_count = _count_prefilter_candidates(qfilter)
     trace_info["prefilter_count"] = prefilter_count
+    if callable(recall):
+        recall = int(recall(prefilter_count))
+    fetch_limit, exhausted = recall, True
     if STAGEA_TRACE:
         log_message("DEBUG", f"stageA backend=qdrant recall={recall} prefilter={QDRANT_ENABLE_PREFILTER}")
         log_message("DEBUG", f"stageA query={query}")
@@ -341,24 +450,26 @@ def qdrant_search(
         glat = _to_float(geo.get("lat"))
         glon = _to_float(geo.get("lng") or geo.get("lon"))
         grad = _to_float(geo.get("radius_km"))
-        _t_scroll = time.perf_counter()
         all_points = []
-        offset = None
+        cursor = None
         GEO_SCROLL_MAX = 15000
-        while True:
-            points, offset = client.scroll(
-                collection_name=QDRANT_COLLECTION,
-                scroll_filter=qfilter,
-                limit=512,
-                offset=offset,
-                with_payload=True,
-                with_vectors=False,
-            )
-            all_points.extend(points or [])
-            if offset is None or len(all_points) >= GEO_SCROLL_MAX:
-                break
-        hit_cap = len(all_points) >= GEO_SCROLL_MAX
-        print(f"[TIMING] qdrant_geo_scroll={time.perf_counter()-_t_scroll:.2f}s total={len(all_points)} hit_cap={hit_cap}")
+        with span("qdrant.geo_scroll") as sp:
+            # One scroll returns the whole box, so there is no further page.
+            while offset == 0:
+                points, cursor = client.scroll(
+                    collection_name=QDRANT_COLLECTION,
+                    scroll_filter=qfilter,
+                    limit=512,
+                    offset=cursor,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+                all_points.extend(points or [])
+                if cursor is None or len(all_points) >= GEO_SCROLL_MAX:
+                    break
+            hit_cap = len(all_points) >= GEO_SCROLL_MAX
+            sp.set(total=len(all_points), hit_cap=hit_cap)
+        exhausted = not hit_cap
 
         rows = []
         # Skip haversine when: exact viewport bounds were used (min/max lat/lng) — no circle needed;
@@ -379,28 +490,19 @@ def qdrant_search(
             rows.append(payload)
         log_message("INFO", f"stageA geo_scroll: {len(rows)} listings within {grad}km (scrolled {len(all_points)} from bbox)")
     else:
-        # Standard vector search path
-        _t_qdrant = time.perf_counter()
-        if hasattr(client, "search"):
-            hits = client.search(
-                collection_name=QDRANT_COLLECTION,
-                query_vector=qx,
-                query_filter=qfilter,
-                limit=recall,
-                with_payload=True,
-                with_vectors=False,
-            )
-        else:
-            qp = client.query_points(
-                collection_name=QDRANT_COLLECTION,
-                query=qx,
-                query_filter=qfilter,
-                limit=recall,
-                with_payload=True,
-                with_vectors=False,
-            )
-            hits = list(getattr(qp, "points", []) or [])
-        print(f"[TIMING] qdrant_search={time.perf_counter()-_t_qdrant:.2f}s recall={recall} hits={len(hits)}")
+        # Standard vector search path. With the sparse vector indexed, keyword
+        # terms ("concierge", "roof terrace") are recalled lexically, so the
+        # fused list can be much shorter than a dense-only recall.
+        sparse_q = query_sparse_vector(query) if hybrid and _has_sparse_vector(client) else ([], [])
+        hybrid = bool(sparse_q[0])
+        limit = fetch_limit = min(recall, QDRANT_HYBRID_RECALL) if hybrid else recall
+        with span("qdrant.search", recall=limit, offset=offset, hybrid=hybrid) as sp:
+            if hybrid:
+                hits = _hybrid_search(client, qx, sparse_q, qfilter, limit, offset)
+            else:
+                hits = _dense_search(client, qx, qfilter, limit, offset)
+            sp.set(hits=len(hits))
+        exhausted = len(hits) < limit
 
         rows = []
         # Post-filter for geometric radius if geo_bound + location_keywords combo
@@ -437,34 +539,21 @@ def qdrant_search(
     loc_keywords = [str(x).strip() for x in (c or {}).get("location_keywords") or [] if str(x).strip()]
     has_geo_bound = isinstance((c or {}).get("geo_bound"), dict)
     
-    if not rows and loc_keywords and not has_geo_bound:
+    # With pushed-down constraints an empty result is only a token miss if
+    # the location filter alone matches nothing.
+    if (
+        not rows and loc_keywords and not has_geo_bound and offset == 0
+        and (not hard_key or _count_prefilter_candidates(location_filter) == 0)
+    ):
         geo_result = _geocode_location_keywords(loc_keywords)
         if geo_result:
             center_lat, center_lon, area_name = geo_result
             GEO_RADIUS_KM = 3.0
             log_message("INFO", f"stageA geo_fallback: token miss → radius {GEO_RADIUS_KM}km around '{area_name}' ({center_lat},{center_lon})")
-            _t_geo = time.perf_counter()
             try:
-                if hasattr(client, "search"):
-                    geo_hits = client.search(
-                        collection_name=QDRANT_COLLECTION,
-                        query_vector=qx,
-                        query_filter=None,
-                        limit=recall,
-                        with_payload=True,
-                        with_vectors=False,
-                    )
-                else:
-                    gqp = client.query_points(
-                        collection_name=QDRANT_COLLECTION,
-                        query=qx,
-                        query_filter=None,
-                        limit=recall,
-                        with_payload=True,
-                        with_vectors=False,
-                    )
-                    geo_hits = list(getattr(gqp, "points", []) or [])
-                print(f"[TIMING] geo_fallback_search={time.perf_counter()-_t_geo:.2f}s hits={len(geo_hits)}")
+                with span("qdrant.geo_fallback", recall=recall) as sp:
+                    geo_hits = _dense_search(client, qx, None, recall)
+                    sp.set(hits=len(geo_hits))
                 for h in geo_hits:
                     payload = dict(h.payload or {})
                     lat = payload.get("latitude")
@@ -487,16 +576,18 @@ def qdrant_search(
 
             if rows:
                 df = pd.DataFrame(rows).reset_index(drop=True)
-                df.attrs["prefilter_count"] = prefilter_count
+                df.attrs.update(
+                    prefilter_count=prefilter_count, recall=recall, exhausted=True, hard_pushdown="",
+                    query_vector=query_vector,
+                )
                 df.attrs["geo_fallback_area"] = area_name
                 return df
 
-    if not rows:
-        df = pd.DataFrame()
-        df.attrs["prefilter_count"] = prefilter_count
-        return df
-    df = pd.DataFrame(rows).reset_index(drop=True)
-    df.attrs["prefilter_count"] = prefilter_count
+    df = pd.DataFrame(rows).reset_index(drop=True) if rows else pd.DataFrame()
+    df.attrs.update(
+        prefilter_count=prefilter_count, recall=fetch_limit, exhausted=exhausted, hard_pushdown=hard_key,
+        query_vector=query_vector,
+    )
     return df
 
 
@@ -504,7 +595,15 @@ def stage_a_search(
     client,
     embedder,
     query: str,
-    recall: int,
+    recall: Union[int, Callable[[Optional[int]], int]],
     c: Optional[Dict[str, Any]] = None,
+    offset: int = 0,
+    pushdown: bool = QDRANT_PUSHDOWN_HARD,
+    query_vector: Optional[np.ndarray] = None,
+    prefilter_count: Optional[int] = None,
+    hybrid: bool = QDRANT_HYBRID,
 ) -> pd.DataFrame:
-    return qdrant_search(client, embedder, query=query, recall=recall, c=c)
+    return qdrant_search(
+        client, embedder, query=query, recall=recall, c=c, offset=offset, pushdown=pushdown,
+        query_vector=query_vector, prefilter_count=prefilter_count, hybrid=hybrid,
+    )
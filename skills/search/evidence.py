@@ -1,14 +1,13 @@
 """Stage D — evidence building for grounded explanation."""
 
 import json
-import re
 from typing import Any, Dict, List
 from urllib.parse import urlparse
 
 import pandas as pd
 
-from skills.search.hard_filter import _parse_available_from_date
-from skills.search.text_utils import _safe_text, _to_float
+from skills.search.listing_fields import listing_available_from, listing_min_tenancy_months
+from skills.search.text_utils import _to_float
 
 
 def build_evidence_for_row(r: Dict[str, Any], c: Dict[str, Any], user_query: str = "") -> Dict[str, Any]:
@@ -44,17 +43,15 @@ def build_evidence_for_row(r: Dict[str, Any], c: Dict[str, Any], user_query: str
         except Exception:
             fields["within_budget"] = None
 
+    _, dt_any = listing_available_from(r)
     if c.get("available_from") is not None:
-        dt = _parse_available_from_date(r.get("available_from"))
-        fields["available_from"] = None if pd.isna(dt) else dt.date().isoformat()
+        fields["available_from"] = None if pd.isna(dt_any) else dt_any.date().isoformat()
         fields["available_required"] = str(c["available_from"])
         fields["available_op"] = "lte"
 
     if c.get("min_tenancy_months") is not None:
         try:
-            raw_t = _safe_text(r.get("min_tenancy"))
-            m = re.search(r"(\d+(?:\.\d+)?)", raw_t)
-            fields["min_tenancy_months"] = float(m.group(1)) if m else None
+            fields["min_tenancy_months"] = listing_min_tenancy_months(r)
             fields["min_tenancy_required_months"] = float(c["min_tenancy_months"])
         except Exception:
             fields["min_tenancy_months"] = None
@@ -77,7 +74,6 @@ def build_evidence_for_row(r: Dict[str, Any], c: Dict[str, Any], user_query: str
     fields["price_pcm"] = None if pd.isna(pd.to_numeric(r.get("price_pcm"), errors="coerce")) else float(pd.to_numeric(r.get("price_pcm"), errors="coerce"))
     fields["bedrooms"] = None if pd.isna(pd.to_numeric(r.get("bedrooms"), errors="coerce")) else int(float(pd.to_numeric(r.get("bedrooms"), errors="coerce")))
     fields["bathrooms"] = None if pd.isna(pd.to_numeric(r.get("bathrooms"), errors="coerce")) else float(pd.to_numeric(r.get("bathrooms"), errors="coerce"))
-    dt_any = _parse_available_from_date(r.get("available_from"))
     fields["available_from"] = None if pd.isna(dt_any) else dt_any.date().isoformat()
 
     ev["fields"] = fields
@@ -0,0 +1,328 @@
+"""Offline place geocoder for commute destinations.
+
+Resolves a free-text place ("Oxford Circus", "kings x", "UCL", "E14",
+"Shoreditch") to ``{name, lat, lon}`` from a local index of:
+
+  - stations (``artifacts/stations.json``)
+  - mental regions (``crawler/london_regions.LONDON_REGIONS``)
+  - postcode districts (centroid of the regions that list them)
+  - common landmarks / employers / campuses (``_LANDMARKS``)
+
+Lookup order: exact normalised name / postcode → prefix (trie) → known place named
+inside the query → bounded edit distance over the trie. Anything still
+unresolved is looked up remotely (TfL Place Search, then Nominatim) on a
+background thread and written to a JSON disk cache, so a turn never waits
+on third-party HTTP; the next mention of the same place resolves locally.
+"""
+
+import json
+import os
+import re
+import threading
+import urllib.parse
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.settings import GEOCODE_CACHE_PATH, GEOCODE_REMOTE_WAIT_S, STATIONS_PATH
+
+try:
+    from crawler.london_regions import LONDON_REGIONS as _LONDON_REGIONS
+except Exception:
+    _LONDON_REGIONS = {}
+
+# name -> (lat, lon); coordinates are approximate building/campus centres.
+_LANDMARKS: Dict[str, Tuple[float, float]] = {
+    "The Shard": (51.5045, -0.0865),
+    "British Museum": (51.5194, -0.1270),
+    "Tate Modern": (51.5076, -0.0994),
+    "Houses of Parliament": (51.4995, -0.1248),
+    "Barbican Centre": (51.5200, -0.0937),
+    "O2 Arena": (51.5030, 0.0032),
+    "Olympic Park": (51.5430, -0.0166),
+    "Wembley Stadium": (51.5560, -0.2796),
+    "Hyde Park": (51.5073, -0.1657),
+    "Westfield Stratford": (51.5432, -0.0063),
+    "Westfield White City": (51.5074, -0.2214),
+    "Heathrow Airport": (51.4700, -0.4543),
+    "London City Airport": (51.5048, 0.0495),
+    "UCL": (51.5246, -0.1340),
+    "University College London": (51.5246, -0.1340),
+    "Imperial College": (51.4988, -0.1749),
+    "LSE": (51.5144, -0.1165),
+    "London School of Economics": (51.5144, -0.1165),
+    "King's College London": (51.5115, -0.1160),
+    "Queen Mary University": (51.5241, -0.0404),
+    "City University": (51.5279, -0.1023),
+    "Guy's Hospital": (51.5030, -0.0870),
+    "St Thomas' Hospital": (51.4988, -0.1183),
+    "St Bartholomew's Hospital": (51.5175, -0.1000),
+    "Royal London Hospital": (51.5185, -0.0590),
+    "Great Ormond Street Hospital": (51.5225, -0.1205),
+    "Google King's Cross": (51.5333, -0.1260),
+    "Meta London": (51.5176, -0.1343),
+    "Amazon Principal Place": (51.5220, -0.0790),
+    "Bloomberg London": (51.5126, -0.0907),
+    "BBC Broadcasting House": (51.5188, -0.1439),
+}
+
+# Common abbreviations → indexed name.
+_ALIASES: Dict[str, str] = {
+    "kings x": "kings cross st pancras",
+    "kings cross": "kings cross st pancras",
+    "st pancras": "kings cross st pancras",
+    "liverpool st": "liverpool street",
+    "paddington stn": "paddington",
+    "waterloo stn": "waterloo",
+    "euston stn": "euston",
+    "victoria stn": "victoria",
+    "bank stn": "bank",
+    "old st": "old street",
+    "tottenham ct rd": "tottenham court road",
+    "tcr": "tottenham court road",
+    "elephant": "elephant & castle",
+    "the city": "bank",
+    "canary whf": "canary wharf",
+}
+
+_KIND_PRIORITY = {"station": 0, "landmark": 1, "region": 2, "district": 3}
+_DISTRICT_RE = re.compile(r"^([a-z]{1,2}\d{1,2}[a-z]?)(?:\s*\d[a-z]{2})?$")
+
+
+def normalize_place(text: str) -> str:
+    s = str(text or "").lower().replace("&", " and ")
+    s = re.sub(r"[’'`.]", "", s)
+    s = re.sub(r"[^a-z0-9]+", " ", s).strip()
+    s = re.sub(r"\s+(?:station|stn|tube station|underground station)$", "", s)
+    return s
+
+
+class _TrieNode:
+    __slots__ = ("children", "entry")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.entry: Optional[Dict[str, Any]] = None
+
+
+class PlaceIndex:
+    def __init__(self, entries: List[Dict[str, Any]], aliases: Optional[Dict[str, str]] = None):
+        self.exact: Dict[str, Dict[str, Any]] = {}
+        for e in entries:
+            key = normalize_place(e["name"])
+            if not key:
+                continue
+            cur = self.exact.get(key)
+            if cur is None or _KIND_PRIORITY[e["kind"]] < _KIND_PRIORITY[cur["kind"]]:
+                self.exact[key] = e
+        for alias, target in (aliases or {}).items():
+            hit = self.exact.get(normalize_place(target))
+            if hit is not None:
+                self.exact.setdefault(normalize_place(alias), hit)
+        self.root = _TrieNode()
+        for key, e in self.exact.items():
+            node = self.root
+            for ch in key:
+                node = node.children.setdefault(ch, _TrieNode())
+            node.entry = e
+        self.max_words = max((len(k.split()) for k in self.exact), default=1)
+
+    def _prefix(self, key: str) -> Optional[Dict[str, Any]]:
+        """Shortest indexed name starting with ``key`` (whole-word prefix)."""
+        node = self.root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        frontier = [(node, "")]
+        while frontier:
+            nxt = []
+            for n, suffix in frontier:
+                if n.entry is not None and (not suffix or suffix.startswith(" ")):
+                    return n.entry
+                nxt.extend((c, suffix + ch) for ch, c in sorted(n.children.items()))
+            frontier = nxt
+        return None
+
+    def _contained(self, key: str) -> Optional[Dict[str, Any]]:
+        """Longest indexed name appearing as a word n-gram of ``key``."""
+        words = key.split()
+        for n in range(min(self.max_words, len(words)), 0, -1):
+            for i in range(len(words) - n + 1):
+                hit = self.exact.get(" ".join(words[i:i + n]))
+                if hit is not None and (n > 1 or len(words[i]) > 3):
+                    return hit
+        return None
+
+    def _fuzzy(self, key: str, max_ed: int) -> Optional[Dict[str, Any]]:
+        """Closest name within ``max_ed`` edits (Levenshtein over the trie)."""
+        best: List[Any] = [max_ed + 1, None]
+        first_row = list(range(len(key) + 1))
+
+        def walk(node: _TrieNode, ch: str, prev_row: List[int]) -> None:
+            row = [prev_row[0] + 1]
+            for i in range(1, len(key) + 1):
+                row.append(min(row[i - 1] + 1, prev_row[i] + 1, prev_row[i - 1] + (key[i - 1] != ch)))
+            if node.entry is not None and row[-1] < best[0]:
+                best[0], best[1] = row[-1], node.entry
+            if min(row) < best[0]:
+                for c, child in node.children.items():
+                    walk(child, c, row)
+
+        for c, child in self.root.children.items():
+            walk(child, c, first_row)
+        return best[1]
+
+    def lookup(self, text: str) -> Optional[Dict[str, Any]]:
+        key = normalize_place(text)
+        if not key:
+            return None
+        hit = self.exact.get(key)
+        if hit is None:
+            m = _DISTRICT_RE.match(key)
+            if m:
+                return self.exact.get(m.group(1))
+        if hit is None and len(key) >= 4:
+            hit = self._prefix(key)
+        if hit is None:
+            hit = self._contained(key)
+        if hit is None and len(key) >= 4:
+            hit = self._fuzzy(key, max(1, min(3, len(key) // 4)))
+        return hit
+
+
+def _build_entries() -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    try:
+        with open(STATIONS_PATH, "r", encoding="utf-8") as f:
+            for s in json.load(f):
+                entries.append({"name": s["name"], "lat": s["lat"], "lon": s["lon"], "kind": "station"})
+    except Exception:
+        pass
+    for name, (lat, lon) in _LANDMARKS.items():
+        entries.append({"name": name, "lat": lat, "lon": lon, "kind": "landmark"})
+    districts: Dict[str, List[Tuple[float, float]]] = {}
+    for name, data in _LONDON_REGIONS.items():
+        entries.append({"name": name, "lat": data["lat"], "lon": data["lng"], "kind": "region"})
+        for pc in data.get("postcodes") or []:
+            districts.setdefault(str(pc).upper(), []).append((data["lat"], data["lng"]))
+    for pc, pts in districts.items():
+        entries.append({
+            "name": pc,
+            "lat": round(sum(p[0] for p in pts) / len(pts), 5),
+            "lon": round(sum(p[1] for p in pts) / len(pts), 5),
+            "kind": "district",
+        })
+    return entries
+
+
+_INDEX: Optional[PlaceIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_place_index() -> PlaceIndex:
+    global _INDEX
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                _INDEX = PlaceIndex(_build_entries(), _ALIASES)
+    return _INDEX
+
+
+# ── Remote resolutions (background, disk-cached) ─────────────────────────────
+
+_REMOTE_CACHE: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+_REMOTE_LOCK = threading.Lock()
+_REMOTE_INFLIGHT: Dict[str, threading.Thread] = {}
+
+
+def _remote_cache() -> Dict[str, Optional[Dict[str, Any]]]:
+    global _REMOTE_CACHE
+    if _REMOTE_CACHE is None:
+        cache: Dict[str, Optional[Dict[str, Any]]] = {}
+        if os.path.exists(GEOCODE_CACHE_PATH):
+            try:
+                with open(GEOCODE_CACHE_PATH, "r", encoding="utf-8") as f:
+                    cache = json.load(f)
+            except Exception:
+                cache = {}
+        _REMOTE_CACHE = cache
+    return _REMOTE_CACHE
+
+
+def _save_remote_cache() -> None:
+    try:
+        os.makedirs(os.path.dirname(GEOCODE_CACHE_PATH), exist_ok=True)
+        tmp = GEOCODE_CACHE_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_remote_cache(), f, ensure_ascii=False)
+        os.replace(tmp, GEOCODE_CACHE_PATH)
+    except Exception:
+        pass
+
+
+def _resolve_remote(cleaned: str) -> Optional[Dict[str, Any]]:
+    # TfL Place Search API (transport-specific)
+    try:
+        encoded = urllib.parse.quote(cleaned)
+        url = f"https://api.tfl.gov.uk/Place/Search?name={encoded}&types=NaptanMetroStation,NaptanRailStation,NaptanBusCoachStation"
+        req = urllib.request.Request(url, headers={"User-Agent": "RentSearch/1.0"})
+        with urllib.request.urlopen(req, timeout=3) as resp:
+            data = json.loads(resp.read().decode())
+        if isinstance(data, list) and data:
+            place = data[0]
+            return {"name": place.get("commonName", cleaned), "lat": place.get("lat"), "lon": place.get("lon")}
+    except Exception:
+        pass
+
+    # OpenStreetMap Nominatim (any address/place in London)
+    try:
+        encoded = urllib.parse.quote(f"{cleaned}, London, UK")
+        url = (
+            f"https://nominatim.openstreetmap.org/search?q={encoded}"
+            "&format=json&limit=1&countrycodes=gb"
+            "&viewbox=-0.51,51.28,0.33,51.69&bounded=1"
+        )
+        req = urllib.request.Request(url, headers={"User-Agent": "RentSearch/1.0"})
+        with urllib.request.urlopen(req, timeout=3) as resp:
+            results = json.loads(resp.read().decode())
+        if isinstance(results, list) and results:
+            hit = results[0]
+            display = hit.get("display_name", cleaned).split(",")[0]
+            return {"name": display, "lat": float(hit["lat"]), "lon": float(hit["lon"])}
+    except Exception:
+        pass
+    return None
+
+
+def _remote_worker(key: str, cleaned: str) -> None:
+    result = _resolve_remote(cleaned)
+    with _REMOTE_LOCK:
+        _remote_cache()[key] = result
+        _save_remote_cache()
+        _REMOTE_INFLIGHT.pop(key, None)
+
+
+def geocode_place(name: str) -> Optional[Dict[str, Any]]:
+    """Resolve a place to {name, lat, lon} without blocking on the network."""
+    cleaned = str(name or "").strip()
+    if not cleaned:
+        return None
+    hit = get_place_index().lookup(cleaned)
+    if hit is not None:
+        return {"name": hit["name"], "lat": hit["lat"], "lon": hit["lon"]}
+
+    key = normalize_place(cleaned)
+    with _REMOTE_LOCK:
+        cache = _remote_cache()
+        if key in cache:
+            return cache[key]
+        worker = _REMOTE_INFLIGHT.get(key)
+        if worker is None:
+            worker = threading.Thread(target=_remote_worker, args=(key, cleaned), daemon=True)
+            _REMOTE_INFLIGHT[key] = worker
+            worker.start()
+    if GEOCODE_REMOTE_WAIT_S > 0:
+        worker.join(GEOCODE_REMOTE_WAIT_S)
+        with _REMOTE_LOCK:
+            return _remote_cache().get(key)
+    return None
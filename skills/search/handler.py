@@ -17,13 +17,6 @@ import json
 import re
 from typing import Any, Dict, Optional, Tuple
 
-try:
-    from fastembed import TextEmbedding as _FastEmbed
-    _USE_FASTEMBED = True
-except ImportError:
-    from sentence_transformers import SentenceTransformer as _FastEmbed  # type: ignore
-    _USE_FASTEMBED = False
-
 from core.chatbot_config import QWEN_BASE_URL, QWEN_MODEL
 from core.llm_client import (
     format_grounded_evidence,
@@ -37,6 +30,7 @@ from core.logger import (
     RANKING_LOG_DETAIL,
     append_ranking_log_entry,
     log_message,
+    ranking_log_candidate_limit,
 )
 from core.settings import (
     EMBED_MODEL,
@@ -156,6 +150,7 @@ def build_pipeline_deps(stage_note):
         logging=LoggingDeps(
             append_ranking_log_entry=append_ranking_log_entry,
             log_message=log_message,
+            ranking_log_candidate_limit=ranking_log_candidate_limit,
         ),
     )
 
@@ -165,8 +160,10 @@ def build_pipeline_deps(stage_note):
 # ---------------------------------------------------------------------------
 
 def run_chat():
+    from skills.search.agentic import embedder_class  # local import: agentic imports this module
+
     qdrant_client = load_stage_a_resources()
-    embedder = _FastEmbed(EMBED_MODEL)
+    embedder = embedder_class()(EMBED_MODEL)
 
     state = init_runtime_state()
 
@@ -1,51 +1,27 @@
 """Stage B — hard-constraint filtering with audit trail."""
 
-import re
-from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from skills.search.listing_fields import (  # noqa: F401  (parsers re-exported for older imports)
+    _is_available_now,
+    _norm_let_type,
+    _parse_available_from_date,
+    _parse_months,
+    listing_available_from,
+    listing_furnish,
+    listing_let_type,
+    listing_min_tenancy_months,
+    listing_non_residential,
+)
 from skills.search.text_utils import _norm_furnish_value, _safe_text, _to_float
 from skills.search.signals import candidate_snapshot
 
 try:
-    from skills.search.bool_signals import resolve_bool_signal
+    from skills.search.bool_signals import resolve_bool_signals
 except ImportError:
-    resolve_bool_signal = None  # type: ignore[assignment]
-
-
-# ---------------------------------------------------------------------------
-# Date helpers
-# ---------------------------------------------------------------------------
-
-def _parse_available_from_date(v: Any) -> pd.Timestamp:
-    s = _safe_text(v).strip()
-    if not s:
-        return pd.NaT
-    lowered = s.lower()
-    if lowered in {"now", "available now", "immediately", "immediate"}:
-        return pd.Timestamp(datetime.utcnow().date())
-    return pd.to_datetime(s, errors="coerce", dayfirst=True)
-
-
-def _is_available_now(v: Any) -> bool:
-    s = _safe_text(v).strip().lower()
-    return s in {"now", "available now", "immediately", "immediate"}
-
-
-def _parse_months(v: Any) -> Optional[float]:
-    """Parse a tenancy string like '6 months' or '12' → float months, or None."""
-    s = _safe_text(v).lower()
-    if not s:
-        return None
-    m = re.search(r"(\d+(?:\.\d+)?)", s)
-    if not m:
-        return None
-    try:
-        return float(m.group(1))
-    except Exception:
-        return None
+    resolve_bool_signals = None  # type: ignore[assignment]
 
 
 # ---------------------------------------------------------------------------
@@ -57,31 +33,23 @@ def apply_hard_filters_with_audit(df: pd.DataFrame, c: Dict[str, Any]) -> Tuple[
     if df is None or len(df) == 0:
         return df, []
 
-    # Always exclude non-residential property types
-    _NON_RESIDENTIAL = {"parking", "garage", "land", "commercial", "office", "storage"}
-
     keep_indices: List[int] = []
     audits: List[Dict[str, Any]] = []
+    req_dt = pd.to_datetime(c.get("available_from"), errors="coerce")
 
     for idx, row in df.iterrows():
         r = row.to_dict()
         reasons: List[str] = []
+        # Canonical constraint name per entry in `reasons` (same order), so
+        # downstream sensitivity analysis never has to re-parse reason text.
+        fail_fields: List[str] = []
         checks: Dict[str, Any] = {}
 
-        def _norm_cat_text(v: Any) -> str:
-            s = _safe_text(v).lower()
-            if not s:
-                return ""
-            s = s.replace("_", " ").replace("-", " ")
-            s = re.sub(r"\s+", " ", s).strip()
-            return s
-
         def _norm_furnish(v: Any) -> str:
             return _norm_furnish_value(v)
 
         # Skip non-residential listings (parking, garages, land, etc.)
-        prop_type_raw = _safe_text(r.get("property_type")).lower().strip()
-        if any(nr in prop_type_raw for nr in _NON_RESIDENTIAL):
+        if listing_non_residential(r):
             continue
 
         layout_options = c.get("layout_options") or []
@@ -168,6 +136,7 @@ def apply_hard_filters_with_audit(df: pd.DataFrame, c: Dict[str, Any]) -> Tuple[
             }
             if not any_pass:
                 reasons.append("layout_options no option matched")
+                fail_fields.append("layout")
 
         rent_req = c.get("max_rent_pcm")
         has_layout_budget = any(
@@ -179,13 +148,11 @@ def apply_hard_filters_with_audit(df: pd.DataFrame, c: Dict[str, Any]) -> Tuple[
             checks["max_rent_pcm"] = {"actual": rent_val, "required": float(rent_req), "op": "lte"}
             if rent_val is not None and rent_val > float(rent_req):
                 reasons.append(f"price {rent_val:g} > {float(rent_req):g}")
+                fail_fields.append("budget")
 
         avail_req = c.get("available_from")
         if avail_req is not None:
-            listing_raw = r.get("available_from")
-            listing_now = _is_available_now(listing_raw)
-            listing_dt = _parse_available_from_date(listing_raw)
-            req_dt = pd.to_datetime(avail_req, errors="coerce")
+            listing_now, listing_dt = listing_available_from(r)
             checks["available_from"] = {
                 "actual": "now" if listing_now else (None if pd.isna(listing_dt) else listing_dt.date().isoformat()),
                 "required": None if pd.isna(req_dt) else req_dt.date().isoformat(),
@@ -195,28 +162,31 @@ def apply_hard_filters_with_audit(df: pd.DataFrame, c: Dict[str, Any]) -> Tuple[
                 reasons.append(
                     f"available_from {listing_dt.date().isoformat()} > {req_dt.date().isoformat()}"
                 )
+                fail_fields.append("available_from")
 
         furnish_req = _norm_furnish(c.get("furnish_type"))
         if furnish_req:
-            furnish_val = _norm_furnish(r.get("furnish_type"))
+            furnish_val = listing_furnish(r)
             checks["furnish_type"] = {"actual": furnish_val or None, "required": furnish_req, "op": "eq"}
             # "ask agent" and "flexible" should pass hard filter for furnish_type.
             if furnish_val and furnish_val not in {"ask agent", "flexible"} and furnish_val != furnish_req:
                 reasons.append(f"furnish_type '{furnish_val}' != '{furnish_req}'")
+                fail_fields.append("furnish_type")
 
-        let_req = _norm_cat_text(c.get("let_type"))
+        let_req = _norm_let_type(c.get("let_type"))
         if let_req:
-            let_val = _norm_cat_text(r.get("let_type"))
+            let_val = listing_let_type(r)
             checks["let_type"] = {"actual": let_val or None, "required": let_req, "op": "eq"}
             if let_val and let_val != let_req:
                 reasons.append(f"let_type '{let_val}' != '{let_req}'")
+                fail_fields.append("let_type")
 
         # min_tenancy_months: user will commit to at most N months.
         # A listing whose required minimum tenancy exceeds N is rejected —
         # the user cannot fulfil the listing's commitment requirement.
         tenancy_req = c.get("min_tenancy_months")
         if tenancy_req is not None:
-            listing_min = _parse_months(r.get("min_tenancy"))
+            listing_min = listing_min_tenancy_months(r)
             checks["min_tenancy_months"] = {
                 "actual": listing_min,
                 "required": float(tenancy_req),
@@ -226,6 +196,7 @@ def apply_hard_filters_with_audit(df: pd.DataFrame, c: Dict[str, Any]) -> Tuple[
                 reasons.append(
                     f"listing requires {listing_min:g}-month min tenancy; user can commit {float(tenancy_req):g} months max"
                 )
+                fail_fields.append("min_tenancy")
 
         size_req = c.get("min_size_sqm")
         if size_req is not None:
@@ -239,14 +210,17 @@ def apply_hard_filters_with_audit(df: pd.DataFrame, c: Dict[str, Any]) -> Tuple[
             }
             if actual_sqm is not None and actual_sqm < float(size_req):
                 reasons.append(f"size_sqm {actual_sqm:g} < {float(size_req):g}")
+                fail_fields.append("min_size_sqm")
 
         # Boolean signal hard filtering
-        if resolve_bool_signal is not None:
+        if resolve_bool_signals is not None:
             bool_prefs = c.get("bool_preferences") or {}
+            resolved_bools = resolve_bool_signals(r, bool_prefs) if bool_prefs else {}
             for signal_name, wanted in bool_prefs.items():
-                resolved = resolve_bool_signal(signal_name, r)
+                resolved = resolved_bools.get(signal_name)
                 if resolved is not None and resolved != wanted:
                     reasons.append(f"bool_{signal_name}={resolved} != wanted={wanted}")
+                    fail_fields.append("other")
 
         hard_pass = len(reasons) == 0
         if hard_pass:
@@ -257,6 +231,7 @@ def apply_hard_filters_with_audit(df: pd.DataFrame, c: Dict[str, Any]) -> Tuple[
                 **candidate_snapshot(r),
                 "hard_pass": hard_pass,
                 "hard_fail_reasons": reasons,
+                "hard_fail_fields": fail_fields,
                 "hard_checks": checks,
                 "score_formula": "hard_pass = all(active_hard_constraints_satisfied_or_unknown)",
                 "score": 1.0 if hard_pass else 0.0,
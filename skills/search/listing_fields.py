@@ -0,0 +1,266 @@
+"""Typed listing fields, precomputed at sync time.
+
+``crawler/sync_qdrant.py::build_payload`` stores these next to the raw
+display strings so Stages B–D and the API read numbers, enums and arrays
+instead of re-parsing the same strings on every request. The ``listing_*``
+readers prefer the stored field and fall back to parsing the raw one, so
+points synced before a field existed (or whose raw value did not parse)
+still work.
+"""
+
+import json
+import math
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from skills.search.text_utils import (
+    _norm_furnish_value,
+    _norm_property_type_value,
+    _safe_text,
+    _to_float,
+    parse_jsonish_items,
+)
+
+AVAILABLE_FROM_EPOCH = "available_from_epoch"  # UTC midnight, seconds
+AVAILABLE_NOW = "available_now"
+MIN_TENANCY_MONTHS = "min_tenancy_months_num"
+DEPOSIT_VALUE = "deposit_value"
+FURNISH_NORM = "furnish_norm"
+PROPERTY_TYPE_NORM = "property_type_norm"
+LET_TYPE_NORM = "let_type_norm"
+NON_RESIDENTIAL = "non_residential"
+PRICE_PCM_NUM = "price_pcm_num"
+BEDROOMS_NUM = "bedrooms_num"
+BATHROOMS_NUM = "bathrooms_num"
+SIZE_SQM_NUM = "size_sqm_num"
+# raw field -> stored array of display strings
+ITEM_FIELDS = {
+    "stations": "stations_items",
+    "schools": "schools_items",
+    "features": "features_items",
+}
+
+NORMALIZED_FIELDS = (
+    AVAILABLE_FROM_EPOCH, AVAILABLE_NOW, MIN_TENANCY_MONTHS, DEPOSIT_VALUE,
+    FURNISH_NORM, PROPERTY_TYPE_NORM, LET_TYPE_NORM, NON_RESIDENTIAL,
+    PRICE_PCM_NUM, BEDROOMS_NUM, BATHROOMS_NUM, SIZE_SQM_NUM, *ITEM_FIELDS.values(),
+)
+
+_NOW_WORDS = {"now", "available now", "immediately", "immediate"}
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{1,2}-\d{1,2}")
+_NON_RESIDENTIAL_WORDS = ("parking", "garage", "land", "commercial", "office", "storage")
+_SQFT_TO_SQM = 0.092903
+_LIST_MARKER_RE = re.compile(r"^[\-–•]\s*")
+_FEATURE_SKIP = {"ask agent", "n/a", "none", ""}
+
+
+# ---------------------------------------------------------------------------
+# Raw-string parsers (sync time, and the fallback for older points)
+# ---------------------------------------------------------------------------
+
+def _parse_available_from_date(v: Any) -> pd.Timestamp:
+    s = _safe_text(v).strip()
+    if not s:
+        return pd.NaT
+    lowered = s.lower()
+    if lowered in _NOW_WORDS:
+        return pd.Timestamp(datetime.utcnow().date())
+    # dd/mm/yyyy from the listing sites; dayfirst would swap an ISO date's month and day.
+    return pd.to_datetime(s, errors="coerce", dayfirst=not _ISO_DATE_RE.match(s))
+
+
+def _is_available_now(v: Any) -> bool:
+    s = _safe_text(v).strip().lower()
+    return s in _NOW_WORDS
+
+
+def _parse_months(v: Any) -> Optional[float]:
+    """Parse a tenancy string like '6 months' or '12' → float months, or None."""
+    s = _safe_text(v).lower()
+    if not s:
+        return None
+    m = re.search(r"(\d+(?:\.\d+)?)", s)
+    if not m:
+        return None
+    try:
+        return float(m.group(1))
+    except Exception:
+        return None
+
+
+def _parse_deposit(val: Any) -> Optional[float]:
+    """Parse deposit which may be a string like '£1,600' or 'Ask agent'."""
+    if val is None:
+        return None
+    m = re.search(r"[\d,]+(?:\.\d+)?", str(val).replace(",", ""))
+    if m:
+        try:
+            f = float(m.group().replace(",", ""))
+            return int(f) if f == int(f) else round(f, 2)
+        except (ValueError, TypeError):
+            pass
+    return None
+
+
+def _norm_let_type(v: Any) -> str:
+    s = _safe_text(v).lower()
+    if not s:
+        return ""
+    s = s.replace("_", " ").replace("-", " ")
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def _is_non_residential(property_type: Any) -> bool:
+    """Parking, garages, land, etc. — never shown as rentals."""
+    s = _safe_text(property_type).lower().strip()
+    return any(word in s for word in _NON_RESIDENTIAL_WORDS)
+
+
+def _size_sqm(rec: Dict[str, Any]) -> Optional[float]:
+    sqm = _to_float(rec.get("size_sqm"))
+    if sqm is not None:
+        return sqm
+    sqft = _to_float(rec.get("size_sqft"))
+    return sqft * _SQFT_TO_SQM if sqft is not None else None
+
+
+def _features_items(val: Any) -> List[str]:
+    """Parse features — handles JSON arrays, Python lists, and newline/semicolon-separated strings."""
+    def _clean(s: str) -> str:
+        return _LIST_MARKER_RE.sub("", s).strip()
+    if isinstance(val, list):
+        return [_clean(str(x)) for x in val if _clean(str(x)).lower() not in _FEATURE_SKIP]
+    if isinstance(val, str) and val.strip():
+        if val.strip().lower() in _FEATURE_SKIP:
+            return []
+        if val.strip().startswith("["):
+            try:
+                parsed = json.loads(val)
+                if isinstance(parsed, list):
+                    return [_clean(str(x)) for x in parsed if _clean(str(x)).lower() not in _FEATURE_SKIP]
+            except Exception:
+                pass
+        # Newline or semicolon separated; strip leading "- " or "• " list markers
+        return [_clean(x) for x in val.replace(";", "\n").split("\n")
+                if _clean(x) and _clean(x).lower() not in _FEATURE_SKIP]
+    return []
+
+
+def _json_list(val: Any) -> List[str]:
+    """Parse a JSON-encoded array string (e.g. image_urls) into list[str]."""
+    if isinstance(val, list):
+        return [str(x) for x in val if x]
+    if isinstance(val, str) and val.strip():
+        try:
+            parsed = json.loads(val)
+            if isinstance(parsed, list):
+                return [str(x) for x in parsed if x]
+        except Exception:
+            pass
+    return []
+
+
+def _epoch(ts: pd.Timestamp) -> Optional[int]:
+    if pd.isna(ts):
+        return None
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(None)
+    return int(ts.normalize().timestamp())
+
+
+def normalize_listing_fields(rec: Dict[str, Any]) -> Dict[str, Any]:
+    """Typed fields for one crawled record (merged into the Qdrant payload)."""
+    raw_avail = rec.get("available_from")
+    now = _is_available_now(raw_avail)
+    out: Dict[str, Any] = {
+        AVAILABLE_NOW: now,
+        AVAILABLE_FROM_EPOCH: None if now else _epoch(_parse_available_from_date(raw_avail)),
+        MIN_TENANCY_MONTHS: _parse_months(rec.get("min_tenancy")),
+        DEPOSIT_VALUE: _parse_deposit(rec.get("deposit")),
+        FURNISH_NORM: _norm_furnish_value(rec.get("furnish_type")),
+        PROPERTY_TYPE_NORM: _norm_property_type_value(rec.get("property_type")),
+        LET_TYPE_NORM: _norm_let_type(rec.get("let_type")),
+        NON_RESIDENTIAL: _is_non_residential(rec.get("property_type")),
+        PRICE_PCM_NUM: _to_float(rec.get("price_pcm")),
+        BEDROOMS_NUM: _to_float(rec.get("bedrooms")),
+        BATHROOMS_NUM: _to_float(rec.get("bathrooms")),
+        SIZE_SQM_NUM: _size_sqm(rec),
+        ITEM_FIELDS["stations"]: parse_jsonish_items(rec.get("stations")),
+        ITEM_FIELDS["schools"]: parse_jsonish_items(rec.get("schools")),
+        ITEM_FIELDS["features"]: _features_items(rec.get("features")),
+    }
+    if "image_urls" in rec:
+        out["image_urls"] = _json_list(rec.get("image_urls"))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Runtime readers
+# ---------------------------------------------------------------------------
+
+def _stored(r: Dict[str, Any], field: str) -> Any:
+    """Stored typed value, or None when the point predates it (missing / NaN column)."""
+    v = r.get(field)
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return None
+    return v
+
+
+def listing_available_from(r: Dict[str, Any]) -> Tuple[bool, pd.Timestamp]:
+    """(available now, availability date); "now" resolves to today's date."""
+    now = _stored(r, AVAILABLE_NOW)
+    if now is not None:
+        if now:
+            return True, pd.Timestamp(datetime.utcnow().date())
+        epoch = _stored(r, AVAILABLE_FROM_EPOCH)
+        return False, pd.NaT if epoch is None else pd.Timestamp(int(epoch), unit="s")
+    raw = r.get("available_from")
+    return _is_available_now(raw), _parse_available_from_date(raw)
+
+
+def listing_min_tenancy_months(r: Dict[str, Any]) -> Optional[float]:
+    v = _stored(r, MIN_TENANCY_MONTHS)
+    if v is not None:
+        return float(v)
+    return _parse_months(r.get("min_tenancy"))
+
+
+def listing_deposit(r: Dict[str, Any]) -> Optional[float]:
+    v = _stored(r, DEPOSIT_VALUE)
+    if v is not None:
+        f = float(v)
+        return int(f) if f == int(f) else f
+    return _parse_deposit(r.get("deposit"))
+
+
+def listing_furnish(r: Dict[str, Any]) -> str:
+    v = _stored(r, FURNISH_NORM)
+    return v if v is not None else _norm_furnish_value(r.get("furnish_type"))
+
+
+def listing_let_type(r: Dict[str, Any]) -> str:
+    v = _stored(r, LET_TYPE_NORM)
+    return v if v is not None else _norm_let_type(r.get("let_type"))
+
+
+def listing_non_residential(r: Dict[str, Any]) -> bool:
+    v = _stored(r, NON_RESIDENTIAL)
+    return bool(v) if v is not None else _is_non_residential(r.get("property_type"))
+
+
+def listing_property_type(r: Dict[str, Any]) -> str:
+    v = _stored(r, PROPERTY_TYPE_NORM)
+    return v if v is not None else _norm_property_type_value(r.get("property_type"))
+
+
+def listing_items(r: Dict[str, Any], field: str) -> List[str]:
+    """Display items for ``stations`` / ``schools`` / ``features``."""
+    v = _stored(r, ITEM_FIELDS[field])
+    if isinstance(v, list):
+        return v
+    if field == "features":
+        return _features_items(r.get("features"))
+    return parse_jsonish_items(r.get(field))
@@ -335,6 +335,12 @@ def _load_index_from_file() -> Optional[Dict[str, Any]]:
         return None
 
 
+def install_location_match_index(idx: Dict[str, Any]) -> None:
+    """Use an index loaded elsewhere (the runtime bundle)."""
+    global _LOCATION_MATCH_INDEX_CACHE
+    _LOCATION_MATCH_INDEX_CACHE = idx
+
+
 def _get_location_match_index() -> Dict[str, Any]:
     global _LOCATION_MATCH_INDEX_CACHE
     if _LOCATION_MATCH_INDEX_CACHE is not None:
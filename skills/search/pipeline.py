@@ -1,17 +1,50 @@
-from typing import Any, Dict, List
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Optional
 
 
-def build_stage_a_records(stage_a_df, candidate_snapshot) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    if stage_a_df is None or len(stage_a_df) == 0:
-        return out
-    for i, row in stage_a_df.reset_index(drop=True).iterrows():
+class LazyRecords(Sequence):
+    """Ranking-log records over a ranked frame, built per row on first access.
+
+    The records only feed the ranking log, which usually keeps the top few,
+    so rows are snapshotted when the log writer reads them rather than for
+    every candidate on the request thread. ``limit`` caps the rows exposed.
+    """
+
+    def __init__(self, df, build: Callable[[int, Any], Dict[str, Any]], limit: Optional[int] = None):
+        self._df = df
+        self._build = build
+        n = 0 if df is None else len(df)
+        self._len = n if limit is None else max(0, min(n, int(limit)))
+        self._cache: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        rec = self._cache.get(i)
+        if rec is None:
+            rec = self._cache[i] = self._build(i, self._df.iloc[i])
+        return rec
+
+    def materialize(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+
+def build_stage_a_records(stage_a_df, candidate_snapshot, limit: Optional[int] = None) -> LazyRecords:
+    def _build(i, row) -> Dict[str, Any]:
         rec = candidate_snapshot(row.to_dict())
         rec["rank"] = i + 1
         rec["score"] = rec.get("qdrant_score")
         rec["score_formula"] = "score = qdrant_cosine_similarity(query_A, listing_embedding)"
-        out.append(rec)
-    return out
+        return rec
+
+    return LazyRecords(stage_a_df, _build, limit)
 
 
 def summarize_stage_b_failures(hard_audits: List[Dict[str, Any]]) -> str:
@@ -29,13 +62,15 @@ def summarize_stage_b_failures(hard_audits: List[Dict[str, Any]]) -> str:
     )
 
 
-def build_stage_c_records(ranked, candidate_snapshot, stage_c_weights: Dict[str, float]) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    if ranked is None or len(ranked) == 0:
-        return out
-    for i, row in ranked.iterrows():
+def build_stage_c_records(
+    ranked,
+    candidate_snapshot,
+    stage_c_weights: Dict[str, float],
+    limit: Optional[int] = None,
+) -> LazyRecords:
+    def _build(i, row) -> Dict[str, Any]:
         rec = candidate_snapshot(row.to_dict())
-        rec["rank"] = i + 1
+        rec["rank"] = row.name + 1  # index label, as ranked.iterrows() gave
         rec["score"] = float(row.get("final_score", 0.0))
         rec["score_formula"] = str(row.get("score_formula", ""))
         rec["components"] = {
@@ -51,5 +86,6 @@ def build_stage_c_records(ranked, candidate_snapshot, stage_c_weights: Dict[str,
             "preference_hits": str(row.get("preference_hits", "") or ""),
             "penalty_reasons": str(row.get("penalty_reasons", "") or ""),
         }
-        out.append(rec)
-    return out
+        return rec
+
+    return LazyRecords(ranked, _build, limit)
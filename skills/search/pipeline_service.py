@@ -1,12 +1,13 @@
 from datetime import datetime
 from dataclasses import dataclass
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 import copy
 import json
 import os
 
 from core.chatbot_config import GROUNDED_EXPLAIN_SYSTEM
+from skills.search.recall_control import adaptive_stage_a_b
 from core.settings import (
     DEFAULT_K,
     ENABLE_STAGE_D_EXPLAIN,
@@ -56,6 +57,7 @@ class ExplainDeps:
 class LoggingDeps:
     append_ranking_log_entry: Callable[..., Any]
     log_message: Callable[..., Any]
+    ranking_log_candidate_limit: Callable[[], Optional[int]]
 
 
 @dataclass
@@ -170,6 +172,10 @@ class PipelineDeps:
     def log_message(self) -> Callable[..., Any]:
         return self.logging.log_message
 
+    @property
+    def ranking_log_candidate_limit(self) -> Callable[[], Optional[int]]:
+        return self.logging.ranking_log_candidate_limit
+
 
 def run_normal_query(
     *,
@@ -268,21 +274,32 @@ def run_normal_query(
     recall = int(state["recall"])
     query = deps.build_stage_a_query(signals, user_in)
 
-    stage_note("Stage A", f"Because we need a broad candidate pool first, running vector recall (recall={recall})")
-    stage_a_df = deps.stage_a_search(qdrant_client, embedder, query=query, recall=recall, c=c)
+    stage_note("Stage A", f"Because we need a broad candidate pool first, running vector recall (recall<={recall})")
+    stage_note("Stage B", "Because these are hard constraints, applying hard filters (budget/layout/move-in, etc.)")
+    stage_a_df, filtered, hard_audits, recall_info = adaptive_stage_a_b(
+        lambda n, offset, first: deps.stage_a_search(
+            qdrant_client, embedder, query=query, recall=n, c=c, offset=offset,
+            query_vector=first.get("query_vector"), prefilter_count=first.get("prefilter_count"),
+        ),
+        deps.apply_hard_filters_with_audit,
+        c,
+        k,
+        recall,
+    )
     prefilter_count = stage_a_df.attrs.get("prefilter_count") if hasattr(stage_a_df, "attrs") else None
     if prefilter_count is not None:
         stage_note(
             "Stage A",
-            f"Because prefilter finished first, candidate pool={prefilter_count}; after vector recall limit, got {len(stage_a_df)} candidates",
+            f"Because prefilter finished first, candidate pool={prefilter_count}; after vector recall limit, got {len(stage_a_df)} candidates "
+            f"in {recall_info['pages']} page(s)",
         )
     else:
-        stage_note("Stage A", f"Because recall finished, got {len(stage_a_df)} candidates")
-    stage_a_records = deps.build_stage_a_records(stage_a_df, deps.candidate_snapshot)
-
-    stage_note("Stage B", "Because these are hard constraints, applying hard filters (budget/layout/move-in, etc.)")
-    filtered, hard_audits = deps.apply_hard_filters_with_audit(stage_a_df, c)
-    stage_b_pass_records = [x for x in hard_audits if x.get("hard_pass")]
+        stage_note("Stage A", f"Because recall finished, got {len(stage_a_df)} candidates in {recall_info['pages']} page(s)")
+    # Candidate records only feed the ranking log: lazy views over the frames,
+    # capped to the rows the log keeps and snapshotted by the log writer.
+    log_limit = deps.ranking_log_candidate_limit()
+    stage_a_records = deps.build_stage_a_records(stage_a_df, deps.candidate_snapshot, limit=log_limit)
+    stage_b_pass_records = [x for x in hard_audits if x.get("hard_pass")][:log_limit]
     fail_brief = deps.summarize_stage_b_failures(hard_audits)
     if fail_brief:
         stage_note("Stage B", f"Because of hard filtering, result is pass={len(filtered)}/{len(stage_a_df)}; top eliminations: {fail_brief}")
@@ -298,7 +315,7 @@ def run_normal_query(
     stage_note("Stage C", f"Because preference signals are [{pref_preview}], running soft rerank and unknown-pass penalties")
     ranked, stage_c_weights = deps.rank_stage_c(filtered, signals, embedder=embedder)
     stage_note("Stage C", f"Because reranking finished, ranked={len(ranked)}; weights={json.dumps(stage_c_weights, ensure_ascii=False)}")
-    stage_c_records = deps.build_stage_c_records(ranked, deps.candidate_snapshot, stage_c_weights)
+    stage_c_records = deps.build_stage_c_records(ranked, deps.candidate_snapshot, stage_c_weights, limit=log_limit)
 
     deps.log_message(
         "INFO",
@@ -335,7 +352,7 @@ def run_normal_query(
                 "constraints": c,
                 "structured_audit": structured_audit,
                 "signals": signals,
-                "counts": {"stage_a": len(stage_a_df), "stage_b": len(filtered), "stage_c": len(ranked), "k": k, "recall": recall},
+                "counts": {"stage_a": len(stage_a_df), "stage_b": len(filtered), "stage_c": len(ranked), "k": k, "recall": recall, "recall_control": recall_info},
                 "stage_a_candidates": stage_a_records,
                 "stage_b_hard_audit": hard_audits,
                 "stage_b_pass_candidates": stage_b_pass_records,
@@ -408,7 +425,7 @@ def run_normal_query(
             "constraints": c,
             "structured_audit": structured_audit,
             "signals": signals,
-            "counts": {"stage_a": len(stage_a_df), "stage_b": len(filtered), "stage_c": len(ranked), "k": k, "recall": recall},
+            "counts": {"stage_a": len(stage_a_df), "stage_b": len(filtered), "stage_c": len(ranked), "k": k, "recall": recall, "recall_control": recall_info},
             "stage_a_candidates": stage_a_records,
             "stage_b_hard_audit": hard_audits,
             "stage_b_pass_candidates": stage_b_pass_records,
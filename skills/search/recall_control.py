@@ -0,0 +1,215 @@
+"""Adaptive Stage A recall sizing.
+
+Instead of always pulling ``RENT_RECALL`` payloads from Qdrant, the first
+fetch is sized to what Stage B is expected to keep:
+
+  recall ≈ (k + RENT_RECALL_MARGIN) / expected pass rate × RENT_RECALL_OVERFETCH
+
+clamped to ``[RENT_RECALL_MIN, RENT_RECALL]`` and to the prefilter count
+(nothing beyond it can come back). The expected pass rate is a per-process
+EWMA of Stage B pass rates keyed by constraint shape (which hard constraints
+are active, with the budget bucketed). If fewer than ``k + margin`` listings
+survive, the next page is fetched at the same ranking offset, sized from the
+pass rate observed so far, up to ``RENT_RECALL_MAX_PAGES``.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from core.settings import (
+    ADAPTIVE_RECALL,
+    RECALL_MARGIN,
+    RECALL_MAX_PAGES,
+    RECALL_MIN,
+    RECALL_OVERFETCH,
+    RECALL_PASS_RATE_ALPHA,
+    RECALL_PRIOR_PASS_RATE,
+)
+from core.tracing import incr, span
+
+_MIN_PASS_RATE = 0.01
+_SHAPE_KEYS = (
+    "layout_options", "available_from", "furnish_type", "let_type",
+    "min_tenancy_months", "min_size_sqm",
+)
+
+_PASS_RATES: Dict[str, float] = {}
+_PASS_RATES_LOCK = threading.Lock()
+
+# fetch(recall, offset, first_attrs) -> Stage A frame. recall may be a callable of
+# the prefilter count; first_attrs are the first page's attrs ({} for the first
+# page), whose query_vector / prefilter_count later pages reuse.
+Fetch = Callable[[Any, int, Dict[str, Any]], pd.DataFrame]
+HardFilter = Callable[[pd.DataFrame, Dict[str, Any]], Tuple[pd.DataFrame, List[Dict[str, Any]]]]
+
+
+def constraint_shape(c: Optional[Dict[str, Any]]) -> str:
+    c = c or {}
+    parts = [key for key in _SHAPE_KEYS if c.get(key)]
+    budget = c.get("max_rent_pcm")
+    if budget is not None:
+        try:
+            parts.append(f"budget<{min(int(float(budget) // 500 + 1) * 500, 5000)}")
+        except (TypeError, ValueError):
+            parts.append("budget")
+    prefs = c.get("bool_preferences")
+    if isinstance(prefs, dict):
+        parts.extend(f"pref:{name}" for name, on in sorted(prefs.items()) if on)
+    if c.get("location_keywords") or c.get("geo_bound"):
+        parts.append("located")
+    return "|".join(parts) or "-"
+
+
+def expected_pass_rate(shape: str) -> float:
+    with _PASS_RATES_LOCK:
+        return _PASS_RATES.get(shape, RECALL_PRIOR_PASS_RATE)
+
+
+def record_pass_rate(shape: str, passed: int, total: int) -> None:
+    if total <= 0:
+        return
+    rate = passed / total
+    with _PASS_RATES_LOCK:
+        prev = _PASS_RATES.get(shape)
+        _PASS_RATES[shape] = rate if prev is None else prev + RECALL_PASS_RATE_ALPHA * (rate - prev)
+
+
+def plan_recall(need: int, pass_rate: float, max_recall: int, available: Optional[int] = None) -> int:
+    """Rows to fetch so that about ``need`` survive Stage B."""
+    n = int(need / max(pass_rate, _MIN_PASS_RATE) * RECALL_OVERFETCH + 0.999)
+    n = min(max(n, RECALL_MIN), max_recall)
+    if available is not None:
+        n = min(n, max(int(available), 1))
+    return max(n, 1)
+
+
+def adaptive_stage_a_b(
+    fetch: Fetch,
+    hard_filter: HardFilter,
+    c: Dict[str, Any],
+    k: int,
+    max_recall: int,
+) -> Tuple[pd.DataFrame, pd.DataFrame, List[Dict[str, Any]], Dict[str, Any]]:
+    """Run Stage A (paged as needed) and Stage B.
+
+    Returns ``(stage_a_df, filtered, audits, info)``; with several pages the
+    frames and audits are concatenated in ranking order.
+    """
+    if not ADAPTIVE_RECALL:
+        stage_a_df = fetch(max_recall, 0, {})
+        filtered, audits = hard_filter(stage_a_df, c)
+        info = {"adaptive": False, "pages": 1, "fetched": len(stage_a_df), "passed": len(filtered)}
+        return stage_a_df, filtered, audits, info
+
+    need = int(k) + RECALL_MARGIN
+    shape = constraint_shape(c)
+    prior = expected_pass_rate(shape)
+
+    stage_a_df = fetch(lambda available: plan_recall(need, prior, max_recall, available), 0, {})
+    filtered, audits = hard_filter(stage_a_df, c)
+    fetched = len(stage_a_df)
+    requested = int(stage_a_df.attrs.get("recall") or fetched)
+    exhausted = bool(stage_a_df.attrs.get("exhausted", True))
+    attrs = dict(stage_a_df.attrs)
+    frames, kept, audit_parts = [stage_a_df], [filtered], [audits]
+    n_pass = len(filtered)
+    pages = 1
+
+    while n_pass < need and not exhausted and requested < max_recall and pages < RECALL_MAX_PAGES:
+        observed = n_pass / fetched if fetched else prior
+        step = plan_recall(need - n_pass, observed, max_recall - requested)
+        with span("search.stage_a_page", offset=requested, recall=step) as sp:
+            page = fetch(step, requested, attrs)
+            sp.set(rows=len(page))
+        pages += 1
+        incr("stage_a_pages")
+        if len(page) == 0:
+            break
+        page_kept, page_audits = hard_filter(page, c)
+        frames.append(page)
+        kept.append(page_kept)
+        audit_parts.append(page_audits)
+        fetched += len(page)
+        requested += int(page.attrs.get("recall") or step)
+        exhausted = bool(page.attrs.get("exhausted", True))
+        n_pass += len(page_kept)
+
+    if pages > 1:
+        stage_a_df = pd.concat(frames, ignore_index=True)
+        stage_a_df.attrs.update(attrs, recall=requested, exhausted=exhausted)
+        filtered = pd.concat(kept, ignore_index=True)
+        audits = [a for part in audit_parts for a in part]
+    record_pass_rate(shape, n_pass, fetched)
+    info = {
+        "adaptive": True,
+        "shape": shape,
+        "prior_pass_rate": round(prior, 4),
+        "pages": pages,
+        "fetched": fetched,
+        "passed": n_pass,
+        "need": need,
+    }
+    return stage_a_df, filtered, audits, info
+
+
+def estimate_total(stage_a_df: pd.DataFrame, n_pass: int, max_recall: int) -> int:
+    """Stage B passes expected over the whole ``max_recall`` window.
+
+    That is the result count an unpaged fetch would have produced. It is
+    exact once Stage A is exhausted; otherwise the observed pass rate is
+    projected over the prefilter count.
+    """
+    attrs = getattr(stage_a_df, "attrs", {}) or {}
+    fetched = len(stage_a_df) if stage_a_df is not None else 0
+    if attrs.get("exhausted", True) or not fetched:
+        return int(n_pass)
+    prefilter = attrs.get("prefilter_count")
+    window = max_recall if prefilter is None else min(int(prefilter), max_recall)
+    return max(int(n_pass), int(round(n_pass / fetched * window)))
+
+
+def page_cursor(stage_a_df: pd.DataFrame, n_pass: int, max_recall: int) -> Optional[Dict[str, Any]]:
+    """Where "show more" resumes the ranking past ``stage_a_df``.
+
+    Returns None when Stage A is already exhausted. The cursor is plain data
+    (next offset, pass rate observed so far, prefilter count), so it can be
+    kept in session state; ``next_page`` fetches from it.
+    """
+    attrs = getattr(stage_a_df, "attrs", {}) or {}
+    offset = int(attrs.get("recall") or len(stage_a_df))
+    if attrs.get("exhausted", True) or offset >= max_recall:
+        return None
+    return {
+        "offset": offset,
+        "pass_rate": n_pass / len(stage_a_df) if len(stage_a_df) else RECALL_PRIOR_PASS_RATE,
+        "prefilter_count": attrs.get("prefilter_count"),
+    }
+
+
+def next_page(
+    fetch: Fetch,
+    hard_filter: HardFilter,
+    c: Dict[str, Any],
+    cursor: Dict[str, Any],
+    k: int,
+    max_recall: int,
+) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]]]:
+    """Stage B survivors of the page at ``cursor`` and the cursor after it.
+
+    The returned cursor is None once the ranking is exhausted; ``cursor``
+    itself is left unchanged. ``fetch`` gets the cursor as its first-page
+    attrs (``prefilter_count`` and, if the caller stored it, ``query_vector``).
+    """
+    offset = int(cursor["offset"])
+    pass_rate = float(cursor.get("pass_rate") or RECALL_PRIOR_PASS_RATE)
+    step = plan_recall(int(k) + RECALL_MARGIN, pass_rate, max_recall - offset)
+    with span("search.stage_a_page", offset=offset, recall=step) as sp:
+        page = fetch(step, offset, cursor)
+        sp.set(rows=len(page))
+    incr("stage_a_pages")
+    offset += int(page.attrs.get("recall") or step)
+    done = len(page) == 0 or bool(page.attrs.get("exhausted", True)) or offset >= max_recall
+    kept, _ = hard_filter(page, c) if len(page) else (page, [])
+    return kept, None if done else {**cursor, "offset": offset}
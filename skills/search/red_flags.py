@@ -8,7 +8,7 @@ the existing amber penalty_reasons (which track missing data).
 """
 
 import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Pattern, Tuple
 
 
 # ---------------------------------------------------------------------------
@@ -74,10 +74,19 @@ _FLAGS: Dict[str, Dict[str, Any]] = {
     },
 }
 
-# Pre-compile all patterns
+# Pre-compile each pattern list into one alternation
+def _alternation(patterns: List[str]) -> Optional[Pattern[str]]:
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
 for _flag_def in _FLAGS.values():
-    _flag_def["_pos_compiled"] = [re.compile(p, re.IGNORECASE) for p in _flag_def["positive"]]
-    _flag_def["_neg_compiled"] = [re.compile(p, re.IGNORECASE) for p in _flag_def["negative"]]
+    _flag_def["_pos_compiled"] = _alternation(_flag_def["positive"])
+    _flag_def["_neg_compiled"] = _alternation(_flag_def["negative"])
+
+# Payload field holding ``detect_red_flags`` output (crawler/sync_qdrant.py).
+PRECOMPUTED_FIELD = "red_flag_labels"
 
 
 def detect_red_flags(row: Dict[str, Any]) -> List[str]:
@@ -123,11 +132,21 @@ def detect_red_flags(row: Dict[str, Any]) -> List[str]:
                 continue  # boolean is authoritative, skip regex
 
         # 2) Check positive patterns first — if any match, skip this flag
-        if any(pat.search(text) for pat in defn["_pos_compiled"]):
+        pos = defn["_pos_compiled"]
+        if pos is not None and pos.search(text):
             continue
 
         # 3) Check negative patterns
-        if any(pat.search(text) for pat in defn["_neg_compiled"]):
+        neg = defn["_neg_compiled"]
+        if neg is not None and neg.search(text):
             flags.append(label)
 
     return flags
+
+
+def listing_red_flags(row: Dict[str, Any]) -> List[str]:
+    """Red flags stored at sync time, falling back to ``detect_red_flags``."""
+    pre = row.get(PRECOMPUTED_FIELD)
+    if isinstance(pre, list):
+        return [str(x) for x in pre]
+    return detect_red_flags(row)
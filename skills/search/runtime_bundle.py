@@ -0,0 +1,165 @@
+"""Prebuilt runtime bundle for fast backend boot.
+
+Packs the search indexes that are otherwise built lazily on the first
+request into one artifact directory:
+
+  bundle.pickle     manifest, location match index, commute graph edges and
+                    preference-sidecar offsets (plain dicts/lists only)
+  pref_vectors.npy  every preference-sidecar vector as one float32 matrix,
+                    opened with mmap so boot does not read it
+
+Built after a Qdrant sync (``crawler/sync_qdrant.py``) or by running this
+module. Each component records the size/mtime of the file it was built from;
+a stale component is skipped and its lazy loader runs as before.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.settings import PREF_VECTOR_ENABLED, PREF_VECTOR_PATH, RUNTIME_BUNDLE_DIR, STATIONS_PATH
+from skills.search import commute, location_match, soft_rank
+
+BUNDLE_VERSION = 1
+_BUNDLE_FILE = "bundle.pickle"
+_VECTORS_FILE = "pref_vectors.npy"
+
+
+def _file_sig(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _sources() -> Dict[str, str]:
+    return {
+        "location_index": location_match._LOCATION_INDEX_PATH,
+        "commute_graph": STATIONS_PATH,
+        "pref_vectors": PREF_VECTOR_PATH,
+    }
+
+
+# ── Build ─────────────────────────────────────────────────────────────────────
+
+def _pack_pref_vectors() -> tuple[Dict[str, Any], np.ndarray]:
+    """Flatten the parquet sidecar into offsets + one (n, dim) matrix."""
+    store = soft_rank._load_pref_vector_store()
+    records: List[Dict[str, Any]] = []
+    keys: Dict[str, int] = {}
+    rows: List[Any] = []
+    seen: Dict[int, int] = {}
+    for key, rec in store.items():
+        rid = seen.get(id(rec))
+        if rid is None:
+            packed: Dict[str, Any] = {
+                "features_segments": rec.get("features_segments") or [],
+                "description_segments": rec.get("description_segments") or [],
+            }
+            for field in ("features_vecs", "description_vecs"):
+                vecs = rec.get(field)
+                vecs = [] if vecs is None else list(vecs)
+                packed[field] = (len(rows), len(rows) + len(vecs))
+                rows.extend(vecs)
+            rid = seen[id(rec)] = len(records)
+            records.append(packed)
+        keys[key] = rid
+    matrix = np.asarray(rows, dtype="float32") if rows else np.zeros((0, 0), dtype="float32")
+    return {"records": records, "keys": keys}, matrix
+
+
+def build_runtime_bundle(bundle_dir: Optional[str] = None) -> Dict[str, Any]:
+    bundle_dir = bundle_dir or RUNTIME_BUNDLE_DIR
+    os.makedirs(bundle_dir, exist_ok=True)
+    t0 = time.perf_counter()
+    sources = _sources()
+    bundle: Dict[str, Any] = {"version": BUNDLE_VERSION, "sources": {}, "components": {}}
+
+    if _file_sig(sources["location_index"]) is not None:
+        bundle["components"]["location_index"] = location_match._get_location_match_index()
+
+    graph = commute.get_commute_graph()
+    if graph.stations:
+        bundle["components"]["commute_graph"] = {"stations": graph.stations, "edges": graph.edges}
+
+    if PREF_VECTOR_ENABLED and _file_sig(sources["pref_vectors"]) is not None:
+        offsets, matrix = _pack_pref_vectors()
+        np.save(os.path.join(bundle_dir, _VECTORS_FILE + ".tmp.npy"), matrix)
+        os.replace(os.path.join(bundle_dir, _VECTORS_FILE + ".tmp.npy"), os.path.join(bundle_dir, _VECTORS_FILE))
+        bundle["components"]["pref_vectors"] = offsets
+
+    for name in bundle["components"]:
+        bundle["sources"][name] = _file_sig(sources[name])
+
+    tmp = os.path.join(bundle_dir, _BUNDLE_FILE + ".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, os.path.join(bundle_dir, _BUNDLE_FILE))
+    manifest = {name: bundle["sources"][name] for name in bundle["components"]}
+    print(f"[runtime_bundle] built {sorted(manifest)} in {time.perf_counter()-t0:.2f}s -> {bundle_dir}")
+    return manifest
+
+
+# ── Load ──────────────────────────────────────────────────────────────────────
+
+def load_runtime_bundle(bundle_dir: Optional[str] = None) -> Dict[str, str]:
+    """Install fresh bundle components into their modules' caches.
+
+    Returns {component: "bundle" | "stale" | "missing"}; anything not loaded
+    from the bundle is left to its lazy loader.
+    """
+    bundle_dir = bundle_dir or RUNTIME_BUNDLE_DIR
+    status = {name: "missing" for name in _sources()}
+    try:
+        with open(os.path.join(bundle_dir, _BUNDLE_FILE), "rb") as f:
+            bundle = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return status
+    if bundle.get("version") != BUNDLE_VERSION:
+        return status
+
+    sources = _sources()
+    components = bundle.get("components") or {}
+    for name, data in components.items():
+        if name not in sources:
+            continue
+        if bundle["sources"].get(name) != _file_sig(sources[name]):
+            status[name] = "stale"
+            continue
+        if name == "location_index":
+            location_match.install_location_match_index(data)
+        elif name == "commute_graph":
+            commute.install_commute_graph(commute.CommuteGraph(data["stations"], data["edges"]))
+        elif name == "pref_vectors":
+            if not PREF_VECTOR_ENABLED:
+                continue
+            try:
+                matrix = np.load(os.path.join(bundle_dir, _VECTORS_FILE), mmap_mode="r")
+            except (OSError, ValueError):
+                status[name] = "stale"
+                continue
+            records = []
+            for packed in data["records"]:
+                fa, fb = packed["features_vecs"]
+                da, db = packed["description_vecs"]
+                records.append({
+                    "features_segments": packed["features_segments"],
+                    "description_segments": packed["description_segments"],
+                    "features_vecs": matrix[fa:fb],
+                    "description_vecs": matrix[da:db],
+                })
+            store = {key: records[rid] for key, rid in data["keys"].items()}
+            soft_rank.install_pref_vector_store(store, f"bundle:{len(store)}")
+        status[name] = "bundle"
+    return status
+
+
+if __name__ == "__main__":
+    print(json.dumps(build_runtime_bundle(), indent=2))
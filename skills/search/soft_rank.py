@@ -5,14 +5,13 @@ import math
 import os
 import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-try:
-    from fastembed import TextEmbedding as SentenceTransformer  # type: ignore[assignment]
-except ImportError:
-    from sentence_transformers import SentenceTransformer  # type: ignore[no-redef]
+
+if TYPE_CHECKING:  # annotation only; the runtime builds the embedder
+    from fastembed import TextEmbedding as SentenceTransformer
 
 from core.internal_helpers import _collect_value_candidates, _embed_texts_cached, _score_intent_group
 from core.settings import (
@@ -33,15 +32,15 @@ from core.settings import (
     W_DEPOSIT,
     W_FRESHNESS,
 )
-from skills.search.red_flags import detect_red_flags
-from skills.search.text_utils import _norm_furnish_value, _safe_text, _to_float, parse_jsonish_items
+from skills.search.red_flags import listing_red_flags
+from skills.search.text_utils import _norm_furnish_value, _safe_text, _to_float
 from skills.search.location_match import _normalize_location_keyword
-from skills.search.hard_filter import _parse_available_from_date
+from skills.search.listing_fields import listing_available_from, listing_furnish, listing_items
 
 try:
-    from skills.search.bool_signals import resolve_bool_signal as _resolve_bool_signal
+    from skills.search.bool_signals import resolve_bool_signals as _resolve_bool_signals
 except ImportError:
-    _resolve_bool_signal = None  # type: ignore[assignment]
+    _resolve_bool_signals = None  # type: ignore[assignment]
 
 
 # ---------------------------------------------------------------------------
@@ -224,6 +223,19 @@ def _load_pref_vector_store() -> Dict[str, Dict[str, Any]]:
     return store
 
 
+def install_pref_vector_store(store: Dict[str, Dict[str, Any]], meta: str) -> None:
+    """Use a store loaded elsewhere (runtime bundle: vectors are mmap slices)."""
+    global _PREF_VECTOR_STORE, _PREF_VECTOR_STORE_META
+    _PREF_VECTOR_STORE = store
+    _PREF_VECTOR_STORE_META = meta
+
+
+def _vec_matrix(v: Any) -> np.ndarray:
+    if v is None or len(v) == 0:
+        return np.zeros((0, 0), dtype="float32")
+    return np.asarray(v, dtype="float32")
+
+
 def _pref_vec_row_key(r: Dict[str, Any]) -> str:
     url = _safe_text(r.get("url"))
     if url:
@@ -237,7 +249,7 @@ def _pref_vec_row_key(r: Dict[str, Any]) -> str:
 def _score_preference_with_sidecar(
     pref_terms: List[str],
     row: Dict[str, Any],
-    embedder: SentenceTransformer,
+    embedder: "SentenceTransformer",
     sim_cache: Dict[str, np.ndarray],
 ) -> Optional[Tuple[float, List[str], str, List[Dict[str, Any]]]]:
     if not pref_terms:
@@ -248,14 +260,12 @@ def _score_preference_with_sidecar(
     if not rec:
         return None
 
-    feat_vecs_raw = rec.get("features_vecs") or []
-    desc_vecs_raw = rec.get("description_vecs") or []
     feat_seg = rec.get("features_segments") or []
     desc_seg = rec.get("description_segments") or []
 
     try:
-        feat_vecs = np.array(feat_vecs_raw, dtype="float32") if feat_vecs_raw else np.zeros((0, 0), dtype="float32")
-        desc_vecs = np.array(desc_vecs_raw, dtype="float32") if desc_vecs_raw else np.zeros((0, 0), dtype="float32")
+        feat_vecs = _vec_matrix(rec.get("features_vecs"))
+        desc_vecs = _vec_matrix(rec.get("description_vecs"))
     except Exception:
         return None
 
@@ -379,7 +389,7 @@ def _score_preference_with_sidecar(
 def rank_stage_c(
     filtered: pd.DataFrame,
     signals: Dict[str, Any],
-    embedder: SentenceTransformer,
+    embedder: "SentenceTransformer",
 ) -> Tuple[pd.DataFrame, Dict[str, float]]:
     if filtered is None or len(filtered) == 0:
         return pd.DataFrame(), compute_stagec_weights(signals)
@@ -449,8 +459,8 @@ def rank_stage_c(
 
     for idx, row in out.iterrows():
         r = row.to_dict()
-        stations_items = parse_jsonish_items(r.get("stations"))
-        schools_items = parse_jsonish_items(r.get("schools"))
+        stations_items = listing_items(r, "stations")
+        schools_items = listing_items(r, "schools")
 
         title = _safe_text(r.get("title"))
         address = _safe_text(r.get("address"))
@@ -505,11 +515,13 @@ def rank_stage_c(
         bool_prefs = hard.get("bool_preferences") or {}
         bool_match_score = 0.0
         bool_hit_labels: List[str] = []
-        if bool_prefs and _resolve_bool_signal is not None:
+        # One text scan per row; reused by match_pct below.
+        resolved_bools = _resolve_bool_signals(r, bool_prefs) if bool_prefs and _resolve_bool_signals else {}
+        if resolved_bools:
             match_count = 0
             total = len(bool_prefs)
             for signal_name, wanted in bool_prefs.items():
-                resolved = _resolve_bool_signal(signal_name, r)
+                resolved = resolved_bools.get(signal_name)
                 if resolved == wanted:
                     match_count += 1
                     label = signal_name.replace("_", " ")
@@ -554,12 +566,12 @@ def rank_stage_c(
             _add_unknown("bathrooms")
         if requires_prop and not _safe_text(r.get("property_type")).strip():
             _add_unknown("property_type")
-        if hard.get("available_from") is not None and pd.isna(_parse_available_from_date(r.get("available_from"))):
+        if hard.get("available_from") is not None and pd.isna(listing_available_from(r)[1]):
             _add_unknown("available_from")
 
         furnish_req = _norm_furnish_value(hard.get("furnish_type"))
         if furnish_req:
-            furn_val = _norm_furnish_value(r.get("furnish_type"))
+            furn_val = listing_furnish(r)
             if not furn_val or furn_val == "ask agent":
                 _add_unknown("furnish_type")
 
@@ -603,7 +615,7 @@ def rank_stage_c(
             _bool_weight_total = 25.0  # total weight for all boolean prefs combined
             _per_bool = _bool_weight_total / len(bool_prefs)
             for signal_name, wanted in bool_prefs.items():
-                resolved = _resolve_bool_signal(signal_name, r) if _resolve_bool_signal else None
+                resolved = resolved_bools.get(signal_name)
                 # True match → met.  None (unknown) → half credit.  Wrong → not met.
                 if resolved == wanted:
                     _match_checks.append((_per_bool, True))
@@ -627,7 +639,7 @@ def rank_stage_c(
 
         # Furnishing match — low-medium impact
         if furnish_req:
-            furn_val = _norm_furnish_value(r.get("furnish_type"))
+            furn_val = listing_furnish(r)
             _match_checks.append((8.0, bool(furn_val and furn_val != "ask agent" and furn_val == furnish_req)))
 
         # Compute match_pct
@@ -653,7 +665,7 @@ def rank_stage_c(
         out.at[idx, "preference_hits"] = ", ".join(all_pref_hits)
         out.at[idx, "preference_source"] = pref_source
         out.at[idx, "penalty_reasons"] = ", ".join(penalties)
-        out.at[idx, "red_flags"] = "; ".join(detect_red_flags(r))
+        out.at[idx, "red_flags"] = "; ".join(listing_red_flags(r))
         out.at[idx, "transit_detail"] = (
             f"group_score={transit_score:.4f}; "
             f"hits=[{', '.join(transit_hits)}]; "
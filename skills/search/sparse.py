@@ -0,0 +1,84 @@
+"""BM25 sparse vectors for hybrid Stage A retrieval.
+
+``crawler/sync_qdrant.py`` stores one sparse vector per listing under
+``SPARSE_VECTOR_NAME`` next to the dense MiniLM vector. The collection sets
+``Modifier.IDF`` on it, so Qdrant supplies the IDF factor at query time:
+
+  - document side: BM25 term-frequency saturation per term,
+    ``tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))``
+  - query side: weight 1.0 per distinct term
+
+Terms map to sparse indices with a stable 31-bit CRC32, so sync and query
+need no shared vocabulary file.
+"""
+
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+SPARSE_VECTOR_NAME = "bm25"
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SparseVec = Tuple[List[int], List[float]]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "with",
+    "we", "you", "your", "our", "will", "can", "also", "all", "any", "i", "me", "my",
+    "want", "looking", "need", "would", "like", "please", "near", "around",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(str(text or "").lower()) if t not in _STOPWORDS]
+
+
+def term_index(term: str) -> int:
+    return zlib.crc32(term.encode("utf-8")) & 0x7FFFFFFF
+
+
+def listing_text(rec: Dict[str, Any]) -> str:
+    """Lexical text for one listing: title, type, address, description, features."""
+    parts: List[str] = []
+    for field in ("title", "property_type", "address", "description"):
+        v = rec.get(field)
+        if v:
+            parts.append(str(v))
+    feats = rec.get("features")
+    if isinstance(feats, list):
+        parts.extend(str(x) for x in feats if x)
+    elif feats:
+        parts.append(str(feats))
+    return " ".join(parts)
+
+
+def average_doc_length(texts: Iterable[str]) -> float:
+    total = n = 0
+    for t in texts:
+        total += len(tokenize(t))
+        n += 1
+    return (total / n) if n and total else 1.0
+
+
+def _to_vec(weights: Dict[int, float]) -> SparseVec:
+    indices = sorted(weights)
+    return indices, [float(weights[i]) for i in indices]
+
+
+def document_sparse_vector(text: str, avgdl: float, k1: float = BM25_K1, b: float = BM25_B) -> SparseVec:
+    tokens = tokenize(text)
+    if not tokens:
+        return [], []
+    norm = k1 * (1 - b + b * len(tokens) / max(avgdl, 1e-9))
+    weights: Dict[int, float] = {}
+    for term, tf in Counter(tokens).items():
+        idx = term_index(term)
+        weights[idx] = weights.get(idx, 0.0) + tf * (k1 + 1) / (tf + norm)
+    return _to_vec(weights)
+
+
+def query_sparse_vector(text: str) -> SparseVec:
+    return _to_vec({term_index(t): 1.0 for t in tokenize(text)})
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Record / replay OpenAI chat completions for offline benchmarks.
+
+``core.llm_client`` talks to the API through two module-level clients
+(``qwen_client`` and ``router_client``); swapping them for the objects here
+makes every LLM call in the pipeline either hit the network and append to a
+fixture file (record) or answer from that file (replay).
+
+Fixture format: one JSON object per line with ``key`` (sha1 of model +
+messages), ``model``, ``content``, ``prompt_tokens``, ``completion_tokens``
+and ``latency_s``.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+
+def request_key(model: str, messages: List[Dict[str, Any]]) -> str:
+    blob = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def _response(content: str, prompt_tokens: int, completion_tokens: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+class _Completions:
+    def __init__(self, create):
+        self.create = create
+
+
+class ReplayClient:
+    """Answers from recorded fixtures; misses return ``miss_content``."""
+
+    def __init__(self, fixtures: Dict[str, Dict[str, Any]], replay_latency: bool = False, miss_content: str = "{}"):
+        self.fixtures = fixtures
+        self.replay_latency = replay_latency
+        self.miss_content = miss_content
+        self.hits = 0
+        self.misses: List[str] = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_Completions(self._create))
+
+    def _create(self, model: str, messages: List[Dict[str, Any]], **_: Any) -> SimpleNamespace:
+        key = request_key(model, messages)
+        rec = self.fixtures.get(key)
+        with self._lock:
+            if rec is None:
+                self.misses.append(key)
+            else:
+                self.hits += 1
+        if rec is None:
+            return _response(self.miss_content, 0, 0)
+        if self.replay_latency and rec.get("latency_s"):
+            time.sleep(float(rec["latency_s"]))
+        return _response(rec["content"], int(rec.get("prompt_tokens") or 0), int(rec.get("completion_tokens") or 0))
+
+
+class RecordingClient:
+    """Forwards to a real client and appends every exchange to ``path``."""
+
+    def __init__(self, real_client: Any, path: str):
+        self.real = real_client
+        self.path = path
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_Completions(self._create))
+
+    def _create(self, model: str, messages: List[Dict[str, Any]], **kwargs: Any) -> Any:
+        t0 = time.perf_counter()
+        r = self.real.chat.completions.create(model=model, messages=messages, **kwargs)
+        rec = {
+            "key": request_key(model, messages),
+            "model": model,
+            "content": r.choices[0].message.content,
+            "prompt_tokens": getattr(r.usage, "prompt_tokens", 0),
+            "completion_tokens": getattr(r.usage, "completion_tokens", 0),
+            "latency_s": round(time.perf_counter() - t0, 4),
+        }
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        return r
+
+
+def load_fixtures(path: str) -> Dict[str, Dict[str, Any]]:
+    fixtures: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(path):
+        return fixtures
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                rec = json.loads(line)
+                fixtures[rec["key"]] = rec
+    return fixtures
+
+
+def install(mode: str, fixtures_path: str, replay_latency: bool = False) -> Optional[ReplayClient]:
+    """Swap the LLM clients in ``core.llm_client``. Returns the replay client (if any)."""
+    import core.llm_client as llm_client
+
+    if mode == "record":
+        os.makedirs(os.path.dirname(fixtures_path) or ".", exist_ok=True)
+        llm_client.qwen_client = RecordingClient(llm_client.qwen_client, fixtures_path)
+        llm_client.router_client = RecordingClient(llm_client.router_client, fixtures_path)
+        return None
+    replay = ReplayClient(load_fixtures(fixtures_path), replay_latency=replay_latency)
+    llm_client.qwen_client = replay
+    llm_client.router_client = replay
+    return replay
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""Offline end-to-end latency benchmark for ``orchestration.workflow.process_turn``.
+
+Drives the multi-turn sessions in ``e2e_sessions.json`` through the real
+pipeline with:
+
+  - LLM calls replayed from recorded fixtures (``llm_replay.py``)
+  - an embedded Qdrant (``QdrantClient(path=...)``) seeded from a fixed
+    JSONL snapshot of the collection (id, vector, payload per line)
+  - TfL lookups disabled (offline commute engine only)
+
+and writes one JSON report: per-turn latency, per-stage span quantiles
+(``core.tracing``), throughput for each concurrency level, and memory.
+
+Usage:
+  # once, with network: export a snapshot and record LLM responses
+  python test/bench/run_e2e_bench.py export-snapshot --limit 3000
+  python test/bench/run_e2e_bench.py run --record
+
+  # offline, any time
+  python test/bench/run_e2e_bench.py run --concurrency 1,4,8
+  python test/bench/run_e2e_bench.py compare old.json new.json
+
+The embedding model must already be in the local fastembed /
+sentence-transformers cache for a fully offline run.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+BENCH_DIR = os.path.join(ROOT, "test", "bench")
+if BENCH_DIR not in sys.path:
+    sys.path.insert(0, BENCH_DIR)
+
+SESSIONS_FILE = os.path.join(BENCH_DIR, "e2e_sessions.json")
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+DEFAULT_SNAPSHOT = os.path.join(FIXTURE_DIR, "listings_snapshot.jsonl")
+DEFAULT_LLM_FIXTURES = os.path.join(FIXTURE_DIR, "llm_responses.jsonl")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def _git_sha() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def _pct(vals: List[float], q: float) -> float:
+    if not vals:
+        return 0.0
+    s = sorted(vals)
+    return s[min(len(s) - 1, max(0, int(round(q * len(s) + 0.5)) - 1))]
+
+
+def _latency_stats(vals: List[float]) -> Dict[str, float]:
+    return {
+        "n": len(vals),
+        "mean_s": round(statistics.fmean(vals), 4) if vals else 0.0,
+        "p50_s": round(_pct(vals, 0.50), 4),
+        "p95_s": round(_pct(vals, 0.95), 4),
+        "p99_s": round(_pct(vals, 0.99), 4),
+        "max_s": round(max(vals), 4) if vals else 0.0,
+    }
+
+
+# ── Snapshot ──────────────────────────────────────────────────────────────────
+
+def export_snapshot(out_path: str, limit: int) -> int:
+    """Write ``limit`` points of the configured (live) collection as JSONL."""
+    from core.settings import QDRANT_COLLECTION
+    from skills.search.engine import load_qdrant_client
+
+    client = load_qdrant_client()
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    n = 0
+    offset = None
+    with open(out_path, "w", encoding="utf-8") as f:
+        while n < limit:
+            points, offset = client.scroll(
+                collection_name=QDRANT_COLLECTION,
+                limit=min(256, limit - n),
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            for pt in points or []:
+                # Dense vector only; seeding rebuilds the BM25 sparse vector from the payload.
+                vector = pt.vector.get("") if isinstance(pt.vector, dict) else pt.vector
+                f.write(json.dumps({"id": pt.id, "vector": vector, "payload": pt.payload}, ensure_ascii=False) + "\n")
+                n += 1
+            if offset is None:
+                break
+    print(f"[bench] exported {n} points -> {out_path}")
+    return n
+
+
+def seed_local_qdrant(snapshot_path: str, qdrant_path: str) -> int:
+    from qdrant_client import QdrantClient, models
+
+    from crawler.sync_qdrant import build_point_vector, create_collection
+    from core.settings import QDRANT_COLLECTION
+    from skills.search.sparse import average_doc_length, listing_text
+
+    with open(snapshot_path, "r", encoding="utf-8") as f:
+        recs = [json.loads(line) for line in f if line.strip()]
+    avgdl = average_doc_length(listing_text(rec["payload"]) for rec in recs)
+
+    client = QdrantClient(path=qdrant_path)
+    create_collection(client)
+    batch: List[Any] = []
+    n = 0
+    for rec in recs:
+        vector = build_point_vector(rec["vector"], rec["payload"], avgdl)
+        batch.append(models.PointStruct(id=rec["id"], vector=vector, payload=rec["payload"]))
+        if len(batch) >= 256:
+            client.upsert(collection_name=QDRANT_COLLECTION, points=batch)
+            n += len(batch)
+            batch = []
+    if batch:
+        client.upsert(collection_name=QDRANT_COLLECTION, points=batch)
+        n += len(batch)
+    client.close()
+    return n
+
+
+# ── Run ───────────────────────────────────────────────────────────────────────
+
+def _offline_env(workdir: str, qdrant_path: str) -> None:
+    """Point every artifact at ``workdir`` before project settings are imported."""
+    os.environ["RENT_QDRANT_URL"] = ""
+    os.environ["RENT_QDRANT_PATH"] = qdrant_path
+    os.environ["RENT_QDRANT_STORAGE_SQLITE"] = os.path.join(
+        qdrant_path, "collection", os.environ.get("RENT_QDRANT_COLLECTION", "rent_listings"), "storage.sqlite"
+    )
+    os.environ.setdefault("RENT_PREF_VECTOR_ENABLED", "0")
+    os.environ["RENT_QA_CHUNK_INDEX_DIR"] = os.path.join(workdir, "qa_chunk_index")
+    os.environ["RENT_COMMUTE_CACHE_DB_PATH"] = os.path.join(workdir, "commute_cache.sqlite")
+    os.environ["RENT_GEOCODE_CACHE_PATH"] = os.path.join(workdir, "geocode_cache.json")
+    os.environ["RENT_GEOCODE_REMOTE_WAIT_S"] = "0"
+    os.environ["RENT_RANKING_LOG_PATH"] = os.path.join(workdir, "ranking_log.jsonl")
+    os.environ["RENT_STRUCTURED_CONFLICT_LOG_PATH"] = os.path.join(workdir, "structured_conflicts.jsonl")
+    os.environ["RENT_STRUCTURED_TRAINING_LOG_PATH"] = os.path.join(workdir, "structured_training_samples.jsonl")
+    os.environ.setdefault("RENT_TRACE_LOG", "0")
+    os.environ.setdefault("ROUTER_DEBUG", "0")
+
+
+def _run_session(session: Dict[str, Any], runtime, turn_times: List[Dict[str, Any]], lock: threading.Lock) -> None:
+    from orchestration.state import AgentState
+    from orchestration.workflow import process_turn
+
+    state = AgentState()
+    for turn in session["turns"]:
+        t0 = time.perf_counter()
+        error = None
+        try:
+            process_turn(turn["text"], state, runtime, router_debug=False, route_hint=turn.get("route_hint"))
+        except Exception as exc:  # noqa: BLE001
+            error = f"{type(exc).__name__}: {exc}"
+        dt = time.perf_counter() - t0
+        with lock:
+            turn_times.append({
+                "session": session["id"],
+                "intent": state.last_intent or "",
+                "seconds": dt,
+                "error": error,
+            })
+
+
+def run_level(sessions: List[Dict[str, Any]], runtime, concurrency: int, repeat: int, trace_alloc: bool) -> Dict[str, Any]:
+    from core import tracing
+
+    tracing.reset_metrics()
+    work = [s for _ in range(repeat) for s in sessions]
+    turn_times: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+    if trace_alloc:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda s: _run_session(s, runtime, turn_times, lock), work))
+    wall = time.perf_counter() - t0
+    alloc_peak = None
+    if trace_alloc:
+        _, alloc_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    by_intent: Dict[str, List[float]] = {}
+    for t in turn_times:
+        by_intent.setdefault(t["intent"] or "unknown", []).append(t["seconds"])
+    return {
+        "concurrency": concurrency,
+        "sessions": len(work),
+        "turns": len(turn_times),
+        "errors": [t for t in turn_times if t["error"]][:20],
+        "wall_s": round(wall, 3),
+        "throughput_turns_per_s": round(len(turn_times) / wall, 3) if wall > 0 else 0.0,
+        "turn_latency": _latency_stats([t["seconds"] for t in turn_times]),
+        "by_intent": {k: _latency_stats(v) for k, v in sorted(by_intent.items())},
+        "stages": tracing.latency_summary(),
+        "memory": {
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1),
+            "tracemalloc_peak_mb": round(alloc_peak / 1e6, 1) if alloc_peak is not None else None,
+        },
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    if not os.path.exists(args.snapshot):
+        raise SystemExit(f"Missing snapshot {args.snapshot}; run `export-snapshot` first.")
+    workdir = tempfile.mkdtemp(prefix="rent-bench-")
+    qdrant_path = os.path.join(workdir, "qdrant")
+    _offline_env(workdir, qdrant_path)
+
+    t0 = time.perf_counter()
+    n_points = seed_local_qdrant(args.snapshot, qdrant_path)
+    seed_s = time.perf_counter() - t0
+
+    import llm_replay
+    replay = llm_replay.install("record" if args.record else "replay", args.llm_fixtures, args.replay_latency)
+
+    import backend.commute_cache as commute_cache
+    from skills.search.agentic import build_search_runtime
+    from skills.search.location_match import _build_location_match_index, install_location_match_index
+
+    commute_cache._fetch_tfl = lambda *a: None  # offline: no TfL
+    install_location_match_index(_build_location_match_index())
+    t0 = time.perf_counter()
+    runtime = build_search_runtime()
+    boot_s = time.perf_counter() - t0
+
+    with open(SESSIONS_FILE, "r", encoding="utf-8") as f:
+        sessions = json.load(f)["sessions"]
+    if args.sessions:
+        wanted = set(args.sessions.split(","))
+        sessions = [s for s in sessions if s["id"] in wanted]
+
+    if args.warmup:
+        run_level(sessions, runtime, 1, 1, False)
+
+    levels = [int(x) for x in str(args.concurrency).split(",") if x.strip()]
+    report = {
+        "meta": {
+            "git_sha": _git_sha(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "snapshot": os.path.relpath(args.snapshot, ROOT),
+            "snapshot_points": n_points,
+            "seed_s": round(seed_s, 3),
+            "runtime_boot_s": round(boot_s, 3),
+            "llm_mode": "record" if args.record else "replay",
+            "replay_latency": bool(args.replay_latency),
+        },
+        "runs": [run_level(sessions, runtime, c, args.repeat, args.tracemalloc) for c in levels],
+    }
+    if replay is not None:
+        report["meta"]["llm_fixture_hits"] = replay.hits
+        report["meta"]["llm_fixture_misses"] = len(replay.misses)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"e2e_{report['meta']['git_sha']}.json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    for r in report["runs"]:
+        lat = r["turn_latency"]
+        print(
+            f"[bench] c={r['concurrency']} turns={r['turns']} wall={r['wall_s']}s "
+            f"tput={r['throughput_turns_per_s']}/s p50={lat['p50_s']}s p95={lat['p95_s']}s "
+            f"rss={r['memory']['max_rss_mb']}MB errors={len(r['errors'])}"
+        )
+    print(f"[bench] report -> {out}")
+    return report
+
+
+# ── Compare ───────────────────────────────────────────────────────────────────
+
+def compare(old_path: str, new_path: str, threshold: float) -> int:
+    """Print per-stage p50/p95 changes; exit 1 if any p95 regressed past ``threshold``."""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    old_runs = {r["concurrency"]: r for r in old["runs"]}
+    regressed = False
+    print(f"{old['meta']['git_sha']} -> {new['meta']['git_sha']}")
+    for run_new in new["runs"]:
+        run_old = old_runs.get(run_new["concurrency"])
+        if run_old is None:
+            continue
+        print(f"\nconcurrency={run_new['concurrency']}  throughput "
+              f"{run_old['throughput_turns_per_s']} -> {run_new['throughput_turns_per_s']} turns/s")
+        rows = [("turn", run_old["turn_latency"], run_new["turn_latency"])]
+        rows += [(name, run_old["stages"].get(name), s) for name, s in sorted(run_new["stages"].items())]
+        for name, a, b in rows:
+            if not a:
+                print(f"  {name:<28} (new) p50={b['p50_s']:.4f}s p95={b['p95_s']:.4f}s")
+                continue
+            change = (b["p95_s"] - a["p95_s"]) / a["p95_s"] if a["p95_s"] else 0.0
+            flag = ""
+            if change > threshold:
+                flag = "  <-- regression"
+                regressed = True
+            print(f"  {name:<28} p50 {a['p50_s']:.4f}->{b['p50_s']:.4f}s  "
+                  f"p95 {a['p95_s']:.4f}->{b['p95_s']:.4f}s ({change:+.0%}){flag}")
+    return 1 if regressed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    ex = sub.add_parser("export-snapshot", help="dump the live collection to JSONL (needs network)")
+    ex.add_argument("--out", default=DEFAULT_SNAPSHOT)
+    ex.add_argument("--limit", type=int, default=3000)
+
+    rp = sub.add_parser("run", help="run the benchmark")
+    rp.add_argument("--snapshot", default=DEFAULT_SNAPSHOT)
+    rp.add_argument("--llm-fixtures", default=DEFAULT_LLM_FIXTURES)
+    rp.add_argument("--record", action="store_true", help="call the real LLM and append fixtures")
+    rp.add_argument("--replay-latency", action="store_true", help="sleep for the recorded LLM latency")
+    rp.add_argument("--concurrency", default="1,4")
+    rp.add_argument("--repeat", type=int, default=1)
+    rp.add_argument("--sessions", default="", help="comma-separated session ids (default: all)")
+    rp.add_argument("--no-warmup", dest="warmup", action="store_false")
+    rp.add_argument("--tracemalloc", action="store_true", help="also record Python allocation peak (slower)")
+    rp.add_argument("--out", default="")
+
+    cp = sub.add_parser("compare", help="diff two reports")
+    cp.add_argument("old")
+    cp.add_argument("new")
+    cp.add_argument("--threshold", type=float, default=0.15, help="p95 regression ratio that fails")
+
+    args = ap.parse_args(argv)
+    if args.cmd == "export-snapshot":
+        export_snapshot(args.out, args.limit)
+        return 0
+    if args.cmd == "compare":
+        return compare(args.old, args.new, args.threshold)
+    run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the search hot functions, with scaling curves.
+
+Each case runs against synthetic listings of several sizes (default
+100 / 1k / 10k / 30k rows) generated from ``crawler/sync_qdrant.py``'s
+``PAYLOAD_FIELDS`` (plus the location tokens sync adds), and reports:
+
+  - time per call (min / median over repeats) and per row
+  - allocations of one call (tracemalloc peak and net retained)
+  - a complexity fit across sizes: the log-log slope plus the closest of
+    O(1) / O(log n) / O(n) / O(n log n) / O(n^2); slopes above 1.15 are
+    flagged as super-linear
+
+Per-row functions (``detect_red_flags``, ``resolve_all_bool_signals``,
+``build_location_tokens``) are timed over the whole frame, so "per call"
+means one pass over n rows. ``rank_stage_c`` uses a deterministic hashing
+embedder so the curve measures the ranking code rather than model
+inference (``--real-embedder`` switches to the configured model).
+
+Usage:
+  python test/bench/run_micro_bench.py
+  python test/bench/run_micro_bench.py --sizes 100,1000 --cases rank_stage_c,chunk_bm25
+  python test/bench/run_micro_bench.py --out test/bench/results/micro.json
+"""
+import argparse
+import gc
+import hashlib
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+RESULTS_DIR = os.path.join(ROOT, "test", "bench", "results")
+DEFAULT_SIZES = "100,1000,10000,30000"
+SUPERLINEAR_SLOPE = 1.15
+
+# ── Synthetic listings ────────────────────────────────────────────────────────
+
+_DISTRICTS = ["E1", "E2", "E8", "E14", "E15", "N1", "N7", "N16", "NW1", "NW5", "SE1", "SE15",
+              "SE22", "SW2", "SW4", "SW9", "SW11", "SW12", "W2", "W9", "W12", "WC1", "EC1", "EC2"]
+_STATIONS = ["Shoreditch High Street", "Old Street", "Dalston Junction", "Hackney Central",
+             "Canary Wharf", "Stratford", "King's Cross St. Pancras", "Angel", "Highbury & Islington",
+             "Camden Town", "Kentish Town", "London Bridge", "Peckham Rye", "East Dulwich", "Brixton",
+             "Clapham Common", "Clapham Junction", "Balham", "Paddington", "Shepherd's Bush",
+             "Russell Square", "Farringdon", "Liverpool Street", "Bethnal Green", "Whitechapel"]
+_FEATURES = ["Garden", "Private garden", "Off-street parking", "Balcony", "Pets considered",
+             "No pets", "Bills included", "Students welcome", "Furnished", "Unfurnished",
+             "Close to transport", "Wood floors", "Dishwasher", "Washing machine", "Concierge",
+             "Gym", "Guarantor required", "No DSS", "Admin fee applies", "Newly refurbished"]
+_SENTENCES = [
+    "A bright and spacious flat moments from the station.",
+    "The property has been recently refurbished to a high standard throughout.",
+    "Pets are considered on a case by case basis.",
+    "Sorry, no pets and no smokers.",
+    "Bills are not included in the rent.",
+    "Communal garden and secure bike storage available to residents.",
+    "Deposit protected with the DPS.",
+    "A UK based guarantor is required for all applicants.",
+    "Local shops, cafes and parks are within a short walk.",
+    "Available now for a minimum twelve month tenancy.",
+    "Housing benefit accepted.",
+    "Close to excellent schools and green spaces.",
+]
+_PROPERTY_TYPES = ["flat", "apartment", "studio", "house", "maisonette", "terraced", "penthouse"]
+_FURNISH = ["Furnished", "Unfurnished", "Part furnished", "Furnished or unfurnished", None]
+_LET_TYPES = ["Long term", "Short term", None]
+
+
+def _maybe_bool(rng: random.Random) -> Optional[bool]:
+    x = rng.random()
+    return None if x < 0.5 else x < 0.8
+
+
+def _synthetic_value(field: str, i: int, rng: random.Random) -> Any:
+    """One value for a ``PAYLOAD_FIELDS`` column, shaped like the crawler output."""
+    district = _DISTRICTS[i % len(_DISTRICTS)]
+    beds = rng.choice([0, 1, 1, 2, 2, 3, 4])
+    if field == "listing_id":
+        return f"rm_{100000 + i}"
+    if field in ("url", "openrent_url"):
+        return f"https://example.invalid/{field}/{100000 + i}"
+    if field in ("source_site", "source"):
+        return rng.choice(["rightmove", "openrent"])
+    if field in ("scraped_at", "added_date"):
+        return f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}"
+    if field == "available_from":
+        return rng.choice(["Now", f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/2026", None])
+    if field == "image_url":
+        return f"https://example.invalid/img/{i}.jpg"
+    if field == "address":
+        return f"{rng.randint(1, 200)} {rng.choice(['High', 'Church', 'Mill', 'Park'])} Road, London {district}"
+    if field == "postcode":
+        return f"{district} {rng.randint(1, 9)}{rng.choice('ABDEFGHJ')}{rng.choice('LNPQRSTU')}"
+    if field == "postcode_district":
+        return district
+    if field == "title":
+        return f"{beds} bedroom {rng.choice(_PROPERTY_TYPES)} to rent"
+    if field == "price_pcm":
+        return float(rng.randint(900, 4500))
+    if field == "price_pw":
+        return None
+    if field == "price_display":
+        return None
+    if field == "bedrooms":
+        return beds
+    if field == "bathrooms":
+        return rng.choice([1, 1, 2, None])
+    if field == "property_type":
+        return rng.choice(_PROPERTY_TYPES)
+    if field == "size_sqm":
+        return rng.choice([None, float(rng.randint(25, 140))])
+    if field == "size_sqft":
+        return None
+    if field in ("deposit", "deposit_amount"):
+        return rng.choice([None, float(rng.randint(900, 5000))])
+    if field == "min_tenancy":
+        return rng.choice(["12 months", "6 months", "Ask agent", None])
+    if field == "let_type":
+        return rng.choice(_LET_TYPES)
+    if field == "furnish_type":
+        return rng.choice(_FURNISH)
+    if field == "council_tax":
+        return rng.choice(["Band A", "Band C", "Band D", "Ask agent", None])
+    if field == "description":
+        return " ".join(rng.sample(_SENTENCES, rng.randint(3, 8)))
+    if field == "features":
+        return json.dumps(rng.sample(_FEATURES, rng.randint(2, 8)))
+    if field == "stations":
+        picks = rng.sample(_STATIONS, 3)
+        return json.dumps([{"name": s, "distance": f"{rng.uniform(0.1, 1.5):.1f} miles"} for s in picks])
+    if field == "schools":
+        return json.dumps([f"{rng.choice(['St Mary', 'Park', 'Hill'])} Primary School; 0.{rng.randint(1, 9)} miles"])
+    if field == "latitude":
+        return 51.45 + rng.random() * 0.12
+    if field == "longitude":
+        return -0.20 + rng.random() * 0.25
+    if field == "discovery_paths":
+        return [f"region:{district.lower()}"]
+    if field == "max_tenants":
+        return rng.choice([None, 1, 2, 3, 4])
+    if field == "epc_rating":
+        return rng.choice([None, "B", "C", "D", "E"])
+    if field in ("bills_included", "student_friendly", "families_allowed", "pets_allowed",
+                 "smokers_allowed", "dss_covers_rent", "garden", "parking", "fireplace",
+                 "epc_not_required", "online_viewings", "live_in_landlord", "dss_income_accepted"):
+        return _maybe_bool(rng)
+    return None
+
+
+def synthetic_rows(n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    from crawler.sync_qdrant import PAYLOAD_FIELDS, build_location_tokens, build_payload
+
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        rec = {f: _synthetic_value(f, i, rng) for f in PAYLOAD_FIELDS}
+        row = build_payload(rec, build_location_tokens(rec))
+        row["retrieval_score"] = rng.random()
+        rows.append(row)
+    return rows
+
+
+# ── Cases ─────────────────────────────────────────────────────────────────────
+
+class HashEmbedder:
+    """Deterministic fastembed-shaped embedder (``.embed``) with no model behind it."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def embed(self, texts):
+        import numpy as np
+
+        for t in texts:
+            seed = int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "little")
+            yield np.random.default_rng(seed).standard_normal(self.dim).astype("float32")
+
+
+_BENCH_CONSTRAINTS = {
+    "max_rent_pcm": 2500,
+    "layout_options": [{"bedrooms": 1}, {"bedrooms": 2}],
+    "furnish_type": "furnished",
+    "location_keywords": ["hackney", "dalston"],
+    "bool_preferences": {"garden": True, "pets_allowed": True},
+    "k": 5,
+}
+_BENCH_SEMANTIC = {
+    "transit_terms": ["near the overground"],
+    "school_terms": ["good primary school"],
+    "general_semantic_phrases": ["quiet street", "bright living room", "modern kitchen"],
+}
+
+
+def _constraints() -> Dict[str, Any]:
+    from skills.search.constraint_ops import normalize_constraints
+
+    return normalize_constraints(json.loads(json.dumps(_BENCH_CONSTRAINTS)))
+
+
+def _case_hard_filter(rows, frame, args):
+    from skills.search.hard_filter import apply_hard_filters_with_audit
+
+    c = _constraints()
+    return lambda: apply_hard_filters_with_audit(frame, c), None
+
+
+def _case_rank_stage_c(rows, frame, args):
+    from skills.common.parse_signals import derive_signals
+    from skills.search.soft_rank import rank_stage_c
+
+    c = _constraints()
+    signals = derive_signals(
+        parsed={"semantic_terms": _BENCH_SEMANTIC, "semantic_parse_source": "precomputed_plan", "final_constraints": c},
+        user_text="furnished 1 or 2 bed in hackney with a garden, pets ok",
+        constraints=c,
+    )
+    if args.real_embedder:
+        from core.settings import EMBED_MODEL
+        from skills.search.agentic import embedder_class
+
+        embedder = embedder_class()(EMBED_MODEL)
+    else:
+        embedder = HashEmbedder()
+    return lambda: rank_stage_c(frame, signals, embedder), None
+
+
+_LOCATION_QUERIES = ["shoreditch", "kings cros", "hackny central", "canary warf", "clapham", "highbury islington"]
+
+
+def _case_location_expand(rows, frame, args):
+    from skills.search import location_match as lm
+
+    # Vocabulary grows with inventory (one place name per four listings).
+    entries: List[Dict[str, Any]] = []
+    lookup_plain: Dict[str, str] = {}
+    lookup_slug: Dict[str, str] = {}
+    lookup_compact: Dict[str, str] = {}
+    names = list(_STATIONS) + [f"{_STATIONS[i % len(_STATIONS)]} {i}" for i in range(len(rows) // 4)]
+    for name in dict.fromkeys(names):
+        plain = lm._normalize_location_keyword(name)
+        slug, compact = lm._slug_key(plain), lm._compact_key(plain)
+        entries.append({"canonical": name, "aliases": [[plain, slug, compact]]})
+        lookup_plain.setdefault(plain, plain)
+        lookup_slug.setdefault(slug, plain)
+        lookup_compact.setdefault(compact, plain)
+    idx = {"entries": entries, "lookup_plain": lookup_plain, "lookup_slug": lookup_slug, "lookup_compact": lookup_compact}
+    previous = lm._LOCATION_MATCH_INDEX_CACHE
+
+    def _run():
+        lm.install_location_match_index(idx)
+        try:
+            return [lm.expand_location_keyword_candidates(q) for q in _LOCATION_QUERIES]
+        finally:
+            lm.install_location_match_index(previous)
+
+    return _run, None
+
+
+def _case_chunk_bm25(rows, frame, args):
+    import numpy as np
+
+    from skills.qa.chunk_index import ListingChunkIndex
+
+    chunks = [{"field": "description", "text": r["description"]} for r in rows]
+    index = ListingChunkIndex.from_chunks(chunks)
+    all_rows = np.arange(len(chunks), dtype=np.int64)
+    terms = ["pets", "garden", "deposit", "guarantor", "station"]
+    return lambda: index.bm25(terms, all_rows), None
+
+
+def _case_red_flags(rows, frame, args):
+    from skills.search.red_flags import detect_red_flags
+
+    return lambda: [detect_red_flags(r) for r in rows], None
+
+
+def _case_bool_signals(rows, frame, args):
+    from skills.search.bool_signals import resolve_all_bool_signals
+
+    return lambda: [resolve_all_bool_signals(r) for r in rows], None
+
+
+def _case_location_tokens(rows, frame, args):
+    from crawler.sync_qdrant import build_location_tokens
+
+    return lambda: [build_location_tokens(r) for r in rows], None
+
+
+def _case_build_metadata(rows, frame, args):
+    import backend.api_server as api
+    from orchestration.listing_store import to_refs
+    from orchestration.state import AgentState
+
+    c = _constraints()
+    state = AgentState(constraints=c)
+    state.search_full_results = to_refs(rows)
+    state.last_results = rows[: int(c.get("k") or 5)]
+    state.last_intent = "Search"
+
+    def _cold():
+        # Page cards are cached per result set; time the first render.
+        with api._PAGE_CARDS_LOCK:
+            api._PAGE_CARDS.clear()
+
+    return lambda: api.build_metadata(state), _cold
+
+
+CASES: Dict[str, Callable[..., Tuple[Callable[[], Any], Optional[Callable[[], None]]]]] = {
+    "apply_hard_filters_with_audit": _case_hard_filter,
+    "rank_stage_c": _case_rank_stage_c,
+    "expand_location_keyword_candidates": _case_location_expand,
+    "chunk_bm25": _case_chunk_bm25,
+    "detect_red_flags": _case_red_flags,
+    "resolve_all_bool_signals": _case_bool_signals,
+    "build_location_tokens": _case_location_tokens,
+    "build_metadata": _case_build_metadata,
+}
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+def measure(fn: Callable[[], Any], setup: Optional[Callable[[], None]], repeat: int, budget_s: float) -> Dict[str, Any]:
+    times: List[float] = []
+    spent = 0.0
+    for i in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        times.append(dt)
+        spent += dt
+        if i >= 1 and spent > budget_s:
+            break
+
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = fn()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {
+        "runs": len(times),
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "alloc_peak_kb": round((peak - before) / 1024.0, 1),
+        "alloc_net_kb": round((after - before) / 1024.0, 1),
+    }
+
+
+_MODELS: Dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: n * n,
+}
+
+
+def fit_complexity(points: List[Tuple[int, float]]) -> Dict[str, Any]:
+    """Log-log slope and the closest complexity class (relative least squares)."""
+    pts = [(n, t) for n, t in points if n > 1 and t > 0]
+    if len(pts) < 2:
+        return {"slope": None, "best_fit": None, "superlinear": False}
+    xs = [math.log(n) for n, _ in pts]
+    ys = [math.log(t) for _, t in pts]
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    den = sum((x - mx) ** 2 for x in xs)
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / den if den else 0.0
+
+    residuals: Dict[str, float] = {}
+    for name, f in _MODELS.items():
+        # Minimise sum(((t - c f(n)) / t)^2) over c.
+        a = sum(f(n) / t for n, t in pts)
+        b = sum((f(n) / t) ** 2 for n, t in pts)
+        c = a / b if b else 0.0
+        residuals[name] = sum(((t - c * f(n)) / t) ** 2 for n, t in pts)
+    best = min(residuals, key=residuals.get)
+    return {
+        "slope": round(slope, 3),
+        "best_fit": best,
+        "superlinear": slope > SUPERLINEAR_SLOPE,
+        "residuals": {k: round(v, 4) for k, v in residuals.items()},
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import pandas as pd
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    names = [x for x in args.cases.split(",") if x.strip()] if args.cases else list(CASES)
+    unknown = [x for x in names if x not in CASES]
+    if unknown:
+        raise SystemExit(f"Unknown case(s): {', '.join(unknown)}. Known: {', '.join(CASES)}")
+
+    report: Dict[str, Any] = {
+        "meta": {"sizes": sizes, "seed": args.seed, "repeat": args.repeat, "real_embedder": bool(args.real_embedder)},
+        "cases": {},
+    }
+    for n in sizes:
+        rows = synthetic_rows(n, args.seed)
+        frame = pd.DataFrame(rows)
+        for name in names:
+            try:
+                fn, setup = CASES[name](rows, frame, args)
+                fn()  # warm caches / imports outside the timed runs
+                m = measure(fn, setup, args.repeat, args.budget)
+            except ImportError as exc:
+                m = {"skipped": f"{type(exc).__name__}: {exc}"}
+            if "median_s" in m:
+                m["per_row_us"] = round(m["median_s"] / n * 1e6, 3)
+                print(f"[micro] {name:<36} n={n:<6} median={m['median_s'] * 1e3:9.2f}ms "
+                      f"per_row={m['per_row_us']:8.2f}us peak={m['alloc_peak_kb']:9.1f}KB")
+            else:
+                print(f"[micro] {name:<36} n={n:<6} skipped ({m['skipped']})")
+            report["cases"].setdefault(name, {"sizes": {}})["sizes"][str(n)] = m
+
+    print("")
+    for name, case in report["cases"].items():
+        pts = [(int(n), m["median_s"]) for n, m in case["sizes"].items() if "median_s" in m]
+        case["fit"] = fit_complexity(pts)
+        fit = case["fit"]
+        if fit["slope"] is not None:
+            flag = "  <-- super-linear" if fit["superlinear"] else ""
+            print(f"[fit]   {name:<36} slope={fit['slope']:5.2f} best={fit['best_fit']}{flag}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"[micro] report -> {args.out}")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--sizes", default=DEFAULT_SIZES)
+    ap.add_argument("--cases", default="", help=f"comma-separated subset of: {', '.join(CASES)}")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--budget", type=float, default=20.0, help="stop repeating a case after this many seconds")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--real-embedder", action="store_true")
+    ap.add_argument("--out", default=os.path.join(RESULTS_DIR, "micro.json"))
+    run(ap.parse_args(argv))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+import os
+
+from skills.search import area_stats
+
+
+def _payloads():
+    return [
+        {"property_type": "flat", "bedrooms": 2, "furnish_type": "Furnished", "price_pcm": 2000,
+         "location_region_tokens": ["dalston", "dalston_london"], "postcode_district": "E8",
+         "available_from": "2026-07-01"},
+        {"property_type": "flat", "bedrooms": 2, "furnish_type": "Unfurnished", "price_pcm": 2300,
+         "location_region_tokens": ["dalston"], "postcode_district": "E8", "available_from": "Now"},
+        {"property_type": "flat", "bedrooms": None, "furnish_type": "", "price_pcm": 1500,
+         "location_region_tokens": ["dalston"]},
+        {"property_type": "parking", "bedrooms": 0, "price_pcm": 100,
+         "location_region_tokens": ["dalston"]},
+    ]
+
+
+def _load(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(area_stats, "AREA_STATS_PATH", str(tmp_path / "area_stats.json"))
+    area_stats.rebuild_area_stats(_payloads())
+
+
+def test_lookup_matches_stage_b_semantics(monkeypatch, tmp_path) -> None:
+    _load(monkeypatch, tmp_path)
+    # Parking is excluded; unknown-bedroom listings pass a layout filter.
+    out = area_stats.lookup_area_price_stats(
+        "Dalston", {"layout_options": [{"bedrooms": 2, "bathrooms": None}], "max_rent_pcm": 2100}
+    )
+    assert out == {
+        "area": "Dalston", "count": 2, "min": 1500.0, "median": 1750.0, "max": 2000.0,
+        # Availability covers the layout match before the budget cap.
+        "availability": {"2026-07": 1, "now": 1, "unknown": 1}, "source": "cube",
+    }
+    assert area_stats.lookup_area_price_stats("e8", {"furnish_type": "furnished"})["count"] == 1
+
+
+def test_uncovered_filters_fall_back(monkeypatch, tmp_path) -> None:
+    _load(monkeypatch, tmp_path)
+    assert area_stats.lookup_area_price_stats("Dalston", {"let_type": "long term"}) is None
+    assert area_stats.lookup_area_price_stats("Nowhere", {}) is None
+
+
+def test_budget_gain_counts_confirmed_beds_only(monkeypatch, tmp_path) -> None:
+    _load(monkeypatch, tmp_path)
+    c = {"location_keywords": ["Dalston"], "layout_options": [{"bedrooms": 2}], "max_rent_pcm": 2000}
+    assert area_stats.area_budget_gain(c, 2500) == 1
+
+
+def test_reloads_when_the_artifact_changes(monkeypatch, tmp_path) -> None:
+    _load(monkeypatch, tmp_path)
+    path = tmp_path / "area_stats.json"
+    cube = area_stats.build_area_stats_cube(_payloads()[:1])
+    path.write_text(json.dumps(cube), encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert area_stats.lookup_area_price_stats("Dalston", {})["count"] == 1
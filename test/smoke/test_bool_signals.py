@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from skills.search.bool_signals import resolve_all_bool_signals, resolve_bool_signals, text_bool_signals
+from skills.search.red_flags import detect_red_flags, listing_red_flags
+
+
+def test_negative_patterns_win_and_explicit_fields_override_text() -> None:
+    listing = {
+        "description": "Sorry, no pets. Rear garden. Bills not included.",
+        "features": ["Off-street parking"],
+        "garden": "false",
+    }
+    resolved = resolve_all_bool_signals(listing)
+    assert resolved["pets_allowed"] is False
+    assert resolved["garden"] is False  # explicit field beats the text
+    assert resolved["parking"] is True
+    assert resolved["bills_included"] is False
+    assert resolved["families_allowed"] is None
+
+
+def test_precomputed_verdicts_match_a_live_scan() -> None:
+    listing = {"description": "Pet friendly flat with a communal garden. No DSS.", "features": "Students welcome"}
+    stored = {
+        "bool_signals": text_bool_signals(listing),
+        "red_flag_labels": detect_red_flags(listing),
+        "description": "",
+        "features": None,
+    }
+    assert resolve_all_bool_signals(stored) == resolve_all_bool_signals(listing)
+    assert listing_red_flags(stored) == detect_red_flags(listing) == ["No DSS"]
+    assert resolve_bool_signals(stored, ["garden", "unknown_signal"]) == {"garden": True, "unknown_signal": None}
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from backend.warmup import BootProfile, run_warmup
+
+
+def test_ready_only_after_all_steps_and_failures_recorded() -> None:
+    profile = BootProfile()
+    seen_ready = []
+
+    def _check() -> int:
+        seen_ready.append(profile.ready.is_set())
+        return 3
+
+    def _boom() -> None:
+        raise RuntimeError("no index")
+
+    run_warmup(profile, [("first", _check), ("broken", _boom), ("last", _check)])
+    snap = profile.snapshot()
+    assert seen_ready == [False, False]
+    assert snap["ready"] is True
+    assert snap["failed"] == "broken"
+    assert [s["step"] for s in snap["steps"]] == ["first", "broken", "last"]
+    assert snap["steps"][0]["result"] == 3
+    assert snap["steps"][1]["error"] == "no index"
+
+
+def test_failed_required_step_keeps_the_server_unready() -> None:
+    profile = BootProfile()
+
+    def _boom() -> None:
+        raise RuntimeError("no embedder")
+
+    run_warmup(profile, [("bundle", _boom), ("embedder", _boom), ("place_index", lambda: 1)], required={"embedder"})
+    snap = profile.snapshot()
+    assert snap["ready"] is False
+    assert snap["failed"] == "embedder"
+    assert [s["step"] for s in snap["steps"]] == ["bundle", "embedder", "place_index"]
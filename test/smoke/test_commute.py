@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from skills.search.commute import CommuteGraph
+
+_STATIONS = [
+    {"name": "Alpha", "lat": 51.500, "lon": -0.100, "modes": ["tube"]},
+    {"name": "Beta", "lat": 51.510, "lon": -0.100, "modes": ["tube"]},
+    {"name": "Gamma", "lat": 51.520, "lon": -0.100, "modes": ["tube"]},
+]
+
+
+def test_commute_routes_over_the_network() -> None:
+    g = CommuteGraph(_STATIONS)
+    out = g.commute(51.4995, -0.100, 51.5205, -0.100)
+    assert out is not None
+    assert "via Alpha (Underground)" in out["summary"]
+    # Walking the same 2.3 km would take ~29 min.
+    assert out["minutes"] < 20
+
+
+def test_out_of_range_origin_returns_none() -> None:
+    g = CommuteGraph(_STATIONS)
+    assert g.commute(52.5, -1.5, 51.52, -0.10) is None
+
+
+def test_prebuilt_edges_match_a_fresh_build() -> None:
+    built = CommuteGraph(_STATIONS)
+    restored = CommuteGraph(built.stations, built.edges)
+    assert restored.edges == built.edges
+    assert restored.commute(51.4995, -0.100, 51.5205, -0.100) == built.commute(51.4995, -0.100, 51.5205, -0.100)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pandas as pd
+from qdrant_client import QdrantClient, models
+
+from skills.search.constraint_pushdown import compile_hard_constraints, hard_pushdown_key
+from skills.search.hard_filter import apply_hard_filters_with_audit
+from skills.search.listing_fields import normalize_listing_fields
+
+
+_ROWS = [
+    {"url": "u1", "price_pcm": "£1,750", "bedrooms": 2, "bathrooms": 1, "furnish_type": "Furnished", "let_type": "Long term"},
+    {"url": "u2", "price_pcm": "2,400", "bedrooms": 2, "bathrooms": 1, "furnish_type": "Furnished"},
+    {"url": "u3", "price_pcm": "1,600", "bedrooms": 3, "bathrooms": 2, "furnish_type": "Unfurnished"},
+    {"url": "u4", "price_pcm": "1,500", "bedrooms": 2, "furnish_type": "Ask agent", "let_type": "short-term"},
+    {"url": "u5", "price_pcm": "", "bedrooms": None, "available_from": "2026-07-01"},
+    {"url": "u6", "price_pcm": "900", "bedrooms": 0, "property_type": "Parking space"},
+    {"url": "u7", "price_pcm": "1,200", "bedrooms": 2, "min_tenancy": "12 months", "size_sqm": 40},
+]
+
+
+def _pushed_urls(c: dict) -> set:
+    client = QdrantClient(":memory:")
+    client.create_collection("t", vectors_config=models.VectorParams(size=1, distance=models.Distance.DOT))
+    client.upsert("t", [
+        models.PointStruct(id=i, vector=[1.0], payload={**r, **normalize_listing_fields(r)})
+        for i, r in enumerate(_ROWS)
+    ])
+    points, _ = client.scroll("t", scroll_filter=models.Filter(must=compile_hard_constraints(c)), limit=100)
+    return {p.payload["url"] for p in points}
+
+
+def test_pushdown_keeps_every_stage_b_pass_and_drops_clear_fails() -> None:
+    c = {
+        "max_rent_pcm": 1800,
+        "layout_options": [{"bedrooms": 2, "bathrooms": 1}],
+        "furnish_type": "furnished",
+        "let_type": "long term",
+        "available_from": "2026-08-01",
+        "min_tenancy_months": 6,
+    }
+    kept, _ = apply_hard_filters_with_audit(pd.DataFrame(_ROWS), c)
+    pushed = _pushed_urls(c)
+    assert set(kept["url"]) <= pushed
+    assert pushed == {"u1", "u5"}
+    assert compile_hard_constraints({"k": 5}) == [] and hard_pushdown_key({"k": 5}) == "" and hard_pushdown_key(c) != hard_pushdown_key({**c, "max_rent_pcm": 2000})
+
+
+def test_relax_reuses_only_a_full_window_frame_of_the_same_location() -> None:
+    from skills.search.agentic import stage_a_reusable
+
+    def frame(n: int, recall: int, exhausted: bool, pushed: str = "") -> pd.DataFrame:
+        df = pd.DataFrame(_ROWS * (n // len(_ROWS) + 1)).head(n)
+        df.attrs.update(prefilter_count=5000, recall=recall, exhausted=exhausted, hard_pushdown=pushed)
+        return df
+
+    old = {"location_keywords": ["Hackney"], "layout_options": [{"bedrooms": 2}], "max_rent_pcm": 2000}
+    relaxed = {**old, "max_rent_pcm": 2300}
+    # The unfiltered near-miss frame covers the window: a budget relax re-runs Stage B/C on it.
+    assert stage_a_reusable(frame(1000, 1000, False), old, relaxed, recall=1000)
+    assert not stage_a_reusable(frame(1000, 1000, False), old, {**relaxed, "location_keywords": ["Camden"]}, recall=1000)
+    # An adaptively sized first page stops short of it.
+    assert not stage_a_reusable(frame(90, 90, False), old, relaxed, recall=1000)
+    # A pushed-down frame lacks the listings the higher budget lets in.
+    assert not stage_a_reusable(frame(40, 40, True, hard_pushdown_key(old)), old, relaxed, recall=1000)
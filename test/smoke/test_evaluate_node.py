@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+from orchestration import evaluate_node as ev
+from orchestration.evaluate_node import compute_confirmed_sensitivity, evaluate_node
+from orchestration.state import AgentState
+
+
+def _listings(n: int, penalty: str = "") -> list:
+    return [
+        {"listing_id": f"id-{i}", "title": f"Listing {i}", "price_pcm": 1500, "bedrooms": 2, "penalty_reasons": penalty}
+        for i in range(1, n + 1)
+    ]
+
+
+def _audit(price: float, beds: float, fields: list) -> dict:
+    return {
+        "price_pcm": price,
+        "bedrooms": beds,
+        "hard_pass": not fields,
+        "hard_fail_reasons": [f"{f} mismatch" for f in fields],
+        "hard_fail_fields": fields,
+    }
+
+
+def test_first_attempt_sensitivity_hint_uses_this_turns_audits() -> None:
+    # Location-only search (no loader pending): enough display results but
+    # few strict ones, so the attempt-0 hint reads the Stage B audits.
+    full = _listings(10, penalty="unknown_hard(bathrooms)")
+    agent_state = AgentState(constraints={"k": 5, "furnish_type": "furnished"})
+    agent_state.search_full_results = full
+    agent_state.last_results = full[:5]
+    state = {
+        "agent_state": agent_state,
+        "last_search_status": "success",
+        "reply_text": "Top results",
+        "relax_attempt": 0,
+        "stage_b_unfiltered": None,
+        "stage_b_audits": [_audit(1400, 2, ["furnish_type"]), _audit(1450, 2, ["furnish_type"])],
+    }
+    out = evaluate_node(state)
+    assert out["eval_decision"] == "done"
+    assert "Only 0 listings fully matched" in out["reply_text"]
+    assert "+2 listings" in out["reply_text"]
+
+
+def _per_audit_sensitivity(audits: list, constraints: dict) -> dict:
+    """The per-audit loop compute_confirmed_sensitivity replaced (budget, layout, other)."""
+    budget = ev._to_num(constraints.get("max_rent_pcm"))
+    req_beds, req_baths = ev._extract_layout_requirements(constraints)
+    result: dict = {}
+    if budget is not None and req_beds:
+        for factor in [1.15, 1.25, 1.50]:
+            new_budget = int(round(budget * factor))
+            gain = 0
+            for a in audits:
+                price, beds = ev._to_num(a.get("price_pcm")), ev._to_num(a.get("bedrooms"))
+                if price is None or beds is None or price <= budget or price > new_budget:
+                    continue
+                if int(round(beds)) not in req_beds:
+                    continue
+                if req_baths:
+                    baths = ev._to_num(a.get("bathrooms"))
+                    if baths is None or float(baths) not in req_baths:
+                        continue
+                gain += 1
+            if gain > 0:
+                result["budget"] = {"threshold": new_budget, "gain": gain}
+                break
+    layout_counts: Counter = Counter()
+    for a in audits:
+        price, beds = ev._to_num(a.get("price_pcm")), ev._to_num(a.get("bedrooms"))
+        if price is None or beds is None or (budget is not None and price > budget):
+            continue
+        if int(round(beds)) not in req_beds:
+            layout_counts[int(round(beds))] += 1
+    if layout_counts:
+        result["layout"] = layout_counts.most_common(2)
+    other_counts: Counter = Counter()
+    for a in audits:
+        reasons = a.get("hard_fail_reasons") or []
+        if a.get("hard_pass") or len(reasons) != 1:
+            continue
+        name = ev._parse_constraint_name(reasons[0])
+        if name not in ("budget", "layout", "location", "other"):
+            other_counts[name] += 1
+    if other_counts:
+        result["other"] = dict(other_counts)
+    return result
+
+
+def test_sensitivity_matches_the_per_audit_loop_on_mixed_audits() -> None:
+    rng = random.Random(7)
+    names = ["budget", "layout", "furnish_type", "let_type", "available_from"]
+    audits = []
+    for _ in range(300):
+        a = _audit(
+            rng.choice([None, 1200, 1750, "£1,950", 2050, 2200, 2400, 2900]),
+            rng.choice([None, 0, 1, 2, 2.0, 3, 4]),
+            rng.sample(names, rng.choice([0, 0, 1, 1, 1, 2, 3])),
+        )
+        a["bathrooms"] = rng.choice([None, 1, 1.0, 2])
+        audits.append(a)
+    for constraints in (
+        {"max_rent_pcm": 2000, "layout_options": [{"bedrooms": 2}]},
+        {"max_rent_pcm": 2000, "layout_options": [{"bedrooms": 2, "bathrooms": 1}, {"bedrooms": 3}]},
+        {"layout_options": [{"bedrooms": 1}]},
+    ):
+        out = compute_confirmed_sensitivity(audits, constraints)
+        out.pop("combo", None)
+        assert out == _per_audit_sensitivity(audits, constraints)
+
+
+def test_sensitivity_suggests_budget_plus_one_dropped_constraint() -> None:
+    audits = (
+        [_audit(2100, 2, ["budget"])]
+        + [_audit(2200, 2, ["budget", "furnish_type"]) for _ in range(3)]
+        + [_audit(1800, 2, ["furnish_type"]) for _ in range(2)]
+        + [_audit(2250, 3, ["layout"])]
+    )
+    out = compute_confirmed_sensitivity(audits, {"max_rent_pcm": 2000, "layout_options": [{"bedrooms": 2}]})
+    assert out["budget"] == {"threshold": 2300, "gain": 4}
+    assert out["other"] == {"furnish_type": 2}
+    assert out["combo"] == {"threshold": 2300, "drop": "furnish_type", "gain": 6}
+    # A typed layout (property type / tag) is not resolved by the price/beds check.
+    typed = {"max_rent_pcm": 2000, "layout_options": [{"bedrooms": 2, "property_type": "flat"}]}
+    assert "combo" not in compute_confirmed_sensitivity(audits, typed)
+
+
+def test_sensitivity_with_no_audits_or_nothing_failing(monkeypatch) -> None:
+    c = {"max_rent_pcm": 2000, "layout_options": [{"bedrooms": 2}]}
+    assert compute_confirmed_sensitivity([], {"layout_options": [{"bedrooms": 2}]}) == {}
+    # No audits this turn: the budget what-if comes from the area-stats cube.
+    monkeypatch.setattr(ev, "area_budget_gain", lambda constraints, new_budget: 3 if new_budget >= 2500 else 0)
+    assert compute_confirmed_sensitivity([], c) == {"budget": {"threshold": 2500, "gain": 3}}
+    assert compute_confirmed_sensitivity([_audit(1500 + 50 * i, 2, []) for i in range(8)], c) == {}
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from skills.search.geocoder import PlaceIndex
+
+_ENTRIES = [
+    {"name": "Oxford Circus", "lat": 51.515, "lon": -0.142, "kind": "station"},
+    {"name": "Old Street", "lat": 51.526, "lon": -0.088, "kind": "station"},
+    {"name": "Shoreditch", "lat": 51.5247, "lon": -0.0793, "kind": "region"},
+    {"name": "E8", "lat": 51.546, "lon": -0.075, "kind": "district"},
+]
+
+
+def test_lookup_paths() -> None:
+    idx = PlaceIndex(_ENTRIES, {"old st": "old street"})
+    assert idx.lookup("Oxford Circus station")["name"] == "Oxford Circus"
+    assert idx.lookup("old st")["name"] == "Old Street"
+    assert idx.lookup("oxfrd circus")["name"] == "Oxford Circus"
+    assert idx.lookup("my office near old street")["name"] == "Old Street"
+    assert idx.lookup("E8 1JU")["name"] == "E8"
+    assert idx.lookup("nowhere at all") is None
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from skills.search.hard_filter import apply_hard_filters_with_audit
+from skills.search.listing_fields import (
+    listing_available_from,
+    listing_deposit,
+    listing_furnish,
+    listing_items,
+    listing_min_tenancy_months,
+    normalize_listing_fields,
+)
+
+
+_RAW = {
+    "url": "u1",
+    "available_from": "15/03/2026",
+    "min_tenancy": "6 months",
+    "deposit": "£1,600",
+    "furnish_type": "Part-furnished",
+    "property_type": "Apartment",
+    "stations": '[{"name": "Angel", "miles": "0.3"}]',
+    "schools": "",
+    "features": "- Balcony\n- Ask agent; Lift",
+    "image_urls": '["a.jpg", "b.jpg"]',
+}
+
+
+def test_stored_fields_read_the_same_as_parsing_raw() -> None:
+    stored = {**_RAW, **normalize_listing_fields(_RAW)}
+    assert stored["image_urls"] == ["a.jpg", "b.jpg"]
+    assert stored["property_type_norm"] == "flat"
+    for r in (_RAW, stored):
+        assert listing_available_from(r) == (False, pd.Timestamp("2026-03-15"))
+        assert listing_min_tenancy_months(r) == 6.0
+        assert listing_deposit(r) == 1600
+        assert listing_furnish(r) == "part-furnished"
+        assert listing_items(r, "stations") == ["Angel (0.3 miles)"]
+        assert listing_items(r, "schools") == []
+        assert listing_items(r, "features") == ["Balcony", "Lift"]
+
+
+def test_hard_filter_mixes_normalized_and_older_points() -> None:
+    late = {**_RAW, "url": "u2", "available_from": "2026-06-01"}
+    df = pd.DataFrame([{**_RAW, **normalize_listing_fields(_RAW)}, late])
+    kept, audits = apply_hard_filters_with_audit(
+        df, {"available_from": "2026-04-01", "min_tenancy_months": 12, "furnish_type": "part-furnished"}
+    )
+    assert list(kept["url"]) == ["u1"]
+    assert audits[1]["hard_fail_fields"] == ["available_from"]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import copy
+
+from orchestration.listing_store import LISTING_STORE, ListingRef, resolve_listings, to_refs
+from orchestration.merger import snapshot_from_constraints
+
+
+def _row(score: float) -> dict:
+    return {
+        "listing_id": "L1",
+        "_qdrant_id": "q-1",
+        "title": "2 bed flat",
+        "description": "long text " * 50,
+        "price_pcm": 2400,
+        "final_score": score,
+        "penalty_reasons": [],
+    }
+
+
+def test_refs_share_payload_and_keep_own_scores() -> None:
+    a, b = to_refs([_row(0.9), _row(0.4)])
+    assert isinstance(a, ListingRef) and isinstance(b, ListingRef)
+    assert a.payload is b.payload
+    assert a.get("final_score") == 0.9
+    assert b["final_score"] == 0.4
+    assert a.get("title") == "2 bed flat"
+    assert LISTING_STORE.get(a.key) is a.payload
+
+
+def test_resolve_returns_plain_dicts() -> None:
+    refs = to_refs([_row(0.7), {"title": "no id"}])
+    out = resolve_listings(refs)
+    assert out[0] == _row(0.7)
+    assert type(out[0]) is dict
+    # Rows without an id pass through untouched.
+    assert out[1] == {"title": "no id"}
+
+
+def test_snapshot_results_are_refs_and_deepcopy_shares_payload() -> None:
+    snap = snapshot_from_constraints({"max_rent_pcm": 2500}, results=[_row(0.5)])
+    ref = snap.results[0]
+    assert isinstance(ref, ListingRef)
+    clone = copy.deepcopy(snap)
+    assert clone.results[0].payload is ref.payload
+    assert clone.results[0].overlay is not ref.overlay
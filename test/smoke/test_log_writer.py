@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+
+from core.log_writer import LogWriter
+
+
+def _read_lines(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_batches_are_written_off_thread_in_order() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "logs", "ranking_log.jsonl")
+        writer = LogWriter(max_queue=64, batch_max=8, flush_s=0.01, compression="none")
+        for i in range(20):
+            assert writer.submit(path, {"i": i}, "test log")
+        # Callables are built on the writer thread; None means "nothing to log".
+        writer.submit(path, lambda: {"i": "lazy"}, "test log")
+        writer.submit(path, lambda: None, "test log")
+        assert writer.flush(timeout=5.0)
+        assert [r["i"] for r in _read_lines(path)] == list(range(20)) + ["lazy"]
+
+
+def test_rotates_before_exceeding_size() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "audit.jsonl")
+        writer = LogWriter(rotate_bytes=200, compression="none")
+        for i in range(10):
+            writer.write_batch([(path, {"i": i, "pad": "x" * 40}, "test log")])
+        files = sorted(os.listdir(tmp))
+        assert len(files) > 1
+        assert all(os.path.getsize(os.path.join(tmp, f)) <= 200 for f in files)
+        total = sum(len(_read_lines(os.path.join(tmp, f))) for f in files)
+        assert total == 10
+
+
+def test_full_queue_drops_instead_of_blocking() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "audit.jsonl")
+        writer = LogWriter(max_queue=1, compression="none")
+        writer._ensure_started = lambda: None  # keep the queue from draining
+        assert writer.submit(path, {"i": 0}, "test log", sheddable=False)
+        assert not writer.submit(path, {"i": 1}, "test log", sheddable=False)
+
+
+def test_warns_and_writes_plain_jsonl_without_zstandard(monkeypatch) -> None:
+    from core import log_writer
+
+    warnings: list = []
+    monkeypatch.setattr(log_writer, "_zstd", None)
+    monkeypatch.setattr(log_writer, "log_message", lambda level, msg: warnings.append((level, msg)))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "audit.jsonl")
+        writer = LogWriter(compression="zstd")
+        writer.write_batch([(path, {"i": 1}, "test log")])
+        assert _read_lines(path) == [{"i": 1}]
+    assert [level for level, msg in warnings if "zstandard" in msg] == ["WARN"]
@@ -40,9 +40,9 @@ def _make_listings(n: int):
     return [{"listing_id": f"id-{i}", "title": f"Listing {i}"} for i in range(1, n + 1)]
 
 
-def _make_agent_state(full_results=None, page_index=0, has_more=False, constraints=None):
+def _make_agent_state(full_results=None, page_index=0, has_more=False, constraints=None, state_cls=None):
     from agent.state import AgentState
-    s = AgentState()
+    s = (state_cls or AgentState)()
     s.search_full_results = list(full_results or [])
     s.last_results = list(full_results[:5] if full_results else [])
     s.page_index = page_index
@@ -188,6 +188,49 @@ def test_paginate_has_more_is_false_on_exact_fit():
     _assert(agent_state.has_more is False, "page 2 is the last page, no more pages")
 
 
+def test_turn_page_reports_slice_without_graph_state():
+    """turn_page (used by the /api/chat/page endpoint) mutates AgentState directly."""
+    from orchestration.nodes import turn_page
+    from orchestration.state import AgentState
+    full = _make_listings(7)
+    agent_state = _make_agent_state(full_results=full, page_index=0, constraints={"k": 5}, state_cls=AgentState)
+    reply, info = turn_page(agent_state, "next")
+    _assert(info["moved"] and info["slice_start"] == 5 and info["slice_end"] == 7, "info should describe slice 5-7")
+    _assert(agent_state.last_results[0]["listing_id"] == "id-6", "page 2 starts at listing 6")
+    _assert("6-7 of 7" in reply, "reply shows the range")
+    reply, info = turn_page(agent_state, "next")
+    _assert(not info["moved"] and "last page" in reply.lower(), "no move past the last page")
+
+
+
+def test_turn_page_pulls_further_pages_from_search_cursor():
+    """Past the held results, turn_page pages further down the same ranking."""
+    from orchestration import nodes
+    from orchestration.state import AgentState
+    full = _make_listings(12)
+    agent_state = _make_agent_state(full_results=full[:5], page_index=0, constraints={"k": 5}, state_cls=AgentState)
+    agent_state.search_total = 40
+    agent_state.search_cursor = {"offset": 5}
+    offsets = []
+
+    def fake_more(cursor, runtime):
+        offsets.append(cursor["offset"])
+        return (full[5:8], {"offset": 8}) if cursor["offset"] == 5 else (full[8:], None)
+
+    original = nodes.more_search_results
+    nodes.more_search_results = fake_more
+    try:
+        _, info = nodes.turn_page(agent_state, "next")
+        _assert(offsets == [] and info["total"] == 40, "no runtime: only the held results are paged")
+        agent_state.page_index = 0
+        reply, info = nodes.turn_page(agent_state, "next", runtime=object())
+    finally:
+        nodes.more_search_results = original
+    _assert(offsets == [5, 8], "cursor pages are fetched in order")
+    _assert(agent_state.last_results[0]["listing_id"] == "id-6", "page 2 starts at listing 6")
+    _assert(agent_state.search_cursor is None and agent_state.has_more, "ranking drained, page 3 still held")
+    _assert("6-10 of 12" in reply, "total is exact once the ranking is exhausted")
+
 # ---------------------------------------------------------------------------
 # Section 2: _is_cross_candidate_query
 # ---------------------------------------------------------------------------
@@ -439,6 +482,8 @@ _TESTS = [
     test_paginate_invalid_action_defaults_to_next,
     test_paginate_fallback_to_last_results_when_full_empty,
     test_paginate_has_more_is_false_on_exact_fit,
+    test_turn_page_reports_slice_without_graph_state,
+    test_turn_page_pulls_further_pages_from_search_cursor,
     # _is_cross_candidate_query
     test_cross_candidate_which_one,
     test_cross_candidate_which_listing,
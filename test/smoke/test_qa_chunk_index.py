@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from skills.qa import chunk_index
+
+
+def _distilled() -> dict:
+    return {
+        "listing_id": "qa-1",
+        "features": ["Pets allowed", "Garden", "Dishwasher"],
+        "stations": ["Dalston Junction", "Haggerston"],
+        "nearest_station": "Dalston Junction",
+        "distance_to_station_m": 250,
+        "description": "Bright flat with a private garden. Close to shops.",
+    }
+
+
+def test_chunks_put_nearest_station_first() -> None:
+    chunks = chunk_index.build_listing_chunks(_distilled())
+    assert chunks[0] == {"field": "nearest_station", "text": "Dalston Junction (250m away)"}
+
+
+def test_bm25_scores_only_category_rows() -> None:
+    idx = chunk_index.ListingChunkIndex.from_chunks(chunk_index.build_listing_chunks(_distilled()))
+    rows = idx.rows_for_fields({"features"})
+    scores = idx.bm25(["garden"], rows)
+    assert len(scores) == len(rows)
+    best = rows[int(scores.argmax())]
+    assert idx.chunks[best]["text"] == "Garden"
+
+
+def test_listing_index_is_cached_per_listing(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(chunk_index, "QA_CHUNK_INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(chunk_index, "_SIDECAR", None)
+    monkeypatch.setattr(chunk_index, "_LRU", chunk_index.OrderedDict())
+    a = chunk_index.get_listing_index(_distilled())
+    assert chunk_index.get_listing_index(_distilled()) is a
+
+
+def test_sidecar_is_read_per_listing_and_reloaded_on_change(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(chunk_index, "QA_CHUNK_INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(chunk_index, "_SIDECAR", None)
+    monkeypatch.setattr(chunk_index, "_LRU", chunk_index.OrderedDict())
+    other = [{"field": "features", "text": "Lift"}]
+    chunks = chunk_index.build_listing_chunks(_distilled())
+    vectors = np.eye(len(chunks) + 1, dtype=np.float32)
+    chunk_index._write_sidecar(str(tmp_path), {"qa-0": other, "qa-1": chunks}, vectors)
+    idx = chunk_index.get_listing_index({"listing_id": "qa-1"})
+    assert idx.chunks == chunks and idx.vectors.shape == (len(chunks), len(chunks) + 1)
+
+    chunk_index._write_sidecar(str(tmp_path), {"qa-1": other}, vectors[:1])
+    meta = tmp_path / "meta.json"
+    st = meta.stat()
+    os.utime(meta, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert chunk_index.get_listing_index({"listing_id": "qa-1"}).chunks == other
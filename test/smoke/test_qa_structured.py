@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from skills.qa.structured import compose_structured_answer, detect_structured_topics
+
+
+def test_detects_only_fully_structured_questions() -> None:
+    assert detect_structured_topics("How many bathrooms and when is it available?") == ["bathrooms", "available_from"]
+    assert detect_structured_topics("Does it allow pets, and is there parking?") == ["pets_allowed", "parking"]
+    assert detect_structured_topics("Is it near good schools?") is None
+    assert detect_structured_topics("Is it quiet and does it have a garden?") is None
+
+
+def test_compose_uses_fields_and_bool_signals() -> None:
+    distilled = {"bathrooms": 2, "nearest_station": "Oval", "distance_to_station_m": 400}
+    payload = {"features": ["No pets"]}
+    out = compose_structured_answer(["bathrooms", "nearest_station", "pets_allowed", "garden"], distilled, payload)
+    assert out == (
+        "It has 2 bathrooms. The nearest station is Oval, 400m away. Pets are not allowed. "
+        "A garden is not mentioned in listing data — please ask the agent."
+    )
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from skills.search.pipeline import build_stage_a_records, build_stage_c_records
+
+
+def _counting_snapshot(calls: list):
+    def snapshot(r: dict) -> dict:
+        calls.append(r["url"])
+        return {"url": r["url"], "qdrant_score": r.get("qdrant_score")}
+    return snapshot
+
+
+def test_stage_a_records_snapshot_only_rows_read() -> None:
+    df = pd.DataFrame({"url": [f"u{i}" for i in range(1000)], "qdrant_score": [1.0 - i / 1000 for i in range(1000)]})
+    calls: list = []
+    recs = build_stage_a_records(df, _counting_snapshot(calls))
+    assert len(recs) == 1000
+    assert calls == []
+    top = recs[:6]
+    assert [r["rank"] for r in top] == [1, 2, 3, 4, 5, 6]
+    assert calls == ["u0", "u1", "u2", "u3", "u4", "u5"]
+    recs[:6]  # cached, no new snapshots
+    assert len(calls) == 6
+
+
+def test_stage_c_records_keep_index_rank_and_limit() -> None:
+    ranked = pd.DataFrame(
+        {"url": ["b", "a", "c"], "final_score": [0.9, 0.8, 0.1]},
+        index=[1, 0, 2],
+    )
+    calls: list = []
+    recs = build_stage_c_records(ranked, _counting_snapshot(calls), {"w": 1.0}, limit=2)
+    assert len(recs) == 2
+    assert [(r["url"], r["rank"], r["score"]) for r in recs.materialize()] == [("b", 2, 0.9), ("a", 1, 0.8)]
+    assert len(build_stage_c_records(ranked, _counting_snapshot(calls), {}, limit=0)) == 0
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+
+from skills.search import recall_control
+from skills.search.recall_control import (
+    adaptive_stage_a_b,
+    constraint_shape,
+    estimate_total,
+    next_page,
+    page_cursor,
+    plan_recall,
+)
+
+
+def _fake_fetch(total: int, calls: list):
+    """Ranked ids 0..total-1."""
+    def fetch(n, offset: int, first: dict) -> pd.DataFrame:
+        if callable(n):
+            n = n(total)
+        calls.append((n, offset))
+        assert (offset == 0) == (first == {})
+        ids = list(range(offset, min(offset + n, total)))
+        df = pd.DataFrame({"id": ids})
+        df.attrs.update(prefilter_count=total, recall=n, exhausted=len(ids) < n)
+        return df
+    return fetch
+
+
+def _keep_every(step: int):
+    def hard_filter(df: pd.DataFrame, c: dict):
+        keep = df[df["id"] % step == 0].reset_index(drop=True) if len(df) else df
+        return keep, [{"hard_pass": i % step == 0} for i in df.get("id", [])]
+    return hard_filter
+
+
+def test_first_fetch_is_sized_and_clamped_to_prefilter() -> None:
+    assert plan_recall(30, 0.25, 1000) == 180
+    assert plan_recall(30, 0.25, 1000, available=40) == 40
+    assert plan_recall(30, 0.0, 1000) == 1000
+    assert constraint_shape({"max_rent_pcm": 1800, "furnish_type": "furnished"}) == "furnish_type|budget<2000"
+
+
+def test_pages_until_enough_survive_and_learns_pass_rate() -> None:
+    recall_control._PASS_RATES.clear()
+    c = {"let_type": "long term"}
+    calls: list = []
+    # Prior 0.25 with k=5 asks for 180; half pass, so one fetch is enough.
+    stage_a, kept, audits, info = adaptive_stage_a_b(_fake_fetch(5000, calls), _keep_every(2), c, 5, 1000)
+    assert calls == [(180, 0)] and info["pages"] == 1 and len(kept) == 90
+    assert recall_control.expected_pass_rate(constraint_shape(c)) == 0.5
+
+    # A stricter filter on the same shape: too few survive, so page on.
+    calls.clear()
+    stage_a, kept, audits, info = adaptive_stage_a_b(_fake_fetch(5000, calls), _keep_every(10), c, 5, 1000)
+    assert calls == [(90, 0), (315, 90)]
+    assert info["pages"] == 2 and len(stage_a) == len(audits) == 405
+    assert list(kept["id"][:3]) == [0, 10, 20] and len(kept) == 41
+
+
+def test_totals_and_show_more_continue_past_the_first_pages() -> None:
+    recall_control._PASS_RATES.clear()
+    calls: list = []
+    fetch = _fake_fetch(5000, calls)
+    stage_a, kept, _, _ = adaptive_stage_a_b(fetch, _keep_every(2), {}, 5, 1000)
+    assert len(stage_a) == 180 and len(kept) == 90
+    # Half of the 1000-row recall window would pass.
+    assert estimate_total(stage_a, len(kept), 1000) == 500
+
+    cursor = page_cursor(stage_a, len(kept), 1000)
+    # Plain data, so it can sit in session state and snapshots.
+    assert json.loads(json.dumps(cursor)) == cursor
+    page, after = next_page(fetch, _keep_every(2), {}, cursor, 5, 1000)
+    assert calls[-1][1] == 180 and cursor["offset"] == 180
+    assert list(page["id"][:2]) == [180, 182]
+    assert after["offset"] == 180 + calls[-1][0] and after["pass_rate"] == cursor["pass_rate"]
+
+
+def test_sparse_pushed_down_result_is_a_single_search() -> None:
+    calls: list = []
+
+    def pushed(n, offset: int, first: dict) -> pd.DataFrame:
+        calls.append((n, offset))
+        df = pd.DataFrame({"id": [0, 10]})
+        df.attrs.update(prefilter_count=2, recall=2, exhausted=True, hard_pushdown='{"max_rent_pcm": 1500}')
+        return df
+
+    stage_a, kept, audits, info = adaptive_stage_a_b(pushed, _keep_every(10), {"max_rent_pcm": 1500}, 5, 400)
+    # Near misses are loaded later, only if evaluate_node decides to relax.
+    assert len(calls) == 1 and len(stage_a) == 2 and len(kept) == 2
+    assert "pushdown_fallback" not in info
+
+
+def test_more_search_results_rebuilds_the_fetch_from_the_cursor(monkeypatch) -> None:
+    from skills.search import agentic
+
+    seen: dict = {}
+
+    def fake_stage_a(client, embedder, query, recall, c=None, offset=0, query_vector=None, prefilter_count=None, **kw):
+        seen.update(query=query, offset=offset, vector=list(query_vector), prefilter=prefilter_count, pushdown=kw.get("pushdown"))
+        df = pd.DataFrame({"id": list(range(offset, offset + recall))})
+        df.attrs.update(recall=recall, exhausted=True)
+        return df
+
+    monkeypatch.setattr(agentic, "stage_a_search", fake_stage_a)
+    monkeypatch.setattr(agentic, "apply_hard_filters_with_audit", _keep_every(2))
+    monkeypatch.setattr(agentic, "rank_stage_c", lambda df, signals, embedder=None: (df.iloc[::-1], None))
+    cursor = {
+        "offset": 180, "pass_rate": 0.5, "prefilter_count": 5000,
+        "query": "2 bed flat", "query_vector": [0.1, 0.2], "pushdown_key": "",
+        "constraints": {"k": 5}, "k": 5, "recall": 1000,
+        "user_text": "2 bed flat", "semantic_terms": {}, "semantic_source": "precomputed_plan",
+    }
+    rows, after = agentic.more_search_results(cursor, agentic.SearchRuntime(qdrant_client=None, embedder=None))
+    assert seen == {"query": "2 bed flat", "offset": 180, "vector": [0.1, 0.2], "prefilter": 5000, "pushdown": False}
+    assert rows[0]["id"] > rows[-1]["id"] and all(r["id"] % 2 == 0 for r in rows)
+    # The fake page is exhausted, so the ranking is done.
+    assert after is None and cursor["offset"] == 180
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from crawler.region_index import RegionIndex
+
+_REGIONS = {
+    "Hackney Central": {"lat": 51.5470, "lng": -0.0560, "postcodes": ["E8", "E9"]},
+    "Dalston": {"lat": 51.5463, "lng": -0.0750, "postcodes": ["E8"]},
+    "Canary Wharf": {"lat": 51.5054, "lng": -0.0235, "postcodes": ["E14"]},
+}
+
+
+def test_keyword_and_district_lookups_keep_region_order() -> None:
+    idx = RegionIndex(_REGIONS)
+    assert idx.match_keyword("dalston") == "Dalston"
+    assert idx.match_keyword("hackney") == "Hackney Central"
+    assert idx.match_keyword("flat near canary wharf") == "Canary Wharf"
+    assert idx.regions_for_district("e8") == ["Hackney Central", "Dalston"]
+    assert idx.center("CANARY WHARF") == (51.5054, -0.0235)
+
+
+def test_nearest_uses_grid_but_matches_distance_order() -> None:
+    idx = RegionIndex(_REGIONS)
+    out = idx.nearest(51.5465, -0.0700, max_km=2.0)
+    assert [r["region"] for r in out] == ["Dalston", "Hackney Central"]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from skills.search.sparse import document_sparse_vector, query_sparse_vector, term_index, tokenize
+
+
+def test_query_terms_hit_document_indices() -> None:
+    assert tokenize("Looking for a flat with a Roof Terrace, EPC B") == ["flat", "roof", "terrace", "epc", "b"]
+    q_idx, q_val = query_sparse_vector("roof terrace and concierge")
+    assert q_val == [1.0, 1.0, 1.0]
+    d_idx, _ = document_sparse_vector("Stunning flat with roof terrace and 24h concierge", avgdl=8.0)
+    assert set(q_idx) <= set(d_idx)
+    assert d_idx == sorted(d_idx)
+
+
+def _weight(text: str, term: str) -> float:
+    idx, val = document_sparse_vector(text, avgdl=10.0)
+    return dict(zip(idx, val))[term_index(term)]
+
+
+def test_bm25_saturates_tf_and_normalises_length() -> None:
+    assert _weight("concierge " + "spacious " * 30, "concierge") < _weight("concierge", "concierge")
+    assert _weight("concierge " * 50, "concierge") < 2.2  # bounded by k1 + 1
+    assert document_sparse_vector("", avgdl=10.0) == ([], [])
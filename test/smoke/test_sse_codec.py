@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+import zlib
+
+from backend.sse_codec import StreamCompressor, content_version, negotiate_encoding, sse_event
+
+
+def test_sse_event_round_trips_json() -> None:
+    text = sse_event("metadata", {"title": "Flat in Café Row", "price": 1500})
+    assert text.startswith("event: metadata\ndata: ")
+    assert text.endswith("\n\n")
+    data = json.loads(text.split("data: ", 1)[1])
+    assert data == {"title": "Flat in Café Row", "price": 1500}
+
+
+def test_negotiate_encoding() -> None:
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+
+
+def test_gzip_stream_flushes_each_event() -> None:
+    comp = StreamCompressor("gzip")
+    dec = zlib.decompressobj(31)
+    events = [sse_event("delta", {"text": f"chunk {i}"}) for i in range(3)]
+    for ev in events:
+        # Every event must be decodable as soon as it is sent.
+        assert dec.decompress(comp.compress(ev)).decode() == ev
+    assert dec.decompress(comp.finish()) == b""
+    assert dec.eof
+
+
+def test_content_version_tracks_content() -> None:
+    pins = [{"url": "a", "price_pcm": 1000}, {"url": "b", "price_pcm": 1200}]
+    assert content_version(pins) == content_version([dict(p) for p in pins])
+    assert content_version(pins) != content_version(pins[:1])
+    assert content_version(pins) != content_version(list(reversed(pins)))
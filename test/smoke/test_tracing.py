@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from core import tracing
+
+
+def test_spans_nest_under_one_trace_and_feed_metrics() -> None:
+    tracing.reset_metrics()
+    with tracing.start_trace("chat_turn", hint="none") as root:
+        with tracing.span("node.search"):
+            with tracing.span("qdrant.search", recall=50) as sp:
+                sp.set(hits=12)
+                inner_trace = tracing.current_trace_id()
+    assert inner_trace == root.trace_id and len(root.trace_id) == 16
+    assert [c.name for c in root.children] == ["node.search"]
+    assert root.children[0].children[0].attrs == {"recall": 50, "hits": 12}
+    assert tracing.current_trace_id() is None
+
+    summary = tracing.latency_summary()
+    assert set(summary) == {"chat_turn", "node.search", "qdrant.search"}
+    assert summary["qdrant.search"]["count"] == 1
+    assert "qdrant.search=" in tracing.format_trace(root)
+
+
+def test_errors_are_counted_and_quantiles_use_the_window() -> None:
+    tracing.reset_metrics()
+    try:
+        with tracing.span("llm.router"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    for ms in range(1, 101):
+        tracing.observe("stage", ms / 1000.0)
+    s = tracing.latency_summary()["stage"]
+    assert s["p50_s"] == 0.05 and s["p95_s"] == 0.095 and s["p99_s"] == 0.099
+
+    tracing.incr("turns", intent="Search")
+    text = tracing.metrics_text()
+    assert 'rent_span_errors_total{span="llm.router"} 1' in text
+    assert 'rent_turns_total{intent="Search"} 1' in text
+    assert 'rent_span_seconds{span="stage",quantile="0.95"} 0.095' in text